@@ -0,0 +1,449 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Offline end-to-end engine benchmark.
+
+Runs the full server container against a simulated NLP service and a local plugin
+server, drives concurrent customer sessions through the engine, and reports per-stage
+latency percentiles, event throughput and peak memory as JSON and CSV, so that results
+can be compared across commits.
+
+Usage: python scripts/benchmark.py --agents 2 --guidelines 20 --tools 5 --sessions 10
+"""
+
+import asyncio
+from contextlib import AsyncExitStack
+import csv
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any, Sequence, cast
+
+import click
+
+
+@dataclass(frozen=True)
+class BenchmarkParams:
+    agents: int
+    guidelines: int
+    tools: int
+    sessions: int
+    turns: int
+    latency_ms: float
+    latency_stddev_ms: float
+    guideline_activation_ratio: float
+    composition_mode: str
+    seed: int
+    plugin_port: int
+    turn_timeout_s: float
+
+
+@dataclass(frozen=True)
+class StageStats:
+    stage: str
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    label: str
+    timestamp: str
+    params: BenchmarkParams
+    wall_time_s: float
+    turns: int
+    events: int
+    events_per_second: float
+    peak_rss_mb: float
+    stages: Sequence[StageStats]
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(stage: str, durations: Sequence[float]) -> StageStats:
+    values = sorted(d * 1000 for d in durations)
+
+    return StageStats(
+        stage=stage,
+        count=len(values),
+        mean_ms=statistics.fmean(values) if values else 0.0,
+        p50_ms=percentile(values, 0.5),
+        p90_ms=percentile(values, 0.9),
+        p99_ms=percentile(values, 0.99),
+        max_ms=values[-1] if values else 0.0,
+    )
+
+
+def current_label() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def create_tools(count: int) -> list[Any]:
+    from parlant.core.services.tools.plugins import tool
+    from parlant.core.tools import ToolContext, ToolResult
+
+    def create_tool(index: int) -> Any:
+        async def benchmark_tool(context: ToolContext) -> ToolResult:
+            return ToolResult(data={"tool": index, "session_id": context.session_id})
+
+        benchmark_tool.__doc__ = f"Looks up benchmark record #{index}"
+
+        return tool(name=f"benchmark_tool_{index}")(benchmark_tool)
+
+    return [create_tool(i) for i in range(count)]
+
+
+async def run_benchmark(
+    params: BenchmarkParams,
+    label: str,
+    log_level: str,
+) -> BenchmarkResult:
+    from parlant.adapters.nlp.simulated import (
+        LatencyDistribution,
+        SimulatedNLPService,
+        SimulationConfig,
+    )
+    from parlant.bin import server
+    from parlant.core.agents import AgentStore, CompositionMode
+    from parlant.core.application import Application
+    from parlant.core.contextual_correlator import ContextualCorrelator
+    from parlant.core.customers import CustomerStore
+    from parlant.core.fragments import FragmentStore
+    from parlant.core.guideline_tool_associations import GuidelineToolAssociationStore
+    from parlant.core.guidelines import GuidelineStore
+    from parlant.core.services.tools.plugins import PluginServer
+    from parlant.core.services.tools.service_registry import ServiceRegistry
+    from parlant.core.sessions import Event, SessionId, SessionStore
+    from parlant.core.tools import ToolId
+    from parlant.core.tracing import Span, Tracer
+
+    config = SimulationConfig(
+        default_latency=LatencyDistribution(
+            mean=params.latency_ms / 1000,
+            stddev=params.latency_stddev_ms / 1000,
+        ),
+        guideline_activation_ratio=params.guideline_activation_ratio,
+        seed=params.seed,
+    )
+
+    server.NLP_SERVICE_INITIALIZERS["simulated"] = lambda: SimulatedNLPService(
+        server.LOGGER, config
+    )
+    server.TRACER = Tracer(server.CORRELATOR, capacity=10_000_000)
+    server.EXIT_STACK = AsyncExitStack()
+
+    async with (
+        server.setup_container("simulated", log_level) as container,
+        server.EXIT_STACK,
+        PluginServer(
+            tools=create_tools(params.tools),
+            port=params.plugin_port,
+            host="127.0.0.1",
+        ) as plugin_server,
+    ):
+        await container[server.DeferredWarmUps].run()
+
+        try:
+            if params.tools:
+                await container[ServiceRegistry].update_tool_service(
+                    name="benchmark",
+                    kind="sdk",
+                    url=plugin_server.url,
+                )
+
+            agent_ids = []
+
+            for a in range(params.agents):
+                agent = await container[AgentStore].create_agent(
+                    name=f"Benchmark Agent {a}",
+                    composition_mode=cast(CompositionMode, params.composition_mode),
+                )
+                agent_ids.append(agent.id)
+
+                for g in range(params.guidelines):
+                    guideline = await container[GuidelineStore].create_guideline(
+                        guideline_set=agent.id,
+                        condition=f"the customer asks about benchmark topic {g}",
+                        action=f"explain benchmark topic {g} briefly",
+                    )
+
+                    if g < params.tools:
+                        await container[GuidelineToolAssociationStore].create_association(
+                            guideline_id=guideline.id,
+                            tool_id=ToolId("benchmark", f"benchmark_tool_{g}"),
+                        )
+
+            if params.composition_mode != "fluid":
+                for g in range(params.guidelines):
+                    await container[FragmentStore].create_fragment(
+                        value=f"Here's what you should know about benchmark topic {g}.",
+                        fields=[],
+                    )
+
+            customer = await container[CustomerStore].create_customer(name="Benchmark Customer")
+
+            session_ids = [
+                (
+                    await container[SessionStore].create_session(
+                        customer_id=customer.id,
+                        agent_id=agent_ids[s % len(agent_ids)],
+                    )
+                ).id
+                for s in range(params.sessions)
+            ]
+
+            application = container[Application]
+            correlator = container[ContextualCorrelator]
+            tracer = container[Tracer]
+
+            turn_durations: list[float] = []
+            stage_durations: dict[str, list[float]] = {}
+
+            async def wait_for_reply(session_id: SessionId, min_offset: int) -> Event:
+                # Polled in a tight loop rather than through the listener's long-poll,
+                # whose interval would otherwise hold up the session's next turn
+                deadline = time.monotonic() + params.turn_timeout_s
+
+                while time.monotonic() < deadline:
+                    if replies := await container[SessionStore].list_events(
+                        session_id=session_id,
+                        min_offset=min_offset,
+                        kinds=["message"],
+                        source="ai_agent",
+                    ):
+                        return replies[0]
+
+                    await asyncio.sleep(0.005)
+
+                raise TimeoutError(f"Session {session_id} produced no agent message")
+
+            async def run_session(session_id: SessionId) -> None:
+                for turn in range(params.turns):
+                    scope = f"BENCHMARK({session_id}:{turn})"
+
+                    with correlator.correlation_scope(scope):
+                        event: Event = await application.post_event(
+                            session_id=session_id,
+                            kind="message",
+                            data={
+                                "message": f"Tell me about benchmark topic {turn}",
+                                "participant": {
+                                    "id": customer.id,
+                                    "display_name": customer.name,
+                                },
+                            },
+                        )
+
+                    reply = await wait_for_reply(session_id, min_offset=event.offset + 1)
+
+                    # Measured between the stored events, so that polling doesn't skew it
+                    turn_durations.append((reply.creation_utc - event.creation_utc).total_seconds())
+
+                    spans: Sequence[Span] = tracer.find_spans(scope)
+
+                    for span in spans:
+                        if span.duration is not None:
+                            stage_durations.setdefault(span.name, []).append(span.duration)
+
+            t_start = time.perf_counter()
+            await asyncio.gather(*(run_session(s) for s in session_ids))
+            wall_time = time.perf_counter() - t_start
+
+            events = 0
+
+            for session_id in session_ids:
+                events += len(await container[SessionStore].list_events(session_id))
+        finally:
+            await plugin_server.shutdown()
+            await server.BACKGROUND_TASK_SERVICE.cancel_all(reason="Benchmark finished")
+
+    return BenchmarkResult(
+        label=label,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        params=params,
+        wall_time_s=wall_time,
+        turns=len(turn_durations),
+        events=events,
+        events_per_second=events / wall_time if wall_time else 0.0,
+        peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        stages=[
+            summarize("turn", turn_durations),
+            *(summarize(stage, durations) for stage, durations in sorted(stage_durations.items())),
+        ],
+    )
+
+
+def write_results(result: BenchmarkResult, output: Path) -> None:
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    json_path = output.with_suffix(".json")
+    json_path.write_text(json.dumps(asdict(result), indent=2))
+
+    csv_path = output.with_suffix(".csv")
+    is_new_file = not csv_path.exists()
+
+    with csv_path.open("a", newline="") as f:
+        writer = csv.writer(f)
+
+        if is_new_file:
+            writer.writerow(
+                [
+                    "label",
+                    "timestamp",
+                    "stage",
+                    "count",
+                    "mean_ms",
+                    "p50_ms",
+                    "p90_ms",
+                    "p99_ms",
+                    "max_ms",
+                    "events_per_second",
+                    "peak_rss_mb",
+                ]
+            )
+
+        for stage in result.stages:
+            writer.writerow(
+                [
+                    result.label,
+                    result.timestamp,
+                    stage.stage,
+                    stage.count,
+                    f"{stage.mean_ms:.3f}",
+                    f"{stage.p50_ms:.3f}",
+                    f"{stage.p90_ms:.3f}",
+                    f"{stage.p99_ms:.3f}",
+                    f"{stage.max_ms:.3f}",
+                    f"{result.events_per_second:.3f}",
+                    f"{result.peak_rss_mb:.1f}",
+                ]
+            )
+
+
+@click.command()
+@click.option("--agents", type=int, default=1, help="Number of agents")
+@click.option("--guidelines", type=int, default=10, help="Guidelines per agent")
+@click.option("--tools", type=int, default=3, help="Tools, each associated with one guideline")
+@click.option("--sessions", type=int, default=5, help="Concurrent sessions")
+@click.option("--turns", type=int, default=3, help="Customer messages per session")
+@click.option("--latency-ms", type=float, default=200.0, help="Mean simulated LLM latency")
+@click.option("--latency-stddev-ms", type=float, default=50.0, help="Simulated latency stddev")
+@click.option(
+    "--guideline-activation-ratio",
+    type=float,
+    default=0.3,
+    help="Share of guidelines deemed applicable",
+)
+@click.option(
+    "--composition-mode",
+    type=click.Choice(["fluid", "strict_assembly", "composited_assembly", "fluid_assembly"]),
+    default="fluid",
+    help="Composition mode of the agents; assembly modes get one fragment per guideline",
+)
+@click.option("--seed", type=int, default=0, help="Seed for simulated latencies and decisions")
+@click.option("--plugin-port", type=int, default=8095, help="Port of the local plugin server")
+@click.option("--turn-timeout", type=float, default=120.0, help="Seconds to wait for a reply")
+@click.option(
+    "--log-level",
+    type=click.Choice(["debug", "info", "warning", "error", "critical"]),
+    default="warning",
+    help="Server log level",
+)
+@click.option("--label", type=str, default=None, help="Result label (defaults to git HEAD)")
+@click.option(
+    "--output",
+    type=click.Path(path_type=Path),
+    default=Path("logs/benchmark/results"),
+    help="Output path prefix; .json is overwritten and .csv is appended to",
+)
+def main(
+    agents: int,
+    guidelines: int,
+    tools: int,
+    sessions: int,
+    turns: int,
+    latency_ms: float,
+    latency_stddev_ms: float,
+    guideline_activation_ratio: float,
+    composition_mode: str,
+    seed: int,
+    plugin_port: int,
+    turn_timeout: float,
+    log_level: str,
+    label: str | None,
+    output: Path,
+) -> None:
+    params = BenchmarkParams(
+        agents=agents,
+        guidelines=guidelines,
+        tools=min(tools, guidelines),
+        sessions=sessions,
+        turns=turns,
+        latency_ms=latency_ms,
+        latency_stddev_ms=latency_stddev_ms,
+        guideline_activation_ratio=guideline_activation_ratio,
+        composition_mode=composition_mode,
+        seed=seed,
+        plugin_port=plugin_port,
+        turn_timeout_s=turn_timeout,
+    )
+
+    with tempfile.TemporaryDirectory() as home_dir:
+        # Must be set before the server module is imported, as it resolves its home on import
+        os.environ["PARLANT_HOME"] = home_dir
+
+        result = asyncio.run(run_benchmark(params, label or current_label(), log_level))
+
+    write_results(result, output)
+
+    click.echo(
+        f"{result.turns} turns, {result.events} events in {result.wall_time_s:.2f}s "
+        f"({result.events_per_second:.1f} events/s), peak RSS {result.peak_rss_mb:.0f} MB"
+    )
+
+    for stage in result.stages:
+        click.echo(
+            f"{stage.stage:<60} n={stage.count:<6} "
+            f"p50={stage.p50_ms:9.1f}ms p90={stage.p90_ms:9.1f}ms p99={stage.p99_ms:9.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
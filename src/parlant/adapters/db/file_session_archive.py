@@ -0,0 +1,73 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Sequence
+from typing_extensions import override
+
+import aiofiles
+
+from parlant.core.common import JSONSerializable
+from parlant.core.sessions import SessionArchive, SessionId
+
+
+class FileSessionArchive(SessionArchive):
+    """Keeps each archived session in its own gzip-compressed JSON file"""
+
+    _SUFFIX = ".json.gz"
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, session_id: SessionId) -> Path:
+        return self._directory / f"{session_id}{self._SUFFIX}"
+
+    @override
+    async def list_session_ids(self) -> Sequence[SessionId]:
+        return [
+            SessionId(p.name.removesuffix(self._SUFFIX))
+            for p in self._directory.glob(f"*{self._SUFFIX}")
+        ]
+
+    @override
+    async def write(self, session_id: SessionId, content: JSONSerializable) -> None:
+        compressed = await asyncio.to_thread(
+            lambda: gzip.compress(json.dumps(content, ensure_ascii=False).encode())
+        )
+
+        # Write to a temporary file first so that a crash never leaves a truncated archive
+        temporary_path = self._path(session_id).with_suffix(".tmp")
+
+        async with aiofiles.open(temporary_path, "wb") as file:
+            await file.write(compressed)
+
+        os.replace(temporary_path, self._path(session_id))
+
+    @override
+    async def read(self, session_id: SessionId) -> JSONSerializable:
+        async with aiofiles.open(self._path(session_id), "rb") as file:
+            compressed = await file.read()
+
+        return await asyncio.to_thread(
+            lambda: json.loads(gzip.decompress(compressed).decode()),
+        )
+
+    @override
+    async def delete(self, session_id: SessionId) -> None:
+        self._path(session_id).unlink(missing_ok=True)
@@ -17,11 +17,17 @@ import importlib
 import json
 import operator
 from pathlib import Path
-from typing import Any, Mapping, Optional, Sequence, cast
+from typing import Any, ContextManager, Mapping, Optional, Sequence, cast
 from typing_extensions import override, Self
 import aiofiles
 
-from parlant.core.persistence.common import Where, matches_filters, ensure_is_total
+from parlant.core.persistence.common import (
+    FieldName,
+    Where,
+    ensure_is_total,
+    matches_filters,
+    sort_documents,
+)
 from parlant.core.async_utils import ReaderWriterLock
 from parlant.core.persistence.document_database import (
     BaseDocument,
@@ -33,6 +39,7 @@ from parlant.core.persistence.document_database import (
     UpdateResult,
 )
 from parlant.core.logging import Logger
+from parlant.core.metrics import MetricsRegistry
 
 
 class JSONFileDocumentDatabase(DocumentDatabase):
@@ -40,12 +47,26 @@ class JSONFileDocumentDatabase(DocumentDatabase):
         self,
         logger: Logger,
         file_path: Path,
+        metrics: Optional[MetricsRegistry] = None,
     ) -> None:
         self.file_path = file_path
 
         self._logger = logger
         self._op_counter = 0
 
+        metrics = metrics or MetricsRegistry()
+
+        self._operation_durations = metrics.histogram(
+            "document_operation_duration_seconds",
+            "Duration of document collection operations",
+            labels=["database", "collection", "operation"],
+        )
+        self._flush_durations = metrics.histogram(
+            "document_flush_duration_seconds",
+            "Duration of writing a document database to disk",
+            labels=["database"],
+        )
+
         self._lock = ReaderWriterLock()
 
         if not self.file_path.exists():
@@ -172,10 +193,18 @@ class JSONFileDocumentDatabase(DocumentDatabase):
         raise ValueError(f'Collection "{name}" does not exists')
 
     async def _flush_unlocked(self) -> None:
-        data = {}
-        for collection_name in self._collections:
-            data[collection_name] = self._collections[collection_name].documents
-        await self._save_data(data)
+        with self._flush_durations.time(database=self.file_path.stem):
+            data = {}
+            for collection_name in self._collections:
+                data[collection_name] = self._collections[collection_name].documents
+            await self._save_data(data)
+
+    def _time_operation(self, collection: str, operation: str) -> ContextManager[None]:
+        return self._operation_durations.time(
+            database=self.file_path.stem,
+            collection=collection,
+            operation=operation,
+        )
 
 
 class JSONFileDocumentCollection(DocumentCollection[TDocument]):
@@ -199,26 +228,33 @@ class JSONFileDocumentCollection(DocumentCollection[TDocument]):
     async def find(
         self,
         filters: Where,
+        sort: Sequence[FieldName] = [],
+        limit: Optional[int] = None,
     ) -> Sequence[TDocument]:
         result = []
-        async with self._lock.reader_lock:
-            for doc in filter(
-                lambda d: matches_filters(filters, d),
-                self.documents,
-            ):
-                result.append(doc)
+        with self._database._time_operation(self._name, "find"):
+            async with self._lock.reader_lock:
+                for doc in filter(
+                    lambda d: matches_filters(filters, d),
+                    self.documents,
+                ):
+                    result.append(doc)
+
+        if sort:
+            result = sort_documents(result, sort)
 
-        return result
+        return result[:limit]
 
     @override
     async def find_one(
         self,
         filters: Where,
     ) -> Optional[TDocument]:
-        async with self._lock.reader_lock:
-            for doc in self.documents:
-                if matches_filters(filters, doc):
-                    return doc
+        with self._database._time_operation(self._name, "find_one"):
+            async with self._lock.reader_lock:
+                for doc in self.documents:
+                    if matches_filters(filters, doc):
+                        return doc
 
         return None
 
@@ -229,10 +265,27 @@ class JSONFileDocumentCollection(DocumentCollection[TDocument]):
     ) -> InsertResult:
         ensure_is_total(document, self._schema)
 
-        async with self._lock.writer_lock:
-            self.documents.append(document)
+        with self._database._time_operation(self._name, "insert_one"):
+            async with self._lock.writer_lock:
+                self.documents.append(document)
 
-        await self._database.flush()
+            await self._database.flush()
+
+        return InsertResult(acknowledged=True)
+
+    @override
+    async def insert_many(
+        self,
+        documents: Sequence[TDocument],
+    ) -> InsertResult:
+        for document in documents:
+            ensure_is_total(document, self._schema)
+
+        with self._database._time_operation(self._name, "insert_many"):
+            async with self._lock.writer_lock:
+                self.documents.extend(documents)
+
+            await self._database.flush()
 
         return InsertResult(acknowledged=True)
 
@@ -242,6 +295,15 @@ class JSONFileDocumentCollection(DocumentCollection[TDocument]):
         filters: Where,
         params: TDocument,
         upsert: bool = False,
+    ) -> UpdateResult[TDocument]:
+        with self._database._time_operation(self._name, "update_one"):
+            return await self._update_one(filters, params, upsert)
+
+    async def _update_one(
+        self,
+        filters: Where,
+        params: TDocument,
+        upsert: bool,
     ) -> UpdateResult[TDocument]:
         async with self._lock.writer_lock:
             for i, d in enumerate(self.documents):
@@ -279,19 +341,41 @@ class JSONFileDocumentCollection(DocumentCollection[TDocument]):
         self,
         filters: Where,
     ) -> DeleteResult[TDocument]:
-        async with self._lock.writer_lock:
-            for i, d in enumerate(self.documents):
-                if matches_filters(filters, d):
-                    document = self.documents.pop(i)
+        with self._database._time_operation(self._name, "delete_one"):
+            async with self._lock.writer_lock:
+                for i, d in enumerate(self.documents):
+                    if matches_filters(filters, d):
+                        document = self.documents.pop(i)
 
-                    await self._database.flush()
+                        await self._database.flush()
 
-                    return DeleteResult(
-                        deleted_count=1, acknowledged=True, deleted_document=document
-                    )
+                        return DeleteResult(
+                            deleted_count=1, acknowledged=True, deleted_document=document
+                        )
 
         return DeleteResult(
             acknowledged=True,
             deleted_count=0,
             deleted_document=None,
         )
+
+    @override
+    async def delete_many(
+        self,
+        filters: Where,
+    ) -> DeleteResult[TDocument]:
+        with self._database._time_operation(self._name, "delete_many"):
+            async with self._lock.writer_lock:
+                remaining_documents = [d for d in self.documents if not matches_filters(filters, d)]
+                deleted_count = len(self.documents) - len(remaining_documents)
+
+                self.documents = remaining_documents
+
+                if deleted_count:
+                    await self._database.flush()
+
+        return DeleteResult(
+            acknowledged=True,
+            deleted_count=deleted_count,
+            deleted_document=None,
+        )
@@ -0,0 +1,816 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import importlib
+import json
+import operator
+from pathlib import Path
+import re
+import sqlite3
+import time
+from typing import Any, Callable, ContextManager, Optional, Sequence, TypeVar, cast
+from typing_extensions import override, Self
+
+from parlant.core.common import JSONSerializable, generate_id
+from parlant.core.leases import LeaseManager, LeaseToken
+from parlant.core.persistence.common import (
+    FieldName,
+    LogicalOperator,
+    Where,
+    WhereExpression,
+    ensure_is_total,
+)
+from parlant.core.persistence.document_database import (
+    BaseDocument,
+    DeleteResult,
+    DocumentCollection,
+    DocumentDatabase,
+    InsertResult,
+    TDocument,
+    UpdateResult,
+)
+from parlant.core.logging import Logger
+from parlant.core.metrics import MetricsRegistry
+from parlant.core.task_queue import QueuedTask, QueuedTaskId, TaskQueue
+
+
+T = TypeVar("T")
+
+_SQL_OPERATORS = {
+    "$eq": "=",
+    "$ne": "!=",
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<=",
+}
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _field(name: str) -> tuple[str, list[Any]]:
+    # Inlining simple paths lets SQLite use the expression indexes defined on them
+    if _IDENTIFIER.match(name):
+        return f"json_extract(data, '$.{name}')", []
+
+    return "json_extract(data, ?)", ['$."' + name.replace('"', '\\"') + '"']
+
+
+def _translate_where(where: Where) -> tuple[str, list[Any]]:
+    """Translates a filter into an SQL condition with the same semantics as `matches_filters`"""
+    if not where:
+        return "1", []
+
+    if next(iter(where.keys())) in ("$and", "$or"):
+        conditions: list[str] = []
+        params: list[Any] = []
+
+        for logical_operator, operands in cast(LogicalOperator, where).items():
+            translated = [_translate_where(o) for o in cast(Sequence[Where], operands)]
+            joiner = " AND " if logical_operator == "$and" else " OR "
+
+            conditions.append("(" + (joiner.join(c for c, _ in translated) or "1") + ")")
+            params.extend(p for _, ps in translated for p in ps)
+
+        return " AND ".join(conditions), params
+
+    conditions = []
+    params = []
+
+    for field_name, field_filter in cast(WhereExpression, where).items():
+        field_sql, field_params = _field(field_name)
+
+        for filter_operator, filter_value in field_filter.items():
+            conditions.append(f"{field_sql} {_SQL_OPERATORS[filter_operator]} ?")
+            params.extend([*field_params, filter_value])
+
+    return " AND ".join(conditions) or "1", params
+
+
+class _SQLiteConnection:
+    """Runs statements on a connection, one at a time, on a dedicated thread,
+    since sqlite3 connections mustn't be used concurrently"""
+
+    def __init__(self, file_path: Path, thread_name_prefix: str) -> None:
+        self._file_path = file_path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name_prefix)
+        self._connection: sqlite3.Connection
+
+    async def open(self, *setup_statements: str) -> None:
+        def connect() -> sqlite3.Connection:
+            connection = sqlite3.connect(
+                self._file_path,
+                check_same_thread=False,
+                isolation_level=None,
+                timeout=30,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+
+            for statement in setup_statements:
+                connection.execute(statement)
+
+            return connection
+
+        self._connection = await asyncio.get_running_loop().run_in_executor(self._executor, connect)
+
+    async def close(self) -> None:
+        await self.run(lambda connection: connection.close())
+        self._executor.shutdown(wait=False)
+
+    async def run(self, f: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, lambda: f(self._connection)
+        )
+
+    async def run_in_transaction(self, f: Callable[[sqlite3.Connection], T]) -> T:
+        def run(connection: sqlite3.Connection) -> T:
+            # IMMEDIATE takes the write lock upfront, making
+            # read-modify-write sequences atomic across processes.
+            connection.execute("BEGIN IMMEDIATE")
+
+            try:
+                result = f(connection)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+            connection.execute("COMMIT")
+            return result
+
+        return await self.run(run)
+
+
+class SQLiteDocumentDatabase(DocumentDatabase):
+    """A document database which can be shared by multiple server processes.
+
+    Documents are stored as JSON, one table per collection,
+    and filters are evaluated by SQLite itself.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        file_path: Path,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.file_path = file_path
+
+        self._logger = logger
+
+        metrics = metrics or MetricsRegistry()
+
+        self._operation_durations = metrics.histogram(
+            "document_operation_duration_seconds",
+            "Duration of document collection operations",
+            labels=["database", "collection", "operation"],
+        )
+
+        self._connection = _SQLiteConnection(file_path, thread_name_prefix="sqlite")
+        self._collections: dict[str, SQLiteDocumentCollection[BaseDocument]] = {}
+
+    async def __aenter__(self) -> Self:
+        await self._connection.open(
+            "PRAGMA synchronous=NORMAL",
+            "CREATE TABLE IF NOT EXISTS __collections__ "
+            "(name TEXT PRIMARY KEY, module_path TEXT NOT NULL, model_path TEXT NOT NULL)",
+        )
+
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[object],
+    ) -> bool:
+        await self._connection.close()
+        return False
+
+    def _time_operation(self, collection: str, operation: str) -> ContextManager[None]:
+        return self._operation_durations.time(
+            database=self.file_path.stem,
+            collection=collection,
+            operation=operation,
+        )
+
+    def _register(self, name: str, schema: type[TDocument]) -> SQLiteDocumentCollection[TDocument]:
+        collection = SQLiteDocumentCollection(database=self, name=name, schema=schema)
+        self._collections[name] = cast(SQLiteDocumentCollection[BaseDocument], collection)
+        return collection
+
+    @override
+    async def create_collection(
+        self,
+        name: str,
+        schema: type[TDocument],
+    ) -> SQLiteDocumentCollection[TDocument]:
+        self._logger.debug(f'Create collection "{name}"')
+
+        def create(connection: sqlite3.Connection) -> None:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote(name)} "
+                "(rowid INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+            )
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(name + '_id')} "
+                f"ON {_quote(name)} (json_extract(data, '$.id'))"
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO __collections__ VALUES (?, ?, ?)",
+                (name, schema.__module__, schema.__qualname__),
+            )
+
+        await self._connection.run_in_transaction(create)
+
+        return self._register(name, schema)
+
+    @override
+    async def get_collection(
+        self,
+        name: str,
+    ) -> SQLiteDocumentCollection[TDocument]:
+        if collection := self._collections.get(name):
+            return cast(SQLiteDocumentCollection[TDocument], collection)
+
+        row = await self._connection.run(
+            lambda connection: connection.execute(
+                "SELECT module_path, model_path FROM __collections__ WHERE name = ?", (name,)
+            ).fetchone()
+        )
+
+        if not row:
+            raise ValueError(f'Collection "{name}" does not exists')
+
+        schema = operator.attrgetter(row[1])(importlib.import_module(row[0]))
+
+        return self._register(name, cast(type[TDocument], schema))
+
+    @override
+    async def get_or_create_collection(
+        self,
+        name: str,
+        schema: type[TDocument],
+    ) -> SQLiteDocumentCollection[TDocument]:
+        if collection := self._collections.get(name):
+            return cast(SQLiteDocumentCollection[TDocument], collection)
+
+        return await self.create_collection(name, schema)
+
+    @override
+    async def delete_collection(
+        self,
+        name: str,
+    ) -> None:
+        def delete(connection: sqlite3.Connection) -> int:
+            connection.execute(f"DROP TABLE IF EXISTS {_quote(name)}")
+            return connection.execute(
+                "DELETE FROM __collections__ WHERE name = ?", (name,)
+            ).rowcount
+
+        if not await self._connection.run_in_transaction(delete):
+            raise ValueError(f'Collection "{name}" does not exists')
+
+        self._collections.pop(name, None)
+
+
+class SQLiteDocumentCollection(DocumentCollection[TDocument]):
+    def __init__(
+        self,
+        database: SQLiteDocumentDatabase,
+        name: str,
+        schema: type[TDocument],
+    ) -> None:
+        self._database = database
+        self._name = name
+        self._schema = schema
+
+        self._table = _quote(name)
+
+    @override
+    async def find(
+        self,
+        filters: Where,
+        sort: Sequence[FieldName] = [],
+        limit: Optional[int] = None,
+    ) -> Sequence[TDocument]:
+        condition, params = _translate_where(filters)
+
+        ordering = [_field(f) for f in sort] + [("rowid", [])]
+        params.extend(p for _, ps in ordering for p in ps)
+
+        query = (
+            f"SELECT data FROM {self._table} WHERE {condition} "
+            f"ORDER BY {', '.join(sql for sql, _ in ordering)}"
+        )
+
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._database._time_operation(self._name, "find"):
+            rows = await self._database._connection.run(
+                lambda connection: connection.execute(query, params).fetchall()
+            )
+
+        return [cast(TDocument, json.loads(row[0])) for row in rows]
+
+    @override
+    async def find_one(
+        self,
+        filters: Where,
+    ) -> Optional[TDocument]:
+        condition, params = _translate_where(filters)
+
+        with self._database._time_operation(self._name, "find_one"):
+            row = await self._database._connection.run(
+                lambda connection: connection.execute(
+                    f"SELECT data FROM {self._table} WHERE {condition} ORDER BY rowid LIMIT 1",
+                    params,
+                ).fetchone()
+            )
+
+        return cast(TDocument, json.loads(row[0])) if row else None
+
+    def _insert(self, connection: sqlite3.Connection, document: TDocument) -> None:
+        connection.execute(
+            f"INSERT INTO {self._table} (data) VALUES (?)",
+            (json.dumps(document, ensure_ascii=False),),
+        )
+
+    @override
+    async def insert_one(
+        self,
+        document: TDocument,
+    ) -> InsertResult:
+        ensure_is_total(document, self._schema)
+
+        with self._database._time_operation(self._name, "insert_one"):
+            await self._database._connection.run_in_transaction(
+                lambda connection: self._insert(connection, document)
+            )
+
+        return InsertResult(acknowledged=True)
+
+    @override
+    async def insert_many(
+        self,
+        documents: Sequence[TDocument],
+    ) -> InsertResult:
+        for document in documents:
+            ensure_is_total(document, self._schema)
+
+        def insert(connection: sqlite3.Connection) -> None:
+            for document in documents:
+                self._insert(connection, document)
+
+        with self._database._time_operation(self._name, "insert_many"):
+            await self._database._connection.run_in_transaction(insert)
+
+        return InsertResult(acknowledged=True)
+
+    @override
+    async def update_one(
+        self,
+        filters: Where,
+        params: TDocument,
+        upsert: bool = False,
+    ) -> UpdateResult[TDocument]:
+        condition, condition_params = _translate_where(filters)
+
+        def update(connection: sqlite3.Connection) -> UpdateResult[TDocument]:
+            row = connection.execute(
+                f"SELECT rowid, data FROM {self._table} WHERE {condition} ORDER BY rowid LIMIT 1",
+                condition_params,
+            ).fetchone()
+
+            if row:
+                updated_document = cast(TDocument, {**json.loads(row[1]), **params})
+
+                connection.execute(
+                    f"UPDATE {self._table} SET data = ? WHERE rowid = ?",
+                    (json.dumps(updated_document, ensure_ascii=False), row[0]),
+                )
+
+                return UpdateResult(
+                    acknowledged=True,
+                    matched_count=1,
+                    modified_count=1,
+                    updated_document=updated_document,
+                )
+
+            if upsert:
+                ensure_is_total(params, self._schema)
+                self._insert(connection, params)
+
+                return UpdateResult(
+                    acknowledged=True,
+                    matched_count=0,
+                    modified_count=0,
+                    updated_document=params,
+                )
+
+            return UpdateResult(
+                acknowledged=True,
+                matched_count=0,
+                modified_count=0,
+                updated_document=None,
+            )
+
+        with self._database._time_operation(self._name, "update_one"):
+            return await self._database._connection.run_in_transaction(update)
+
+    @override
+    async def delete_one(
+        self,
+        filters: Where,
+    ) -> DeleteResult[TDocument]:
+        condition, params = _translate_where(filters)
+
+        def delete(connection: sqlite3.Connection) -> DeleteResult[TDocument]:
+            row = connection.execute(
+                f"SELECT rowid, data FROM {self._table} WHERE {condition} ORDER BY rowid LIMIT 1",
+                params,
+            ).fetchone()
+
+            if not row:
+                return DeleteResult(acknowledged=True, deleted_count=0, deleted_document=None)
+
+            connection.execute(f"DELETE FROM {self._table} WHERE rowid = ?", (row[0],))
+
+            return DeleteResult(
+                acknowledged=True,
+                deleted_count=1,
+                deleted_document=cast(TDocument, json.loads(row[1])),
+            )
+
+        with self._database._time_operation(self._name, "delete_one"):
+            return await self._database._connection.run_in_transaction(delete)
+
+    @override
+    async def delete_many(
+        self,
+        filters: Where,
+    ) -> DeleteResult[TDocument]:
+        condition, params = _translate_where(filters)
+
+        def delete(connection: sqlite3.Connection) -> DeleteResult[TDocument]:
+            cursor = connection.execute(f"DELETE FROM {self._table} WHERE {condition}", params)
+
+            return DeleteResult(
+                acknowledged=True,
+                deleted_count=cursor.rowcount,
+                deleted_document=None,
+            )
+
+        with self._database._time_operation(self._name, "delete_many"):
+            return await self._database._connection.run_in_transaction(delete)
+
+
+class SQLiteLeaseManager(LeaseManager):
+    """Coordinates leases between server processes through a shared SQLite file"""
+
+    def __init__(self, file_path: Path) -> None:
+        super().__init__()
+
+        self.file_path = file_path
+
+        self._worker_id = generate_id()
+        self._connection = _SQLiteConnection(file_path, thread_name_prefix="sqlite-leases")
+
+    async def __aenter__(self) -> Self:
+        await self._connection.open(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            "key TEXT PRIMARY KEY, owner TEXT NOT NULL, token TEXT NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[object],
+    ) -> bool:
+        # Let other workers take over our leases right away
+        await self._connection.run(
+            lambda connection: connection.execute(
+                "DELETE FROM leases WHERE owner = ?", (self._worker_id,)
+            )
+        )
+        await self._connection.close()
+        return False
+
+    @override
+    async def acquire(self, key: str, ttl: timedelta) -> Optional[LeaseToken]:
+        def acquire(connection: sqlite3.Connection) -> Optional[LeaseToken]:
+            now = time.time()
+
+            row = connection.execute(
+                "SELECT owner, expires_at FROM leases WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and row[0] != self._worker_id and row[1] > now:
+                return None
+
+            token = LeaseToken(generate_id())
+
+            connection.execute(
+                "INSERT OR REPLACE INTO leases (key, owner, token, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, self._worker_id, token, now + ttl.total_seconds()),
+            )
+
+            return token
+
+        return await self._connection.run_in_transaction(acquire)
+
+    @override
+    async def renew(self, key: str, token: LeaseToken, ttl: timedelta) -> bool:
+        cursor = await self._connection.run(
+            lambda connection: connection.execute(
+                "UPDATE leases SET expires_at = ? WHERE key = ? AND token = ?",
+                (time.time() + ttl.total_seconds(), key, token),
+            )
+        )
+        return cursor.rowcount > 0
+
+    @override
+    async def release(self, key: str, token: LeaseToken) -> None:
+        await self._connection.run(
+            lambda connection: connection.execute(
+                "DELETE FROM leases WHERE key = ? AND token = ?", (key, token)
+            )
+        )
+
+
+class SQLiteTaskQueue(TaskQueue):
+    """A task queue which survives restarts and can be shared by multiple server processes"""
+
+    FAILED_TASK_RETENTION = timedelta(days=7)
+
+    def __init__(self, file_path: Path, polling_interval: float = 0.25) -> None:
+        self.file_path = file_path
+
+        self._connection = _SQLiteConnection(file_path, thread_name_prefix="sqlite-tasks")
+        self._polling_interval = polling_interval
+        self._changed = asyncio.Event()
+
+    async def __aenter__(self) -> Self:
+        await self._connection.open(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+            "kind TEXT NOT NULL, tag TEXT NOT NULL, payload TEXT NOT NULL, "
+            "correlation_id TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL, "
+            "available_at REAL NOT NULL, claimed_until REAL, "
+            "superseded INTEGER NOT NULL DEFAULT 0, error TEXT)",
+            "CREATE INDEX IF NOT EXISTS tasks_tag ON tasks (tag)",
+            "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, available_at)",
+        )
+
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[object],
+    ) -> bool:
+        await self._connection.close()
+        return False
+
+    @override
+    async def enqueue(
+        self,
+        kind: str,
+        tag: str,
+        payload: JSONSerializable,
+        correlation_id: str,
+        supersede: bool = True,
+    ) -> QueuedTaskId:
+        def enqueue(connection: sqlite3.Connection) -> QueuedTaskId:
+            now = time.time()
+
+            if supersede:
+                # Tasks which nobody is working on are simply dropped,
+                # while their consumers are left to cancel claimed ones.
+                connection.execute(
+                    "DELETE FROM tasks WHERE tag = ? AND status = 'queued' "
+                    "AND (claimed_until IS NULL OR claimed_until < ?)",
+                    (tag, now),
+                )
+                connection.execute(
+                    "UPDATE tasks SET superseded = 1 WHERE tag = ? AND status = 'queued'",
+                    (tag,),
+                )
+            elif row := connection.execute(
+                "SELECT id FROM tasks WHERE tag = ? AND status = 'queued' AND superseded = 0",
+                (tag,),
+            ).fetchone():
+                return QueuedTaskId(row[0])
+
+            task_id = QueuedTaskId(generate_id())
+
+            connection.execute(
+                "INSERT INTO tasks "
+                "(id, kind, tag, payload, correlation_id, status, attempts, available_at) "
+                "VALUES (?, ?, ?, ?, ?, 'queued', 0, ?)",
+                (task_id, kind, tag, json.dumps(payload), correlation_id, now),
+            )
+
+            return task_id
+
+        task_id = await self._connection.run_in_transaction(enqueue)
+        self._changed.set()
+
+        return task_id
+
+    @override
+    async def claim(
+        self,
+        kinds: Sequence[str],
+        visibility_timeout: timedelta,
+    ) -> Optional[QueuedTask]:
+        def claim(connection: sqlite3.Connection) -> Optional[QueuedTask]:
+            now = time.time()
+
+            # Superseded tasks whose consumer went away have nothing left to do
+            connection.execute(
+                "DELETE FROM tasks WHERE superseded = 1 AND claimed_until < ?",
+                (now,),
+            )
+
+            row = connection.execute(
+                "SELECT id, kind, tag, payload, correlation_id, attempts FROM tasks "
+                "WHERE status = 'queued' AND superseded = 0 AND available_at <= ? "
+                "AND (claimed_until IS NULL OR claimed_until < ?) "
+                f"AND kind IN ({', '.join('?' for _ in kinds)}) "
+                "AND tag NOT IN ("
+                "SELECT tag FROM tasks WHERE status = 'queued' AND claimed_until >= ?"
+                ") ORDER BY seq LIMIT 1",
+                (now, now, *kinds, now),
+            ).fetchone()
+
+            if not row:
+                return None
+
+            connection.execute(
+                "UPDATE tasks SET claimed_until = ?, attempts = attempts + 1 WHERE id = ?",
+                (now + visibility_timeout.total_seconds(), row[0]),
+            )
+
+            return QueuedTask(
+                id=QueuedTaskId(row[0]),
+                kind=row[1],
+                tag=row[2],
+                payload=json.loads(row[3]),
+                correlation_id=row[4],
+                attempt=row[5] + 1,
+            )
+
+        if not kinds:
+            return None
+
+        return await self._connection.run_in_transaction(claim)
+
+    @override
+    async def extend(
+        self,
+        task_ids: Sequence[QueuedTaskId],
+        visibility_timeout: timedelta,
+    ) -> None:
+        await self._connection.run(
+            lambda connection: connection.execute(
+                "UPDATE tasks SET claimed_until = ? "
+                f"WHERE id IN ({', '.join('?' for _ in task_ids)})",
+                (time.time() + visibility_timeout.total_seconds(), *task_ids),
+            )
+        )
+
+    @override
+    async def list_superseded(
+        self,
+        task_ids: Sequence[QueuedTaskId],
+    ) -> Sequence[QueuedTaskId]:
+        rows = await self._connection.run(
+            lambda connection: connection.execute(
+                "SELECT id FROM tasks WHERE superseded = 1 "
+                f"AND id IN ({', '.join('?' for _ in task_ids)})",
+                tuple(task_ids),
+            ).fetchall()
+        )
+        return [QueuedTaskId(row[0]) for row in rows]
+
+    @override
+    async def complete(self, task_id: QueuedTaskId) -> None:
+        await self._connection.run(
+            lambda connection: connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        )
+        self._changed.set()
+
+    @override
+    async def retry(self, task_id: QueuedTaskId, delay: timedelta) -> None:
+        def retry(connection: sqlite3.Connection) -> None:
+            connection.execute("DELETE FROM tasks WHERE id = ? AND superseded = 1", (task_id,))
+            connection.execute(
+                "UPDATE tasks SET claimed_until = NULL, available_at = ? WHERE id = ?",
+                (time.time() + delay.total_seconds(), task_id),
+            )
+
+        await self._connection.run_in_transaction(retry)
+        self._changed.set()
+
+    @override
+    async def fail(self, task_id: QueuedTaskId, error: str) -> None:
+        def fail(connection: sqlite3.Connection) -> None:
+            now = time.time()
+
+            # Failed tasks are kept for a while to be looked into. Their available_at
+            # records when they failed, which is when older ones are pruned.
+            connection.execute(
+                "UPDATE tasks SET status = 'failed', claimed_until = NULL, available_at = ?, "
+                "error = ? WHERE id = ?",
+                (now, error, task_id),
+            )
+            connection.execute(
+                "DELETE FROM tasks WHERE status = 'failed' AND available_at < ?",
+                (now - self.FAILED_TASK_RETENTION.total_seconds(),),
+            )
+
+        await self._connection.run_in_transaction(fail)
+        self._changed.set()
+
+    async def release_claims(self) -> None:
+        """Makes claimed tasks claimable right away.
+
+        Only safe when no consumer is running, e.g. when a server starts,
+        so that tasks claimed before a crash don't wait out their claims."""
+
+        def release_claims(connection: sqlite3.Connection) -> None:
+            connection.execute("DELETE FROM tasks WHERE superseded = 1")
+            connection.execute(
+                "UPDATE tasks SET claimed_until = NULL WHERE claimed_until IS NOT NULL"
+            )
+
+        await self._connection.run_in_transaction(release_claims)
+
+    @override
+    async def wait(self, timeout: float) -> None:
+        def read_due_time(connection: sqlite3.Connection) -> Optional[float]:
+            # Tasks become claimable by themselves once their retry delay or claim expires
+            now = time.time()
+
+            row = connection.execute(
+                "SELECT MIN(CASE WHEN claimed_until >= ? THEN claimed_until ELSE available_at END) "
+                "FROM tasks WHERE status = 'queued' AND superseded = 0 "
+                "AND (available_at > ? OR claimed_until >= ?)",
+                (now, now, now),
+            ).fetchone()
+
+            return cast(Optional[float], row[0])
+
+        def read_data_version(connection: sqlite3.Connection) -> int:
+            return cast(int, connection.execute("PRAGMA data_version").fetchone()[0])
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        if due_time := await self._connection.run(read_due_time):
+            deadline = min(deadline, loop.time() + due_time - time.time())
+
+        # Other processes can't signal us, but their commits change the data version,
+        # which is much cheaper to check than trying to claim a task
+        data_version = await self._connection.run(read_data_version)
+
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait(), timeout=min(remaining, self._polling_interval)
+                )
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            if await self._connection.run(read_data_version) != data_version:
+                break
+
+        self._changed.clear()
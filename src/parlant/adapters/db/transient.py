@@ -17,7 +17,14 @@ from typing import Optional, Sequence, cast
 from typing_extensions import override
 from typing_extensions import get_type_hints
 
-from parlant.core.persistence.common import matches_filters, Where, ObjectId, ensure_is_total
+from parlant.core.persistence.common import (
+    FieldName,
+    ObjectId,
+    Where,
+    ensure_is_total,
+    matches_filters,
+    sort_documents,
+)
 from parlant.core.persistence.document_database import (
     BaseDocument,
     DeleteResult,
@@ -101,6 +108,8 @@ class TransientDocumentCollection(DocumentCollection[TDocument]):
     async def find(
         self,
         filters: Where,
+        sort: Sequence[FieldName] = [],
+        limit: Optional[int] = None,
     ) -> Sequence[TDocument]:
         result = []
         for doc in filter(
@@ -109,7 +118,10 @@ class TransientDocumentCollection(DocumentCollection[TDocument]):
         ):
             result.append(doc)
 
-        return result
+        if sort:
+            result = sort_documents(result, sort)
+
+        return result[:limit]
 
     @override
     async def find_one(
@@ -133,6 +145,18 @@ class TransientDocumentCollection(DocumentCollection[TDocument]):
 
         return InsertResult(acknowledged=True)
 
+    @override
+    async def insert_many(
+        self,
+        documents: Sequence[TDocument],
+    ) -> InsertResult:
+        for document in documents:
+            ensure_is_total(document, self._schema)
+
+        self._documents.extend(documents)
+
+        return InsertResult(acknowledged=True)
+
     @override
     async def update_one(
         self,
@@ -184,3 +208,19 @@ class TransientDocumentCollection(DocumentCollection[TDocument]):
             deleted_count=0,
             deleted_document=None,
         )
+
+    @override
+    async def delete_many(
+        self,
+        filters: Where,
+    ) -> DeleteResult[TDocument]:
+        remaining_documents = [d for d in self._documents if not matches_filters(filters, d)]
+        deleted_count = len(self._documents) - len(remaining_documents)
+
+        self._documents = remaining_documents
+
+        return DeleteResult(
+            acknowledged=True,
+            deleted_count=deleted_count,
+            deleted_document=None,
+        )
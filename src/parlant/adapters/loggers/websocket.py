@@ -1,19 +1,126 @@
 import asyncio
 from collections import deque
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional
 from fastapi import WebSocket
 from typing_extensions import override
 
 from parlant.core.common import UniqueId, generate_id
 from parlant.core.contextual_correlator import ContextualCorrelator
-from parlant.core.logging import CorrelationalLogger, LogLevel
+from parlant.core.logging import CorrelationalLogger, LogLevel, LogMessage, render_log_message
 
 
 @dataclass(frozen=True)
+class LogFilter:
+    min_level: LogLevel = LogLevel.DEBUG
+    correlation_id: Optional[str] = None
+
+    def matches(self, payload: dict[str, Any]) -> bool:
+        if LogLevel[payload["level"]].to_logging_level() < self.min_level.to_logging_level():
+            return False
+
+        if self.correlation_id:
+            correlation_id: str = payload["correlation_id"]
+
+            return correlation_id == self.correlation_id or correlation_id.startswith(
+                f"{self.correlation_id}::"
+            )
+
+        return True
+
+
 class WebSocketSubscription:
-    socket: WebSocket
-    expiration: asyncio.Event
+    """A subscriber's own bounded queue of log messages, delivered independently of others.
+
+    When the subscriber falls behind and its queue is full, new messages are dropped,
+    and a summary of how many were dropped is delivered once it catches up.
+    """
+
+    def __init__(
+        self,
+        socket: WebSocket,
+        log_filter: LogFilter,
+        batched: bool,
+        max_queue_size: int,
+        max_batch_size: int,
+    ) -> None:
+        self.socket = socket
+        self.filter = log_filter
+        self.batched = batched
+        self.expiration = asyncio.Event()
+
+        self._queue = deque[dict[str, Any]]()
+        self._max_queue_size = max_queue_size
+        self._max_batch_size = max_batch_size
+        self._dropped = 0
+        self._has_messages = asyncio.Event()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def offer(self, payload: dict[str, Any]) -> None:
+        if self.expiration.is_set() or not self.filter.matches(payload):
+            return
+
+        if len(self._queue) >= self._max_queue_size:
+            self._dropped += 1
+        else:
+            self._queue.append(payload)
+
+        self._has_messages.set()
+
+    async def deliver(self) -> None:
+        """Sends queued messages until the socket fails or the subscription expires"""
+
+        expiration = asyncio.create_task(self.expiration.wait())
+
+        try:
+            while not self.expiration.is_set():
+                has_messages = asyncio.create_task(self._has_messages.wait())
+
+                await asyncio.wait(
+                    [has_messages, expiration],
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                has_messages.cancel()
+
+                if self.expiration.is_set():
+                    return
+
+                self._has_messages.clear()
+
+                try:
+                    await self._send_pending()
+                except Exception:
+                    self.expiration.set()
+        finally:
+            expiration.cancel()
+
+    async def _send_pending(self) -> None:
+        while self._queue or self._dropped:
+            batch = []
+
+            if self._dropped:
+                batch.append(
+                    {
+                        "level": "WARNING",
+                        "correlation_id": "<main>",
+                        "message": f"[WebSocketLogger] Dropped {self._dropped} log messages "
+                        "because this subscriber fell behind",
+                    }
+                )
+                self._dropped = 0
+
+            while self._queue and len(batch) < self._max_batch_size:
+                batch.append(self._queue.popleft())
+
+            if self.batched:
+                await self.socket.send_json(batch)
+            else:
+                for payload in batch:
+                    await self.socket.send_json(payload)
 
 
 class WebSocketLogger(CorrelationalLogger):
@@ -22,6 +129,8 @@ class WebSocketLogger(CorrelationalLogger):
         correlator: ContextualCorrelator,
         log_level: LogLevel = LogLevel.DEBUG,
         logger_id: str | None = None,
+        max_subscriber_queue_size: int = 10_000,
+        max_batch_size: int = 100,
     ) -> None:
         super().__init__(correlator, log_level, logger_id)
 
@@ -30,6 +139,9 @@ class WebSocketLogger(CorrelationalLogger):
         self._socket_subscriptions: dict[UniqueId, WebSocketSubscription] = {}
         self._lock = asyncio.Lock()
 
+        self._max_subscriber_queue_size = max_subscriber_queue_size
+        self._max_batch_size = max_batch_size
+
     def _enqueue_message(self, level: str, message: str) -> None:
         payload = {
             "level": level,
@@ -40,10 +152,21 @@ class WebSocketLogger(CorrelationalLogger):
         self._message_queue.append(payload)
         self._messages_in_queue.release()
 
-    async def subscribe(self, web_socket: WebSocket) -> WebSocketSubscription:
+    async def subscribe(
+        self,
+        web_socket: WebSocket,
+        log_filter: LogFilter = LogFilter(),
+        batched: bool = False,
+    ) -> WebSocketSubscription:
         socket_id = generate_id()
 
-        subscription = WebSocketSubscription(web_socket, asyncio.Event())
+        subscription = WebSocketSubscription(
+            web_socket,
+            log_filter,
+            batched=batched,
+            max_queue_size=self._max_subscriber_queue_size,
+            max_batch_size=self._max_batch_size,
+        )
 
         async with self._lock:
             self._socket_subscriptions[socket_id] = subscription
@@ -51,47 +174,58 @@ class WebSocketLogger(CorrelationalLogger):
         return subscription
 
     @override
-    def debug(self, message: str) -> None:
-        self._enqueue_message("DEBUG", message)
+    def set_level(self, log_level: LogLevel) -> None:
+        # Each subscriber picks its own minimum level (see LogFilter),
+        # so the server's log level mustn't hide messages from them
+        pass
+
+    @override
+    def debug(self, message: LogMessage) -> None:
+        self._enqueue_message("DEBUG", render_log_message(message))
 
     @override
-    def info(self, message: str) -> None:
-        self._enqueue_message("INFO", message)
+    def info(self, message: LogMessage) -> None:
+        self._enqueue_message("INFO", render_log_message(message))
 
     @override
-    def warning(self, message: str) -> None:
-        self._enqueue_message("WARNING", message)
+    def warning(self, message: LogMessage) -> None:
+        self._enqueue_message("WARNING", render_log_message(message))
 
     @override
-    def error(self, message: str) -> None:
-        self._enqueue_message("ERROR", message)
+    def error(self, message: LogMessage) -> None:
+        self._enqueue_message("ERROR", render_log_message(message))
 
     @override
-    def critical(self, message: str) -> None:
-        self._enqueue_message("CRITICAL", message)
+    def critical(self, message: LogMessage) -> None:
+        self._enqueue_message("CRITICAL", render_log_message(message))
 
     async def start(self) -> None:
         try:
             while True:
                 try:
                     await self._messages_in_queue.acquire()
-                    payload = self._message_queue.popleft()
 
-                    async with self._lock:
-                        socket_subscriptions = dict(self._socket_subscriptions)
-
-                    expired_ids = set()
+                    payloads = [self._message_queue.popleft()]
 
-                    for socket_id, subscription in socket_subscriptions.items():
-                        try:
-                            await subscription.socket.send_json(payload)
-                        except Exception:
-                            expired_ids.add(socket_id)
+                    while not self._messages_in_queue.locked():
+                        await self._messages_in_queue.acquire()
+                        payloads.append(self._message_queue.popleft())
 
                     async with self._lock:
+                        expired_ids = [
+                            socket_id
+                            for socket_id, subscription in self._socket_subscriptions.items()
+                            if subscription.expiration.is_set()
+                        ]
+
                         for socket_id in expired_ids:
-                            subscription = self._socket_subscriptions.pop(socket_id)
-                            subscription.expiration.set()
+                            del self._socket_subscriptions[socket_id]
+
+                        socket_subscriptions = list(self._socket_subscriptions.values())
+
+                    for subscription in socket_subscriptions:
+                        for payload in payloads:
+                            subscription.offer(payload)
                 except asyncio.CancelledError:
                     return
         finally:
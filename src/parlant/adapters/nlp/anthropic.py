@@ -22,7 +22,7 @@ from anthropic import (
     InternalServerError,
     RateLimitError,
 )  # type: ignore
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 from typing_extensions import override
 import jsonfinder  # type: ignore
 import os
@@ -37,15 +37,27 @@ from parlant.core.nlp.generation import (
     SchematicGenerationResult,
     SchematicGenerator,
     UsageInfo,
+    split_prompt,
 )
 from parlant.core.logging import Logger
+from parlant.core.metrics import MetricsRegistry
 from parlant.core.nlp.moderation import ModerationService, NoModeration
 from parlant.core.nlp.policies import policy, retry
 from parlant.core.nlp.service import NLPService
-from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.nlp.tokenization import (
+    ApproximateTokenizer,
+    EstimatingTokenizer,
+    MemoizingTokenizer,
+)
+
+
+# Claude's tokenizer produces about 15% more tokens than GPT-4o's on English prompts
+CLAUDE_APPROXIMATE_TOKENIZER = ApproximateTokenizer(bytes_per_token=3.5, tokens_per_word=1.5)
 
 
 class AnthropicEstimatingTokenizer(EstimatingTokenizer):
+    """Counts tokens exactly, at the cost of a request to Anthropic's API"""
+
     def __init__(self, client: AsyncAnthropic) -> None:
         self.encoding = tiktoken.encoding_for_model("gpt-4o-2024-08-06")
         self._client = client
@@ -68,7 +80,9 @@ class AnthropicAISchematicGenerator(SchematicGenerator[T]):
 
         self._client = AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
 
-        self._estimating_tokenizer = AnthropicEstimatingTokenizer(self._client)
+        # Token counts are only used for budgeting prompts, which doesn't
+        # justify a round-trip to the API for each and every one of them
+        self._estimating_tokenizer = MemoizingTokenizer(CLAUDE_APPROXIMATE_TOKENIZER)
 
     @property
     @override
@@ -77,7 +91,7 @@ class AnthropicAISchematicGenerator(SchematicGenerator[T]):
 
     @property
     @override
-    def tokenizer(self) -> AnthropicEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._estimating_tokenizer
 
     @policy(
@@ -101,15 +115,42 @@ class AnthropicAISchematicGenerator(SchematicGenerator[T]):
     ) -> SchematicGenerationResult[T]:
         anthropic_api_arguments = {k: v for k, v in hints.items() if k in self.supported_hints}
 
+        static_prefix, dynamic_content = split_prompt(prompt)
+
         t_start = time.time()
-        response = await self._client.messages.create(
-            messages=[{"role": "user", "content": prompt}],
-            model=self.model_name,
-            max_tokens=4096,
-            **anthropic_api_arguments,
-        )
+        if static_prefix:
+            # Mark the static prefix as a cache breakpoint, so that it's billed
+            # at the cached rate on subsequent generations of the same kind
+            response = await self._client.beta.prompt_caching.messages.create(
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": static_prefix,
+                                "cache_control": {"type": "ephemeral"},
+                            },
+                            {"type": "text", "text": dynamic_content},
+                        ],
+                    }
+                ],
+                model=self.model_name,
+                max_tokens=4096,
+                **anthropic_api_arguments,
+            )
+        else:
+            response = await self._client.messages.create(
+                messages=[{"role": "user", "content": prompt}],
+                model=self.model_name,
+                max_tokens=4096,
+                **anthropic_api_arguments,
+            )
         t_end = time.time()
 
+        cache_read_tokens = getattr(response.usage, "cache_read_input_tokens", None) or 0
+        cache_creation_tokens = getattr(response.usage, "cache_creation_input_tokens", None) or 0
+
         raw_content = response.content[0].text
 
         try:
@@ -130,8 +171,15 @@ class AnthropicAISchematicGenerator(SchematicGenerator[T]):
                     model=self.id,
                     duration=(t_end - t_start),
                     usage=UsageInfo(
-                        input_tokens=response.usage.input_tokens,
+                        # Anthropic reports cached tokens separately from the uncached ones
+                        input_tokens=(
+                            response.usage.input_tokens + cache_read_tokens + cache_creation_tokens
+                        ),
                         output_tokens=response.usage.output_tokens,
+                        extra={
+                            "cached_input_tokens": cache_read_tokens,
+                            "cache_creation_input_tokens": cache_creation_tokens,
+                        },
                     ),
                 ),
             )
@@ -156,8 +204,9 @@ class Claude_Sonnet_3_5(AnthropicAISchematicGenerator[T]):
 
 
 class AnthropicService(NLPService):
-    def __init__(self, logger: Logger) -> None:
+    def __init__(self, logger: Logger, metrics: Optional[MetricsRegistry] = None) -> None:
         self._logger = logger
+        self._metrics = metrics
         self._logger.info("Initialized AnthropicService")
 
     @override
@@ -166,7 +215,7 @@ class AnthropicService(NLPService):
 
     @override
     async def get_embedder(self) -> Embedder:
-        return JinaAIEmbedder()
+        return JinaAIEmbedder(self._metrics)
 
     @override
     async def get_moderation_service(self) -> ModerationService:
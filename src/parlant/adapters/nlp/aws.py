@@ -15,7 +15,7 @@
 import time
 from anthropic import AsyncAnthropicBedrock
 from pydantic import ValidationError
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 from typing_extensions import override
 import jsonfinder  # type: ignore
 import os
@@ -32,9 +32,10 @@ from parlant.core.nlp.generation import (
     UsageInfo,
 )
 from parlant.core.logging import Logger
+from parlant.core.metrics import MetricsRegistry
 from parlant.core.nlp.moderation import ModerationService, NoModeration
 from parlant.core.nlp.service import NLPService
-from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.nlp.tokenization import EstimatingTokenizer, MemoizingTokenizer
 
 
 class AnthropicBedrockEstimatingTokenizer(EstimatingTokenizer):
@@ -64,7 +65,7 @@ class AnthropicBedrockAISchematicGenerator(SchematicGenerator[T]):
             aws_region=os.environ["AWS_REGION"],
         )
 
-        self._estimating_tokenizer = AnthropicBedrockEstimatingTokenizer()
+        self._estimating_tokenizer = MemoizingTokenizer(AnthropicBedrockEstimatingTokenizer())
 
     @property
     @override
@@ -73,7 +74,7 @@ class AnthropicBedrockAISchematicGenerator(SchematicGenerator[T]):
 
     @property
     @override
-    def tokenizer(self) -> AnthropicBedrockEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._estimating_tokenizer
 
     @override
@@ -139,8 +140,9 @@ class Claude_Sonnet_3_5(AnthropicBedrockAISchematicGenerator[T]):
 
 
 class BedrockService(NLPService):
-    def __init__(self, logger: Logger) -> None:
+    def __init__(self, logger: Logger, metrics: Optional[MetricsRegistry] = None) -> None:
         self._logger = logger
+        self._metrics = metrics
 
     @override
     async def get_schematic_generator(self, t: type[T]) -> AnthropicBedrockAISchematicGenerator[T]:
@@ -148,7 +150,7 @@ class BedrockService(NLPService):
 
     @override
     async def get_embedder(self) -> Embedder:
-        return JinaAIEmbedder()
+        return JinaAIEmbedder(self._metrics)
 
     @override
     async def get_moderation_service(self) -> ModerationService:
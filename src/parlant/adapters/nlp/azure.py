@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from __future__ import annotations
+from functools import partial
 import time
 from openai import AsyncAzureOpenAI
 from typing import Any, Mapping
@@ -25,7 +26,7 @@ import tiktoken
 
 from parlant.adapters.nlp.common import normalize_json_output
 from parlant.core.logging import Logger
-from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.nlp.tokenization import EstimatingTokenizer, MemoizingTokenizer
 from parlant.core.nlp.service import NLPService
 from parlant.core.nlp.embedding import Embedder, EmbeddingResult
 from parlant.core.nlp.generation import (
@@ -61,14 +62,14 @@ class AzureSchematicGenerator(SchematicGenerator[T]):
         self.model_name = model_name
         self._logger = logger
         self._client = client
-        self._tokenizer = AzureEstimatingTokenizer(model_name=self.model_name)
+        self._tokenizer = MemoizingTokenizer(AzureEstimatingTokenizer(model_name=self.model_name))
 
     @property
     def id(self) -> str:
         return f"azure/{self.model_name}"
 
     @property
-    def tokenizer(self) -> AzureEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._tokenizer
 
     async def generate(
@@ -97,7 +98,7 @@ class AzureSchematicGenerator(SchematicGenerator[T]):
             t_end = time.time()
 
             if response.usage:
-                self._logger.debug(response.usage.model_dump_json(indent=2))
+                self._logger.debug(partial(response.usage.model_dump_json, indent=2))
 
             parsed_object = response.choices[0].message.parsed
             assert parsed_object
@@ -136,7 +137,7 @@ class AzureSchematicGenerator(SchematicGenerator[T]):
             t_end = time.time()
 
             if response.usage:
-                self._logger.debug(response.usage.model_dump_json(indent=2))
+                self._logger.debug(partial(response.usage.model_dump_json, indent=2))
 
             raw_content = response.choices[0].message.content or "{}"
 
@@ -214,7 +215,7 @@ class AzureEmbedder(Embedder):
     def __init__(self, model_name: str, client: AsyncAzureOpenAI) -> None:
         self.model_name = model_name
         self._client = client
-        self._tokenizer = AzureEstimatingTokenizer(model_name=self.model_name)
+        self._tokenizer = MemoizingTokenizer(AzureEstimatingTokenizer(model_name=self.model_name))
 
     @property
     @override
@@ -223,7 +224,7 @@ class AzureEmbedder(Embedder):
 
     @property
     @override
-    def tokenizer(self) -> AzureEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._tokenizer
 
     async def embed(
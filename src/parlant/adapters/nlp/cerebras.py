@@ -15,7 +15,7 @@
 import time
 from pydantic import ValidationError
 from cerebras.cloud.sdk import AsyncCerebras
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 from typing_extensions import override
 import jsonfinder  # type: ignore
 import os
@@ -32,9 +32,10 @@ from parlant.core.nlp.generation import (
     UsageInfo,
 )
 from parlant.core.logging import Logger
+from parlant.core.metrics import MetricsRegistry
 from parlant.core.nlp.moderation import ModerationService, NoModeration
 from parlant.core.nlp.service import NLPService
-from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.nlp.tokenization import EstimatingTokenizer, MemoizingTokenizer
 
 
 class LlamaEstimatingTokenizer(EstimatingTokenizer):
@@ -126,7 +127,7 @@ class Llama3_3_8B(CerebrasSchematicGenerator[T]):
             model_name="llama3.1-8b",
             logger=logger,
         )
-        self._estimating_tokenizer = LlamaEstimatingTokenizer()
+        self._estimating_tokenizer = MemoizingTokenizer(LlamaEstimatingTokenizer())
 
     @property
     @override
@@ -140,7 +141,7 @@ class Llama3_3_8B(CerebrasSchematicGenerator[T]):
 
     @property
     @override
-    def tokenizer(self) -> LlamaEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._estimating_tokenizer
 
 
@@ -151,7 +152,7 @@ class Llama3_3_70B(CerebrasSchematicGenerator[T]):
             logger=logger,
         )
 
-        self._estimating_tokenizer = LlamaEstimatingTokenizer()
+        self._estimating_tokenizer = MemoizingTokenizer(LlamaEstimatingTokenizer())
 
     @property
     @override
@@ -160,7 +161,7 @@ class Llama3_3_70B(CerebrasSchematicGenerator[T]):
 
     @property
     @override
-    def tokenizer(self) -> LlamaEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._estimating_tokenizer
 
     @property
@@ -173,8 +174,10 @@ class CerebrasService(NLPService):
     def __init__(
         self,
         logger: Logger,
+        metrics: Optional[MetricsRegistry] = None,
     ) -> None:
         self._logger = logger
+        self._metrics = metrics
         self._logger.info("Initialized CerebrasService")
 
     @override
@@ -183,7 +186,7 @@ class CerebrasService(NLPService):
 
     @override
     async def get_embedder(self) -> Embedder:
-        return JinaAIEmbedder()
+        return JinaAIEmbedder(self._metrics)
 
     @override
     async def get_moderation_service(self) -> ModerationService:
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from __future__ import annotations
+from functools import partial
 import time
 from openai import (
     APIConnectionError,
@@ -23,7 +24,7 @@ from openai import (
     InternalServerError,
     RateLimitError,
 )
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 from typing_extensions import override
 import json
 import jsonfinder  # type: ignore
@@ -35,8 +36,9 @@ import tiktoken
 from parlant.adapters.nlp.common import normalize_json_output
 from parlant.adapters.nlp.hugging_face import JinaAIEmbedder
 from parlant.core.logging import Logger
+from parlant.core.metrics import MetricsRegistry
 from parlant.core.nlp.policies import policy, retry
-from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.nlp.tokenization import EstimatingTokenizer, MemoizingTokenizer
 from parlant.core.nlp.service import NLPService
 from parlant.core.nlp.embedding import Embedder
 from parlant.core.nlp.generation import (
@@ -80,7 +82,9 @@ class DeepSeekSchematicGenerator(SchematicGenerator[T]):
             api_key=os.environ["DEEPSEEK_API_KEY"],
         )
 
-        self._tokenizer = DeepSeekEstimatingTokenizer(model_name=self.model_name)
+        self._tokenizer = MemoizingTokenizer(
+            DeepSeekEstimatingTokenizer(model_name=self.model_name)
+        )
 
     @property
     @override
@@ -89,7 +93,7 @@ class DeepSeekSchematicGenerator(SchematicGenerator[T]):
 
     @property
     @override
-    def tokenizer(self) -> DeepSeekEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._tokenizer
 
     @policy(
@@ -135,7 +139,7 @@ class DeepSeekSchematicGenerator(SchematicGenerator[T]):
         t_end = time.time()
 
         if response.usage:
-            self._logger.debug(response.usage.model_dump_json(indent=2))
+            self._logger.debug(partial(response.usage.model_dump_json, indent=2))
 
         raw_content = response.choices[0].message.content or "{}"
 
@@ -191,8 +195,10 @@ class DeepSeekService(NLPService):
     def __init__(
         self,
         logger: Logger,
+        metrics: Optional[MetricsRegistry] = None,
     ) -> None:
         self._logger = logger
+        self._metrics = metrics
         self._logger.info("Initialized DeepSeekService")
 
     @override
@@ -201,7 +207,7 @@ class DeepSeekService(NLPService):
 
     @override
     async def get_embedder(self) -> Embedder:
-        return JinaAIEmbedder()
+        return JinaAIEmbedder(self._metrics)
 
     @override
     async def get_moderation_service(self) -> ModerationService:
@@ -24,7 +24,7 @@ from vertexai.preview import tokenization  # type: ignore
 
 from parlant.adapters.nlp.common import normalize_json_output
 from parlant.core.nlp.policies import policy, retry
-from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.nlp.tokenization import EstimatingTokenizer, MemoizingTokenizer
 from parlant.core.nlp.moderation import ModerationService, NoModeration
 from parlant.core.nlp.service import NLPService
 from parlant.core.nlp.embedding import Embedder, EmbeddingResult
@@ -35,6 +35,7 @@ from parlant.core.nlp.generation import (
     GenerationInfo,
     SchematicGenerationResult,
     UsageInfo,
+    split_prompt,
 )
 from parlant.core.logging import Logger
 
@@ -65,7 +66,7 @@ class GeminiSchematicGenerator(SchematicGenerator[T]):
 
         self._model = genai.GenerativeModel(model_name)  # type: ignore
 
-        self._tokenizer = GoogleEstimatingTokenizer(model_name=self.model_name)
+        self._tokenizer = MemoizingTokenizer(GoogleEstimatingTokenizer(model_name=self.model_name))
 
     @property
     @override
@@ -97,9 +98,13 @@ class GeminiSchematicGenerator(SchematicGenerator[T]):
     ) -> SchematicGenerationResult[T]:
         gemini_api_arguments = {k: v for k, v in hints.items() if k in self.supported_hints}
 
+        static_prefix, dynamic_content = split_prompt(prompt)
+
         t_start = time.time()
         response = await self._model.generate_content_async(
-            contents=prompt,
+            # Sending the static prefix as a separate part keeps it identical across
+            # generations, so that it can be served from Gemini's context cache
+            contents=[static_prefix, dynamic_content] if static_prefix else prompt,
             generation_config=gemini_api_arguments,  # type: ignore
         )
         t_end = time.time()
@@ -129,6 +134,7 @@ class GeminiSchematicGenerator(SchematicGenerator[T]):
                         output_tokens=response.usage_metadata.candidates_token_count,
                         extra={
                             "cached_input_tokens": response.usage_metadata.cached_content_token_count
+                            or 0
                         },
                     ),
                 ),
@@ -184,7 +190,7 @@ class GoogleEmbedder(Embedder):
 
     def __init__(self, model_name: str) -> None:
         self.model_name = model_name
-        self._tokenizer = GoogleEstimatingTokenizer(model_name=self.model_name)
+        self._tokenizer = MemoizingTokenizer(GoogleEstimatingTokenizer(model_name=self.model_name))
 
     @property
     @override
@@ -193,7 +199,7 @@ class GoogleEmbedder(Embedder):
 
     @property
     @override
-    def tokenizer(self) -> GoogleEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._tokenizer
 
     @policy(
@@ -12,13 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import annotations
+import asyncio
 from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
 import os
 from pathlib import Path
-from typing import Any
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional, Sequence
 from typing_extensions import override
-import torch  # type: ignore
-from transformers import AutoModel, AutoTokenizer  # type: ignore
 from huggingface_hub.errors import (  # type: ignore
     InferenceTimeoutError,
     InferenceEndpointError,
@@ -28,15 +33,24 @@ from huggingface_hub.errors import (  # type: ignore
 
 from tempfile import gettempdir
 
+from parlant.core.metrics import MetricsRegistry
 from parlant.core.nlp.policies import policy, retry
-from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.nlp.tokenization import EstimatingTokenizer, MemoizingTokenizer
 from parlant.core.nlp.embedding import Embedder, EmbeddingResult
 
+# torch and transformers take seconds to import, so they're only
+# imported once a model is actually created or used.
+if TYPE_CHECKING:
+    import torch  # type: ignore
+    from transformers import AutoModel, AutoTokenizer  # type: ignore
 
 _TOKENIZER_MODELS: dict[str, AutoTokenizer] = {}
 _AUTO_MODELS: dict[str, AutoModel] = {}
+_EMBEDDING_WORKERS: dict[str, _EmbeddingWorker] = {}
 _DEVICE: torch.device | None = None
 
+TORCH_THREADS_ENV_VAR = "PARLANT_TORCH_THREADS"
+
 
 def _model_temp_dir() -> str:
     return str(Path(gettempdir()) / "parlant_data" / "hf_models")
@@ -46,6 +60,8 @@ def _create_tokenizer(model_name: str) -> AutoTokenizer:
     if model_name in _TOKENIZER_MODELS:
         return _TOKENIZER_MODELS[model_name]
 
+    from transformers import AutoTokenizer  # type: ignore
+
     save_dir = os.environ.get("PARLANT_HOME", _model_temp_dir())
     os.makedirs(save_dir, exist_ok=True)
 
@@ -63,6 +79,8 @@ def _get_device() -> torch.device:
     if _DEVICE:
         return _DEVICE
 
+    import torch  # type: ignore
+
     if torch.backends.mps.is_available():
         _DEVICE = torch.device("mps")
     elif torch.cuda.is_available():
@@ -77,6 +95,8 @@ def _create_auto_model(model_name: str) -> AutoModel:
     if model_name in _AUTO_MODELS:
         return _AUTO_MODELS[model_name]
 
+    from transformers import AutoModel  # type: ignore
+
     save_dir = os.environ.get("PARLANT_HOME", _model_temp_dir())
     os.makedirs(save_dir, exist_ok=True)
 
@@ -104,11 +124,212 @@ class HuggingFaceEstimatingTokenizer(EstimatingTokenizer):
         return len(tokens)
 
 
+@dataclass(frozen=True)
+class _EmbeddingBatchInfo:
+    size: int
+    queue_duration: float
+    inference_duration: float
+
+
+@dataclass
+class _EmbeddingRequest:
+    texts: list[str]
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future[tuple[list[list[float]], _EmbeddingBatchInfo]]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class _EmbeddingWorker:
+    """Runs a model's inference on a dedicated thread, off the event loop.
+
+    Texts from concurrent embed() calls are run through the model together,
+    in batches of up to max_batch_size texts. A batch is started once it's full,
+    or once max_batch_latency has passed since its first request arrived.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_batch_size: int,
+        max_batch_latency: timedelta,
+        torch_threads: Optional[int],
+    ) -> None:
+        self._model = _create_auto_model(model_name)
+        self._tokenizer = _create_tokenizer(model_name)
+        self._max_batch_size = max_batch_size
+        self._max_batch_latency = max_batch_latency.total_seconds()
+        self._torch_threads = torch_threads
+        self._requests: queue.SimpleQueue[_EmbeddingRequest] = queue.SimpleQueue()
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"embedder({model_name})",
+            daemon=True,
+        )
+        self._thread.start()
+
+    async def embed(self, texts: list[str]) -> tuple[list[list[float]], _EmbeddingBatchInfo]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[tuple[list[list[float]], _EmbeddingBatchInfo]] = loop.create_future()
+
+        self._requests.put(_EmbeddingRequest(texts=texts, loop=loop, future=future))
+
+        return await future
+
+    def _run(self) -> None:
+        if self._torch_threads:
+            import torch  # type: ignore
+
+            torch.set_num_threads(self._torch_threads)
+
+        while True:
+            # Requests whose callers have given up on them needn't be run
+            if not (batch := [r for r in self._collect_batch() if not r.future.cancelled()]):
+                continue
+
+            try:
+                started_at = time.perf_counter()
+                vectors = self._infer([t for r in batch for t in r.texts])
+                finished_at = time.perf_counter()
+            except Exception as exc:
+                for r in batch:
+                    self._resolve(r, exc)
+                continue
+
+            offset = 0
+
+            for r in batch:
+                info = _EmbeddingBatchInfo(
+                    size=len(vectors),
+                    queue_duration=started_at - r.enqueued_at,
+                    inference_duration=finished_at - started_at,
+                )
+                self._resolve(r, (vectors[offset : offset + len(r.texts)], info))
+                offset += len(r.texts)
+
+    def _collect_batch(self) -> list[_EmbeddingRequest]:
+        batch = [self._requests.get()]
+        size = len(batch[0].texts)
+        deadline = time.perf_counter() + self._max_batch_latency
+
+        while size < self._max_batch_size:
+            timeout = deadline - time.perf_counter()
+
+            try:
+                request = self._requests.get(timeout=max(timeout, 0))
+            except queue.Empty:
+                break
+
+            batch.append(request)
+            size += len(request.texts)
+
+        return batch
+
+    def _infer(self, texts: Sequence[str]) -> list[list[float]]:
+        import torch  # type: ignore
+
+        vectors: list[list[float]] = []
+
+        # A single large request may exceed the batch size on its own
+        for i in range(0, len(texts), self._max_batch_size):
+            tokenized_texts = self._tokenizer.batch_encode_plus(
+                texts[i : i + self._max_batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors="pt",
+            )
+            tokenized_texts = {
+                key: value.to(_get_device()) for key, value in tokenized_texts.items()
+            }
+
+            with torch.no_grad():
+                embeddings = self._model(**tokenized_texts).last_hidden_state[:, 0, :]
+
+            vectors.extend(embeddings.tolist())
+
+        return vectors
+
+    def _resolve(self, request: _EmbeddingRequest, result: Any) -> None:
+        def set_result() -> None:
+            if request.future.done():
+                return
+
+            if isinstance(result, Exception):
+                request.future.set_exception(result)
+            else:
+                request.future.set_result(result)
+
+        try:
+            request.loop.call_soon_threadsafe(set_result)
+        except RuntimeError:
+            pass  # The caller's event loop has already been closed
+
+
+def _get_embedding_worker(
+    model_name: str,
+    max_batch_size: int,
+    max_batch_latency: timedelta,
+    torch_threads: Optional[int],
+) -> _EmbeddingWorker:
+    # Workers are shared by all embedders of the same model,
+    # so that their concurrent calls can be batched together
+    if model_name not in _EMBEDDING_WORKERS:
+        if not torch_threads and TORCH_THREADS_ENV_VAR in os.environ:
+            torch_threads = int(os.environ[TORCH_THREADS_ENV_VAR])
+
+        _EMBEDDING_WORKERS[model_name] = _EmbeddingWorker(
+            model_name,
+            max_batch_size=max_batch_size,
+            max_batch_latency=max_batch_latency,
+            torch_threads=torch_threads,
+        )
+
+    return _EMBEDDING_WORKERS[model_name]
+
+
 class HuggingFaceEmbedder(Embedder):
-    def __init__(self, model_name: str) -> None:
+    BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+    def __init__(
+        self,
+        model_name: str,
+        metrics: Optional[MetricsRegistry] = None,
+        max_batch_size: int = 32,
+        max_batch_latency: timedelta = timedelta(milliseconds=5),
+        torch_threads: Optional[int] = None,
+    ) -> None:
         self.model_name = model_name
-        self._model = _create_auto_model(model_name)
-        self._tokenizer = HuggingFaceEstimatingTokenizer(model_name=model_name)
+        self._tokenizer = MemoizingTokenizer(HuggingFaceEstimatingTokenizer(model_name=model_name))
+        self._worker = _get_embedding_worker(
+            model_name,
+            max_batch_size=max_batch_size,
+            max_batch_latency=max_batch_latency,
+            torch_threads=torch_threads,
+        )
+
+        metrics = metrics or MetricsRegistry()
+
+        self._embedded_texts = metrics.counter(
+            "embedding_texts",
+            "Texts embedded by local models",
+            labels=["model"],
+        )
+        self._batch_sizes = metrics.histogram(
+            "embedding_batch_size",
+            "Number of texts in the batch each embedding call was run in",
+            labels=["model"],
+            buckets=self.BATCH_SIZE_BUCKETS,
+        )
+        self._queue_durations = metrics.histogram(
+            "embedding_queue_duration_seconds",
+            "Time embedding calls waited for their batch to start",
+            labels=["model"],
+        )
+        self._inference_durations = metrics.histogram(
+            "embedding_inference_duration_seconds",
+            "Duration of running an embedding batch through the model",
+            labels=["model"],
+        )
 
     @property
     @override
@@ -122,7 +343,7 @@ class HuggingFaceEmbedder(Embedder):
 
     @property
     @override
-    def tokenizer(self) -> HuggingFaceEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._tokenizer
 
     @policy(
@@ -144,20 +365,22 @@ class HuggingFaceEmbedder(Embedder):
         texts: list[str],
         hints: Mapping[str, Any] = {},
     ) -> EmbeddingResult:
-        tokenized_texts = self._tokenizer._tokenizer.batch_encode_plus(
-            texts, padding=True, truncation=True, return_tensors="pt"
-        )
-        tokenized_texts = {key: value.to(_get_device()) for key, value in tokenized_texts.items()}
+        if not texts:
+            return EmbeddingResult(vectors=[])
+
+        vectors, batch = await self._worker.embed(texts)
 
-        with torch.no_grad():
-            embeddings = self._model(**tokenized_texts).last_hidden_state[:, 0, :]
+        self._embedded_texts.inc(len(texts), model=self.model_name)
+        self._batch_sizes.observe(batch.size, model=self.model_name)
+        self._queue_durations.observe(batch.queue_duration, model=self.model_name)
+        self._inference_durations.observe(batch.inference_duration, model=self.model_name)
 
-        return EmbeddingResult(vectors=embeddings.tolist())
+        return EmbeddingResult(vectors=vectors)
 
 
 class JinaAIEmbedder(HuggingFaceEmbedder):
-    def __init__(self) -> None:
-        super().__init__("jinaai/jina-embeddings-v2-base-en")
+    def __init__(self, metrics: Optional[MetricsRegistry] = None) -> None:
+        super().__init__("jinaai/jina-embeddings-v2-base-en", metrics)
 
     @property
     def dimensions(self) -> int:
@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 from itertools import chain
+from functools import partial
 import time
 from openai import (
     APIConnectionError,
@@ -30,6 +31,7 @@ import json
 import jsonfinder  # type: ignore
 import os
 
+from openai.types.chat import ChatCompletionMessageParam
 from pydantic import ValidationError
 import tiktoken
 
@@ -37,7 +39,7 @@ from parlant.adapters.nlp.common import normalize_json_output
 from parlant.core.engines.alpha.tool_caller import ToolCallInferenceSchema
 from parlant.core.logging import Logger
 from parlant.core.nlp.policies import policy, retry
-from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.nlp.tokenization import EstimatingTokenizer, MemoizingTokenizer
 from parlant.core.nlp.service import NLPService
 from parlant.core.nlp.embedding import Embedder, EmbeddingResult
 from parlant.core.nlp.generation import (
@@ -46,6 +48,7 @@ from parlant.core.nlp.generation import (
     GenerationInfo,
     SchematicGenerationResult,
     UsageInfo,
+    split_prompt,
 )
 from parlant.core.nlp.moderation import ModerationCheck, ModerationService, ModerationTag
 
@@ -75,7 +78,7 @@ class OpenAISchematicGenerator(SchematicGenerator[T]):
 
         self._client = AsyncClient(api_key=os.environ["OPENAI_API_KEY"])
 
-        self._tokenizer = OpenAIEstimatingTokenizer(model_name=self.model_name)
+        self._tokenizer = MemoizingTokenizer(OpenAIEstimatingTokenizer(model_name=self.model_name))
 
     @property
     @override
@@ -84,7 +87,7 @@ class OpenAISchematicGenerator(SchematicGenerator[T]):
 
     @property
     @override
-    def tokenizer(self) -> OpenAIEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._tokenizer
 
     @policy(
@@ -110,6 +113,20 @@ class OpenAISchematicGenerator(SchematicGenerator[T]):
         with self._logger.operation(f"OpenAI LLM Request ({self.schema.__name__})"):
             return await self._do_generate(prompt, hints)
 
+    def _format_messages(self, prompt: str) -> list[ChatCompletionMessageParam]:
+        static_prefix, dynamic_content = split_prompt(prompt)
+
+        if not static_prefix:
+            return [{"role": "developer", "content": prompt}]
+
+        # OpenAI caches matching prompt prefixes automatically. Sending the static prefix
+        # as a message of its own keeps its tokens identical across generations,
+        # regardless of the dynamic content that follows it.
+        return [
+            {"role": "developer", "content": static_prefix},
+            {"role": "developer", "content": dynamic_content},
+        ]
+
     async def _do_generate(
         self,
         prompt: str,
@@ -120,7 +137,7 @@ class OpenAISchematicGenerator(SchematicGenerator[T]):
         if hints.get("strict", False):
             t_start = time.time()
             response = await self._client.beta.chat.completions.parse(
-                messages=[{"role": "developer", "content": prompt}],
+                messages=self._format_messages(prompt),
                 model=self.model_name,
                 response_format=self.schema,
                 **openai_api_arguments,
@@ -128,7 +145,7 @@ class OpenAISchematicGenerator(SchematicGenerator[T]):
             t_end = time.time()
 
             if response.usage:
-                self._logger.debug(response.usage.model_dump_json(indent=2))
+                self._logger.debug(partial(response.usage.model_dump_json, indent=2))
 
             parsed_object = response.choices[0].message.parsed
             assert parsed_object
@@ -156,7 +173,7 @@ class OpenAISchematicGenerator(SchematicGenerator[T]):
         else:
             t_start = time.time()
             response = await self._client.chat.completions.create(
-                messages=[{"role": "developer", "content": prompt}],
+                messages=self._format_messages(prompt),
                 model=self.model_name,
                 response_format={"type": "json_object"},
                 **openai_api_arguments,
@@ -164,7 +181,7 @@ class OpenAISchematicGenerator(SchematicGenerator[T]):
             t_end = time.time()
 
             if response.usage:
-                self._logger.debug(response.usage.model_dump_json(indent=2))
+                self._logger.debug(partial(response.usage.model_dump_json, indent=2))
 
             raw_content = response.choices[0].message.content or "{}"
 
@@ -241,7 +258,7 @@ class OpenAIEmbedder(Embedder):
     def __init__(self, model_name: str) -> None:
         self.model_name = model_name
         self._client = AsyncClient(api_key=os.environ["OPENAI_API_KEY"])
-        self._tokenizer = OpenAIEstimatingTokenizer(model_name=self.model_name)
+        self._tokenizer = MemoizingTokenizer(OpenAIEstimatingTokenizer(model_name=self.model_name))
 
     @property
     @override
@@ -250,7 +267,7 @@ class OpenAIEmbedder(Embedder):
 
     @property
     @override
-    def tokenizer(self) -> OpenAIEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._tokenizer
 
     @policy(
@@ -0,0 +1,366 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import asyncio
+from dataclasses import dataclass, field
+import hashlib
+import math
+import random
+import re
+import time
+import types
+from typing import Any, Callable, Literal, Mapping, Optional, Union, cast, get_args, get_origin
+from pydantic import BaseModel
+from typing_extensions import override
+
+from parlant.core.engines.alpha.fluid_message_generator import FluidMessageSchema, Revision
+from parlant.core.engines.alpha.message_assembler import (
+    AssembledMessageSchema,
+    MaterializedFragment,
+    Revision as AssemblyRevision,
+)
+from parlant.core.engines.alpha.guideline_proposer import (
+    GuidelinePropositionSchema,
+    GuidelinePropositionsSchema,
+)
+from parlant.core.engines.alpha.tool_caller import ToolCallEvaluation, ToolCallInferenceSchema
+from parlant.core.logging import Logger
+from parlant.core.nlp.embedding import Embedder, EmbeddingResult
+from parlant.core.nlp.generation import (
+    T,
+    GenerationInfo,
+    SchematicGenerationResult,
+    SchematicGenerator,
+    UsageInfo,
+)
+from parlant.core.nlp.moderation import ModerationService, NoModeration
+from parlant.core.nlp.service import NLPService
+from parlant.core.nlp.tokenization import EstimatingTokenizer
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """A log-normal latency distribution (constant when stddev is 0), in seconds"""
+
+    mean: float = 0.0
+    stddev: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.mean <= 0:
+            return 0.0
+
+        if self.stddev <= 0:
+            return self.mean
+
+        sigma = math.sqrt(math.log(1 + (self.stddev / self.mean) ** 2))
+        mu = math.log(self.mean) - sigma**2 / 2
+
+        return rng.lognormvariate(mu, sigma)
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    default_latency: LatencyDistribution = LatencyDistribution()
+    latency_by_schema: Mapping[str, LatencyDistribution] = field(default_factory=dict)
+    guideline_activation_ratio: float = 0.3
+    """The share of evaluated guidelines that are deemed applicable"""
+    tool_call_ratio: float = 1.0
+    """The share of evaluated tools that are deemed worth calling"""
+    seed: int = 0
+
+
+class SimulatedTokenizer(EstimatingTokenizer):
+    @override
+    async def estimate_token_count(self, prompt: str) -> int:
+        return len(prompt) // 4
+
+
+def _stable_fraction(*parts: Any) -> float:
+    digest = hashlib.md5(":".join(str(p) for p in parts).encode()).hexdigest()
+    return int(digest[:8], 16) / 0xFFFFFFFF
+
+
+def build_minimal_instance(schema: type[T]) -> T:
+    """Builds the smallest schema-valid instance, leaving defaulted fields at their defaults"""
+
+    def value_for(annotation: Any) -> Any:
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+
+        if origin in (Union, types.UnionType):
+            if type(None) in args:
+                return None
+            return value_for(args[0])
+        if origin is Literal:
+            return args[0]
+        if origin in (list, tuple, set, frozenset) or (
+            origin and getattr(origin, "__name__", "") in ("Sequence", "Iterable")
+        ):
+            return []
+        if origin in (dict,) or (origin and getattr(origin, "__name__", "") == "Mapping"):
+            return {}
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return build_fields(annotation)
+
+        return {str: "", bool: False, int: 0, float: 0.0}.get(annotation)
+
+    def build_fields(model: type[BaseModel]) -> dict[str, Any]:
+        return {
+            name: value_for(f.annotation)
+            for name, f in model.model_fields.items()
+            if f.is_required()
+        }
+
+    return schema.model_validate(build_fields(schema))
+
+
+def _propose_guidelines(prompt: str, config: SimulationConfig) -> GuidelinePropositionsSchema:
+    guideline_ids = [
+        id
+        for id in dict.fromkeys(re.findall(r'"guideline_id": "([^"]+)"', prompt))
+        if not id.startswith("<")
+    ]
+
+    checks = []
+
+    for guideline_id in guideline_ids:
+        applies = _stable_fraction(config.seed, guideline_id) < config.guideline_activation_ratio
+
+        checks.append(
+            GuidelinePropositionSchema(
+                guideline_id=guideline_id,
+                condition="",
+                condition_application_rationale="Simulated",
+                condition_applies=applies,
+                applies_score=9 if applies else 2,
+            )
+        )
+
+    return GuidelinePropositionsSchema(checks=checks)
+
+
+def _infer_tool_calls(prompt: str, config: SimulationConfig) -> ToolCallInferenceSchema:
+    should_run = _stable_fraction(config.seed, prompt) < config.tool_call_ratio
+
+    return ToolCallInferenceSchema(
+        name="",
+        subtleties_to_be_aware_of="",
+        tool_calls_for_candidate_tool=[
+            ToolCallEvaluation(
+                applicability_rationale="Simulated",
+                applicability_score=9 if should_run else 2,
+                same_call_is_already_staged=False,
+                comparison_with_rejected_tools_including_references_to_subtleties="",
+                relevant_subtleties="",
+                a_rejected_tool_would_have_been_a_better_fit_if_it_werent_already_rejected=False,
+                should_run=should_run,
+            )
+        ],
+    )
+
+
+def _generate_message(prompt: str, config: SimulationConfig) -> FluidMessageSchema:
+    return FluidMessageSchema(
+        last_message_of_customer=None,
+        guidelines=[],
+        revisions=[
+            Revision(
+                revision_number=1,
+                content="This is a simulated reply.",
+                followed_all_instructions=True,
+            )
+        ],
+    )
+
+
+def _assemble_message(prompt: str, config: SimulationConfig) -> AssembledMessageSchema:
+    # The fragment bank is rendered as a one-line list of stringified fragment dicts.
+    # Fragments without fields can be selected as-is; without any, the engine
+    # concedes that it has nothing to say.
+    bank = re.search(r"FRAGMENT BANK:\n-+\n(\[.*\])", prompt)
+    fragments = [ast.literal_eval(f) for f in ast.literal_eval(bank.group(1))] if bank else []
+
+    fragment = next((f for f in fragments if "fields" not in f), None)
+
+    selected = (
+        [
+            MaterializedFragment(
+                fragment_id=fragment["fragment_id"],
+                raw_content=fragment["value"],
+                justification="Simulated",
+            )
+        ]
+        if fragment
+        else []
+    )
+
+    return AssembledMessageSchema(
+        last_message_of_customer=None,
+        guidelines=[],
+        revisions=[
+            AssemblyRevision(
+                revision_number=1,
+                selected_content_fragments=selected,
+                sequenced_rendered_content_fragments=[f.raw_content for f in selected],
+                composited_fragment_sequence=" ".join(f.raw_content for f in selected),
+                followed_all_instructions=True,
+            )
+        ],
+    )
+
+
+_CANNED_RESPONSES: Mapping[type[Any], Callable[[str, SimulationConfig], Any]] = {
+    GuidelinePropositionsSchema: _propose_guidelines,
+    ToolCallInferenceSchema: _infer_tool_calls,
+    FluidMessageSchema: _generate_message,
+    AssembledMessageSchema: _assemble_message,
+}
+
+
+class SimulatedSchematicGenerator(SchematicGenerator[T]):
+    """Returns canned, schema-valid content after a simulated latency"""
+
+    def __init__(
+        self,
+        schema: type[T],
+        config: SimulationConfig,
+        rng: random.Random,
+    ) -> None:
+        self._schema = schema
+        self._config = config
+        self._rng = rng
+        self._latency = config.latency_by_schema.get(schema.__name__, config.default_latency)
+        self._tokenizer = SimulatedTokenizer()
+
+    @property
+    @override
+    def schema(self) -> type[T]:  # type: ignore[override]
+        return self._schema
+
+    @override
+    async def generate(
+        self,
+        prompt: str,
+        hints: Mapping[str, Any] = {},
+    ) -> SchematicGenerationResult[T]:
+        t_start = time.time()
+
+        if latency := self._latency.sample(self._rng):
+            await asyncio.sleep(latency)
+
+        if respond := _CANNED_RESPONSES.get(self._schema):
+            content = cast(T, respond(prompt, self._config))
+        else:
+            content = build_minimal_instance(self._schema)
+
+        return SchematicGenerationResult(
+            content=content,
+            info=GenerationInfo(
+                schema_name=self._schema.__name__,
+                model=self.id,
+                duration=time.time() - t_start,
+                usage=UsageInfo(
+                    input_tokens=await self._tokenizer.estimate_token_count(prompt),
+                    output_tokens=len(content.model_dump_json()) // 4,
+                ),
+            ),
+        )
+
+    @property
+    @override
+    def id(self) -> str:
+        return "simulated"
+
+    @property
+    @override
+    def max_tokens(self) -> int:
+        return 128 * 1024
+
+    @property
+    @override
+    def tokenizer(self) -> EstimatingTokenizer:
+        return self._tokenizer
+
+
+class DeterministicEmbedder(Embedder):
+    """Embeds texts by hashing their words, so that texts sharing words are similar"""
+
+    def __init__(self, dimensions: int = 256) -> None:
+        self._dimensions = dimensions
+        self._tokenizer = SimulatedTokenizer()
+
+    @override
+    async def embed(
+        self,
+        texts: list[str],
+        hints: Mapping[str, Any] = {},
+    ) -> EmbeddingResult:
+        return EmbeddingResult(vectors=[self._embed_one(t) for t in texts])
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self._dimensions
+
+        for word in re.findall(r"\w+", text.lower()):
+            digest = int(hashlib.md5(word.encode()).hexdigest()[:8], 16)
+            vector[digest % self._dimensions] += 1.0 if digest & 0x80000000 else -1.0
+
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+
+        return [v / norm for v in vector]
+
+    @property
+    @override
+    def id(self) -> str:
+        return f"deterministic-{self._dimensions}"
+
+    @property
+    @override
+    def max_tokens(self) -> int:
+        return 8192
+
+    @property
+    @override
+    def tokenizer(self) -> EstimatingTokenizer:
+        return self._tokenizer
+
+    @property
+    @override
+    def dimensions(self) -> int:
+        return self._dimensions
+
+
+class SimulatedNLPService(NLPService):
+    def __init__(
+        self,
+        logger: Logger,
+        config: Optional[SimulationConfig] = None,
+    ) -> None:
+        self._logger = logger
+        self._config = config or SimulationConfig()
+        self._rng = random.Random(self._config.seed)
+
+        self._logger.info("Initialized SimulatedNLPService")
+
+    @override
+    async def get_schematic_generator(self, t: type[T]) -> SimulatedSchematicGenerator[T]:
+        return SimulatedSchematicGenerator[t](t, self._config, self._rng)  # type: ignore
+
+    @override
+    async def get_embedder(self) -> Embedder:
+        return DeterministicEmbedder()
+
+    @override
+    async def get_moderation_service(self) -> ModerationService:
+        return NoModeration()
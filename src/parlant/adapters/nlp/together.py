@@ -45,7 +45,7 @@ from parlant.core.logging import Logger
 from parlant.core.nlp.moderation import ModerationService, NoModeration
 from parlant.core.nlp.policies import policy, retry
 from parlant.core.nlp.service import NLPService
-from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.nlp.tokenization import EstimatingTokenizer, MemoizingTokenizer
 
 
 class LlamaEstimatingTokenizer(EstimatingTokenizer):
@@ -140,7 +140,7 @@ class Llama3_1_8B(TogetherAISchematicGenerator[T]):
             model_name="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo",
             logger=logger,
         )
-        self._estimating_tokenizer = LlamaEstimatingTokenizer()
+        self._estimating_tokenizer = MemoizingTokenizer(LlamaEstimatingTokenizer())
 
     @property
     @override
@@ -154,7 +154,7 @@ class Llama3_1_8B(TogetherAISchematicGenerator[T]):
 
     @property
     @override
-    def tokenizer(self) -> LlamaEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._estimating_tokenizer
 
 
@@ -165,7 +165,7 @@ class Llama3_1_70B(TogetherAISchematicGenerator[T]):
             logger=logger,
         )
 
-        self._estimating_tokenizer = LlamaEstimatingTokenizer()
+        self._estimating_tokenizer = MemoizingTokenizer(LlamaEstimatingTokenizer())
 
     @property
     @override
@@ -174,7 +174,7 @@ class Llama3_1_70B(TogetherAISchematicGenerator[T]):
 
     @property
     @override
-    def tokenizer(self) -> LlamaEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._estimating_tokenizer
 
     @property
@@ -190,7 +190,7 @@ class Llama3_1_405B(TogetherAISchematicGenerator[T]):
             logger=logger,
         )
 
-        self._estimating_tokenizer = LlamaEstimatingTokenizer()
+        self._estimating_tokenizer = MemoizingTokenizer(LlamaEstimatingTokenizer())
 
     @property
     @override
@@ -199,7 +199,7 @@ class Llama3_1_405B(TogetherAISchematicGenerator[T]):
 
     @property
     @override
-    def tokenizer(self) -> LlamaEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._estimating_tokenizer
 
     @property
@@ -246,7 +246,9 @@ class TogetherAIEmbedder(Embedder):
 class M2Bert32K(TogetherAIEmbedder):
     def __init__(self) -> None:
         super().__init__(model_name="togethercomputer/m2-bert-80M-32k-retrieval")
-        self._estimating_tokenizer = HuggingFaceEstimatingTokenizer(self.model_name)
+        self._estimating_tokenizer = MemoizingTokenizer(
+            HuggingFaceEstimatingTokenizer(self.model_name)
+        )
 
     @property
     @override
@@ -260,7 +262,7 @@ class M2Bert32K(TogetherAIEmbedder):
 
     @property
     @override
-    def tokenizer(self) -> HuggingFaceEstimatingTokenizer:
+    def tokenizer(self) -> EstimatingTokenizer:
         return self._estimating_tokenizer
 
     @property
@@ -282,7 +284,7 @@ class TogetherService(NLPService):
         if t == FluidMessageSchema:
             return Llama3_1_405B[t](self._logger)  # type: ignore
         elif t == ToolCallInferenceSchema:
-            return FallbackSchematicGenerator(
+            return FallbackSchematicGenerator[t](  # type: ignore
                 Llama3_1_8B[t](self._logger),  # type: ignore
                 Llama3_1_70B[t](self._logger),  # type: ignore
                 logger=self._logger,
@@ -336,15 +336,17 @@ class ChromaCollection(Generic[TDocument], VectorCollection[TDocument]):
                 n_results=k,
             )
 
-            if not docs["metadatas"]:
+            metadatas = docs["metadatas"]
+
+            if not metadatas:
                 return []
 
             self._logger.debug(
-                f"Similar documents found\n{json.dumps(docs['metadatas'][0], indent=2)}"
+                lambda: f"Similar documents found\n{json.dumps(metadatas[0], indent=2)}"
             )
 
             assert docs["distances"]
             return [
                 SimilarDocumentResult(document=cast(TDocument, m), distance=d)
-                for m, d in zip(docs["metadatas"][0], docs["distances"][0])
+                for m, d in zip(metadatas[0], docs["distances"][0])
             ]
@@ -71,6 +71,27 @@ AgentMaxEngineIterationsField: TypeAlias = Annotated[
     ),
 ]
 
+AgentMaxHistoryTurnsField: TypeAlias = Annotated[
+    int,
+    Field(
+        description="Number of most recent customer turns included verbatim in the agent's prompts. "
+        "Older turns are replaced with a summary which is updated in the background. "
+        "Unset to include the full interaction history",
+        ge=1,
+        examples=[10, 20],
+    ),
+]
+
+AgentMaxHistoryTokensField: TypeAlias = Annotated[
+    int,
+    Field(
+        description="Maximum number of tokens the interaction history may take up in each prompt. "
+        "The oldest events are dropped first",
+        ge=1,
+        examples=[2000, 8000],
+    ),
+]
+
 agent_example: ExampleJson = {
     "id": "IUCGT-lvpS",
     "name": "Haxon",
@@ -116,6 +137,8 @@ class AgentDTO(
     creation_utc: AgentCreationUTCField
     max_engine_iterations: AgentMaxEngineIterationsField
     composition_mode: CompositionModeDTO
+    max_history_turns: Optional[AgentMaxHistoryTurnsField] = None
+    max_history_tokens: Optional[AgentMaxHistoryTokensField] = None
 
 
 agent_creation_params_example: ExampleJson = {
@@ -135,6 +158,8 @@ class AgentCreationParamsDTO(
     Optional fields:
     - `description`: Detailed explanation of the agent's purpose
     - `max_engine_iterations`: Processing limit per request
+    - `max_history_turns`: Customer turns kept verbatim in prompts
+    - `max_history_tokens`: Token budget of the interaction history in prompts
 
     Note: Agents must be created via the API before they can be used.
     """
@@ -142,6 +167,8 @@ class AgentCreationParamsDTO(
     name: AgentNameField
     description: Optional[AgentDescriptionField] = None
     max_engine_iterations: Optional[AgentMaxEngineIterationsField] = None
+    max_history_turns: Optional[AgentMaxHistoryTurnsField] = None
+    max_history_tokens: Optional[AgentMaxHistoryTokensField] = None
 
 
 agent_update_params_example: ExampleJson = {
@@ -166,6 +193,8 @@ class AgentUpdateParamsDTO(
     description: Optional[AgentDescriptionField] = None
     max_engine_iterations: Optional[AgentMaxEngineIterationsField] = None
     composition_mode: Optional[CompositionModeDTO] = None
+    max_history_turns: Optional[AgentMaxHistoryTurnsField] = None
+    max_history_tokens: Optional[AgentMaxHistoryTokensField] = None
 
 
 def create_router(
@@ -202,11 +231,14 @@ def create_router(
         - `name` defaults to `"Unnamed Agent"` if not provided
         - `description` defaults to `None`
         - `max_engine_iterations` defaults to `None` (uses system default)
+        - `max_history_turns` and `max_history_tokens` default to `None` (full history)
         """
         agent = await agent_store.create_agent(
             name=params and params.name or "Unnamed Agent",
             description=params and params.description or None,
             max_engine_iterations=params and params.max_engine_iterations or None,
+            max_history_turns=params and params.max_history_turns or None,
+            max_history_tokens=params and params.max_history_tokens or None,
         )
 
         return AgentDTO(
@@ -216,6 +248,8 @@ def create_router(
             creation_utc=agent.creation_utc,
             max_engine_iterations=agent.max_engine_iterations,
             composition_mode=CompositionModeDTO(agent.composition_mode),
+            max_history_turns=agent.max_history_turns,
+            max_history_tokens=agent.max_history_tokens,
         )
 
     @router.get(
@@ -247,6 +281,8 @@ def create_router(
                 creation_utc=a.creation_utc,
                 max_engine_iterations=a.max_engine_iterations,
                 composition_mode=CompositionModeDTO(a.composition_mode),
+                max_history_turns=a.max_history_turns,
+                max_history_tokens=a.max_history_tokens,
             )
             for a in agents
         ]
@@ -281,6 +317,8 @@ def create_router(
             creation_utc=agent.creation_utc,
             max_engine_iterations=agent.max_engine_iterations,
             composition_mode=CompositionModeDTO(agent.composition_mode),
+            max_history_turns=agent.max_history_turns,
+            max_history_tokens=agent.max_history_tokens,
         )
 
     @router.patch(
@@ -327,6 +365,13 @@ def create_router(
             if dto.composition_mode:
                 params["composition_mode"] = dto.composition_mode.value
 
+            # These can be explicitly set to null, to go back to the full history
+            if "max_history_turns" in dto.model_fields_set:
+                params["max_history_turns"] = dto.max_history_turns
+
+            if "max_history_tokens" in dto.model_fields_set:
+                params["max_history_tokens"] = dto.max_history_tokens
+
             return params
 
         agent = await agent_store.update_agent(
@@ -340,6 +385,8 @@ def create_router(
             creation_utc=agent.creation_utc,
             max_engine_iterations=agent.max_engine_iterations,
             composition_mode=CompositionModeDTO(agent.composition_mode),
+            max_history_turns=agent.max_history_turns,
+            max_history_tokens=agent.max_history_tokens,
         )
 
     @router.delete(
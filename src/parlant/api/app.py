@@ -14,10 +14,12 @@
 
 import asyncio
 import os
-from typing import Awaitable, Callable, TypeAlias
+import re
+from typing import Awaitable, Callable, Optional, Sequence, TypeAlias
 
 from fastapi import APIRouter, FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.types import Receive, Scope, Send
@@ -34,6 +36,8 @@ from parlant.api import tags
 from parlant.api import customers
 from parlant.api import logs
 from parlant.api import fragments
+from parlant.api import metrics
+from parlant.api import traces
 from parlant.core.context_variables import ContextVariableStore
 from parlant.core.contextual_correlator import ContextualCorrelator
 from parlant.core.agents import AgentStore
@@ -44,6 +48,7 @@ from parlant.core.fragments import FragmentStore
 from parlant.core.guideline_connections import GuidelineConnectionStore
 from parlant.core.guidelines import GuidelineStore
 from parlant.core.guideline_tool_associations import GuidelineToolAssociationStore
+from parlant.core.inspections import InspectionStore
 from parlant.core.nlp.service import NLPService
 from parlant.core.services.tools.service_registry import ServiceRegistry
 from parlant.core.sessions import SessionListener, SessionStore
@@ -52,7 +57,11 @@ from parlant.core.services.indexing.behavioral_change_evaluation import (
     BehavioralChangeEvaluator,
 )
 from parlant.core.logging import Logger
+from parlant.core.metrics import MetricsRegistry
+from parlant.core.tracing import Tracer
 from parlant.core.application import Application
+from parlant.core.resource_versions import Resource, ResourceVersionStore
+from parlant.core.task_queue import TaskQueueConsumer
 from parlant.core.tags import TagStore
 
 ASGIApplication: TypeAlias = Callable[
@@ -65,6 +74,35 @@ ASGIApplication: TypeAlias = Callable[
 ]
 
 
+GZIP_MINIMUM_SIZE = 1024
+
+# Read-mostly endpoints whose responses only change when the given resources are written
+_VERSIONED_ENDPOINTS: Sequence[tuple[re.Pattern[str], Sequence[Resource]]] = [
+    (
+        re.compile(r"^/agents/[^/]+/guidelines(/[^/]+)?$"),
+        ["guidelines", "guideline_connections", "guideline_tool_associations"],
+    ),
+    (re.compile(r"^/agents/[^/]+/terms(/[^/]+)?$"), ["glossary"]),
+    (re.compile(r"^/agents(/[^/]+)?$"), ["agents"]),
+    (re.compile(r"^/fragments(/[^/]+)?$"), ["fragments"]),
+    (re.compile(r"^/services$"), ["services"]),
+]
+
+
+def _versioned_resources(path: str) -> Sequence[Resource]:
+    path = path.rstrip("/")
+    return next((resources for p, resources in _VERSIONED_ENDPOINTS if p.match(path)), [])
+
+
+def _matches_etag(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    # Conditional GETs use weak comparison, so the W/ prefix is ignored
+    candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
 class AppWrapper:
     def __init__(self, app: FastAPI) -> None:
         self.app = app
@@ -90,6 +128,7 @@ async def create_api_app(container: Container) -> ASGIApplication:
     tag_store = container[TagStore]
     session_store = container[SessionStore]
     session_listener = container[SessionListener]
+    inspection_store = container[InspectionStore]
     evaluation_store = container[EvaluationStore]
     evaluation_listener = container[EvaluationListener]
     evaluation_service = container[BehavioralChangeEvaluator]
@@ -102,6 +141,10 @@ async def create_api_app(container: Container) -> ASGIApplication:
     service_registry = container[ServiceRegistry]
     nlp_service = container[NLPService]
     application = container[Application]
+    metrics_registry = container[MetricsRegistry]
+    tracer = container[Tracer]
+    resource_version_store = container[ResourceVersionStore]
+    task_queue_consumer = container[TaskQueueConsumer]
 
     api_app = FastAPI()
 
@@ -115,12 +158,40 @@ async def create_api_app(container: Container) -> ASGIApplication:
         except asyncio.CancelledError:
             return Response(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
 
+    @api_app.middleware("http")
+    async def handle_conditional_get(
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        if request.method != "GET" or not (resources := _versioned_resources(request.url.path)):
+            return await call_next(request)
+
+        # Versions are read before the response is made, so that a concurrent write
+        # can only make the tag older than the response, never newer
+        versions = await resource_version_store.read_versions(resources)
+        etag = 'W/"' + "-".join(versions[r] for r in resources) + '"'
+
+        if _matches_etag(request.headers.get("if-none-match"), etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": "no-cache"},
+            )
+
+        response = await call_next(request)
+
+        if response.status_code == status.HTTP_200_OK:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
+
+        return response
+
     api_app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag"],
     )
 
     @api_app.middleware("http")
@@ -128,14 +199,18 @@ async def create_api_app(container: Container) -> ASGIApplication:
         request: Request,
         call_next: Callable[[Request], Awaitable[Response]],
     ) -> Response:
-        if request.url.path.startswith("/chat/"):
+        if request.url.path.startswith("/chat/") or request.url.path in ("/metrics", "/traces"):
             return await call_next(request)
 
         request_id = generate_id()
         with correlator.correlation_scope(f"RID({request_id})"):
-            with logger.operation(f"HTTP Request: {request.method} {request.url.path}"):
+            with logger.operation(
+                "HTTP Request", {"method": request.method, "path": request.url.path}
+            ):
                 return await call_next(request)
 
+    api_app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
     @api_app.exception_handler(ItemNotFoundError)
     async def item_not_found_error_handler(
         request: Request, exc: ItemNotFoundError
@@ -197,7 +272,9 @@ async def create_api_app(container: Container) -> ASGIApplication:
             customer_store=customer_store,
             session_store=session_store,
             session_listener=session_listener,
+            inspection_store=inspection_store,
             nlp_service=nlp_service,
+            task_queue_consumer=task_queue_consumer,
         ),
     )
 
@@ -245,4 +322,16 @@ async def create_api_app(container: Container) -> ASGIApplication:
         )
     )
 
+    api_app.include_router(
+        router=metrics.create_router(
+            metrics_registry,
+        )
+    )
+
+    api_app.include_router(
+        router=traces.create_router(
+            tracer,
+        )
+    )
+
     return AppWrapper(api_app)
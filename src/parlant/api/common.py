@@ -13,8 +13,10 @@
 # limitations under the License.
 
 from enum import Enum
+from fastapi import HTTPException, Query, status
+from fastapi.responses import JSONResponse
 from pydantic import Field
-from typing import Annotated, Any, Mapping, Optional, Sequence, TypeAlias
+from typing import Annotated, Any, Mapping, Optional, Sequence, TypeAlias, TypeVar
 
 from parlant.core.common import DefaultBaseModel
 from parlant.core.guidelines import GuidelineId
@@ -337,3 +339,45 @@ class ToolIdDTO(
 
 def example_json_content(json_example: ExampleJson) -> ExtraSchema:
     return {"application/json": {"example": json_example}}
+
+
+LimitQuery: TypeAlias = Annotated[
+    int,
+    Query(
+        description="Maximum number of items to return. "
+        "To fetch the next page, pass the ID of the last returned item as `after`",
+        examples=[50],
+        ge=1,
+    ),
+]
+
+FieldsQuery: TypeAlias = Annotated[
+    str,
+    Query(
+        description="If set, only return the specified fields of each item (separated by commas)",
+        examples=["id,creation_utc", "id,title"],
+    ),
+]
+
+
+TDTO = TypeVar("TDTO", bound=DefaultBaseModel)
+
+
+def project_fields(
+    dto_type: type[TDTO],
+    dtos: Sequence[TDTO],
+    fields: Optional[str],
+) -> Sequence[TDTO] | JSONResponse:
+    """Restricts each of the listed DTOs to the requested fields, if any were requested"""
+    if not fields:
+        return dtos
+
+    field_names = {f.strip() for f in fields.split(",") if f.strip()}
+
+    if unknown_fields := field_names - set(dto_type.model_fields):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(sorted(unknown_fields))}",
+        )
+
+    return JSONResponse(content=[d.model_dump(mode="json", include=field_names) for d in dtos])
@@ -14,11 +14,19 @@
 
 from datetime import datetime
 import dateutil.parser
-from fastapi import APIRouter, Path, status
+from fastapi import APIRouter, Path, Query, status
+from fastapi.responses import JSONResponse
 from pydantic import Field
 from typing import Annotated, Mapping, Optional, Sequence, TypeAlias
 
-from parlant.api.common import apigen_config, ExampleJson, example_json_content
+from parlant.api.common import (
+    FieldsQuery,
+    LimitQuery,
+    apigen_config,
+    ExampleJson,
+    example_json_content,
+    project_fields,
+)
 from parlant.core.common import DefaultBaseModel
 from parlant.core.customers import CustomerId, CustomerStore
 from parlant.core.tags import TagId
@@ -72,6 +80,14 @@ CustomerIdPath: TypeAlias = Annotated[
     ),
 ]
 
+CustomerIdQuery: TypeAlias = Annotated[
+    CustomerId,
+    Query(
+        description="Only return customers created after the customer with this ID",
+        examples=["ck_IdAXUtp"],
+    ),
+]
+
 
 CustomerCreationUTCField: TypeAlias = Annotated[
     datetime,
@@ -299,28 +315,40 @@ def create_router(
                 "description": "List of all customers in the system.",
                 "content": example_json_content(customer_example),
             },
+            status.HTTP_404_NOT_FOUND: {
+                "description": "The customer specified in `after` was not found",
+            },
         },
         **apigen_config(group_name=API_GROUP, method_name="list"),
     )
-    async def list_customers() -> Sequence[CustomerDTO]:
+    async def list_customers(
+        limit: Optional[LimitQuery] = None,
+        after: Optional[CustomerIdQuery] = None,
+        fields: Optional[FieldsQuery] = None,
+    ) -> Sequence[CustomerDTO] | JSONResponse:
         """
         Retrieves a list of all customers in the system.
 
         Returns an empty list if no customers exist.
-        Customers are returned in no guaranteed order.
+        Customers are returned in order of creation, starting with the guest customer,
+        and can be paged through using `limit` and `after`.
         """
-        customers = await customer_store.list_customers()
-
-        return [
-            CustomerDTO(
-                id=customer.id,
-                creation_utc=customer.creation_utc,
-                name=customer.name,
-                extra=customer.extra,
-                tags=customer.tags,
-            )
-            for customer in customers
-        ]
+        customers = await customer_store.list_customers(limit=limit, after=after)
+
+        return project_fields(
+            CustomerDTO,
+            [
+                CustomerDTO(
+                    id=customer.id,
+                    creation_utc=customer.creation_utc,
+                    name=customer.name,
+                    extra=customer.extra,
+                    tags=customer.tags,
+                )
+                for customer in customers
+            ],
+            fields,
+        )
 
     @router.patch(
         "/{customer_id}",
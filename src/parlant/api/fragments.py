@@ -16,12 +16,20 @@ from datetime import datetime
 from typing import Annotated, Optional, Sequence, TypeAlias
 import dateutil
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import JSONResponse
 from pydantic import Field
 
 from parlant.core.common import DefaultBaseModel
 from parlant.core.fragments import FragmentId, FragmentStore, FragmentUpdateParams, FragmentField
 from parlant.core.tags import TagId
-from parlant.api.common import ExampleJson, apigen_config, example_json_content
+from parlant.api.common import (
+    ExampleJson,
+    FieldsQuery,
+    LimitQuery,
+    apigen_config,
+    example_json_content,
+    project_fields,
+)
 
 
 API_GROUP = "fragments"
@@ -248,6 +256,14 @@ TagsQuery: TypeAlias = Annotated[
     Query(description="Filter fragments by tags", examples=["tag1", "tag2"]),
 ]
 
+FragmentIdQuery: TypeAlias = Annotated[
+    FragmentId,
+    Query(
+        description="Only return fragments created after the fragment with this ID",
+        examples=["t9a8g703f4"],
+    ),
+]
+
 
 def create_router(
     fragment_store: FragmentStore,
@@ -320,24 +336,43 @@ def create_router(
             status.HTTP_200_OK: {
                 "description": "List of all fragments in the system",
                 "content": example_json_content([fragment_example]),
-            }
+            },
+            status.HTTP_404_NOT_FOUND: {
+                "description": "The fragment specified in `after` was not found",
+            },
         },
         **apigen_config(group_name=API_GROUP, method_name="list"),
     )
-    async def list_fragments(tags: TagsQuery = []) -> Sequence[FragmentDTO]:
-        fragments = await fragment_store.list_fragments()
-
-        return [
-            FragmentDTO(
-                id=f.id,
-                creation_utc=f.creation_utc,
-                value=f.value,
-                fields=[_fragment_field_to_dto(s) for s in f.fields],
-                tags=f.tags,
+    async def list_fragments(
+        tags: TagsQuery = [],
+        limit: Optional[LimitQuery] = None,
+        after: Optional[FragmentIdQuery] = None,
+        fields: Optional[FieldsQuery] = None,
+    ) -> Sequence[FragmentDTO] | JSONResponse:
+        # Tags are stored apart from fragments, so tag filters have to be applied before paging
+        fragments = [
+            f
+            for f in await fragment_store.list_fragments(
+                limit=None if tags else limit,
+                after=after,
             )
-            for f in fragments
             if (any(tag in f.tags for tag in tags) if tags else True)
-        ]
+        ][:limit]
+
+        return project_fields(
+            FragmentDTO,
+            [
+                FragmentDTO(
+                    id=f.id,
+                    creation_utc=f.creation_utc,
+                    value=f.value,
+                    fields=[_fragment_field_to_dto(s) for s in f.fields],
+                    tags=f.tags,
+                )
+                for f in fragments
+            ],
+            fields,
+        )
 
     @router.patch(
         "/{fragment_id}",
@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from fastapi import APIRouter, Path, status
+from fastapi import APIRouter, Path, Query, status
+from fastapi.responses import JSONResponse
 from typing import Annotated, Optional, Sequence, TypeAlias
 from pydantic import Field
 
 from parlant.api import common
-from parlant.api.common import apigen_config, ExampleJson
+from parlant.api.common import FieldsQuery, LimitQuery, apigen_config, ExampleJson, project_fields
 from parlant.core.agents import AgentId
 from parlant.core.common import DefaultBaseModel
 from parlant.core.glossary import TermUpdateParams, GlossaryStore, TermId
@@ -84,6 +85,14 @@ TermIdPath: TypeAlias = Annotated[
     ),
 ]
 
+TermIdQuery: TypeAlias = Annotated[
+    TermId,
+    Query(
+        description="Only return terms created after the term with this ID",
+        examples=["term-eth01"],
+    ),
+]
+
 term_example: ExampleJson = {
     "id": "term-eth01",
     "name": "Gas",
@@ -228,31 +237,39 @@ def create_router(
                 "content": common.example_json_content([term_example]),
             },
             status.HTTP_404_NOT_FOUND: {
-                "description": "Terms not found. The specified `agent_id` does not exist"
+                "description": "Terms not found. The specified `agent_id` or `after` term does not exist"
             },
         },
         **apigen_config(group_name=API_GROUP, method_name="list_terms"),
     )
     async def list_terms(
         agent_id: TermAgentIdPath,
-    ) -> Sequence[TermDTO]:
+        limit: Optional[LimitQuery] = None,
+        after: Optional[TermIdQuery] = None,
+        fields: Optional[FieldsQuery] = None,
+    ) -> Sequence[TermDTO] | JSONResponse:
         """
         Retrieves a list of all terms in the agent's glossary.
 
         Returns an empty list if no terms associated to the provided agent's ID.
-        Terms are returned in no guaranteed order.
+        Terms are returned in order of creation, and can be paged through
+        using `limit` and `after`.
         """
-        terms = await glossary_store.list_terms(term_set=agent_id)
-
-        return [
-            TermDTO(
-                id=term.id,
-                name=term.name,
-                description=term.description,
-                synonyms=term.synonyms,
-            )
-            for term in terms
-        ]
+        terms = await glossary_store.list_terms(term_set=agent_id, limit=limit, after=after)
+
+        return project_fields(
+            TermDTO,
+            [
+                TermDTO(
+                    id=term.id,
+                    name=term.name,
+                    description=term.description,
+                    synonyms=term.synonyms,
+                )
+                for term in terms
+            ],
+            fields,
+        )
 
     @router.patch(
         "/{agent_id}/terms/{term_id}",
@@ -16,7 +16,8 @@ from collections import defaultdict
 from dataclasses import dataclass
 from itertools import chain
 from typing import Annotated, Optional, Sequence, TypeAlias
-from fastapi import APIRouter, HTTPException, Path, status
+from fastapi import APIRouter, HTTPException, Path, Query, status
+from fastapi.responses import JSONResponse
 from pydantic import Field
 
 from parlant.api import agents, common
@@ -77,6 +78,14 @@ GuidelineIdPath: TypeAlias = Annotated[
     ),
 ]
 
+GuidelineIdQuery: TypeAlias = Annotated[
+    GuidelineId,
+    Query(
+        description="Only return guidelines created after the guideline with this ID",
+        examples=["IUCGT-l4pS"],
+    ),
+]
+
 
 class GuidelineDTO(
     DefaultBaseModel,
@@ -673,30 +682,44 @@ def create_router(
                 "description": "List of all guidelines for the specified agent",
                 "content": common.example_json_content([guideline_dto_example]),
             },
-            status.HTTP_404_NOT_FOUND: {"description": "Agent not found"},
+            status.HTTP_404_NOT_FOUND: {
+                "description": "Agent or the guideline specified in `after` not found"
+            },
         },
         **apigen_config(group_name=API_GROUP, method_name="list"),
     )
     async def list_guidelines(
         agent_id: agents.AgentIdPath,
-    ) -> Sequence[GuidelineDTO]:
+        limit: Optional[common.LimitQuery] = None,
+        after: Optional[GuidelineIdQuery] = None,
+        fields: Optional[common.FieldsQuery] = None,
+    ) -> Sequence[GuidelineDTO] | JSONResponse:
         """
         Lists all guidelines for the specified agent.
 
         Returns an empty list if no guidelines exist.
-        Guidelines are returned in no guaranteed order.
+        Guidelines are returned in order of creation, and can be paged through
+        using `limit` and `after`.
         Does not include connections or tool associations.
         """
-        guidelines = await guideline_store.list_guidelines(guideline_set=agent_id)
+        guidelines = await guideline_store.list_guidelines(
+            guideline_set=agent_id,
+            limit=limit,
+            after=after,
+        )
 
-        return [
-            GuidelineDTO(
-                id=guideline.id,
-                condition=guideline.content.condition,
-                action=guideline.content.action,
-            )
-            for guideline in guidelines
-        ]
+        return common.project_fields(
+            GuidelineDTO,
+            [
+                GuidelineDTO(
+                    id=guideline.id,
+                    condition=guideline.content.condition,
+                    action=guideline.content.action,
+                )
+                for guideline in guidelines
+            ],
+            fields,
+        )
 
     @router.patch(
         "/{agent_id}/guidelines/{guideline_id}",
@@ -267,6 +267,18 @@ AgentIdField: TypeAlias = Annotated[
 ]
 
 
+EvaluationExhaustiveField: TypeAlias = Annotated[
+    bool,
+    Field(
+        description=(
+            "Whether to check each payload for coherence against all existing guidelines, "
+            "rather than only against the ones most semantically related to it"
+        ),
+        examples=[False],
+    ),
+]
+
+
 evaluation_creation_params_example: ExampleJson = {
     "agent_id": "a1g2e3n4t5",
     "payloads": [
@@ -294,6 +306,7 @@ class EvaluationCreationParamsDTO(
 
     agent_id: AgentIdField
     payloads: Sequence[PayloadDTO]
+    exhaustive: Optional[EvaluationExhaustiveField] = False
 
 
 EvaluationIdPath: TypeAlias = Annotated[
@@ -314,6 +327,18 @@ EvaluationProgressField: TypeAlias = Annotated[
     ),
 ]
 
+EvaluationPrunedPairsField: TypeAlias = Annotated[
+    int,
+    Field(
+        description=(
+            "Number of guideline pairs which were not checked for coherence, "
+            "having been found to be semantically unrelated"
+        ),
+        ge=0,
+        examples=[120],
+    ),
+]
+
 CreationUtcField: TypeAlias = Annotated[
     datetime,
     Field(
@@ -326,6 +351,7 @@ evaluation_example: ExampleJson = {
     "id": "eval_123xz",
     "status": "completed",
     "progress": 100.0,
+    "pruned_pairs": 120,
     "creation_utc": "2024-03-24T12:00:00Z",
     "error": None,
     "invoices": [
@@ -392,6 +418,7 @@ class EvaluationDTO(
     id: EvaluationIdPath
     status: EvaluationStatusDTO
     progress: EvaluationProgressField
+    pruned_pairs: EvaluationPrunedPairsField = 0
     creation_utc: CreationUtcField
     error: Optional[ErrorField] = None
     invoices: Sequence[InvoiceDTO]
@@ -451,6 +478,7 @@ def create_router(
                     PayloadDescriptor(PayloadKind.GUIDELINE, p)
                     for p in [_payload_from_dto(p) for p in params.payloads]
                 ],
+                exhaustive=params.exhaustive or False,
             )
         except EvaluationValidationError as exc:
             raise HTTPException(
@@ -512,6 +540,7 @@ def create_router(
             id=evaluation.id,
             status=_evaluation_status_to_dto(evaluation.status),
             progress=evaluation.progress,
+            pruned_pairs=evaluation.pruned_pairs,
             creation_utc=evaluation.creation_utc,
             invoices=[
                 InvoiceDTO(
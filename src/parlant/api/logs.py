@@ -1,6 +1,9 @@
-from fastapi import APIRouter, WebSocket
+from typing import Literal, Optional
+from fastapi import APIRouter, Query, WebSocket
+from typing_extensions import Annotated
 
-from parlant.adapters.loggers.websocket import WebSocketLogger
+from parlant.adapters.loggers.websocket import LogFilter, WebSocketLogger
+from parlant.core.logging import LogLevel
 
 
 def create_router(
@@ -9,9 +12,29 @@ def create_router(
     router = APIRouter()
 
     @router.websocket("/logs")
-    async def stream_logs(websocket: WebSocket) -> None:
+    async def stream_logs(
+        websocket: WebSocket,
+        level: Annotated[
+            Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+            Query(description="Minimum level of the messages to stream"),
+        ] = "DEBUG",
+        correlation_id: Annotated[
+            Optional[str],
+            Query(description="Only stream messages of this correlation scope and its sub-scopes"),
+        ] = None,
+        batch: Annotated[
+            bool,
+            Query(description="Send messages in JSON array frames instead of one per frame"),
+        ] = False,
+    ) -> None:
         await websocket.accept()
-        subscription = await websocket_logger.subscribe(websocket)
-        await subscription.expiration.wait()
+
+        subscription = await websocket_logger.subscribe(
+            websocket,
+            LogFilter(min_level=LogLevel[level], correlation_id=correlation_id),
+            batched=batch,
+        )
+
+        await subscription.deliver()
 
     return router
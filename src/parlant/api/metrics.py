@@ -0,0 +1,45 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from fastapi import APIRouter, Response, status
+
+from parlant.core.metrics import MetricsRegistry
+
+
+def create_router(
+    metrics: MetricsRegistry,
+) -> APIRouter:
+    router = APIRouter()
+
+    @router.get(
+        "/metrics",
+        operation_id="read_metrics",
+        include_in_schema=False,
+        responses={
+            status.HTTP_200_OK: {
+                "description": "Current performance counters in OpenMetrics text format",
+                "content": {MetricsRegistry.CONTENT_TYPE: {}},
+            },
+        },
+    )
+    async def read_metrics() -> Response:
+        """
+        Exposes engine, store and LLM performance counters for scraping.
+        """
+        return Response(
+            content=metrics.render(),
+            media_type=MetricsRegistry.CONTENT_TYPE,
+        )
+
+    return router
@@ -15,22 +15,32 @@
 from datetime import datetime
 from enum import Enum
 from fastapi import APIRouter, HTTPException, Path, Query, status
+from fastapi.responses import JSONResponse
 from itertools import chain
 from pydantic import Field
-from typing import Annotated, Mapping, Optional, Sequence, Set, TypeAlias, cast
+from typing import Annotated, Iterable, Mapping, Optional, Sequence, Set, TypeAlias, cast
 
 
-from parlant.api.common import GuidelineIdField, ExampleJson, JSONSerializableDTO, apigen_config
+from parlant.api.common import (
+    FieldsQuery,
+    GuidelineIdField,
+    ExampleJson,
+    JSONSerializableDTO,
+    LimitQuery,
+    apigen_config,
+    project_fields,
+)
 from parlant.api.glossary import TermDTO
 from parlant.core.agents import AgentId, AgentStore
 from parlant.core.application import Application
-from parlant.core.async_utils import Timeout
-from parlant.core.common import DefaultBaseModel
+from parlant.core.async_utils import Timeout, safe_gather
+from parlant.core.common import DefaultBaseModel, ItemNotFoundError, JSONSerializable
 from parlant.core.customers import CustomerId, CustomerStore
 from parlant.core.engines.types import UtteranceReason, UtteranceRequest
+from parlant.core.inspections import InspectionStore
 from parlant.core.logging import Logger
 from parlant.core.nlp.generation import GenerationInfo
-from parlant.core.nlp.moderation import ModerationService
+from parlant.core.nlp.moderation import CachedModerationService, ModerationService
 from parlant.core.nlp.service import NLPService
 from parlant.core.sessions import (
     Event,
@@ -40,6 +50,7 @@ from parlant.core.sessions import (
     MessageGenerationInspection,
     Participant,
     PreparationIteration,
+    Session,
     SessionId,
     SessionListener,
     SessionStore,
@@ -47,6 +58,7 @@ from parlant.core.sessions import (
     ToolEventData,
 )
 from parlant.core.fragments import FragmentId
+from parlant.core.task_queue import TaskQueueConsumer
 
 API_GROUP = "sessions"
 
@@ -632,6 +644,52 @@ class GenerationInfoDTO(
     usage: UsageInfoDTO
 
 
+PromptCacheUsageInputTokensField: TypeAlias = Annotated[
+    int,
+    Field(
+        description="Total input tokens of the generations using this schema",
+        examples=[12000],
+    ),
+]
+
+PromptCacheUsageCachedInputTokensField: TypeAlias = Annotated[
+    int,
+    Field(
+        description="Input tokens that were served from the provider's prompt cache",
+        examples=[9000],
+    ),
+]
+
+PromptCacheUsageHitRatioField: TypeAlias = Annotated[
+    float,
+    Field(
+        description="Share of input tokens served from the provider's prompt cache",
+        examples=[0.75],
+        ge=0.0,
+        le=1.0,
+    ),
+]
+
+prompt_cache_usage_example = {
+    "schema_name": "GuidelinePropositionsSchema",
+    "input_tokens": 12000,
+    "cached_input_tokens": 9000,
+    "hit_ratio": 0.75,
+}
+
+
+class PromptCacheUsageDTO(
+    DefaultBaseModel,
+    json_schema_extra={"example": prompt_cache_usage_example},
+):
+    """Prompt caching statistics for the generations of a single schema."""
+
+    schema_name: GenerationInfoSchemaNameField
+    input_tokens: PromptCacheUsageInputTokensField
+    cached_input_tokens: PromptCacheUsageCachedInputTokensField
+    hit_ratio: PromptCacheUsageHitRatioField
+
+
 MessageGenerationInspectionMessagesField: TypeAlias = Annotated[
     Sequence[str | None],
     Field(
@@ -721,6 +779,16 @@ class MessageEventDataDTO(
     fragments: MessageEventDataFragmentsField = None
 
 
+MessageGenerationInspectionHedgeWonField: TypeAlias = Annotated[
+    bool,
+    Field(
+        description="Whether the messages came from a hedged generation attempt, "
+        "started while a slow earlier attempt was still running",
+        examples=[False],
+    ),
+]
+
+
 message_generation_inspection_example = {
     "generation": {
         "schema_name": "customer_response_v2",
@@ -743,6 +811,7 @@ message_generation_inspection_example = {
             "fragments": ["frag_987abc"],
         },
     ],
+    "hedge_won": False,
 }
 
 
@@ -754,6 +823,7 @@ class MessageGenerationInspectionDTO(
 
     generation: GenerationInfoDTO
     messages: Sequence[Optional[MessageEventDataDTO]]
+    hedge_won: MessageGenerationInspectionHedgeWonField = False
 
 
 GuidelinePropositionInspectionTotalDurationField: TypeAlias = Annotated[
@@ -893,10 +963,18 @@ EventTracePreparationIterationsField: TypeAlias = Annotated[
     ),
 ]
 
+EventTracePromptCacheUsageField: TypeAlias = Annotated[
+    Sequence[PromptCacheUsageDTO],
+    Field(
+        description="Prompt caching statistics per schema, across all generations of the traced event",
+    ),
+]
+
 event_trace_example = {
     "tool_calls": [tool_call_example],
     "message_generations": [message_generation_inspection_example],
     "preparation_iterations": [preparation_iteration_example],
+    "prompt_cache_usage": [prompt_cache_usage_example],
 }
 
 
@@ -909,6 +987,7 @@ class EventTraceDTO(
     tool_calls: EventTraceToolCallsField
     message_generations: EventTraceMessageGenerationsField
     preparation_iterations: EventTracePreparationIterationsField
+    prompt_cache_usage: EventTracePromptCacheUsageField
 
 
 event_inspection_example = {
@@ -955,6 +1034,30 @@ def generation_info_to_dto(gi: GenerationInfo) -> GenerationInfoDTO:
     )
 
 
+def prompt_cache_usage_to_dtos(
+    generations: Iterable[GenerationInfo],
+) -> Sequence[PromptCacheUsageDTO]:
+    usage_by_schema: dict[str, tuple[int, int]] = {}
+
+    for gi in generations:
+        input_tokens, cached_input_tokens = usage_by_schema.get(gi.schema_name, (0, 0))
+
+        usage_by_schema[gi.schema_name] = (
+            input_tokens + gi.usage.input_tokens,
+            cached_input_tokens + ((gi.usage.extra or {}).get("cached_input_tokens") or 0),
+        )
+
+    return [
+        PromptCacheUsageDTO(
+            schema_name=schema_name,
+            input_tokens=input_tokens,
+            cached_input_tokens=cached_input_tokens,
+            hit_ratio=min(1.0, cached_input_tokens / input_tokens) if input_tokens else 0.0,
+        )
+        for schema_name, (input_tokens, cached_input_tokens) in usage_by_schema.items()
+    ]
+
+
 def participant_to_dto(participant: Participant) -> ParticipantDTO:
     return ParticipantDTO(
         id=participant["id"],
@@ -990,6 +1093,7 @@ def message_generation_inspection_to_dto(
         messages=[
             message_event_data_to_dto(message) for message in m.messages if message is not None
         ],
+        hedge_won=m.hedge_won,
     )
 
 
@@ -1076,6 +1180,14 @@ CustomerIdQuery: TypeAlias = Annotated[
     ),
 ]
 
+SessionIdQuery: TypeAlias = Annotated[
+    SessionId,
+    Query(
+        description="Only return sessions created after the session with this ID",
+        examples=["sess_123yz"],
+    ),
+]
+
 ModerationQuery: TypeAlias = Annotated[
     Moderation,
     Query(
@@ -1083,6 +1195,15 @@ ModerationQuery: TypeAlias = Annotated[
     ),
 ]
 
+DeferModerationQuery: TypeAlias = Annotated[
+    bool,
+    Query(
+        description="If set, the event is stored and returned before it is moderated, "
+        "and its flags are updated once moderation completes. "
+        "The agent only responds to it after that.",
+    ),
+]
+
 MinOffsetQuery: TypeAlias = Annotated[
     int,
     Query(
@@ -1122,6 +1243,44 @@ def utterance_request_dto_to_utterance_request(utter: UtteranceRequestDTO) -> Ut
     return UtteranceRequest(action=utter.action, reason=reason_dto_to_reason[utter.reason])
 
 
+async def schedule_message_moderation(
+    task_queue_consumer: TaskQueueConsumer,
+    session_id: SessionId,
+    event_id: EventId,
+    moderation: Moderation,
+) -> None:
+    # Not superseding, so that scheduling a moderation which is already queued is a no-op
+    await task_queue_consumer.submit(
+        "moderate-message",
+        tag=f"moderate-message({event_id})",
+        payload={
+            "session_id": session_id,
+            "event_id": event_id,
+            "moderation": moderation.value,
+        },
+        supersede=False,
+    )
+
+
+async def recover_pending_moderations(
+    logger: Logger,
+    session_store: SessionStore,
+    task_queue_consumer: TaskQueueConsumer,
+) -> None:
+    """Reschedules deferred moderations whose tasks were lost, e.g. when
+    an in-memory task queue went down with its process. Until they complete,
+    their sessions aren't processed."""
+    for session_id, event in await session_store.list_events_pending_moderation():
+        logger.info(f"Recovering moderation task: '{event.id}'")
+
+        await schedule_message_moderation(
+            task_queue_consumer,
+            session_id,
+            event.id,
+            Moderation(cast(MessageEventData, event.data)["pending_moderation"]),
+        )
+
+
 def create_router(
     logger: Logger,
     application: Application,
@@ -1129,10 +1288,57 @@ def create_router(
     customer_store: CustomerStore,
     session_store: SessionStore,
     session_listener: SessionListener,
+    inspection_store: InspectionStore,
     nlp_service: NLPService,
+    task_queue_consumer: TaskQueueConsumer,
 ) -> APIRouter:
     router = APIRouter()
 
+    content_moderation_service: Optional[ModerationService] = None
+    jailbreak_moderation_service: Optional[ModerationService] = None
+
+    async def _moderate(message: str, moderation: Moderation) -> tuple[bool, Set[str]]:
+        async def check_content() -> tuple[bool, Set[str]]:
+            nonlocal content_moderation_service
+
+            if not content_moderation_service:
+                content_moderation_service = CachedModerationService(
+                    await nlp_service.get_moderation_service()
+                )
+
+            check = await content_moderation_service.check(message)
+            return check.flagged, set(check.tags)
+
+        async def check_jailbreak() -> tuple[bool, Set[str]]:
+            nonlocal jailbreak_moderation_service
+
+            if not jailbreak_moderation_service:
+                jailbreak_moderation_service = CachedModerationService(
+                    _get_jailbreak_moderation_service(logger)
+                )
+
+            check = await jailbreak_moderation_service.check(message)
+
+            if "jailbreak" in check.tags:
+                return True, {"jailbreak"}
+
+            return False, set()
+
+        checks = []
+
+        if moderation in [Moderation.AUTO, Moderation.PARANOID]:
+            checks.append(check_content())
+
+        if moderation == Moderation.PARANOID:
+            checks.append(check_jailbreak())
+
+        verdicts = list(await safe_gather(*checks)) if checks else []
+
+        return (
+            any(flagged for flagged, _ in verdicts),
+            set(chain.from_iterable(tags for _, tags in verdicts)),
+        )
+
     @router.post(
         "",
         status_code=status.HTTP_201_CREATED,
@@ -1216,6 +1422,9 @@ def create_router(
                 "description": "List of all matching sessions",
                 "content": {"application/json": {"example": [session_example]}},
             },
+            status.HTTP_404_NOT_FOUND: {
+                "description": "The session specified in `after` was not found",
+            },
             status.HTTP_422_UNPROCESSABLE_ENTITY: {
                 "description": "Validation error in request parameters"
             },
@@ -1225,30 +1434,42 @@ def create_router(
     async def list_sessions(
         agent_id: Optional[AgentIdQuery] = None,
         customer_id: Optional[CustomerIdQuery] = None,
-    ) -> Sequence[SessionDTO]:
+        limit: Optional[LimitQuery] = None,
+        after: Optional[SessionIdQuery] = None,
+        fields: Optional[FieldsQuery] = None,
+    ) -> Sequence[SessionDTO] | JSONResponse:
         """Lists all sessions matching the specified filters.
 
         Can filter by agent_id and/or customer_id. Returns all sessions if no
-        filters are provided."""
+        filters are provided.
+
+        Sessions are returned in order of creation, and can be paged through
+        using `limit` and `after`."""
 
         sessions = await session_store.list_sessions(
             agent_id=agent_id,
             customer_id=customer_id,
+            limit=limit,
+            after=after,
         )
 
-        return [
-            SessionDTO(
-                id=s.id,
-                agent_id=s.agent_id,
-                creation_utc=s.creation_utc,
-                title=s.title,
-                customer_id=s.customer_id,
-                consumption_offsets=ConsumptionOffsetsDTO(
-                    client=s.consumption_offsets["client"],
-                ),
-            )
-            for s in sessions
-        ]
+        return project_fields(
+            SessionDTO,
+            [
+                SessionDTO(
+                    id=s.id,
+                    agent_id=s.agent_id,
+                    creation_utc=s.creation_utc,
+                    title=s.title,
+                    customer_id=s.customer_id,
+                    consumption_offsets=ConsumptionOffsetsDTO(
+                        client=s.consumption_offsets["client"],
+                    ),
+                )
+                for s in sessions
+            ],
+            fields,
+        )
 
     @router.delete(
         "/{session_id}",
@@ -1269,6 +1490,7 @@ def create_router(
 
         await session_store.read_session(session_id)
         await session_store.delete_session(session_id)
+        await inspection_store.delete_inspections(session_id=session_id)
 
     @router.delete(
         "",
@@ -1300,6 +1522,7 @@ def create_router(
 
         for s in sessions:
             await session_store.delete_session(s.id)
+            await inspection_store.delete_inspections(session_id=s.id)
 
     @router.patch(
         "/{session_id}",
@@ -1375,6 +1598,7 @@ def create_router(
         session_id: SessionIdPath,
         params: EventCreationParamsDTO,
         moderation: ModerationQuery = Moderation.NONE,
+        defer_moderation: DeferModerationQuery = False,
     ) -> EventDTO:
         """Creates a new event in the specified session.
 
@@ -1387,7 +1611,7 @@ def create_router(
             )
 
         if params.source == EventSourceDTO.CUSTOMER:
-            return await _add_customer_message(session_id, params, moderation)
+            return await _add_customer_message(session_id, params, moderation, defer_moderation)
         elif params.source == EventSourceDTO.AI_AGENT:
             return await _add_agent_message(session_id, params)
         elif params.source == EventSourceDTO.HUMAN_AGENT_ON_BEHALF_OF_AI_AGENT:
@@ -1398,10 +1622,57 @@ def create_router(
                 detail='Only "customer" and "human_agent_on_behalf_of_ai_agent" sources are supported for direct posting.',
             )
 
+    async def _read_customer_participant(session_id: SessionId) -> tuple[Session, Participant]:
+        session = await session_store.read_session(session_id)
+
+        try:
+            customer = await customer_store.read_customer(session.customer_id)
+            customer_display_name = customer.name
+        except Exception:
+            customer_display_name = session.customer_id
+
+        return session, {"id": session.customer_id, "display_name": customer_display_name}
+
+    async def _moderate_posted_message(payload: JSONSerializable) -> None:
+        task = cast(Mapping[str, str], payload)
+        session_id = SessionId(task["session_id"])
+        event_id = EventId(task["event_id"])
+
+        try:
+            event = await session_store.read_event(session_id, event_id)
+        except ItemNotFoundError:
+            logger.info(f"Skipping moderation of deleted event {event_id}")
+            return
+
+        message_data = cast(MessageEventData, event.data)
+
+        try:
+            flagged, tags = await _moderate(message_data["message"], Moderation(task["moderation"]))
+        except Exception as exc:
+            # Failing closed, as the message would have been rejected had it been moderated upfront
+            logger.error(f"Moderation of event {event_id} failed; flagging it: {exc}")
+            flagged, tags = True, set()
+
+        moderated_data = {k: v for k, v in message_data.items() if k != "pending_moderation"} | {
+            "flagged": flagged,
+            "tags": list(tags),
+        }
+
+        await session_store.update_event(
+            session_id=session_id,
+            event_id=event_id,
+            params={"data": cast(JSONSerializable, moderated_data)},
+        )
+
+        await application.dispatch_processing_task(await session_store.read_session(session_id))
+
+    task_queue_consumer.register_handler("moderate-message", _moderate_posted_message)
+
     async def _add_customer_message(
         session_id: SessionIdPath,
         params: EventCreationParamsDTO,
         moderation: Moderation = Moderation.NONE,
+        defer_moderation: bool = False,
     ) -> EventDTO:
         if not params.message:
             raise HTTPException(
@@ -1409,35 +1680,45 @@ def create_router(
                 detail="Missing 'message' field for event",
             )
 
-        flagged = False
-        tags: Set[str] = set()
+        if defer_moderation and moderation != Moderation.NONE:
+            session, participant = await _read_customer_participant(session_id)
 
-        if moderation in [Moderation.AUTO, Moderation.PARANOID]:
-            moderation_service = await nlp_service.get_moderation_service()
-            check = await moderation_service.check(params.message)
-            flagged |= check.flagged
-            tags.update(check.tags)
+            message_data: MessageEventData = {
+                "message": params.message,
+                "participant": participant,
+                "flagged": False,
+                "tags": [],
+                "pending_moderation": moderation.value,
+            }
 
-        if moderation == Moderation.PARANOID:
-            check = await _get_jailbreak_moderation_service(logger).check(params.message)
-            if "jailbreak" in check.tags:
-                flagged = True
-                tags.update({"jailbreak"})
+            # Processing skips the session until the verdict is recorded on the event,
+            # at which point the moderation task dispatches it again
+            event = await application.post_event(
+                session_id=session_id,
+                kind=params.kind.value,
+                data=message_data,
+                source="customer",
+                trigger_processing=True,
+            )
 
-        session = await session_store.read_session(session_id)
+            await schedule_message_moderation(
+                task_queue_consumer,
+                session.id,
+                event.id,
+                moderation,
+            )
 
-        try:
-            customer = await customer_store.read_customer(session.customer_id)
-            customer_display_name = customer.name
-        except Exception:
-            customer_display_name = session.customer_id
+            return event_to_dto(event)
 
-        message_data: MessageEventData = {
+        # Moderation doesn't depend on the session, so both are fetched together
+        (flagged, tags), (session, participant) = await safe_gather(
+            _moderate(params.message, moderation),
+            _read_customer_participant(session_id),
+        )
+
+        message_data = {
             "message": params.message,
-            "participant": {
-                "id": session.customer_id,
-                "display_name": customer_display_name,
-            },
+            "participant": participant,
             "flagged": flagged,
             "tags": list(tags),
         }
@@ -1562,7 +1843,9 @@ def create_router(
         correlation_id: Optional[CorrelationIdQuery] = None,
         kinds: Optional[KindsQuery] = None,
         wait_for_data: int = 60,
-    ) -> Sequence[EventDTO]:
+        limit: Optional[LimitQuery] = None,
+        fields: Optional[FieldsQuery] = None,
+    ) -> Sequence[EventDTO] | JSONResponse:
         """Lists events from a session with optional filtering and waiting capabilities.
 
         This endpoint retrieves events from a specified session and can:
@@ -1570,6 +1853,9 @@ def create_router(
         2. Wait for new events to arrive if requested
         3. Return events in chronological order based on their offset
 
+        Events can be paged through using `limit`, by passing the offset
+        following the last returned event as `min_offset`.
+
         Notes:
             Long Polling Behavior:
             - When wait_for_data = 0:
@@ -1602,21 +1888,26 @@ def create_router(
             source=source.value if source else None,
             kinds=kind_list,
             correlation_id=correlation_id,
+            limit=limit,
         )
 
-        return [
-            EventDTO(
-                id=e.id,
-                source=EventSourceDTO(e.source),
-                kind=EventKindDTO(e.kind),
-                offset=e.offset,
-                creation_utc=e.creation_utc,
-                correlation_id=e.correlation_id,
-                data=cast(JSONSerializableDTO, e.data),
-                deleted=e.deleted,
-            )
-            for e in events
-        ]
+        return project_fields(
+            EventDTO,
+            [
+                EventDTO(
+                    id=e.id,
+                    source=EventSourceDTO(e.source),
+                    kind=EventKindDTO(e.kind),
+                    offset=e.offset,
+                    creation_utc=e.creation_utc,
+                    correlation_id=e.correlation_id,
+                    data=cast(JSONSerializableDTO, e.data),
+                    deleted=e.deleted,
+                )
+                for e in events
+            ],
+            fields,
+        )
 
     @router.delete(
         "/{session_id}/events",
@@ -1671,17 +1962,24 @@ def create_router(
         """Retrieves detailed inspection information about an event.
 
         For AI agent message events, includes information about message generation,
-        tool calls, and preparation iterations."""
+        tool calls, and preparation iterations. The trace is omitted for events
+        whose processing was not sampled for inspection."""
 
         event = await session_store.read_event(session_id, event_id)
 
         trace: Optional[EventTraceDTO] = None
 
         if event.kind == "message" and event.source == "ai_agent":
-            inspection = await session_store.read_inspection(
-                session_id=session_id,
-                correlation_id=event.correlation_id,
-            )
+            try:
+                inspection = await inspection_store.read_inspection(
+                    session_id=session_id,
+                    correlation_id=event.correlation_id,
+                )
+            except ItemNotFoundError:
+                return EventInspectionResult(
+                    session_id=session_id,
+                    event=event_to_dto(event),
+                )
 
             trace = EventTraceDTO(
                 tool_calls=await _find_correlated_tool_calls(session_id, event),
@@ -1692,6 +1990,18 @@ def create_router(
                     preparation_iteration_to_dto(iteration)
                     for iteration in inspection.preparation_iterations
                 ],
+                prompt_cache_usage=prompt_cache_usage_to_dtos(
+                    chain(
+                        (m.generation for m in inspection.message_generations),
+                        chain.from_iterable(
+                            chain(
+                                iteration.generations.guideline_proposition.batches,
+                                iteration.generations.tool_calls,
+                            )
+                            for iteration in inspection.preparation_iterations
+                        ),
+                    )
+                ),
             )
 
         return EventInspectionResult(
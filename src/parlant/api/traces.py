@@ -0,0 +1,45 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any
+from fastapi import APIRouter, Query, status
+from typing_extensions import Annotated
+
+from parlant.core.tracing import Tracer, spans_to_otlp
+
+
+def create_router(
+    tracer: Tracer,
+) -> APIRouter:
+    router = APIRouter()
+
+    @router.get(
+        "/traces",
+        operation_id="read_traces",
+        include_in_schema=False,
+        responses={
+            status.HTTP_200_OK: {
+                "description": "Recorded spans of the correlation scope, in OTLP/JSON format",
+            },
+        },
+    )
+    async def read_traces(
+        correlation_id: Annotated[str, Query(description="Correlation scope to look up")],
+    ) -> dict[str, Any]:
+        """
+        Returns the recently recorded spans belonging to a correlation scope and its sub-scopes.
+        """
+        return spans_to_otlp(tracer.find_spans(correlation_id))
+
+    return router
@@ -914,18 +914,22 @@ class Actions:
         union_patterns: list[str],
         intersection_patterns: list[str],
     ) -> Iterator[dict[str, Any]]:
-        url = f"{ctx.obj.server_address.replace('http', 'ws')}/logs"
+        url = f"{ctx.obj.server_address.replace('http', 'ws')}/logs?batch=true"
         ws = create_connection(url)
 
         try:
             rich.print(Text("Streaming logs...", style="bold yellow"))
 
             while True:
-                raw_message = ws.recv()
-                message = json.loads(raw_message)
+                raw_messages = json.loads(ws.recv())
 
-                if Actions._log_entry_matches(message, union_patterns, intersection_patterns):
-                    yield message
+                # Older servers ignore the batch parameter and send one entry per frame
+                if isinstance(raw_messages, dict):
+                    raw_messages = [raw_messages]
+
+                for message in raw_messages:
+                    if Actions._log_entry_matches(message, union_patterns, intersection_patterns):
+                        yield message
         except KeyboardInterrupt:
             rich.print(Text("Log streaming interrupted by user.", style="bold red"))
         except WebSocketConnectionClosedException:
@@ -14,14 +14,30 @@
 
 # mypy: disable-error-code=import-untyped
 
+# Imported first so that the time taken by the rest of the imports is measured as well
+from parlant.bin.startup_profiler import STARTUP_PROFILER
+
 import asyncio
-from contextlib import asynccontextmanager, AsyncExitStack
+import base64
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, AsyncExitStack
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 import importlib
 import os
+import pickle
 import traceback
 from lagom import Container, Singleton
-from typing import AsyncIterator, Callable, Iterable, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Literal,
+    Optional,
+    TypeAlias,
+    cast,
+)
 import toml
 from typing_extensions import NoReturn
 import click
@@ -31,24 +47,36 @@ import sys
 import uvicorn
 
 from parlant.adapters.loggers.websocket import WebSocketLogger
-from parlant.adapters.vector_db.chroma import ChromaDatabase
+from parlant.adapters.db.file_session_archive import FileSessionArchive
+from parlant.adapters.db.sqlite import (
+    SQLiteDocumentDatabase,
+    SQLiteLeaseManager,
+    SQLiteTaskQueue,
+)
 from parlant.core.engines.alpha import guideline_proposer
 from parlant.core.engines.alpha import tool_caller
 from parlant.core.engines.alpha import fluid_message_generator
+from parlant.core.engines.alpha.hedging import HedgingPolicy
 from parlant.core.engines.alpha.hooks import LifecycleHooks
 from parlant.core.engines.alpha.message_assembler import AssembledMessageSchema
 from parlant.core.fragments import FragmentDocumentStore, FragmentStore
+from parlant.core.inspections import (
+    InspectionDocumentStore,
+    InspectionSamplingPolicy,
+    InspectionStore,
+)
 from parlant.core.nlp.service import NLPService
 from parlant.core.shots import ShotCollection
 from parlant.core.tags import TagDocumentStore, TagStore
 from parlant.api.app import create_api_app, ASGIApplication
+from parlant.api.sessions import recover_pending_moderations
 from parlant.core.background_tasks import BackgroundTaskService
 from parlant.core.contextual_correlator import ContextualCorrelator
-from parlant.core.agents import AgentDocumentStore, AgentStore
+from parlant.core.agents import AgentDocumentStore, AgentStore, CachedAgentStore
 from parlant.core.context_variables import ContextVariableDocumentStore, ContextVariableStore
 from parlant.core.emission.event_publisher import EventPublisherFactory
 from parlant.core.emissions import EventEmitterFactory
-from parlant.core.customers import CustomerDocumentStore, CustomerStore
+from parlant.core.customers import CachedCustomerStore, CustomerDocumentStore, CustomerStore
 from parlant.core.evaluations import (
     EvaluationListener,
     PollingEvaluationListener,
@@ -66,18 +94,26 @@ from parlant.core.guidelines import (
 )
 from parlant.adapters.db.json_file import JSONFileDocumentDatabase
 from parlant.core.nlp.embedding import EmbedderFactory
-from parlant.core.nlp.generation import SchematicGenerator
+from parlant.core.nlp.generation import (
+    FallbackSchematicGenerator,
+    MeteredSchematicGenerator,
+    SchematicGenerator,
+    T as TSchema,
+)
 from parlant.core.services.tools.service_registry import (
     ServiceRegistry,
     ServiceDocumentRegistry,
 )
+from parlant.core.session_retention import SessionRetentionPolicy, SessionRetentionService
 from parlant.core.sessions import (
+    CachedSessionStore,
     PollingSessionListener,
     SessionDocumentStore,
     SessionListener,
     SessionStore,
 )
-from parlant.core.glossary import GlossaryStore, GlossaryVectorStore
+from parlant.core.glossary import DeferredGlossaryStore, GlossaryStore, GlossaryVectorStore
+from parlant.core.resource_versions import ResourceVersionDocumentStore, ResourceVersionStore
 from parlant.core.engines.alpha.engine import AlphaEngine
 from parlant.core.guideline_tool_associations import (
     GuidelineToolAssociationDocumentStore,
@@ -94,9 +130,14 @@ from parlant.core.engines.alpha.fluid_message_generator import (
     FluidMessageGeneratorShot,
     FluidMessageSchema,
 )
+from parlant.core.engines.alpha.interaction_history import (
+    HistorySummarizer,
+    HistorySummarySchema,
+)
 from parlant.core.engines.alpha.tool_event_generator import ToolEventGenerator
 from parlant.core.engines.types import Engine
 from parlant.core.services.indexing.behavioral_change_evaluation import (
+    DEFAULT_MAX_CONCURRENT_PAYLOADS,
     BehavioralChangeEvaluator,
 )
 from parlant.core.services.indexing.coherence_checker import (
@@ -108,10 +149,20 @@ from parlant.core.services.indexing.guideline_connection_proposer import (
     GuidelineConnectionProposer,
     GuidelineConnectionPropositionsSchema,
 )
+from parlant.core.services.indexing.pair_verdicts import (
+    GuidelinePairVerdictDocumentStore,
+    GuidelinePairVerdictStore,
+)
 from parlant.core.logging import CompositeLogger, FileLogger, LogLevel, Logger
+from parlant.core.metrics import MetricsLogger, MetricsRegistry
+from parlant.core.tracing import OTLPJSONFileExporter, Tracer, TracingLogger
 from parlant.core.application import Application
+from parlant.core.leases import InMemoryLeaseManager, LeaseManager
+from parlant.core.task_queue import InMemoryTaskQueue, TaskQueue, TaskQueueConsumer
 from parlant.core.version import VERSION
 
+STARTUP_PROFILER.mark("Import server modules")
+
 DEFAULT_PORT = 8800
 SERVER_ADDRESS = "https://localhost"
 
@@ -125,6 +176,14 @@ EXIT_STACK: AsyncExitStack
 
 DEFAULT_AGENT_NAME = "Default Agent"
 
+INSPECTION_RETENTION_CHECK_INTERVAL = timedelta(hours=1)
+
+TRACE_EXPORT_MAX_FILE_SIZE = 100 * 1024 * 1024
+
+WORKER_PARAMS_ENV_VAR = "PARLANT_WORKER_PARAMS"
+
+DatabaseBackend: TypeAlias = Literal["json", "sqlite"]
+
 sys.path.append(PARLANT_HOME_DIR.as_posix())
 sys.path.append(".")
 
@@ -134,6 +193,10 @@ LOGGER = FileLogger(PARLANT_HOME_DIR / "parlant.log", CORRELATOR, LogLevel.INFO)
 
 BACKGROUND_TASK_SERVICE = BackgroundTaskService(LOGGER)
 
+METRICS = MetricsRegistry()
+
+TRACER = Tracer(CORRELATOR)
+
 
 class StartupError(Exception):
     def __init__(self, message: str) -> None:
@@ -146,13 +209,29 @@ class CLIParams:
     nlp_service: str
     log_level: str
     modules: list[str]
-
-
-def load_nlp_service(name: str, extra_name: str, class_name: str, module_path: str) -> NLPService:
+    inspection_sampling: InspectionSamplingPolicy
+    inspection_compression: bool
+    inspection_retention: Optional[timedelta]
+    session_retention: SessionRetentionPolicy
+    database: DatabaseBackend
+    workers: int
+    profile_startup: bool
+    trace_export: Optional[Path]
+    evaluation_concurrency: int
+    hedging_policy: HedgingPolicy
+
+
+def load_nlp_service(
+    name: str,
+    extra_name: str,
+    class_name: str,
+    module_path: str,
+    *args: Any,
+) -> NLPService:
     try:
         module = importlib.import_module(module_path)
         service = getattr(module, class_name)
-        return cast(NLPService, service(LOGGER))
+        return cast(NLPService, service(LOGGER, *args))
     except ModuleNotFoundError as exc:
         LOGGER.error(f"Failed to import module: {exc.name}")
         LOGGER.critical(
@@ -163,12 +242,12 @@ def load_nlp_service(name: str, extra_name: str, class_name: str, module_path: s
 
 def load_anthropic() -> NLPService:
     return load_nlp_service(
-        "Anthropic", "anthropic", "AnthropicService", "parlant.adapters.nlp.anthropic"
+        "Anthropic", "anthropic", "AnthropicService", "parlant.adapters.nlp.anthropic", METRICS
     )
 
 
 def load_aws() -> NLPService:
-    return load_nlp_service("AWS", "aws", "BedrockService", "parlant.adapters.nlp.aws")
+    return load_nlp_service("AWS", "aws", "BedrockService", "parlant.adapters.nlp.aws", METRICS)
 
 
 def load_azure() -> NLPService:
@@ -179,13 +258,13 @@ def load_azure() -> NLPService:
 
 def load_cerebras() -> NLPService:
     return load_nlp_service(
-        "Cerebras", "cerebras", "CerebrasService", "parlant.adapters.nlp.cerebras"
+        "Cerebras", "cerebras", "CerebrasService", "parlant.adapters.nlp.cerebras", METRICS
     )
 
 
 def load_deepseek() -> NLPService:
     return load_nlp_service(
-        "DeepSeek", "deepseek", "DeepSeekService", "parlant.adapters.nlp.deepseek"
+        "DeepSeek", "deepseek", "DeepSeekService", "parlant.adapters.nlp.deepseek", METRICS
     )
 
 
@@ -205,6 +284,18 @@ def load_together() -> NLPService:
     )
 
 
+NLP_SERVICE_INITIALIZERS: dict[str, Callable[[], NLPService]] = {
+    "anthropic": load_anthropic,
+    "aws": load_aws,
+    "azure": load_azure,
+    "cerebras": load_cerebras,
+    "deepseek": load_deepseek,
+    "gemini": load_gemini,
+    "openai": load_openai,
+    "together": load_together,
+}
+
+
 async def create_agent_if_absent(agent_store: AgentStore) -> None:
     agents = await agent_store.list_agents()
     if not agents:
@@ -253,19 +344,137 @@ async def load_modules(
             await m.shutdown_module()
 
 
+async def enforce_inspection_retention(
+    inspection_store: InspectionStore,
+    retention: timedelta,
+) -> None:
+    while True:
+        if deleted := await inspection_store.delete_inspections(
+            created_before=datetime.now(timezone.utc) - retention
+        ):
+            LOGGER.info(f"Deleted {deleted} inspections older than {retention}")
+
+        await asyncio.sleep(INSPECTION_RETENTION_CHECK_INTERVAL.total_seconds())
+
+
+def create_document_database(
+    name: str, backend: DatabaseBackend
+) -> SQLiteDocumentDatabase | JSONFileDocumentDatabase:
+    if backend == "sqlite":
+        return SQLiteDocumentDatabase(LOGGER, PARLANT_HOME_DIR / f"{name}.sqlite", METRICS)
+
+    return JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / f"{name}.json", METRICS)
+
+
+async def enter_async_contexts(*contexts: AbstractAsyncContextManager[Any]) -> list[Any]:
+    """Enters independent contexts concurrently, but registers their exits
+    on the exit stack in the order given, so teardown order doesn't depend on
+    which of them happened to finish entering first."""
+    results = await asyncio.gather(
+        *[context.__aenter__() for context in contexts],
+        return_exceptions=True,
+    )
+
+    for context, result in zip(contexts, results):
+        if not isinstance(result, BaseException):
+            EXIT_STACK.push_async_exit(context)
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+    return list(results)
+
+
+class DeferredWarmUps:
+    """Initialization steps which the server doesn't need in order to start accepting requests.
+
+    They're run once the server is listening, and anything which depends
+    on them waits for them to complete (see DeferredGlossaryStore).
+    """
+
+    def __init__(self) -> None:
+        self._warm_ups: list[tuple[str, Callable[[], Awaitable[None]]]] = []
+
+    def add(self, name: str, warm_up: Callable[[], Awaitable[None]]) -> None:
+        self._warm_ups.append((name, warm_up))
+
+    async def run(self) -> None:
+        async def run_one(name: str, warm_up: Callable[[], Awaitable[None]]) -> None:
+            with STARTUP_PROFILER.measure(name):
+                await warm_up()
+
+        await asyncio.gather(*[run_one(name, warm_up) for name, warm_up in self._warm_ups])
+        self._warm_ups.clear()
+
+
 @asynccontextmanager
-async def setup_container(nlp_service_name: str, log_level: str) -> AsyncIterator[Container]:
+async def setup_container(
+    nlp_service_name: str,
+    log_level: str,
+    inspection_sampling: InspectionSamplingPolicy = InspectionSamplingPolicy(),
+    inspection_compression: bool = True,
+    inspection_retention: Optional[timedelta] = None,
+    session_retention: SessionRetentionPolicy = SessionRetentionPolicy(),
+    database: DatabaseBackend = "json",
+    workers: int = 1,
+    evaluation_concurrency: int = DEFAULT_MAX_CONCURRENT_PAYLOADS,
+    hedging_policy: HedgingPolicy = HedgingPolicy(),
+    trace_export: Optional[Path] = None,
+) -> AsyncIterator[Container]:
     c = Container()
 
+    # Queued tasks only have to survive restarts and be shared when the rest of the data is
+    if database == "sqlite":
+        # Entered first so that it's still open while background tasks are shutting down
+        task_queue = await EXIT_STACK.enter_async_context(
+            SQLiteTaskQueue(PARLANT_HOME_DIR / "tasks.sqlite")
+        )
+
+        # Multiple workers have their claims released by their parent process instead
+        if workers == 1:
+            await task_queue.release_claims()
+
+        c[TaskQueue] = task_queue
+    else:
+        c[TaskQueue] = InMemoryTaskQueue()
+
     c[BackgroundTaskService] = await EXIT_STACK.enter_async_context(BACKGROUND_TASK_SERVICE)
 
     c[ContextualCorrelator] = CORRELATOR
 
-    c[WebSocketLogger] = WebSocketLogger(CORRELATOR, LogLevel.INFO)
+    c[MetricsRegistry] = METRICS
+    c[MetricsRegistry].gauge(
+        "background_tasks",
+        "Number of running background tasks by kind",
+        labels=["kind"],
+        callback=lambda: {
+            (kind,): count for kind, count in c[BackgroundTaskService].count_running_tasks().items()
+        },
+    )
+
+    c[Tracer] = TRACER
+
+    if trace_export:
+        # Workers write files of their own rather than interleaving their appends
+        if workers > 1:
+            trace_export = trace_export.with_name(
+                f"{trace_export.stem}.{os.getpid()}{trace_export.suffix}"
+            )
+
+        c[Tracer].add_exporter(
+            EXIT_STACK.enter_context(
+                OTLPJSONFileExporter(trace_export, max_file_size=TRACE_EXPORT_MAX_FILE_SIZE)
+            )
+        )
+
+    c[WebSocketLogger] = WebSocketLogger(CORRELATOR)
     c[Logger] = CompositeLogger(
         [
             LOGGER,
             c[WebSocketLogger],
+            MetricsLogger(c[MetricsRegistry]),
+            TracingLogger(c[Tracer]),
         ]
     )
     c[Logger].set_level(
@@ -279,124 +488,209 @@ async def setup_container(nlp_service_name: str, log_level: str) -> AsyncIterato
     )
     await c[BackgroundTaskService].start(c[WebSocketLogger].start(), tag="websocket-logger")
 
-    agents_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "agents.json")
-    )
-    context_variables_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "context_variables.json")
-    )
-    tags_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "tags.json")
-    )
-    customers_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "customers.json")
+    c[TaskQueueConsumer] = TaskQueueConsumer(
+        c[Logger],
+        c[ContextualCorrelator],
+        c[BackgroundTaskService],
+        c[TaskQueue],
     )
-    sessions_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(
-            LOGGER,
-            PARLANT_HOME_DIR / "sessions.json",
+
+    # Only the SQLite backend may be shared by several server processes
+    if database == "sqlite":
+        c[LeaseManager] = await EXIT_STACK.enter_async_context(
+            SQLiteLeaseManager(PARLANT_HOME_DIR / "leases.sqlite")
+        )
+    else:
+        c[LeaseManager] = InMemoryLeaseManager()
+
+    database_names = [
+        "agents",
+        "context_variables",
+        "tags",
+        "customers",
+        "sessions",
+        "inspections",
+        "fragments",
+        "guidelines",
+        "guideline_tool_associations",
+        "guideline_connections",
+        "evaluations",
+        "guideline_pair_verdicts",
+        "services",
+        "resource_versions",
+    ]
+
+    # Databases (and then their stores) are independent of each other, so they're opened together
+    with STARTUP_PROFILER.measure("Open databases"):
+        dbs = dict(
+            zip(
+                database_names,
+                await enter_async_contexts(
+                    *[create_document_database(name, database) for name in database_names]
+                ),
+            )
         )
-    )
-    fragments_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "fragments.json")
-    )
-    guidelines_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "guidelines.json")
-    )
-    guideline_tool_associations_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "guideline_tool_associations.json")
-    )
-    guideline_connections_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "guideline_connections.json")
-    )
-    evaluations_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "evaluations.json")
-    )
-    services_db = await EXIT_STACK.enter_async_context(
-        JSONFileDocumentDatabase(LOGGER, PARLANT_HOME_DIR / "services.json")
-    )
 
-    c[AgentStore] = await EXIT_STACK.enter_async_context(AgentDocumentStore(agents_db))
-    c[ContextVariableStore] = await EXIT_STACK.enter_async_context(
-        ContextVariableDocumentStore(context_variables_db)
-    )
-    c[TagStore] = await EXIT_STACK.enter_async_context(TagDocumentStore(tags_db))
-    c[CustomerStore] = await EXIT_STACK.enter_async_context(CustomerDocumentStore(customers_db))
-    c[FragmentStore] = await EXIT_STACK.enter_async_context(FragmentDocumentStore(fragments_db))
-    c[GuidelineStore] = await EXIT_STACK.enter_async_context(GuidelineDocumentStore(guidelines_db))
-    c[GuidelineToolAssociationStore] = await EXIT_STACK.enter_async_context(
-        GuidelineToolAssociationDocumentStore(guideline_tool_associations_db)
-    )
-    c[GuidelineConnectionStore] = await EXIT_STACK.enter_async_context(
-        GuidelineConnectionDocumentStore(guideline_connections_db)
-    )
-    c[SessionStore] = await EXIT_STACK.enter_async_context(SessionDocumentStore(sessions_db))
+    with STARTUP_PROFILER.measure("Open stores"):
+        # Stores record their writes here, so it has to be open before any of them
+        c[ResourceVersionStore] = await EXIT_STACK.enter_async_context(
+            ResourceVersionDocumentStore(dbs["resource_versions"])
+        )
+        versions = c[ResourceVersionStore]
+
+        # Other server processes can only write to a shared SQLite backend, so only then
+        # do the entity caches have to watch for writes to customers and sessions,
+        # which are frequent enough not to bump their versions otherwise
+        shared_versions = versions if database == "sqlite" else None
+
+        stores: list[Any] = await enter_async_contexts(
+            AgentDocumentStore(dbs["agents"], versions=versions),
+            ContextVariableDocumentStore(dbs["context_variables"]),
+            TagDocumentStore(dbs["tags"]),
+            CustomerDocumentStore(dbs["customers"], versions=shared_versions),
+            FragmentDocumentStore(dbs["fragments"], versions=versions),
+            GuidelineDocumentStore(dbs["guidelines"], versions=versions),
+            GuidelineToolAssociationDocumentStore(
+                dbs["guideline_tool_associations"], versions=versions
+            ),
+            GuidelineConnectionDocumentStore(dbs["guideline_connections"], versions=versions),
+            SessionDocumentStore(
+                dbs["sessions"],
+                archive=FileSessionArchive(PARLANT_HOME_DIR / "archive" / "sessions"),
+                lease_manager=c[LeaseManager],
+                versions=shared_versions,
+            ),
+            InspectionDocumentStore(dbs["inspections"], compress=inspection_compression),
+            EvaluationDocumentStore(dbs["evaluations"]),
+            GuidelinePairVerdictDocumentStore(dbs["guideline_pair_verdicts"], versions=versions),
+        )
+
+        (
+            agent_store,
+            c[ContextVariableStore],
+            c[TagStore],
+            customer_store,
+            c[FragmentStore],
+            c[GuidelineStore],
+            c[GuidelineToolAssociationStore],
+            c[GuidelineConnectionStore],
+            session_store,
+            c[InspectionStore],
+            c[EvaluationStore],
+            c[GuidelinePairVerdictStore],
+        ) = stores
+
+        c[AgentStore] = CachedAgentStore(agent_store, c[MetricsRegistry], shared_versions)
+        c[CustomerStore] = CachedCustomerStore(customer_store, c[MetricsRegistry], shared_versions)
+        c[SessionStore] = CachedSessionStore(session_store, c[MetricsRegistry], shared_versions)
+
     c[SessionListener] = PollingSessionListener
 
-    c[EvaluationStore] = await EXIT_STACK.enter_async_context(
-        EvaluationDocumentStore(evaluations_db)
+    c[SessionRetentionService] = SessionRetentionService(
+        c[Logger],
+        c[SessionStore],
+        c[BackgroundTaskService],
+        c[LeaseManager],
+        session_retention,
     )
+    await c[SessionRetentionService].start()
+
+    c[InspectionSamplingPolicy] = inspection_sampling
+
+    if inspection_retention:
+        await c[BackgroundTaskService].start(
+            enforce_inspection_retention(c[InspectionStore], inspection_retention),
+            tag="inspection-retention",
+        )
+
     c[EvaluationListener] = PollingEvaluationListener
 
     c[EventEmitterFactory] = Singleton(EventPublisherFactory)
 
-    nlp_service_initializer: dict[str, Callable[[], NLPService]] = {
-        "anthropic": load_anthropic,
-        "aws": load_aws,
-        "azure": load_azure,
-        "cerebras": load_cerebras,
-        "deepseek": load_deepseek,
-        "gemini": load_gemini,
-        "openai": load_openai,
-        "together": load_together,
-    }
-
-    c[ServiceRegistry] = await EXIT_STACK.enter_async_context(
-        ServiceDocumentRegistry(
-            database=services_db,
-            event_emitter_factory=c[EventEmitterFactory],
-            logger=c[Logger],
-            correlator=c[ContextualCorrelator],
-            nlp_services={nlp_service_name: nlp_service_initializer[nlp_service_name]()},
+    with STARTUP_PROFILER.measure("Load NLP service"):
+        c[ServiceRegistry] = await EXIT_STACK.enter_async_context(
+            ServiceDocumentRegistry(
+                database=dbs["services"],
+                event_emitter_factory=c[EventEmitterFactory],
+                logger=c[Logger],
+                correlator=c[ContextualCorrelator],
+                nlp_services={nlp_service_name: NLP_SERVICE_INITIALIZERS[nlp_service_name]()},
+                versions=versions,
+            )
         )
-    )
 
-    nlp_service = await c[ServiceRegistry].read_nlp_service(nlp_service_name)
+        nlp_service = await c[ServiceRegistry].read_nlp_service(nlp_service_name)
 
     c[NLPService] = nlp_service
 
-    embedder_factory = EmbedderFactory(c)
-    c[GlossaryStore] = await EXIT_STACK.enter_async_context(
-        GlossaryVectorStore(
-            await EXIT_STACK.enter_async_context(
-                ChromaDatabase(LOGGER, PARLANT_HOME_DIR, embedder_factory),
-            ),
-            embedder_type=type(await nlp_service.get_embedder()),
-            embedder_factory=embedder_factory,
+    c[DeferredWarmUps] = DeferredWarmUps()
+
+    # The vector database is slow to load, so the glossary only becomes available
+    # once the server is up. Glossary calls made before that simply wait for it.
+    glossary_store = DeferredGlossaryStore()
+    c[GlossaryStore] = glossary_store
+
+    async def load_glossary_store() -> None:
+        try:
+            chroma = await asyncio.to_thread(
+                importlib.import_module, "parlant.adapters.vector_db.chroma"
+            )
+
+            embedder_factory = EmbedderFactory(c)
+
+            glossary_store.provide(
+                await EXIT_STACK.enter_async_context(
+                    GlossaryVectorStore(
+                        await EXIT_STACK.enter_async_context(
+                            chroma.ChromaDatabase(LOGGER, PARLANT_HOME_DIR, embedder_factory),
+                        ),
+                        embedder_type=type(await nlp_service.get_embedder()),
+                        embedder_factory=embedder_factory,
+                        versions=versions,
+                    )
+                )
+            )
+        except Exception as exc:
+            LOGGER.critical(f"Failed to load the glossary store: {exc}")
+            glossary_store.fail(exc)
+            raise
+
+    c[DeferredWarmUps].add("Load glossary store", load_glossary_store)
+
+    async def make_schematic_generator(schema: type[TSchema]) -> SchematicGenerator[TSchema]:
+        generator = await nlp_service.get_schematic_generator(schema)
+
+        if isinstance(generator, FallbackSchematicGenerator):
+            generator.export_metrics(c[MetricsRegistry])
+
+        return MeteredSchematicGenerator(
+            generator,
+            c[MetricsRegistry],
+            c[Tracer],
         )
-    )
 
-    c[SchematicGenerator[GuidelinePropositionsSchema]] = await nlp_service.get_schematic_generator(
+    c[SchematicGenerator[GuidelinePropositionsSchema]] = await make_schematic_generator(
         GuidelinePropositionsSchema
     )
-    c[SchematicGenerator[FluidMessageSchema]] = await nlp_service.get_schematic_generator(
-        FluidMessageSchema
-    )
-    c[SchematicGenerator[AssembledMessageSchema]] = await nlp_service.get_schematic_generator(
+    c[SchematicGenerator[FluidMessageSchema]] = await make_schematic_generator(FluidMessageSchema)
+    c[SchematicGenerator[AssembledMessageSchema]] = await make_schematic_generator(
         AssembledMessageSchema
     )
-    c[SchematicGenerator[ToolCallInferenceSchema]] = await nlp_service.get_schematic_generator(
+    c[SchematicGenerator[ToolCallInferenceSchema]] = await make_schematic_generator(
         ToolCallInferenceSchema
     )
-    c[
-        SchematicGenerator[ConditionsEntailmentTestsSchema]
-    ] = await nlp_service.get_schematic_generator(ConditionsEntailmentTestsSchema)
-    c[
-        SchematicGenerator[ActionsContradictionTestsSchema]
-    ] = await nlp_service.get_schematic_generator(ActionsContradictionTestsSchema)
-    c[
-        SchematicGenerator[GuidelineConnectionPropositionsSchema]
-    ] = await nlp_service.get_schematic_generator(GuidelineConnectionPropositionsSchema)
+    c[SchematicGenerator[ConditionsEntailmentTestsSchema]] = await make_schematic_generator(
+        ConditionsEntailmentTestsSchema
+    )
+    c[SchematicGenerator[ActionsContradictionTestsSchema]] = await make_schematic_generator(
+        ActionsContradictionTestsSchema
+    )
+    c[SchematicGenerator[GuidelineConnectionPropositionsSchema]] = await make_schematic_generator(
+        GuidelineConnectionPropositionsSchema
+    )
+    c[SchematicGenerator[HistorySummarySchema]] = await make_schematic_generator(
+        HistorySummarySchema
+    )
 
     c[ShotCollection[GuidelinePropositionShot]] = guideline_proposer.shot_collection
     c[ShotCollection[ToolCallerInferenceShot]] = tool_caller.shot_collection
@@ -412,6 +706,7 @@ async def setup_container(nlp_service_name: str, log_level: str) -> AsyncIterato
         c[Logger],
         c[SchematicGenerator[GuidelineConnectionPropositionsSchema]],
         c[GlossaryStore],
+        c[GuidelinePairVerdictStore],
     )
 
     c[CoherenceChecker] = CoherenceChecker(
@@ -419,22 +714,28 @@ async def setup_container(nlp_service_name: str, log_level: str) -> AsyncIterato
         c[SchematicGenerator[ConditionsEntailmentTestsSchema]],
         c[SchematicGenerator[ActionsContradictionTestsSchema]],
         c[GlossaryStore],
+        c[NLPService],
+        c[GuidelinePairVerdictStore],
     )
 
     c[BehavioralChangeEvaluator] = BehavioralChangeEvaluator(
         c[Logger],
-        c[BackgroundTaskService],
+        c[TaskQueueConsumer],
         c[AgentStore],
         c[EvaluationStore],
         c[GuidelineStore],
         c[GuidelineConnectionProposer],
         c[CoherenceChecker],
+        max_concurrent_payloads=evaluation_concurrency,
     )
 
+    c[HedgingPolicy] = hedging_policy
+
     c[FluidMessageGenerator] = FluidMessageGenerator(
         c[Logger],
         c[ContextualCorrelator],
         c[SchematicGenerator[FluidMessageSchema]],
+        c[HedgingPolicy],
     )
 
     c[ToolEventGenerator] = ToolEventGenerator(
@@ -444,31 +745,61 @@ async def setup_container(nlp_service_name: str, log_level: str) -> AsyncIterato
         c[SchematicGenerator[ToolCallInferenceSchema]],
     )
 
+    c[HistorySummarizer] = HistorySummarizer(
+        c[Logger],
+        c[ContextualCorrelator],
+        c[SessionStore],
+        c[BackgroundTaskService],
+        c[SchematicGenerator[HistorySummarySchema]],
+    )
+
     c[Engine] = Singleton(AlphaEngine)
 
     c[Application] = Application(c)
 
+    # Handlers are all registered by now, so queued work can be resumed
+    await c[TaskQueueConsumer].start()
+
+    STARTUP_PROFILER.mark("Set up container")
+
     yield c
 
 
 async def recover_server_tasks(
     evaluation_store: EvaluationStore,
     evaluator: BehavioralChangeEvaluator,
+    session_store: SessionStore,
+    task_queue_consumer: TaskQueueConsumer,
 ) -> None:
+    # Evaluations which are already queued are left as they are
     for evaluation in await evaluation_store.list_evaluations():
         if evaluation.status in [EvaluationStatus.PENDING, EvaluationStatus.RUNNING]:
             LOGGER.info(f"Recovering evaluation task: '{evaluation.id}'")
-            await evaluator.run_evaluation(evaluation)
+            await evaluator.schedule_evaluation(evaluation.id)
+
+    await recover_pending_moderations(LOGGER, session_store, task_queue_consumer)
 
 
 @asynccontextmanager
-async def load_app(params: CLIParams) -> AsyncIterator[ASGIApplication]:
+async def load_app(params: CLIParams) -> AsyncIterator[tuple[ASGIApplication, Container]]:
     global EXIT_STACK
 
     EXIT_STACK = AsyncExitStack()
 
     async with (
-        setup_container(params.nlp_service, params.log_level) as base_container,
+        setup_container(
+            params.nlp_service,
+            params.log_level,
+            inspection_sampling=params.inspection_sampling,
+            inspection_compression=params.inspection_compression,
+            inspection_retention=params.inspection_retention,
+            session_retention=params.session_retention,
+            database=params.database,
+            workers=params.workers,
+            evaluation_concurrency=params.evaluation_concurrency,
+            hedging_policy=params.hedging_policy,
+            trace_export=params.trace_export,
+        ) as base_container,
         EXIT_STACK,
     ):
         modules = set(await get_module_list_from_config() + params.modules)
@@ -485,16 +816,32 @@ async def load_app(params: CLIParams) -> AsyncIterator[ASGIApplication]:
         await recover_server_tasks(
             evaluation_store=actual_container[EvaluationStore],
             evaluator=actual_container[BehavioralChangeEvaluator],
+            session_store=actual_container[SessionStore],
+            task_queue_consumer=actual_container[TaskQueueConsumer],
         )
 
-        await create_agent_if_absent(actual_container[AgentStore])
+        async with actual_container[LeaseManager].exclusive("create-default-agent"):
+            await create_agent_if_absent(actual_container[AgentStore])
+
+        app = await create_api_app(actual_container)
 
-        yield await create_api_app(actual_container)
+        STARTUP_PROFILER.mark("Load app")
+
+        yield app, actual_container
+
+
+async def warm_up(container: Container, profile_startup: bool) -> None:
+    try:
+        await container[DeferredWarmUps].run()
+    finally:
+        if profile_startup:
+            print(STARTUP_PROFILER.report(), file=sys.stderr)
 
 
 async def serve_app(
     app: ASGIApplication,
     port: int,
+    on_started: Callable[[], Awaitable[None]],
 ) -> None:
     config = uvicorn.Config(
         app,
@@ -505,6 +852,16 @@ async def serve_app(
     )
     server = uvicorn.Server(config)
 
+    async def wait_until_started() -> None:
+        while not server.started:
+            await asyncio.sleep(0.01)
+
+        STARTUP_PROFILER.mark("Start listening")
+
+        await on_started()
+
+    await BACKGROUND_TASK_SERVICE.start(wait_until_started(), tag="deferred-warm-ups")
+
     try:
         LOGGER.info(".-----------------------------------------.")
         LOGGER.info("| Server is ready for some serious action |")
@@ -520,6 +877,78 @@ async def serve_app(
         sys.exit(1)
 
 
+class WorkerApp:
+    """Loads the server within each of the processes spawned by uvicorn in multi-worker mode"""
+
+    def __init__(self, params: CLIParams) -> None:
+        self._params = params
+        self._app: Optional[ASGIApplication] = None
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] == "lifespan":
+            await self._serve_lifespan(receive, send)
+        else:
+            assert self._app
+            await self._app(scope, receive, send)
+
+    async def _serve_lifespan(self, receive: Any, send: Any) -> None:
+        await receive()  # lifespan.startup
+
+        try:
+            async with load_app(self._params) as (app, container):
+                self._app = app
+                await send({"type": "lifespan.startup.complete"})
+
+                await BACKGROUND_TASK_SERVICE.start(
+                    warm_up(container, self._params.profile_startup),
+                    tag="deferred-warm-ups",
+                )
+
+                await receive()  # lifespan.shutdown
+                await BACKGROUND_TASK_SERVICE.cancel_all(reason="Worker shutting down")
+        except BaseException as e:
+            LOGGER.critical(traceback.format_exc())
+
+            if not self._app:
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+
+        await send({"type": "lifespan.shutdown.complete"})
+
+
+def create_worker_app() -> WorkerApp:
+    params = pickle.loads(base64.b64decode(os.environ[WORKER_PARAMS_ENV_VAR]))
+    return WorkerApp(params)
+
+
+async def release_task_claims() -> None:
+    async with SQLiteTaskQueue(PARLANT_HOME_DIR / "tasks.sqlite") as task_queue:
+        await task_queue.release_claims()
+
+
+def serve_workers(params: CLIParams) -> None:
+    # Worker processes are spawned afresh, so they receive their parameters through the environment
+    os.environ[WORKER_PARAMS_ENV_VAR] = base64.b64encode(pickle.dumps(params)).decode()
+
+    # No worker is running yet, so claims left by the previous server are certainly stale
+    asyncio.run(release_task_claims())
+
+    LOGGER.info(f"Parlant server version {VERSION}")
+    LOGGER.info(f"Using home directory '{PARLANT_HOME_DIR.absolute()}'")
+    LOGGER.info(f"Starting {params.workers} workers")
+    LOGGER.info(f"Try the Sandbox UI at http://localhost:{params.port}")
+
+    uvicorn.run(
+        "parlant.bin.server:create_worker_app",
+        factory=True,
+        host="0.0.0.0",
+        port=params.port,
+        workers=params.workers,
+        log_level="critical",
+        timeout_graceful_shutdown=1,
+    )
+
+
 def die(message: str) -> NoReturn:
     print(message, file=sys.stderr)
     sys.exit(1)
@@ -552,10 +981,11 @@ async def start_server(params: CLIParams) -> None:
             "Please rename 'runtime-data' to 'parlant-data' to avoid this warning in the future."
         )
 
-    async with load_app(params) as app:
+    async with load_app(params) as (app, container):
         await serve_app(
             app,
             params.port,
+            on_started=lambda: warm_up(container, params.profile_startup),
         )
 
 
@@ -635,6 +1065,85 @@ def main() -> None:
             "in it will also be loaded."
         ),
     )
+    @click.option(
+        "--inspection-sampling",
+        default="all",
+        metavar="SPEC",
+        help=(
+            "Which processed turns to record inspections for: 'all', 'errors', "
+            "'1/N' (one in N turns) or 'tags:TAG_ID[,TAG_ID...]' (customers with any of these tags). "
+            "Turns which ran into errors are always recorded"
+        ),
+    )
+    @click.option(
+        "--inspection-compression/--no-inspection-compression",
+        default=True,
+        help="Compress stored inspections",
+    )
+    @click.option(
+        "--inspection-retention-days",
+        type=click.IntRange(min=1),
+        default=None,
+        help="Delete inspections older than this many days (default: keep all)",
+    )
+    @click.option(
+        "--archive-idle-sessions-after-days",
+        type=click.IntRange(min=1),
+        default=None,
+        help=(
+            "Move the events of sessions idle for this many days into compressed archive files, "
+            "which are restored when the session is accessed again (default: never)"
+        ),
+    )
+    @click.option(
+        "--database",
+        type=click.Choice(["json", "sqlite"]),
+        default="json",
+        help="Storage backend. Use 'sqlite' to share data between multiple workers",
+    )
+    @click.option(
+        "--workers",
+        type=click.IntRange(min=1),
+        default=1,
+        help=(
+            "Number of server processes. Each session is processed by one worker at a time. "
+            "Requires --database sqlite when greater than 1"
+        ),
+    )
+    @click.option(
+        "--evaluation-concurrency",
+        type=click.IntRange(min=1),
+        default=DEFAULT_MAX_CONCURRENT_PAYLOADS,
+        help="Maximum number of guidelines that an evaluation checks at the same time",
+    )
+    @click.option(
+        "--hedge-message-generation-after-percentile",
+        type=click.FloatRange(min=0, max=1, min_open=True),
+        default=None,
+        metavar="PERCENTILE",
+        help=(
+            "Start the next message generation attempt alongside the current one once it has taken "
+            "longer than this percentile (e.g. 0.95) of recent generations, and use whichever "
+            "finishes first. At most 10% extra generations are made this way (default: never)"
+        ),
+    )
+    @click.option(
+        "--trace-export",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        metavar="PATH",
+        help=(
+            "Append finished spans to this file in the OTLP JSON format. It's rotated to PATH.1 "
+            "once it reaches 100MB, and with multiple workers, each writes to a file of its own "
+            "named after its process ID (default: don't export)"
+        ),
+    )
+    @click.option(
+        "--profile-startup",
+        is_flag=True,
+        help="Print how long each phase of the server's startup took",
+        default=False,
+    )
     @click.option(
         "--version",
         is_flag=True,
@@ -654,6 +1163,16 @@ def main() -> None:
         together: bool,
         log_level: str,
         module: tuple[str],
+        inspection_sampling: str,
+        inspection_compression: bool,
+        inspection_retention_days: Optional[int],
+        archive_idle_sessions_after_days: Optional[int],
+        database: DatabaseBackend,
+        workers: int,
+        evaluation_concurrency: int,
+        hedge_message_generation_after_percentile: Optional[float],
+        trace_export: Optional[Path],
+        profile_startup: bool,
         version: bool,
     ) -> None:
         if version:
@@ -695,14 +1214,50 @@ def main() -> None:
         else:
             assert False, "Should never get here"
 
+        try:
+            inspection_sampling_policy = InspectionSamplingPolicy.parse(inspection_sampling)
+        except ValueError as exc:
+            die(f"error: {exc}")
+
+        if workers > 1:
+            if database != "sqlite":
+                die("error: multiple workers require --database sqlite")
+
+            # Each worker keeps track of archived sessions by itself
+            if archive_idle_sessions_after_days:
+                die("error: session archiving is not supported with multiple workers")
+
         ctx.obj = CLIParams(
             port=port,
             nlp_service=nlp_service,
             log_level=log_level,
             modules=list(module),
+            inspection_sampling=inspection_sampling_policy,
+            inspection_compression=inspection_compression,
+            inspection_retention=(
+                timedelta(days=inspection_retention_days) if inspection_retention_days else None
+            ),
+            session_retention=SessionRetentionPolicy(
+                idle_session_ttl=(
+                    timedelta(days=archive_idle_sessions_after_days)
+                    if archive_idle_sessions_after_days
+                    else None
+                ),
+            ),
+            database=database,
+            workers=workers,
+            profile_startup=profile_startup,
+            trace_export=trace_export,
+            evaluation_concurrency=evaluation_concurrency,
+            hedging_policy=HedgingPolicy(
+                latency_percentile=hedge_message_generation_after_percentile
+            ),
         )
 
-        asyncio.run(start_server(ctx.obj))
+        if workers > 1:
+            serve_workers(ctx.obj)
+        else:
+            asyncio.run(start_server(ctx.obj))
 
     try:
         cli()
@@ -0,0 +1,79 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import time
+from typing import Iterator
+
+
+@dataclass(frozen=True)
+class StartupPhase:
+    name: str
+    started_at: float
+    duration: float
+
+
+class StartupProfiler:
+    """Records how long each phase of the server's startup took.
+
+    Offsets are measured from the moment this module was first imported,
+    so the cost of importing the server's own modules is included.
+    """
+
+    def __init__(self) -> None:
+        self._started_at = time.perf_counter()
+        self._last_mark = self._started_at
+        self._phases: list[StartupPhase] = []
+
+    def mark(self, name: str) -> None:
+        """Records everything since the previous mark as a single phase"""
+        now = time.perf_counter()
+        self._record(name, self._last_mark, now)
+        self._last_mark = now
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self._record(name, started_at, time.perf_counter())
+
+    def _record(self, name: str, started_at: float, finished_at: float) -> None:
+        self._phases.append(
+            StartupPhase(
+                name=name,
+                started_at=started_at - self._started_at,
+                duration=finished_at - started_at,
+            )
+        )
+
+    @property
+    def phases(self) -> list[StartupPhase]:
+        return sorted(self._phases, key=lambda p: p.started_at)
+
+    def report(self) -> str:
+        lines = [f"{'Offset':>10}  {'Duration':>10}  Phase"]
+
+        for phase in self.phases:
+            lines.append(
+                f"{phase.started_at * 1000:>8.1f}ms  {phase.duration * 1000:>8.1f}ms  {phase.name}"
+            )
+
+        return "\n".join(lines)
+
+
+STARTUP_PROFILER = StartupProfiler()
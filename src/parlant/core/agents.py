@@ -20,8 +20,11 @@ from typing_extensions import override, TypedDict, Self
 
 from parlant.core.async_utils import ReaderWriterLock
 from parlant.core.common import ItemNotFoundError, UniqueId, Version, generate_id
+from parlant.core.entity_cache import EntityCache
+from parlant.core.metrics import MetricsRegistry
 from parlant.core.persistence.common import ObjectId
 from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
+from parlant.core.resource_versions import ResourceVersionStore
 
 AgentId = NewType("AgentId", str)
 
@@ -38,6 +41,8 @@ class AgentUpdateParams(TypedDict, total=False):
     description: Optional[str]
     max_engine_iterations: int
     composition_mode: CompositionMode
+    max_history_turns: Optional[int]
+    max_history_tokens: Optional[int]
 
 
 @dataclass(frozen=True)
@@ -48,6 +53,10 @@ class Agent:
     creation_utc: datetime
     max_engine_iterations: int
     composition_mode: CompositionMode = "fluid"
+    max_history_turns: Optional[int] = None
+    """Customer turns kept verbatim in prompts; older turns are folded into a summary"""
+    max_history_tokens: Optional[int] = None
+    """Token budget of the interaction history section of each prompt"""
 
 
 class AgentStore(ABC):
@@ -58,6 +67,9 @@ class AgentStore(ABC):
         description: Optional[str] = None,
         creation_utc: Optional[datetime] = None,
         max_engine_iterations: Optional[int] = None,
+        composition_mode: Optional[CompositionMode] = None,
+        max_history_turns: Optional[int] = None,
+        max_history_tokens: Optional[int] = None,
     ) -> Agent: ...
 
     @abstractmethod
@@ -93,6 +105,8 @@ class _AgentDocument(TypedDict, total=False):
     description: Optional[str]
     max_engine_iterations: int
     composition_mode: CompositionMode
+    max_history_turns: Optional[int]
+    max_history_tokens: Optional[int]
 
 
 class AgentDocumentStore(AgentStore):
@@ -101,9 +115,11 @@ class AgentDocumentStore(AgentStore):
     def __init__(
         self,
         database: DocumentDatabase,
+        versions: Optional[ResourceVersionStore] = None,
     ):
         self._database = database
         self._collection: DocumentCollection[_AgentDocument]
+        self._versions = versions
 
         self._lock = ReaderWriterLock()
 
@@ -122,6 +138,10 @@ class AgentDocumentStore(AgentStore):
     ) -> None:
         pass
 
+    async def _bump_version(self) -> None:
+        if self._versions:
+            await self._versions.bump_version("agents")
+
     def _serialize(self, agent: Agent) -> _AgentDocument:
         return _AgentDocument(
             id=ObjectId(agent.id),
@@ -131,6 +151,8 @@ class AgentDocumentStore(AgentStore):
             description=agent.description,
             max_engine_iterations=agent.max_engine_iterations,
             composition_mode=agent.composition_mode,
+            max_history_turns=agent.max_history_turns,
+            max_history_tokens=agent.max_history_tokens,
         )
 
     def _deserialize(self, agent_document: _AgentDocument) -> Agent:
@@ -141,6 +163,8 @@ class AgentDocumentStore(AgentStore):
             description=agent_document["description"],
             max_engine_iterations=agent_document["max_engine_iterations"],
             composition_mode=cast(CompositionMode, agent_document.get("composition_mode", "fluid")),
+            max_history_turns=agent_document.get("max_history_turns"),
+            max_history_tokens=agent_document.get("max_history_tokens"),
         )
 
     @override
@@ -151,6 +175,8 @@ class AgentDocumentStore(AgentStore):
         creation_utc: Optional[datetime] = None,
         max_engine_iterations: Optional[int] = None,
         composition_mode: Optional[CompositionMode] = None,
+        max_history_turns: Optional[int] = None,
+        max_history_tokens: Optional[int] = None,
     ) -> Agent:
         async with self._lock.writer_lock:
             creation_utc = creation_utc or datetime.now(timezone.utc)
@@ -163,9 +189,12 @@ class AgentDocumentStore(AgentStore):
                 creation_utc=creation_utc,
                 max_engine_iterations=max_engine_iterations,
                 composition_mode=composition_mode or "fluid",
+                max_history_turns=max_history_turns,
+                max_history_tokens=max_history_tokens,
             )
 
             await self._collection.insert_one(document=self._serialize(agent=agent))
+            await self._bump_version()
 
         return agent
 
@@ -210,6 +239,7 @@ class AgentDocumentStore(AgentStore):
                 filters={"id": {"$eq": agent_id}},
                 params=cast(_AgentDocument, params),
             )
+            await self._bump_version()
 
         assert result.updated_document
 
@@ -223,5 +253,77 @@ class AgentDocumentStore(AgentStore):
         async with self._lock.writer_lock:
             result = await self._collection.delete_one({"id": {"$eq": agent_id}})
 
+            if result.deleted_count:
+                await self._bump_version()
+
         if result.deleted_count == 0:
             raise ItemNotFoundError(item_id=UniqueId(agent_id))
+
+
+class CachedAgentStore(AgentStore):
+    def __init__(
+        self,
+        agent_store: AgentStore,
+        metrics: MetricsRegistry,
+        versions: Optional[ResourceVersionStore] = None,
+    ) -> None:
+        self._agent_store = agent_store
+        self._cache = EntityCache[AgentId, Agent]("agents", metrics, versions)
+
+    @override
+    async def create_agent(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        creation_utc: Optional[datetime] = None,
+        max_engine_iterations: Optional[int] = None,
+        composition_mode: Optional[CompositionMode] = None,
+        max_history_turns: Optional[int] = None,
+        max_history_tokens: Optional[int] = None,
+    ) -> Agent:
+        return await self._agent_store.create_agent(
+            name=name,
+            description=description,
+            creation_utc=creation_utc,
+            max_engine_iterations=max_engine_iterations,
+            composition_mode=composition_mode,
+            max_history_turns=max_history_turns,
+            max_history_tokens=max_history_tokens,
+        )
+
+    @override
+    async def list_agents(
+        self,
+    ) -> Sequence[Agent]:
+        return await self._agent_store.list_agents()
+
+    @override
+    async def read_agent(
+        self,
+        agent_id: AgentId,
+    ) -> Agent:
+        return await self._cache.get_or_read(
+            agent_id,
+            lambda: self._agent_store.read_agent(agent_id),
+        )
+
+    @override
+    async def update_agent(
+        self,
+        agent_id: AgentId,
+        params: AgentUpdateParams,
+    ) -> Agent:
+        try:
+            return await self._agent_store.update_agent(agent_id, params)
+        finally:
+            self._cache.discard(agent_id)
+
+    @override
+    async def delete_agent(
+        self,
+        agent_id: AgentId,
+    ) -> None:
+        try:
+            await self._agent_store.delete_agent(agent_id)
+        finally:
+            self._cache.discard(agent_id)
@@ -21,20 +21,22 @@ from lagom import Container
 
 from parlant.core.async_utils import Timeout
 from parlant.core.background_tasks import BackgroundTaskService
-from parlant.core.common import generate_id
+from parlant.core.common import ItemNotFoundError, JSONSerializable, UniqueId, generate_id
 from parlant.core.contextual_correlator import ContextualCorrelator
 from parlant.core.agents import AgentId
 from parlant.core.emissions import EventEmitterFactory
 from parlant.core.customers import CustomerId
-from parlant.core.evaluations import ConnectionProposition, Invoice
+from parlant.core.evaluations import Invoice
 from parlant.core.guideline_connections import (
+    GuidelineConnectionId,
     GuidelineConnectionStore,
 )
-from parlant.core.guidelines import GuidelineId, GuidelineStore
+from parlant.core.guidelines import GuidelineContent, GuidelineId, GuidelineStore
 from parlant.core.sessions import (
     Event,
     EventKind,
     EventSource,
+    MessageEventData,
     Session,
     SessionId,
     SessionListener,
@@ -42,6 +44,7 @@ from parlant.core.sessions import (
 )
 from parlant.core.engines.types import Context, Engine, UtteranceRequest
 from parlant.core.logging import Logger
+from parlant.core.task_queue import TaskQueueConsumer
 
 
 TaskQueue: TypeAlias = list[asyncio.Task[None]]
@@ -58,9 +61,12 @@ class Application:
         self._engine = container[Engine]
         self._event_emitter_factory = container[EventEmitterFactory]
         self._background_task_service = container[BackgroundTaskService]
+        self._task_queue_consumer = container[TaskQueueConsumer]
 
         self._lock = asyncio.Lock()
 
+        self._task_queue_consumer.register_handler("process-session", self._handle_processing_task)
+
     async def wait_for_update(
         self,
         session_id: SessionId,
@@ -120,13 +126,39 @@ class Application:
 
     async def dispatch_processing_task(self, session: Session) -> str:
         with self._correlator.correlation_scope(generate_id()):
-            await self._background_task_service.restart(
-                self._process_session(session),
+            # Processing restarts if new events arrive while
+            # it's running, wherever it happens to be running.
+            await self._task_queue_consumer.submit(
+                "process-session",
                 tag=f"process-session({session.id})",
+                payload={"session_id": session.id},
             )
 
             return self._correlator.correlation_id
 
+    async def _handle_processing_task(self, payload: JSONSerializable) -> None:
+        session_id = SessionId(cast(Mapping[str, str], payload)["session_id"])
+
+        try:
+            session = await self._session_store.read_session(session_id)
+        except ItemNotFoundError:
+            self._logger.info(f"Skipping processing of deleted session {session_id}")
+            return
+
+        customer_messages = await self._session_store.list_events(
+            session_id=session_id,
+            source="customer",
+            kinds=["message"],
+        )
+
+        # The agent mustn't respond to messages it doesn't know are safe yet;
+        # processing is dispatched again once their moderation completes
+        if any(cast(MessageEventData, e.data).get("pending_moderation") for e in customer_messages):
+            self._logger.info(f"Deferring processing of session {session_id} until moderation")
+            return
+
+        await self._process_session(session)
+
     async def _process_session(self, session: Session) -> None:
         event_emitter = await self._event_emitter_factory.create_event_emitter(
             emitting_agent_id=session.agent_id,
@@ -165,75 +197,66 @@ class Application:
         guideline_set: str,
         invoices: Sequence[Invoice],
     ) -> Iterable[GuidelineId]:
-        async def _create_connection_with_existing_guideline(
-            source_key: str,
-            target_key: str,
-            content_guidelines: dict[str, GuidelineId],
-            guideline_set: str,
-            proposition: ConnectionProposition,
-        ) -> None:
-            if source_key in content_guidelines:
-                source_guideline_id = content_guidelines[source_key]
-                target_guideline_id = (
-                    await self._guideline_store.find_guideline(
-                        guideline_set=guideline_set,
-                        guideline_content=proposition.target,
-                    )
-                ).id
-            else:
-                source_guideline_id = (
-                    await self._guideline_store.find_guideline(
-                        guideline_set=guideline_set,
-                        guideline_content=proposition.source,
-                    )
-                ).id
-                target_guideline_id = content_guidelines[target_key]
-
-            await self._guideline_connection_store.create_connection(
-                source=source_guideline_id,
-                target=target_guideline_id,
+        # Guidelines and connections are each written in bulk, as writing them
+        # one at a time makes applying a large evaluation take minutes
+        added_guidelines = iter(
+            await self._guideline_store.create_guidelines(
+                guideline_set=guideline_set,
+                contents=[i.payload.content for i in invoices if i.payload.operation == "add"],
             )
+        )
 
-        content_guidelines: dict[str, GuidelineId] = {
-            f"{invoice.payload.content.condition}_{invoice.payload.content.action}": (
-                await self._guideline_store.create_guideline(
-                    guideline_set=guideline_set,
-                    condition=invoice.payload.content.condition,
-                    action=invoice.payload.content.action,
-                )
-                if invoice.payload.operation == "add"
-                else await self._guideline_store.update_guideline(
+        content_guidelines: dict[GuidelineContent, GuidelineId] = {}
+
+        for invoice in invoices:
+            if invoice.payload.operation == "add":
+                guideline = next(added_guidelines)
+            else:
+                guideline = await self._guideline_store.update_guideline(
                     guideline_id=cast(GuidelineId, invoice.payload.updated_id),
                     params={
                         "condition": invoice.payload.content.condition,
                         "action": invoice.payload.content.action,
                     },
                 )
-            ).id
-            for invoice in invoices
-        }
+
+            content_guidelines[invoice.payload.content] = guideline.id
+
+        existing_guidelines: dict[GuidelineContent, GuidelineId] = {}
+
+        for g in await self._guideline_store.list_guidelines(guideline_set=guideline_set):
+            existing_guidelines.setdefault(g.content, g.id)
+
+        def resolve_guideline_id(content: GuidelineContent) -> GuidelineId:
+            if guideline_id := content_guidelines.get(content, existing_guidelines.get(content)):
+                return guideline_id
+
+            raise ItemNotFoundError(
+                item_id=UniqueId(f"{content.condition}{content.action}"),
+                message=f"with guideline_set '{guideline_set}'",
+            )
+
+        connections_to_delete: dict[GuidelineConnectionId, None] = {}
 
         for invoice in invoices:
             if invoice.payload.operation == "update" and invoice.payload.connection_proposition:
                 guideline_id = cast(GuidelineId, invoice.payload.updated_id)
 
-                connections_to_delete = list(
-                    await self._guideline_connection_store.list_connections(
+                for connection in [
+                    *await self._guideline_connection_store.list_connections(
                         indirect=False,
                         source=guideline_id,
-                    )
-                )
-                connections_to_delete.extend(
-                    await self._guideline_connection_store.list_connections(
+                    ),
+                    *await self._guideline_connection_store.list_connections(
                         indirect=False,
                         target=guideline_id,
-                    )
-                )
+                    ),
+                ]:
+                    connections_to_delete[connection.id] = None
 
-                for conn in connections_to_delete:
-                    await self._guideline_connection_store.delete_connection(conn.id)
+        await self._guideline_connection_store.delete_connections(list(connections_to_delete))
 
-        connections: set[ConnectionProposition] = set([])
+        connections: list[tuple[GuidelineId, GuidelineId]] = []
 
         for invoice in invoices:
             assert invoice.data
@@ -242,23 +265,21 @@ class Application:
                 continue
 
             for proposition in invoice.data.connection_propositions:
-                source_key = f"{proposition.source.condition}_{proposition.source.action}"
-                target_key = f"{proposition.target.condition}_{proposition.target.action}"
-
-                if proposition not in connections:
-                    if proposition.check_kind == "connection_with_another_evaluated_guideline":
-                        await self._guideline_connection_store.create_connection(
-                            source=content_guidelines[source_key],
-                            target=content_guidelines[target_key],
+                if proposition.check_kind == "connection_with_another_evaluated_guideline":
+                    connections.append(
+                        (
+                            content_guidelines[proposition.source],
+                            content_guidelines[proposition.target],
                         )
-                    else:
-                        await _create_connection_with_existing_guideline(
-                            source_key,
-                            target_key,
-                            content_guidelines,
-                            guideline_set,
-                            proposition,
+                    )
+                else:
+                    connections.append(
+                        (
+                            resolve_guideline_id(proposition.source),
+                            resolve_guideline_id(proposition.target),
                         )
-                    connections.add(proposition)
+                    )
+
+        await self._guideline_connection_store.create_connections(connections)
 
         return content_guidelines.values()
@@ -13,8 +13,9 @@
 # limitations under the License.
 
 import asyncio
+from collections import Counter
 import traceback
-from typing import Any, Coroutine, Optional, TypeAlias
+from typing import Any, Coroutine, Mapping, Optional, TypeAlias
 from typing_extensions import Self
 
 from parlant.core.logging import Logger
@@ -50,6 +51,12 @@ class BackgroundTaskService:
 
         return False
 
+    def count_running_tasks(self) -> Mapping[str, int]:
+        """Counts running tasks by kind, i.e. their tag without the parenthesized suffix"""
+        return Counter(
+            tag.split("(", 1)[0] for tag, task in list(self._tasks.items()) if not task.done()
+        )
+
     async def cancel(self, *, tag: str, reason: str = "(not given)") -> None:
         async with self._lock:
             if task := self._tasks.get(tag):
@@ -21,7 +21,10 @@ from typing_extensions import override, TypedDict, Self
 from parlant.core.async_utils import ReaderWriterLock
 from parlant.core.tags import TagId
 from parlant.core.common import ItemNotFoundError, UniqueId, Version, generate_id
-from parlant.core.persistence.common import ObjectId
+from parlant.core.entity_cache import EntityCache
+from parlant.core.metrics import MetricsRegistry
+from parlant.core.persistence.common import ObjectId, Where, keyset_filters
+from parlant.core.resource_versions import ResourceVersionStore
 from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
 
 CustomerId = NewType("CustomerId", str)
@@ -73,7 +76,12 @@ class CustomerStore(ABC):
     @abstractmethod
     async def list_customers(
         self,
-    ) -> Sequence[Customer]: ...
+        limit: Optional[int] = None,
+        after: Optional[CustomerId] = None,
+    ) -> Sequence[Customer]:
+        """Lists customers by creation time, starting with the guest customer,
+        optionally starting after a given customer"""
+        ...
 
     @abstractmethod
     async def add_tag(
@@ -127,8 +135,10 @@ class CustomerDocumentStore(CustomerStore):
     def __init__(
         self,
         database: DocumentDatabase,
+        versions: Optional[ResourceVersionStore] = None,
     ) -> None:
         self._database = database
+        self._versions = versions
         self._customers_collection: DocumentCollection[_CustomerDocument]
         self._customer_tag_association_collection: DocumentCollection[
             _CustomerTagAssociationDocument
@@ -155,6 +165,10 @@ class CustomerDocumentStore(CustomerStore):
     ) -> None:
         pass
 
+    async def _bump_version(self) -> None:
+        if self._versions:
+            await self._versions.bump_version("customers")
+
     def _serialize_customer(self, customer: Customer) -> _CustomerDocument:
         return _CustomerDocument(
             id=ObjectId(customer.id),
@@ -201,6 +215,7 @@ class CustomerDocumentStore(CustomerStore):
             await self._customers_collection.insert_one(
                 document=self._serialize_customer(customer=customer)
             )
+            await self._bump_version()
 
         return customer
 
@@ -246,6 +261,7 @@ class CustomerDocumentStore(CustomerStore):
                 filters={"id": {"$eq": customer_id}},
                 params={"name": params["name"]},
             )
+            await self._bump_version()
 
         assert result.updated_document
 
@@ -253,11 +269,32 @@ class CustomerDocumentStore(CustomerStore):
 
     async def list_customers(
         self,
+        limit: Optional[int] = None,
+        after: Optional[CustomerId] = None,
     ) -> Sequence[Customer]:
         async with self._lock.reader_lock:
-            return [await self.read_customer(CustomerStore.GUEST_ID)] + [
+            guest = [] if after else [await self.read_customer(CustomerStore.GUEST_ID)]
+            filters: Where = {}
+
+            if after and after != CustomerStore.GUEST_ID:
+                cursor = await self._customers_collection.find_one({"id": {"$eq": after}})
+
+                if not cursor:
+                    raise ItemNotFoundError(item_id=UniqueId(after))
+
+                filters = keyset_filters(["creation_utc", "id"], cursor)
+
+            if limit is not None:
+                guest = guest[:limit]
+                limit -= len(guest)
+
+            return guest + [
                 await self._deserialize_customer(e)
-                for e in await self._customers_collection.find({})
+                for e in await self._customers_collection.find(
+                    filters,
+                    sort=["creation_utc", "id"],
+                    limit=limit,
+                )
             ]
 
     @override
@@ -271,6 +308,9 @@ class CustomerDocumentStore(CustomerStore):
         async with self._lock.writer_lock:
             result = await self._customers_collection.delete_one({"id": {"$eq": customer_id}})
 
+            if result.deleted_count:
+                await self._bump_version()
+
         if result.deleted_count == 0:
             raise ItemNotFoundError(item_id=UniqueId(customer_id))
 
@@ -300,6 +340,7 @@ class CustomerDocumentStore(CustomerStore):
             _ = await self._customer_tag_association_collection.insert_one(
                 document=association_document
             )
+            await self._bump_version()
 
             customer_document = await self._customers_collection.find_one(
                 {"id": {"$eq": customer_id}}
@@ -327,6 +368,8 @@ class CustomerDocumentStore(CustomerStore):
             if delete_result.deleted_count == 0:
                 raise ItemNotFoundError(item_id=UniqueId(tag_id))
 
+            await self._bump_version()
+
             customer_document = await self._customers_collection.find_one(
                 {"id": {"$eq": customer_id}}
             )
@@ -356,6 +399,7 @@ class CustomerDocumentStore(CustomerStore):
                 filters={"id": {"$eq": customer_id}},
                 params={"extra": updated_extra},
             )
+            await self._bump_version()
 
         assert result.updated_document
 
@@ -381,7 +425,112 @@ class CustomerDocumentStore(CustomerStore):
                 filters={"id": {"$eq": customer_id}},
                 params={"extra": updated_extra},
             )
+            await self._bump_version()
 
         assert result.updated_document
 
         return await self._deserialize_customer(customer_document=result.updated_document)
+
+
+class CachedCustomerStore(CustomerStore):
+    def __init__(
+        self,
+        customer_store: CustomerStore,
+        metrics: MetricsRegistry,
+        versions: Optional[ResourceVersionStore] = None,
+    ) -> None:
+        self._customer_store = customer_store
+        self._cache = EntityCache[CustomerId, Customer]("customers", metrics, versions)
+
+    @override
+    async def create_customer(
+        self,
+        name: str,
+        extra: Mapping[str, str] = {},
+        creation_utc: Optional[datetime] = None,
+    ) -> Customer:
+        return await self._customer_store.create_customer(name, extra, creation_utc)
+
+    @override
+    async def read_customer(
+        self,
+        customer_id: CustomerId,
+    ) -> Customer:
+        return await self._cache.get_or_read(
+            customer_id,
+            lambda: self._customer_store.read_customer(customer_id),
+        )
+
+    @override
+    async def update_customer(
+        self,
+        customer_id: CustomerId,
+        params: CustomerUpdateParams,
+    ) -> Customer:
+        try:
+            return await self._customer_store.update_customer(customer_id, params)
+        finally:
+            self._cache.discard(customer_id)
+
+    @override
+    async def delete_customer(
+        self,
+        customer_id: CustomerId,
+    ) -> None:
+        try:
+            await self._customer_store.delete_customer(customer_id)
+        finally:
+            self._cache.discard(customer_id)
+
+    @override
+    async def list_customers(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[CustomerId] = None,
+    ) -> Sequence[Customer]:
+        return await self._customer_store.list_customers(limit, after)
+
+    @override
+    async def add_tag(
+        self,
+        customer_id: CustomerId,
+        tag_id: TagId,
+        creation_utc: Optional[datetime] = None,
+    ) -> Customer:
+        try:
+            return await self._customer_store.add_tag(customer_id, tag_id, creation_utc)
+        finally:
+            self._cache.discard(customer_id)
+
+    @override
+    async def remove_tag(
+        self,
+        customer_id: CustomerId,
+        tag_id: TagId,
+    ) -> Customer:
+        try:
+            return await self._customer_store.remove_tag(customer_id, tag_id)
+        finally:
+            self._cache.discard(customer_id)
+
+    @override
+    async def add_extra(
+        self,
+        customer_id: CustomerId,
+        extra: Mapping[str, str],
+    ) -> Customer:
+        try:
+            return await self._customer_store.add_extra(customer_id, extra)
+        finally:
+            self._cache.discard(customer_id)
+
+    @override
+    async def remove_extra(
+        self,
+        customer_id: CustomerId,
+        keys: Sequence[str],
+    ) -> Customer:
+        try:
+            return await self._customer_store.remove_extra(customer_id, keys)
+        finally:
+            self._cache.discard(customer_id)
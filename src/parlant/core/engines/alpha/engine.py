@@ -33,12 +33,17 @@ from parlant.core.context_variables import (
 from parlant.core.customers import Customer, CustomerStore
 from parlant.core.engines.alpha.fluid_message_generator import FluidMessageGenerator
 from parlant.core.engines.alpha.hooks import LifecycleHooks
+from parlant.core.engines.alpha.interaction_history import (
+    HistorySummarizer,
+    window_interaction_history,
+)
 from parlant.core.engines.alpha.message_assembler import MessageAssembler
 from parlant.core.engines.alpha.message_event_composer import (
     MessageEventComposer,
 )
 from parlant.core.engines.alpha.tool_caller import ToolInsights
 from parlant.core.guidelines import Guideline, GuidelineId, GuidelineContent, GuidelineStore
+from parlant.core.inspections import InspectionSamplingPolicy, InspectionStore
 from parlant.core.guideline_connections import GuidelineConnectionStore
 from parlant.core.guideline_tool_associations import (
     GuidelineToolAssociationStore,
@@ -88,7 +93,8 @@ class _InteractionState:
         return _InteractionState([], -1)
 
     history: Sequence[Event]
-    """An sequenced event-by-event representation of the interaction"""
+    """An sequenced event-by-event representation of the interaction,
+    windowed according to the agent's history policy"""
 
     last_known_event_offset: int
     """An accessor which is often useful when emitting status events"""
@@ -157,6 +163,8 @@ class AlphaEngine(Engine):
         correlator: ContextualCorrelator,
         agent_store: AgentStore,
         session_store: SessionStore,
+        inspection_store: InspectionStore,
+        inspection_sampling_policy: InspectionSamplingPolicy,
         customer_store: CustomerStore,
         context_variable_store: ContextVariableStore,
         glossary_store: GlossaryStore,
@@ -168,6 +176,7 @@ class AlphaEngine(Engine):
         tool_event_generator: ToolEventGenerator,
         fluid_message_generator: FluidMessageGenerator,
         message_assembler: MessageAssembler,
+        history_summarizer: HistorySummarizer,
         lifecycle_hooks: LifecycleHooks,
     ) -> None:
         self._logger = logger
@@ -175,6 +184,8 @@ class AlphaEngine(Engine):
 
         self._agent_store = agent_store
         self._session_store = session_store
+        self._inspection_store = inspection_store
+        self._inspection_sampling_policy = inspection_sampling_policy
         self._customer_store = customer_store
         self._context_variable_store = context_variable_store
         self._glossary_store = glossary_store
@@ -187,6 +198,7 @@ class AlphaEngine(Engine):
         self._tool_event_generator = tool_event_generator
         self._fluid_message_generator = fluid_message_generator
         self._message_assembler = message_assembler
+        self._history_summarizer = history_summarizer
 
         self._lifecycle_hooks = lifecycle_hooks
 
@@ -202,8 +214,15 @@ class AlphaEngine(Engine):
         loaded_context = await self._load_context(context, event_emitter)
 
         try:
-            with self._logger.operation(f"Processing context for session {context.session_id}"):
+            with self._logger.operation(
+                "[AlphaEngine] Processing context", {"session_id": context.session_id}
+            ):
                 await self._do_process(loaded_context, event_emitter)
+
+            # Fold turns which fell out of the history window into
+            # the session's summary, without delaying the response.
+            await self._history_summarizer.schedule(loaded_context.agent, context.session_id)
+
             return True
         except asyncio.CancelledError:
             return False
@@ -239,7 +258,9 @@ class AlphaEngine(Engine):
         )
 
         try:
-            with self._logger.operation(f"Uttering in session {context.session_id}"):
+            with self._logger.operation(
+                "[AlphaEngine] Uttering", {"session_id": context.session_id}
+            ):
                 await self._do_utter(loaded_context, requests)
             return True
         except asyncio.CancelledError:
@@ -263,12 +284,16 @@ class AlphaEngine(Engine):
             )
             raise
 
-    async def _load_interaction_state(self, context: Context) -> _InteractionState:
-        history = list(await self._session_store.list_events(context.session_id))
-        last_known_event_offset = history[-1].offset if history else -1
+    async def _load_interaction_state(
+        self,
+        context: Context,
+        agent: Agent,
+    ) -> _InteractionState:
+        events = await self._session_store.list_events(context.session_id)
+        last_known_event_offset = events[-1].offset if events else -1
 
         return _InteractionState(
-            history=history,
+            history=window_interaction_history(events, agent.max_history_turns),
             last_known_event_offset=last_known_event_offset,
         )
 
@@ -286,12 +311,13 @@ class AlphaEngine(Engine):
         if not await self._lifecycle_hooks.call_on_acknowledged(context.info, event_emitter):
             return  # Hook requested to bail out
 
+        preparation_iteration_inspections: list[PreparationIteration] = []
+
         try:
             if not await self._lifecycle_hooks.call_on_preparing(context.info, event_emitter):
                 return  # Hook requested to bail out
 
             preparation_state = await self._initialize_preparation_state(context)
-            preparation_iteration_inspections = []
 
             # Mark that the agent is in the process of preparing for a response.
             await self._emit_processing_event(context)
@@ -344,9 +370,8 @@ class AlphaEngine(Engine):
             )
 
             # Save results for later inspection.
-            await self._session_store.create_inspection(
-                session_id=context.session.id,
-                correlation_id=self._correlator.correlation_id,
+            await self._record_inspection(
+                context,
                 preparation_iterations=preparation_iteration_inspections,
                 message_generations=message_generation_inspections,
             )
@@ -366,6 +391,16 @@ class AlphaEngine(Engine):
             self._logger.warning("Processing cancelled")
             await self._emit_cancellation_event(context)
             raise
+        except Exception:
+            # Keep whatever was gathered before the failure, as
+            # failed turns are the ones most worth inspecting.
+            await self._record_inspection(
+                context,
+                preparation_iterations=preparation_iteration_inspections,
+                message_generations=[],
+                errored=True,
+            )
+            raise
         finally:
             # Mark that the agent is ready to receive and respond to new events.
             await self._emit_ready_event(context)
@@ -392,9 +427,8 @@ class AlphaEngine(Engine):
             )
 
             # Save results for later inspection.
-            await self._session_store.create_inspection(
-                session_id=context.session.id,
-                correlation_id=self._correlator.correlation_id,
+            await self._record_inspection(
+                context,
                 preparation_iterations=[],
                 message_generations=message_generation_inspections,
             )
@@ -406,6 +440,37 @@ class AlphaEngine(Engine):
             # Mark that the agent is ready to receive and respond to new events.
             await self._emit_ready_event(context)
 
+    async def _record_inspection(
+        self,
+        context: _LoadedContext,
+        preparation_iterations: Sequence[PreparationIteration],
+        message_generations: Sequence[MessageGenerationInspection],
+        errored: bool = False,
+    ) -> None:
+        errored = errored or any(
+            "error_details" in tool_call["result"]["metadata"]
+            for iteration in preparation_iterations
+            for tool_call in iteration.tool_calls
+        )
+
+        if not self._inspection_sampling_policy.should_record(
+            self._correlator.correlation_id,
+            context.customer,
+            errored,
+        ):
+            return
+
+        try:
+            await self._inspection_store.create_inspection(
+                session_id=context.session.id,
+                correlation_id=self._correlator.correlation_id,
+                preparation_iterations=preparation_iterations,
+                message_generations=message_generations,
+            )
+        except Exception as exc:
+            # Inspections are diagnostic; failing to store one shouldn't fail the turn
+            self._logger.error(f"Failed to record inspection: {exc}")
+
     async def _load_context(
         self,
         context: Context,
@@ -419,7 +484,7 @@ class AlphaEngine(Engine):
         customer = await self._customer_store.read_customer(session.customer_id)
 
         if load_interaction:
-            interaction = await self._load_interaction_state(context)
+            interaction = await self._load_interaction_state(context, agent)
         else:
             interaction = _InteractionState([], -1)
 
@@ -622,6 +687,7 @@ class AlphaEngine(Engine):
                         else None
                         for e in event_generation_result.events
                     ],
+                    hedge_won=event_generation_result.hedge_won,
                 )
             )
 
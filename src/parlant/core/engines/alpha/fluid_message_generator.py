@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from functools import partial
 from itertools import chain
 import json
 import traceback
@@ -22,6 +23,8 @@ from parlant.core.contextual_correlator import ContextualCorrelator
 from parlant.core.agents import Agent
 from parlant.core.context_variables import ContextVariable, ContextVariableValue
 from parlant.core.customers import Customer
+from parlant.core.engines.alpha.hedging import Hedger, HedgingPolicy
+from parlant.core.engines.alpha.interaction_history import fit_interaction_history
 from parlant.core.engines.alpha.message_event_composer import (
     MessageCompositionError,
     MessageEventComposer,
@@ -113,10 +116,12 @@ class FluidMessageGenerator(MessageEventComposer):
         logger: Logger,
         correlator: ContextualCorrelator,
         schematic_generator: SchematicGenerator[FluidMessageSchema],
+        hedging_policy: HedgingPolicy,
     ) -> None:
         self._logger = logger
         self._correlator = correlator
         self._schematic_generator = schematic_generator
+        self._hedger = Hedger(hedging_policy)
 
     async def shots(self) -> Sequence[FluidMessageGeneratorShot]:
         return await shot_collection.list()
@@ -147,6 +152,12 @@ class FluidMessageGenerator(MessageEventComposer):
                 )
                 return []
 
+            interaction_history = await fit_interaction_history(
+                interaction_history,
+                self._schematic_generator.tokenizer,
+                agent.max_history_tokens,
+            )
+
             prompt = self._format_prompt(
                 agent=agent,
                 context_variables=context_variables,
@@ -177,38 +188,45 @@ class FluidMessageGenerator(MessageEventComposer):
                 2: 0.5,
             }
 
-            last_generation_exception: Exception | None = None
-
-            self._logger.debug(f"[MessageEventComposer][Fluid][Prompt]\n{prompt}")
+            self._logger.debug(lambda: f"[MessageEventComposer][Fluid][Prompt]\n{prompt}")
 
-            for generation_attempt in range(3):
-                try:
-                    generation_info, response_message = await self._generate_response_message(
-                        prompt,
-                        temperature=generation_attempt_temperatures[generation_attempt],
-                        final_attempt=(generation_attempt + 1)
-                        == len(generation_attempt_temperatures),
-                    )
+            def log_failure(generation_attempt: int, exc: Exception) -> None:
+                self._logger.warning(
+                    f"[MessageEventComposer][Fluid] Generation attempt {generation_attempt} failed: {traceback.format_exception(exc)}"
+                )
 
-                    if response_message is not None:
-                        event = await event_emitter.emit_message_event(
-                            correlation_id=self._correlator.correlation_id,
-                            data=response_message,
+            try:
+                result = await self._hedger.run(
+                    self._schematic_generator.schema.__name__,
+                    [
+                        partial(
+                            self._generate_response_message,
+                            prompt,
+                            temperature=temperature,
+                            final_attempt=(generation_attempt + 1)
+                            == len(generation_attempt_temperatures),
                         )
+                        for generation_attempt, temperature in generation_attempt_temperatures.items()
+                    ],
+                    on_failure=log_failure,
+                )
+            except Exception as exc:
+                raise MessageCompositionError() from exc
 
-                        return [MessageEventComposition(generation_info, [event])]
-                    else:
-                        self._logger.debug(
-                            "[MessageEventComposer][Fluid] Skipping response; no response deemed necessary"
-                        )
-                        return [MessageEventComposition(generation_info, [])]
-                except Exception as exc:
-                    self._logger.warning(
-                        f"[MessageEventComposer][Fluid] Generation attempt {generation_attempt} failed: {traceback.format_exception(exc)}"
-                    )
-                    last_generation_exception = exc
+            generation_info, response_message = result.value
 
-            raise MessageCompositionError() from last_generation_exception
+            if response_message is not None:
+                event = await event_emitter.emit_message_event(
+                    correlation_id=self._correlator.correlation_id,
+                    data=response_message,
+                )
+
+                return [MessageEventComposition(generation_info, [event], result.hedge_won)]
+            else:
+                self._logger.debug(
+                    "[MessageEventComposer][Fluid] Skipping response; no response deemed necessary"
+                )
+                return [MessageEventComposition(generation_info, [], result.hedge_won)]
 
     def get_guideline_propositions_text(
         self,
@@ -260,6 +278,20 @@ Do not disregard a guideline because you believe its 'when' condition or rationa
 {json.dumps(shot.expected_result.model_dump(mode="json", exclude_unset=True), indent=2)}
 ```"""
 
+    def _format_shots(self, shots: Sequence[FluidMessageGeneratorShot]) -> str:
+        return """
+EXAMPLES
+-----------------
+""" + "\n".join(
+            f"""
+Example {i} - {shot.description}: ###
+{self._format_shot(shot)}
+###
+
+"""
+            for i, shot in enumerate(shots, start=1)
+        )
+
     def _format_prompt(
         self,
         agent: Agent,
@@ -275,7 +307,7 @@ Do not disregard a guideline because you believe its 'when' condition or rationa
     ) -> str:
         builder = PromptBuilder()
 
-        builder.add_section(
+        builder.add_static_section(
             """
 GENERAL INSTRUCTIONS
 -----------------
@@ -288,7 +320,7 @@ Later in this prompt, you'll be provided with behavioral guidelines and other co
         )
 
         builder.add_agent_identity(agent)
-        builder.add_section(
+        builder.add_static_section(
             """
 TASK DESCRIPTION:
 -----------------
@@ -307,7 +339,7 @@ Always abide by the following general principles (note these are not the "guidel
         if not interaction_history or all(
             [event.kind != "message" for event in interaction_history]
         ):
-            builder.add_section(
+            builder.add_static_section(
                 """
 The interaction with the customer has just began, and no messages were sent by either party.
 If told so by a guideline or some other contextual condition, send the first message. Otherwise, do not produce a reply.
@@ -326,13 +358,13 @@ Otherwise, follow the rest of this prompt to choose the content of your response
             )
 
         else:
-            builder.add_section("""
+            builder.add_static_section("""
 Since the interaction with the customer is already ongoing, always produce a reply to the customer's last message.
 The only exception where you may not produce a reply is if the customer explicitly asked you not to respond to their message.
 In all other cases, even if the customer is indicating that the conversation is over, you must produce a reply.
                 """)
 
-        builder.add_section(
+        builder.add_static_section(
             f"""
 REVISION MECHANISM
 -----------------
@@ -401,22 +433,16 @@ In cases of conflict, prioritize the business's values and ensure your decisions
 
 """  # noqa
         )
-        builder.add_section(
-            """
-EXAMPLES
------------------
-"""
-            + "\n".join(
-                f"""
-Example {i} - {shot.description}: ###
-{self._format_shot(shot)}
-###
-
-"""
-                for i, shot in enumerate(shots, start=1)
+        if (shots_key := shot_collection.cache_key(shots)) is not None:
+            builder.add_cached_section(
+                key=("FluidMessageGenerator.shots", shots_key),
+                render=lambda: self._format_shots(shots),
             )
-        )
-        builder.add_section(
+        else:
+            # The shots were not taken from the collection (e.g., by an overridden shots()),
+            # so there's nothing to key their rendering on
+            builder.add_static_section(self._format_shots(shots))
+        builder.add_static_section(
             """
 INTERACTION CONTEXT
 -----------------
@@ -580,7 +606,7 @@ Produce a valid JSON object in the following format: ###
         )
 
         self._logger.debug(
-            f"[MessageEventComposer][Fluid][Completion]\n{message_event_response.content.model_dump_json(indent=2)}"
+            lambda: f"[MessageEventComposer][Fluid][Completion]\n{message_event_response.content.model_dump_json(indent=2)}"
         )
 
         if not message_event_response.content.produced_reply:
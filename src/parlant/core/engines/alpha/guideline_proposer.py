@@ -26,6 +26,7 @@ from parlant.core.agents import Agent
 from parlant.core.context_variables import ContextVariable, ContextVariableValue
 from parlant.core.customers import Customer
 from parlant.core.nlp.generation import GenerationInfo, SchematicGenerator
+from parlant.core.engines.alpha.interaction_history import fit_interaction_history
 from parlant.core.engines.alpha.guideline_proposition import (
     GuidelineProposition,
     PreviouslyAppliedType,
@@ -116,6 +117,12 @@ class GuidelineProposer:
                 total_duration=0.0, batch_count=0, batch_generations=[], batches=[]
             )
 
+        interaction_history = await fit_interaction_history(
+            interaction_history,
+            self._schematic_generator.tokenizer,
+            agent.max_history_tokens,
+        )
+
         guidelines_dict = {g.id: g for i, g in enumerate(guidelines, start=1)}
         t_start = time.time()
         batches = self._create_guideline_batches(
@@ -124,7 +131,8 @@ class GuidelineProposer:
         )
 
         with self._logger.operation(
-            f"[GuidelineProposer] Evaluating {len(guidelines)} guidelines ({len(batches)} batches)"
+            "[GuidelineProposer] Evaluating guidelines",
+            {"guidelines": len(guidelines), "batches": len(batches)},
         ):
             batch_tasks = [
                 self._process_guideline_batch(
@@ -224,9 +232,10 @@ class GuidelineProposer:
         )
 
         with self._logger.operation(
-            f"[GuidelineProposer] Evaluating batch ({len(guidelines_dict)} guidelines)"
+            "[GuidelineProposer] Evaluating batch",
+            {"guidelines": len(guidelines_dict)},
         ):
-            self._logger.debug(f"[GuidelineProposer][Prompt]\n{prompt}")
+            self._logger.debug(lambda: f"[GuidelineProposer][Prompt]\n{prompt}")
 
             inference = await self._schematic_generator.generate(
                 prompt=prompt,
@@ -239,7 +248,7 @@ class GuidelineProposer:
             )
         else:
             self._logger.debug(
-                f"[GuidelineProposer][Completion]\n{inference.content.model_dump_json(indent=2)}"
+                lambda: f"[GuidelineProposer][Completion]\n{inference.content.model_dump_json(indent=2)}"
             )
 
         propositions = []
@@ -250,7 +259,7 @@ class GuidelineProposer:
                 or proposition.guideline_should_reapply
             ):
                 self._logger.debug(
-                    f"[GuidelineProposer][Completion][Activated]\n{proposition.model_dump_json(indent=2)}"
+                    lambda: f"[GuidelineProposer][Completion][Activated]\n{proposition.model_dump_json(indent=2)}"
                 )
 
                 propositions.append(
@@ -276,7 +285,7 @@ class GuidelineProposer:
                 )
             else:
                 self._logger.debug(
-                    f"[GuidelineProposer][Completion][Skipped]\n{proposition.model_dump_json(indent=2)}"
+                    lambda: f"[GuidelineProposer][Completion][Skipped]\n{proposition.model_dump_json(indent=2)}"
                 )
 
         return inference.info, propositions
@@ -328,6 +337,19 @@ class GuidelineProposer:
 
         return formatted_shot
 
+    def _format_shots(self, shots: Sequence[GuidelinePropositionShot]) -> str:
+        return """
+Examples of Condition Evaluations:
+-------------------
+""" + "".join(
+            f"""
+Example #{i}: ###
+{self._format_shot(shot)}
+###
+"""
+            for i, shot in enumerate(shots, start=1)
+        )
+
     def _format_prompt(
         self,
         agent: Agent,
@@ -367,7 +389,7 @@ class GuidelineProposer:
 
         builder = PromptBuilder()
 
-        builder.add_section(
+        builder.add_static_section(
             f"""
 GENERAL INSTRUCTIONS
 -----------------
@@ -421,20 +443,15 @@ In such cases, re-apply the guideline only if its condition becomes true again l
 
 """  # noqa
         )
-        builder.add_section(
-            """
-Examples of Condition Evaluations:
--------------------
-"""
-            + "".join(
-                f"""
-Example #{i}: ###
-{self._format_shot(shot)}
-###
-"""
-                for i, shot in enumerate(shots, start=1)
+        if (shots_key := shot_collection.cache_key(shots)) is not None:
+            builder.add_cached_section(
+                key=("GuidelineProposer.shots", shots_key),
+                render=lambda: self._format_shots(shots),
             )
-        )
+        else:
+            # The shots were not taken from the collection (e.g., by an overridden shots()),
+            # so there's nothing to key their rendering on
+            builder.add_static_section(self._format_shots(shots))
         builder.add_agent_identity(agent)
         builder.add_context_variables(context_variables)
         builder.add_glossary(terms)
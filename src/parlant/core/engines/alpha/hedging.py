@@ -0,0 +1,159 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import math
+import time
+from typing import Awaitable, Callable, Generic, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    latency_percentile: Optional[float] = None
+    """An attempt still running past this percentile of its schema's latencies
+    is hedged by starting the next attempt alongside it (default: never hedge)"""
+    max_extra_spend: float = 0.1
+    """Hedged attempts may add at most this fraction to the number of generations"""
+    min_samples: int = 20
+    window_size: int = 200
+    """How many of the most recent runs the latencies and the extra spend are measured over"""
+
+
+@dataclass(frozen=True)
+class HedgedResult(Generic[T]):
+    value: T
+    attempt: int
+    hedge_won: bool
+    """Whether the result came from an attempt started while an earlier one was still running"""
+
+
+class Hedger:
+    """Runs a sequence of fallback attempts, starting each one when the previous attempt
+    fails or, per the policy, when it takes unusually long, and returns the first result"""
+
+    def __init__(self, policy: HedgingPolicy) -> None:
+        self._policy = policy
+
+        self._latencies: dict[str, deque[float]] = {}
+        self._run_times: dict[str, deque[float]] = {}
+        self._hedge_times: dict[str, deque[float]] = {}
+
+    def _record_latency(self, key: str, latency: float) -> None:
+        self._latencies.setdefault(key, deque(maxlen=self._policy.window_size)).append(latency)
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        if self._policy.latency_percentile is None:
+            return None
+
+        latencies = sorted(self._latencies.get(key, ()))
+
+        if len(latencies) < self._policy.min_samples:
+            return None
+
+        index = math.ceil(self._policy.latency_percentile * len(latencies)) - 1
+        return latencies[max(0, min(index, len(latencies) - 1))]
+
+    def _record_run(self, key: str) -> None:
+        self._run_times.setdefault(key, deque(maxlen=self._policy.window_size)).append(
+            time.monotonic()
+        )
+
+    def _acquire_hedge(self, key: str) -> bool:
+        runs = self._run_times[key]
+        hedges = self._hedge_times.setdefault(key, deque())
+
+        # Only count hedges made since the oldest run still in the window,
+        # so a past burst of hedging doesn't hold back the budget for good
+        while hedges and hedges[0] < runs[0]:
+            hedges.popleft()
+
+        if len(hedges) + 1 > self._policy.max_extra_spend * len(runs):
+            return False
+
+        hedges.append(time.monotonic())
+        return True
+
+    async def run(
+        self,
+        key: str,
+        attempts: Sequence[Callable[[], Awaitable[T]]],
+        on_failure: Callable[[int, Exception], None],
+    ) -> HedgedResult[T]:
+        self._record_run(key)
+
+        running: dict[asyncio.Future[T], tuple[int, float, bool]] = {}
+        next_attempt = 0
+        last_exception: Optional[Exception] = None
+        may_hedge = True
+
+        def start(hedged: bool) -> None:
+            nonlocal next_attempt
+            task = asyncio.ensure_future(attempts[next_attempt]())
+            running[task] = (next_attempt, time.monotonic(), hedged)
+            next_attempt += 1
+
+        try:
+            while running or next_attempt < len(attempts):
+                if not running:
+                    start(hedged=False)
+
+                timeout: Optional[float] = None
+
+                if may_hedge and next_attempt < len(attempts):
+                    if (delay := self.hedge_delay(key)) is not None:
+                        last_started = max(started for _, started, _ in running.values())
+                        timeout = max(0.0, last_started + delay - time.monotonic())
+
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    if self._acquire_hedge(key):
+                        start(hedged=True)
+                    else:
+                        may_hedge = False
+                    continue
+
+                for task in sorted(done, key=lambda t: running[t][0]):
+                    attempt, started, hedged = running.pop(task)
+                    self._record_latency(key, time.monotonic() - started)
+
+                    if exception := task.exception():
+                        if not isinstance(exception, Exception):
+                            raise exception
+
+                        on_failure(attempt, exception)
+                        last_exception = exception
+                    else:
+                        return HedgedResult(task.result(), attempt, hedged)
+        finally:
+            for task, (_, started, _) in running.items():
+                task.cancel()
+
+                # A cancelled attempt ran for at least this long, and leaving it out
+                # would bias the latencies toward the attempts that happened to be fast
+                self._record_latency(key, time.monotonic() - started)
+
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        assert last_exception
+        raise last_exception
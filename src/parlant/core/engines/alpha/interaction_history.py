@@ -0,0 +1,246 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional, Sequence, cast
+
+from parlant.core.agents import Agent
+from parlant.core.background_tasks import BackgroundTaskService
+from parlant.core.common import DefaultBaseModel
+from parlant.core.contextual_correlator import ContextualCorrelator
+from parlant.core.engines.alpha.prompt_builder import PromptBuilder
+from parlant.core.logging import Logger
+from parlant.core.nlp.generation import SchematicGenerator
+from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.sessions import (
+    Event,
+    HistorySummaryEventData,
+    SessionId,
+    SessionStore,
+    is_history_summary,
+)
+
+
+class HistorySummarySchema(DefaultBaseModel):
+    summary: str
+
+
+def _verbatim_window_start(timeline: Sequence[Event], max_turns: int) -> Optional[int]:
+    """Returns the offset from which the last `max_turns` customer turns begin,
+    or None if the interaction doesn't have more turns than that"""
+    customer_messages = [e for e in timeline if e.kind == "message" and e.source == "customer"]
+
+    if len(customer_messages) <= max_turns:
+        return None
+
+    return customer_messages[-max_turns].offset if max_turns > 0 else timeline[-1].offset + 1
+
+
+def window_interaction_history(
+    events: Sequence[Event],
+    max_turns: Optional[int],
+) -> Sequence[Event]:
+    """Keeps the last `max_turns` turns verbatim, replacing older ones with the session's
+    latest history summary. Older events that weren't summarized yet are kept as they are."""
+    timeline = [e for e in events if not is_history_summary(e)]
+
+    if max_turns is None:
+        return timeline
+
+    window_start = _verbatim_window_start(timeline, max_turns)
+
+    if window_start is None:
+        return timeline
+
+    summaries = [e for e in events if is_history_summary(e)]
+    summary = summaries[-1] if summaries else None
+    summarized_until = (
+        cast(HistorySummaryEventData, summary.data)["summarized_until_offset"] if summary else -1
+    )
+
+    return [
+        *([summary] if summary else []),
+        *(e for e in timeline if summarized_until < e.offset),
+    ]
+
+
+async def fit_interaction_history(
+    events: Sequence[Event],
+    tokenizer: EstimatingTokenizer,
+    max_tokens: Optional[int],
+) -> Sequence[Event]:
+    """Drops the oldest events until the history fits within `max_tokens`.
+
+    The history summary (if any) and the most recent rendered event are always kept.
+    """
+    if max_tokens is None or not events:
+        return events
+
+    summary = events[0] if is_history_summary(events[0]) else None
+    timeline = events[1:] if summary else events
+
+    remaining_tokens = max_tokens
+
+    if summary:
+        remaining_tokens -= await tokenizer.estimate_token_count(PromptBuilder.adapt_event(summary))
+
+    kept: list[Event] = []
+    kept_rendered_event = False
+
+    for event in reversed(timeline):
+        # Status events aren't rendered into prompts, so they neither cost tokens
+        # nor count as the most recent event, which is kept regardless of its size
+        if event.kind != "status":
+            tokens = await tokenizer.estimate_token_count(PromptBuilder.adapt_event(event))
+
+            if kept_rendered_event and tokens > remaining_tokens:
+                break
+
+            remaining_tokens -= tokens
+            kept_rendered_event = True
+
+        kept.append(event)
+
+    return [*([summary] if summary else []), *reversed(kept)]
+
+
+class HistorySummarizer:
+    """Folds turns that fall out of an agent's verbatim history window
+    into an incrementally updated summary event, in the background"""
+
+    def __init__(
+        self,
+        logger: Logger,
+        correlator: ContextualCorrelator,
+        session_store: SessionStore,
+        background_task_service: BackgroundTaskService,
+        schematic_generator: SchematicGenerator[HistorySummarySchema],
+    ) -> None:
+        self._logger = logger
+        self._correlator = correlator
+        self._session_store = session_store
+        self._background_task_service = background_task_service
+        self._schematic_generator = schematic_generator
+
+        self._sessions_in_progress: set[SessionId] = set()
+
+    async def schedule(self, agent: Agent, session_id: SessionId) -> None:
+        if agent.max_history_turns is None or session_id in self._sessions_in_progress:
+            return
+
+        self._sessions_in_progress.add(session_id)
+
+        await self._background_task_service.start(
+            self._summarize(session_id, agent.max_history_turns),
+            tag=f"history-summary({session_id})",
+        )
+
+    async def _summarize(self, session_id: SessionId, max_turns: int) -> None:
+        try:
+            events = await self._session_store.list_events(session_id)
+
+            summaries = [e for e in events if is_history_summary(e)]
+            timeline = [e for e in events if not is_history_summary(e)]
+
+            window_start = _verbatim_window_start(timeline, max_turns)
+
+            if window_start is None:
+                return
+
+            previous_summary = (
+                cast(HistorySummaryEventData, summaries[-1].data) if summaries else None
+            )
+            summarized_until = (
+                previous_summary["summarized_until_offset"] if previous_summary else -1
+            )
+
+            events_to_fold = [
+                e
+                for e in timeline
+                if summarized_until < e.offset < window_start and e.kind in ("message", "tool")
+            ]
+
+            if not events_to_fold:
+                return
+
+            with self._logger.operation(
+                "[HistorySummarizer] Summarizing history",
+                {"session_id": session_id, "events": len(events_to_fold)},
+            ):
+                prompt = self._format_prompt(
+                    previous_summary["history_summary"] if previous_summary else None,
+                    events_to_fold,
+                )
+
+                inference = await self._schematic_generator.generate(
+                    prompt=prompt,
+                    hints={"temperature": 0.1},
+                )
+
+            await self._session_store.create_event(
+                session_id=session_id,
+                source="system",
+                kind="custom",
+                correlation_id=self._correlator.correlation_id,
+                data={
+                    "history_summary": inference.content.summary,
+                    "summarized_until_offset": window_start - 1,
+                },
+            )
+
+            for summary in summaries:
+                await self._session_store.delete_event(summary.id)
+        except Exception as exc:
+            self._logger.error(f"Failed to summarize history of session {session_id}: {exc}")
+        finally:
+            self._sessions_in_progress.discard(session_id)
+
+    def _format_prompt(
+        self,
+        previous_summary: Optional[str],
+        events: Sequence[Event],
+    ) -> str:
+        builder = PromptBuilder()
+
+        builder.add_static_section("""
+You are part of a system of AI agents which interact with a customer on the behalf of a business.
+Long interactions are shortened by replacing their earlier parts with a summary.
+Your task is to produce an updated summary of the earlier part of the interaction,
+which folds the events provided below into the existing summary (if any).
+
+The summary must preserve every detail that may be needed to continue the interaction correctly:
+customer requests and preferences, facts, identifiers and numbers that were provided,
+results of tool calls, commitments made by the agent, and open issues.
+Write it as concise, factual prose, in the third person.
+""")
+
+        if previous_summary:
+            builder.add_section(f"""
+The following is the existing summary of the interaction: ###
+{previous_summary}
+###
+""")
+
+        builder.add_section(f"""
+The following are the events to fold into the summary: ###
+{[PromptBuilder.adapt_event(e) for e in events]}
+###
+
+Produce a valid JSON object in the following format: ###
+{{
+    "summary": "<THE UPDATED SUMMARY>"
+}}
+###
+""")
+
+        return builder.build()
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from functools import partial
 from itertools import chain
 import json
 import traceback
@@ -22,6 +23,8 @@ from parlant.core.contextual_correlator import ContextualCorrelator
 from parlant.core.agents import Agent, CompositionMode
 from parlant.core.context_variables import ContextVariable, ContextVariableValue
 from parlant.core.customers import Customer
+from parlant.core.engines.alpha.hedging import Hedger, HedgingPolicy
+from parlant.core.engines.alpha.interaction_history import fit_interaction_history
 from parlant.core.engines.alpha.message_event_composer import (
     MessageCompositionError,
     MessageEventComposer,
@@ -124,11 +127,13 @@ class MessageAssembler(MessageEventComposer):
         correlator: ContextualCorrelator,
         schematic_generator: SchematicGenerator[AssembledMessageSchema],
         fragment_store: FragmentStore,
+        hedging_policy: HedgingPolicy,
     ) -> None:
         self._logger = logger
         self._correlator = correlator
         self._schematic_generator = schematic_generator
         self._fragment_store = fragment_store
+        self._hedger = Hedger(hedging_policy)
 
     async def shots(self, composition_mode: CompositionMode) -> Sequence[MessageAssemblerShot]:
         shots = await shot_collection.list()
@@ -161,6 +166,12 @@ class MessageAssembler(MessageEventComposer):
                 )
                 return []
 
+            interaction_history = await fit_interaction_history(
+                interaction_history,
+                self._schematic_generator.tokenizer,
+                agent.max_history_tokens,
+            )
+
             fragments = await self._fragment_store.list_fragments()
 
             prompt = self._format_prompt(
@@ -194,46 +205,51 @@ class MessageAssembler(MessageEventComposer):
                 2: 0.2,
             }
 
-            last_generation_exception: Exception | None = None
-
-            self._logger.debug(f"[MessageEventComposer][Assembly][Prompt]\n{prompt}")
+            self._logger.debug(lambda: f"[MessageEventComposer][Assembly][Prompt]\n{prompt}")
 
-            for generation_attempt in range(3):
-                try:
-                    generation_info, assembly_result = await self._generate_response_message(
-                        prompt,
-                        fragments,
-                        agent.composition_mode,
-                        temperature=generation_attempt_temperatures[generation_attempt],
-                        final_attempt=(generation_attempt + 1)
-                        == len(generation_attempt_temperatures),
-                    )
-
-                    if assembly_result is not None:
-                        event = await event_emitter.emit_message_event(
-                            correlation_id=self._correlator.correlation_id,
-                            data=MessageEventData(
-                                message=assembly_result.message,
-                                participant=Participant(id=agent.id, display_name=agent.name),
-                                fragments={
-                                    id: value for id, value in assembly_result.fragments.items()
-                                },
-                            ),
-                        )
+            def log_failure(generation_attempt: int, exc: Exception) -> None:
+                self._logger.warning(
+                    f"[MessageEventComposer][Assembly] Generation attempt {generation_attempt} failed: {traceback.format_exception(exc)}"
+                )
 
-                        return [MessageEventComposition(generation_info, [event])]
-                    else:
-                        self._logger.debug(
-                            "[MessageEventComposer][Assembly] Skipping response; no response deemed necessary"
+            try:
+                result = await self._hedger.run(
+                    self._schematic_generator.schema.__name__,
+                    [
+                        partial(
+                            self._generate_response_message,
+                            prompt,
+                            fragments,
+                            agent.composition_mode,
+                            temperature=temperature,
+                            final_attempt=(generation_attempt + 1)
+                            == len(generation_attempt_temperatures),
                         )
-                        return [MessageEventComposition(generation_info, [])]
-                except Exception as exc:
-                    self._logger.warning(
-                        f"[MessageEventComposer][Assembly] Generation attempt {generation_attempt} failed: {traceback.format_exception(exc)}"
-                    )
-                    last_generation_exception = exc
+                        for generation_attempt, temperature in generation_attempt_temperatures.items()
+                    ],
+                    on_failure=log_failure,
+                )
+            except Exception as exc:
+                raise MessageCompositionError() from exc
+
+            generation_info, assembly_result = result.value
+
+            if assembly_result is not None:
+                event = await event_emitter.emit_message_event(
+                    correlation_id=self._correlator.correlation_id,
+                    data=MessageEventData(
+                        message=assembly_result.message,
+                        participant=Participant(id=agent.id, display_name=agent.name),
+                        fragments={id: value for id, value in assembly_result.fragments.items()},
+                    ),
+                )
 
-            raise MessageCompositionError() from last_generation_exception
+                return [MessageEventComposition(generation_info, [event], result.hedge_won)]
+            else:
+                self._logger.debug(
+                    "[MessageEventComposer][Assembly] Skipping response; no response deemed necessary"
+                )
+                return [MessageEventComposition(generation_info, [], result.hedge_won)]
 
     def _get_fragment_bank_text(self, fragments: Sequence[Fragment]) -> str:
         content = """
@@ -327,6 +343,20 @@ Do not disregard a guideline because you believe its 'when' condition or rationa
 {json.dumps(shot.expected_result.model_dump(mode="json", exclude_unset=True), indent=2)}
 ```"""
 
+    def _format_shots(self, shots: Sequence[MessageAssemblerShot]) -> str:
+        return """
+EXAMPLES
+-----------------
+""" + "\n".join(
+            f"""
+Example {i} - {shot.description}: ###
+{self._format_shot(shot)}
+###
+
+"""
+            for i, shot in enumerate(shots, start=1)
+        )
+
     def _format_prompt(
         self,
         agent: Agent,
@@ -345,7 +375,7 @@ Do not disregard a guideline because you believe its 'when' condition or rationa
 
         builder = PromptBuilder()
 
-        builder.add_section(
+        builder.add_static_section(
             """
 GENERAL INSTRUCTIONS
 -----------------
@@ -358,7 +388,7 @@ Later in this prompt, you'll be provided with behavioral guidelines and other co
         )
 
         builder.add_agent_identity(agent)
-        builder.add_section(
+        builder.add_static_section(
             """
 TASK DESCRIPTION:
 -----------------
@@ -377,7 +407,7 @@ Always abide by the following general principles (note these are not the "guidel
         if not interaction_history or all(
             [event.kind != "message" for event in interaction_history]
         ):
-            builder.add_section(
+            builder.add_static_section(
                 """
 The interaction with the customer has just began, and no messages were sent by either party.
 If told so by a guideline or some other contextual condition, send the first message. Otherwise, do not produce a reply.
@@ -396,7 +426,7 @@ Otherwise, follow the rest of this prompt to choose the content of your response
             )
 
         else:
-            builder.add_section("""
+            builder.add_static_section("""
 Since the interaction with the customer is already ongoing, always produce a reply to the customer's last message.
 The only exception where you may not produce a reply is if the customer explicitly asked you not to respond to their message.
 In all other cases, even if the customer is indicating that the conversation is over, you must produce a reply.
@@ -411,8 +441,9 @@ For suggested fragments, use the special ID "<auto>". \
         else:
             fragment_instruction = "You can ONLY USE FRAGMENTS FROM THE FRAGMENT BANK in generating the revision's content."
 
-        builder.add_section(
-            f"""
+        builder.add_cached_section(
+            key=("MessageAssembler.revision_mechanism", can_suggest_fragments),
+            render=lambda: f"""
 REVISION MECHANISM
 -----------------
 To craft an optimal response, you must produce incremental revisions of your reply, ensuring alignment with all provided guidelines based on the latest interaction state.
@@ -465,23 +496,17 @@ For instance, if a guideline explicitly prohibits a specific action (e.g., "neve
 
 In cases of conflict, prioritize the business's values and ensure your decisions align with their overarching goals.
 
-"""  # noqa
+""",  # noqa
         )
-        builder.add_section(
-            """
-EXAMPLES
------------------
-"""
-            + "\n".join(
-                f"""
-Example {i} - {shot.description}: ###
-{self._format_shot(shot)}
-###
-
-"""
-                for i, shot in enumerate(shots, start=1)
+        if (shots_key := shot_collection.cache_key(shots)) is not None:
+            builder.add_cached_section(
+                key=("MessageAssembler.shots", shots_key),
+                render=lambda: self._format_shots(shots),
             )
-        )
+        else:
+            # The shots were not taken from the collection (e.g., by an overridden shots()),
+            # so there's nothing to key their rendering on
+            builder.add_static_section(self._format_shots(shots))
         builder.add_context_variables(context_variables)
         builder.add_glossary(terms)
         builder.add_section(self._get_fragment_bank_text(fragments))
@@ -642,7 +667,7 @@ Produce a valid JSON object in the following format: ###
         )
 
         self._logger.debug(
-            f"[MessageEventComposer][Assembly][Completion]\n{message_event_response.content.model_dump_json(indent=2)}"
+            lambda: f"[MessageEventComposer][Assembly][Completion]\n{message_event_response.content.model_dump_json(indent=2)}"
         )
 
         if not message_event_response.content.produced_reply:
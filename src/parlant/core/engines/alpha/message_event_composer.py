@@ -32,6 +32,7 @@ from parlant.core.tools import ToolId
 class MessageEventComposition:
     generation_info: GenerationInfo
     events: Sequence[Optional[EmittedEvent]]
+    hedge_won: bool = False
 
 
 class MessageCompositionError(Exception):
@@ -13,19 +13,27 @@
 # limitations under the License.
 
 from __future__ import annotations
+from collections import OrderedDict
 from enum import Enum, auto
+from functools import lru_cache
 import json
-from typing import Any, Optional, Sequence, cast
+from typing import Any, Callable, Hashable, Optional, Sequence, cast
 
 from parlant.core.agents import Agent
-from parlant.core.common import generate_id
 from parlant.core.context_variables import ContextVariable, ContextVariableValue
-from parlant.core.sessions import Event, EventSource, MessageEventData, ToolEventData
+from parlant.core.sessions import (
+    Event,
+    EventSource,
+    HistorySummaryEventData,
+    MessageEventData,
+    ToolEventData,
+)
 from parlant.core.glossary import Term
 from parlant.core.engines.alpha.utils import (
     context_variables_to_json,
 )
 from parlant.core.emissions import EmittedEvent
+from parlant.core.nlp.generation import Prompt
 
 
 class BuiltInSection(Enum):
@@ -49,14 +57,49 @@ class SectionStatus(Enum):
     """The section is not included in the prompt in any fashion"""
 
 
+_MAX_CACHED_SECTIONS = 512
+
+_cached_sections: OrderedDict[Hashable, str] = OrderedDict()
+
+
+@lru_cache(maxsize=_MAX_CACHED_SECTIONS)
+def _normalize_static_content(content: str) -> str:
+    return content.strip()
+
+
+def _get_cached_section(key: Hashable, render: Callable[[], str]) -> str:
+    if (content := _cached_sections.get(key)) is not None:
+        _cached_sections.move_to_end(key)
+        return content
+
+    content = render().strip()
+    _cached_sections[key] = content
+
+    if len(_cached_sections) > _MAX_CACHED_SECTIONS:
+        _cached_sections.popitem(last=False)
+
+    return content
+
+
 class PromptBuilder:
     def __init__(self) -> None:
         self._sections: dict[str | BuiltInSection, dict[str, Any]] = {}
 
-    def build(self) -> str:
-        section_contents = [s["content"] for s in self._sections.values()]
-        prompt = "\n\n".join(section_contents)
-        return prompt
+    def build(self) -> Prompt:
+        """Joins the sections into a prompt, placing static sections first (in the order they
+        were added) so that the prompt begins with a prefix that providers can cache"""
+        static_contents = [s["content"] for s in self._sections.values() if s["static"]]
+        dynamic_contents = [s["content"] for s in self._sections.values() if not s["static"]]
+
+        if not static_contents or not dynamic_contents:
+            return Prompt("\n\n".join(static_contents + dynamic_contents))
+
+        static_prefix = "\n\n".join(static_contents) + "\n\n"
+
+        return Prompt(
+            static_prefix + "\n\n".join(dynamic_contents),
+            static_prefix_length=len(static_prefix),
+        )
 
     def add_section(
         self,
@@ -65,19 +108,59 @@ class PromptBuilder:
         title: Optional[str] = None,
         status: Optional[SectionStatus] = None,
     ) -> PromptBuilder:
+        return self._add_normalized_section(content.strip(), name, title, status, static=False)
+
+    def add_static_section(
+        self,
+        content: str,
+        name: str | BuiltInSection | None = None,
+        title: Optional[str] = None,
+        status: Optional[SectionStatus] = None,
+    ) -> PromptBuilder:
+        """Adds a section whose content is a constant, normalizing it only once per process"""
+        return self._add_normalized_section(
+            _normalize_static_content(content), name, title, status, static=True
+        )
+
+    def add_cached_section(
+        self,
+        key: Hashable,
+        render: Callable[[], str],
+        name: str | BuiltInSection | None = None,
+        title: Optional[str] = None,
+        status: Optional[SectionStatus] = None,
+    ) -> PromptBuilder:
+        """Adds a section whose content depends only on the key, rendering it only on a cache miss"""
+        return self._add_normalized_section(
+            _get_cached_section(key, render), name, title, status, static=True
+        )
+
+    def _add_normalized_section(
+        self,
+        content: str,
+        name: str | BuiltInSection | None,
+        title: Optional[str],
+        status: Optional[SectionStatus],
+        static: bool,
+    ) -> PromptBuilder:
+        index = len(self._sections)
+
         while not name:
-            candidate = generate_id()
+            candidate = f"<section-{index}>"
 
             if candidate not in self._sections:
                 name = candidate
 
+            index += 1
+
         if name in self._sections:
             raise ValueError(f"Section '{name}' was already added")
 
         self._sections[name] = {
-            "content": content.strip(),
+            "content": content,
             "title": title,
             "status": status,
+            "static": static,
         }
 
         return self
@@ -122,6 +205,14 @@ class PromptBuilder:
                 ]
             }
 
+        event_kind: str = e.kind
+
+        if e.kind == "custom" and isinstance(e.data, dict) and "history_summary" in e.data:
+            summary_data = cast(HistorySummaryEventData, e.data)
+
+            event_kind = "summary"
+            data = {"summary_of_earlier_interaction": summary_data["history_summary"]}
+
         source_map: dict[EventSource, str] = {
             "customer": "user",
             "customer_ui": "frontend_application",
@@ -133,7 +224,7 @@ class PromptBuilder:
 
         return json.dumps(
             {
-                "event_kind": e.kind,
+                "event_kind": event_kind,
                 "event_source": source_map[e.source],
                 "data": data,
             }
@@ -144,9 +235,10 @@ class PromptBuilder:
         agent: Agent,
     ) -> PromptBuilder:
         if agent.description:
-            self.add_section(
+            self.add_cached_section(
+                key=("agent_identity", agent.name, agent.description),
                 name=BuiltInSection.AGENT_IDENTITY,
-                content=f"""
+                render=lambda: f"""
 You are an AI agent named {agent.name}.
 
 The following is a description of your background and personality: ###
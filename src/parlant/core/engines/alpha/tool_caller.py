@@ -30,6 +30,7 @@ from parlant.core.nlp.generation import GenerationInfo, SchematicGenerator
 from parlant.core.services.tools.service_registry import ServiceRegistry
 from parlant.core.sessions import Event, ToolResult
 from parlant.core.glossary import Term
+from parlant.core.engines.alpha.interaction_history import fit_interaction_history
 from parlant.core.engines.alpha.guideline_proposition import GuidelineProposition
 from parlant.core.engines.alpha.prompt_builder import PromptBuilder, BuiltInSection, SectionStatus
 from parlant.core.emissions import EmittedEvent
@@ -150,6 +151,12 @@ class ToolCaller:
                 insights=ToolInsights(),
             )
 
+        interaction_history = await fit_interaction_history(
+            interaction_history,
+            self._schematic_generator.tokenizer,
+            agent.max_history_tokens,
+        )
+
         batches: dict[tuple[ToolId, Tool], list[GuidelineProposition]] = defaultdict(list)
         services: dict[str, ToolService] = {}
 
@@ -166,7 +173,7 @@ class ToolCaller:
 
         t_start = time.time()
 
-        with self._logger.operation(f"[ToolCaller] Tool evaluation ({len(batches)} batches)"):
+        with self._logger.operation("[ToolCaller] Tool evaluation", {"batches": len(batches)}):
             batch_tasks = [
                 self._infer_calls_for_single_tool(
                     agent=agent,
@@ -230,7 +237,9 @@ class ToolCaller:
 
         tool_id, tool, _ = candidate_descriptor
 
-        with self._logger.operation(f"[ToolCaller] Evaluating '{tool_id}'"):
+        with self._logger.operation(
+            "[ToolCaller] Evaluating tool", {"tool_id": tool_id.to_string()}
+        ):
             generation_info, inference_output = await self._run_inference(inference_prompt)
 
         tool_calls = []
@@ -247,7 +256,7 @@ class ToolCaller:
                     if argument in candidate_descriptor[1].required
                 ):
                     self._logger.debug(
-                        f"[ToolCaller][Completion][Activated]\n{tc.model_dump_json(indent=2)}"
+                        lambda: f"[ToolCaller][Completion][Activated]\n{tc.model_dump_json(indent=2)}"
                     )
 
                     tool_calls.append(
@@ -286,7 +295,7 @@ class ToolCaller:
 
             else:
                 self._logger.debug(
-                    f"[ToolCaller][Completion][Skipped]\n{tc.model_dump_json(indent=2)}"
+                    lambda: f"[ToolCaller][Completion][Skipped]\n{tc.model_dump_json(indent=2)}"
                 )
 
         return generation_info, tool_calls, missing_data
@@ -341,6 +350,19 @@ Please be tolerant of possible typos by the user with regards to these terms,and
 {json.dumps(shot.expected_result.model_dump(mode="json", exclude_unset=True), indent=2)}
 ```"""
 
+    def _format_shots(self, shots: Sequence[ToolCallerInferenceShot]) -> str:
+        return """
+EXAMPLES
+-----------------
+""" + "\n".join(
+            f"""
+Example #{i}: ###
+{self._format_shot(shot)}
+###
+"""
+            for i, shot in enumerate(shots, start=1)
+        )
+
     def _format_tool_call_inference_prompt(
         self,
         agent: Agent,
@@ -357,7 +379,7 @@ Please be tolerant of possible typos by the user with regards to these terms,and
 
         builder = PromptBuilder()
 
-        builder.add_section(
+        builder.add_static_section(
             """
 
 GENERAL INSTRUCTIONS
@@ -376,7 +398,7 @@ These calls do not require to be re-run at this time, unless you identify a vali
 """
         )
         builder.add_agent_identity(agent)
-        builder.add_section(
+        builder.add_static_section(
             f"""
 -----------------
 TASK DESCRIPTION
@@ -429,20 +451,15 @@ Only the responses are provided, without the interaction history or tool descrip
 
 """  # noqa
         )
-        builder.add_section(
-            """
-EXAMPLES
------------------
-"""
-            + "\n".join(
-                f"""
-Example #{i}: ###
-{self._format_shot(shot)}
-###
-"""
-                for i, shot in enumerate(shots, start=1)
+        if (shots_key := shot_collection.cache_key(shots)) is not None:
+            builder.add_cached_section(
+                key=("ToolCaller.shots", shots_key),
+                render=lambda: self._format_shots(shots),
             )
-        )
+        else:
+            # The shots were not taken from the collection (e.g., by an overridden shots()),
+            # so there's nothing to key their rendering on
+            builder.add_static_section(self._format_shots(shots))
         builder.add_context_variables(context_variables)
         if terms:
             builder.add_section(
@@ -659,7 +676,7 @@ Guidelines:
         self,
         prompt: str,
     ) -> tuple[GenerationInfo, Sequence[ToolCallEvaluation]]:
-        self._logger.debug(f"[ToolCaller][Inference][Prompt]\n{prompt}")
+        self._logger.debug(lambda: f"[ToolCaller][Inference][Prompt]\n{prompt}")
 
         inference = await self._schematic_generator.generate(
             prompt=prompt,
@@ -667,7 +684,7 @@ Guidelines:
         )
 
         self._logger.debug(
-            f"[ToolCaller][Inference][Completion]\n{inference.content.model_dump_json(indent=2)}"
+            lambda: f"[ToolCaller][Inference][Completion]\n{inference.content.model_dump_json(indent=2)}"
         )
 
         return inference.info, inference.content.tool_calls_for_candidate_tool
@@ -680,7 +697,7 @@ Guidelines:
     ) -> ToolCallResult:
         try:
             self._logger.debug(
-                f"[ToolCaller][Execution][Invocation] ({tool_call.tool_id.to_string()}/{tool_call.id})"
+                lambda: f"[ToolCaller][Execution][Invocation] ({tool_call.tool_id.to_string()}/{tool_call.id})"
                 + (f"\n{json.dumps(tool_call.arguments, indent=2)}" if tool_call.arguments else "")
             )
 
@@ -694,7 +711,7 @@ Guidelines:
                 )
 
                 self._logger.debug(
-                    f"[ToolCaller][Execution][Result] Tool call succeeded ({tool_call.tool_id.to_string()}/{tool_call.id})\n{json.dumps(asdict(result), indent=2)}"
+                    lambda: f"[ToolCaller][Execution][Result] Tool call succeeded ({tool_call.tool_id.to_string()}/{tool_call.id})\n{json.dumps(asdict(result), indent=2)}"
                 )
             except Exception as exc:
                 self._logger.error(
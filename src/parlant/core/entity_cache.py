@@ -0,0 +1,116 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from collections import OrderedDict
+import time
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+from parlant.core.metrics import MetricsRegistry
+from parlant.core.resource_versions import Resource, ResourceVersionStore
+
+TKey = TypeVar("TKey", bound=Hashable)
+TEntity = TypeVar("TEntity")
+
+
+class EntityCache(Generic[TKey, TEntity]):
+    """An in-process LRU cache of entities read from a store.
+
+    The owning store invalidates it on every write it makes. When a version store
+    is given, writes made by other processes are noticed by checking the resource's
+    version at most once every `version_check_interval` seconds."""
+
+    DEFAULT_MAX_SIZE = 1024
+    DEFAULT_VERSION_CHECK_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        resource: Resource,
+        metrics: MetricsRegistry,
+        versions: Optional[ResourceVersionStore] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        version_check_interval: float = DEFAULT_VERSION_CHECK_INTERVAL,
+    ) -> None:
+        self._resource = resource
+        self._versions = versions
+        self._max_size = max_size
+        self._version_check_interval = version_check_interval
+
+        self._entries: OrderedDict[TKey, TEntity] = OrderedDict()
+        self._generation = 0
+        self._remote_version: Optional[str] = None
+        self._remote_version_checked_at = -float("inf")
+
+        self._hits = metrics.counter(
+            "entity_cache_hits",
+            "Entity reads served from the in-process cache",
+            labels=["resource"],
+        )
+        self._misses = metrics.counter(
+            "entity_cache_misses",
+            "Entity reads which had to go to the underlying store",
+            labels=["resource"],
+        )
+
+    def invalidate(self) -> None:
+        # Bumping the generation also keeps reads which were in flight
+        # during the invalidation from repopulating the cache with stale entities
+        self._generation += 1
+        self._entries.clear()
+
+    def discard(self, key: TKey) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    async def _sync_with_remote_version(self) -> None:
+        if not self._versions:
+            return
+
+        now = time.monotonic()
+
+        if now - self._remote_version_checked_at < self._version_check_interval:
+            return
+
+        self._remote_version_checked_at = now
+
+        version = (await self._versions.read_versions([self._resource]))[self._resource]
+
+        if version != self._remote_version:
+            self._remote_version = version
+            self.invalidate()
+
+    async def get_or_read(
+        self,
+        key: TKey,
+        read: Callable[[], Awaitable[TEntity]],
+    ) -> TEntity:
+        await self._sync_with_remote_version()
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._hits.inc(resource=self._resource)
+            return self._entries[key]
+
+        self._misses.inc(resource=self._resource)
+
+        generation = self._generation
+        entity = await read()
+
+        if generation == self._generation:
+            self._entries[key] = entity
+
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+        return entity
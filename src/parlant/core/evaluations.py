@@ -38,6 +38,7 @@ from parlant.core.common import (
     generate_id,
 )
 from parlant.core.guidelines import GuidelineContent, GuidelineId
+from parlant.core.metrics import MetricsRegistry
 from parlant.core.persistence.common import ObjectId
 from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
 
@@ -118,6 +119,9 @@ class Invoice:
     approved: bool
     data: Optional[InvoiceData]
     error: Optional[str]
+    # The findings of this payload's own checks, kept while the evaluation is still running
+    # so that an interrupted evaluation only needs to redo the payloads that didn't finish
+    checkpoint: Optional[InvoiceData] = None
 
 
 @dataclass(frozen=True)
@@ -129,6 +133,8 @@ class Evaluation:
     error: Optional[str]
     invoices: Sequence[Invoice]
     progress: float
+    exhaustive: bool = False
+    pruned_pairs: int = 0
 
 
 class EvaluationUpdateParams(TypedDict, total=False):
@@ -136,6 +142,7 @@ class EvaluationUpdateParams(TypedDict, total=False):
     error: Optional[str]
     invoices: Sequence[Invoice]
     progress: float
+    pruned_pairs: int
 
 
 class EvaluationStore(ABC):
@@ -146,6 +153,7 @@ class EvaluationStore(ABC):
         payload_descriptors: Sequence[PayloadDescriptor],
         creation_utc: Optional[datetime] = None,
         extra: Optional[Mapping[str, JSONSerializable]] = None,
+        exhaustive: bool = False,
     ) -> Evaluation: ...
 
     @abstractmethod
@@ -155,6 +163,14 @@ class EvaluationStore(ABC):
         params: EvaluationUpdateParams,
     ) -> Evaluation: ...
 
+    @abstractmethod
+    async def update_invoice(
+        self,
+        evaluation_id: EvaluationId,
+        invoice_index: int,
+        invoice: Invoice,
+    ) -> Evaluation: ...
+
     @abstractmethod
     async def read_evaluation(
         self,
@@ -213,6 +229,7 @@ class _InvoiceDocument(TypedDict, total=False):
     approved: bool
     data: Optional[_InvoiceDataDocument]
     error: Optional[str]
+    checkpoint: Optional[_InvoiceDataDocument]
 
 
 class _EvaluationDocument(TypedDict, total=False):
@@ -224,6 +241,8 @@ class _EvaluationDocument(TypedDict, total=False):
     error: Optional[str]
     invoices: Sequence[_InvoiceDocument]
     progress: float
+    exhaustive: bool
+    pruned_pairs: int
 
 
 class EvaluationDocumentStore(EvaluationStore):
@@ -318,6 +337,11 @@ class EvaluationDocumentStore(EvaluationStore):
                 approved=invoice.approved,
                 data=serialize_invoice_guideline_data(invoice.data) if invoice.data else None,
                 error=invoice.error,
+                checkpoint=(
+                    serialize_invoice_guideline_data(invoice.checkpoint)
+                    if invoice.checkpoint
+                    else None
+                ),
             )
         else:
             raise ValueError(f"Unsupported invoice kind: {kind}")
@@ -332,6 +356,8 @@ class EvaluationDocumentStore(EvaluationStore):
             error=evaluation.error,
             invoices=[self._serialize_invoice(inv) for inv in evaluation.invoices],
             progress=evaluation.progress,
+            exhaustive=evaluation.exhaustive,
+            pruned_pairs=evaluation.pruned_pairs,
         )
 
     def _deserialize_evaluation(self, evaluation_document: _EvaluationDocument) -> Evaluation:
@@ -407,6 +433,12 @@ class EvaluationDocumentStore(EvaluationStore):
             else:
                 data = None
 
+            checkpoint_doc = invoice_doc.get("checkpoint")
+            if checkpoint_doc is not None:
+                checkpoint = deserialize_invoice_guideline_data(checkpoint_doc)
+            else:
+                checkpoint = None
+
             return Invoice(
                 kind=kind,
                 payload=payload,
@@ -415,6 +447,7 @@ class EvaluationDocumentStore(EvaluationStore):
                 approved=invoice_doc["approved"],
                 data=data,
                 error=invoice_doc.get("error"),
+                checkpoint=checkpoint,
             )
 
         evaluation_id = EvaluationId(evaluation_document["id"])
@@ -434,6 +467,8 @@ class EvaluationDocumentStore(EvaluationStore):
             error=evaluation_document.get("error"),
             invoices=invoices,
             progress=evaluation_document["progress"],
+            exhaustive=evaluation_document.get("exhaustive", False),
+            pruned_pairs=evaluation_document.get("pruned_pairs", 0),
         )
 
     @override
@@ -443,6 +478,7 @@ class EvaluationDocumentStore(EvaluationStore):
         payload_descriptors: Sequence[PayloadDescriptor],
         creation_utc: Optional[datetime] = None,
         extra: Optional[Mapping[str, JSONSerializable]] = None,
+        exhaustive: bool = False,
     ) -> Evaluation:
         async with self._lock.writer_lock:
             creation_utc = creation_utc or datetime.now(timezone.utc)
@@ -470,6 +506,7 @@ class EvaluationDocumentStore(EvaluationStore):
                 error=None,
                 invoices=invoices,
                 progress=0.0,
+                exhaustive=exhaustive,
             )
 
             await self._collection.insert_one(self._serialize_evaluation(evaluation=evaluation))
@@ -496,6 +533,9 @@ class EvaluationDocumentStore(EvaluationStore):
             if "progress" in params:
                 update_params["progress"] = params["progress"]
 
+            if "pruned_pairs" in params:
+                update_params["pruned_pairs"] = params["pruned_pairs"]
+
             result = await self._collection.update_one(
                 filters={"id": {"$eq": evaluation.id}},
                 params=update_params,
@@ -505,6 +545,28 @@ class EvaluationDocumentStore(EvaluationStore):
 
         return self._deserialize_evaluation(result.updated_document)
 
+    @override
+    async def update_invoice(
+        self,
+        evaluation_id: EvaluationId,
+        invoice_index: int,
+        invoice: Invoice,
+    ) -> Evaluation:
+        async with self._lock.writer_lock:
+            evaluation = await self.read_evaluation(evaluation_id)
+
+            invoices = list(evaluation.invoices)
+            invoices[invoice_index] = invoice
+
+            result = await self._collection.update_one(
+                filters={"id": {"$eq": evaluation.id}},
+                params={"invoices": [self._serialize_invoice(i) for i in invoices]},
+            )
+
+        assert result.updated_document
+
+        return self._deserialize_evaluation(result.updated_document)
+
     @override
     async def read_evaluation(
         self,
@@ -541,23 +603,29 @@ class EvaluationListener(ABC):
 
 
 class PollingEvaluationListener(EvaluationListener):
-    def __init__(self, evaluation_store: EvaluationStore) -> None:
+    def __init__(self, evaluation_store: EvaluationStore, metrics: MetricsRegistry) -> None:
         self._evaluation_store = evaluation_store
 
+        self._waiters = metrics.gauge(
+            "evaluation_listener_waiters",
+            "Number of requests currently waiting for evaluations to complete",
+        )
+
     @override
     async def wait_for_completion(
         self,
         evaluation_id: EvaluationId,
         timeout: Timeout = Timeout.infinite(),
     ) -> bool:
-        while True:
-            evaluation = await self._evaluation_store.read_evaluation(
-                evaluation_id,
-            )
+        with self._waiters.track_in_progress():
+            while True:
+                evaluation = await self._evaluation_store.read_evaluation(
+                    evaluation_id,
+                )
 
-            if evaluation.status in [EvaluationStatus.COMPLETED, EvaluationStatus.FAILED]:
-                return True
-            elif timeout.expired():
-                return False
-            else:
-                await timeout.wait_up_to(1)
+                if evaluation.status in [EvaluationStatus.COMPLETED, EvaluationStatus.FAILED]:
+                    return True
+                elif timeout.expired():
+                    return False
+                else:
+                    await timeout.wait_up_to(1)
@@ -22,8 +22,9 @@ from typing_extensions import override, TypedDict, Self
 from parlant.core.async_utils import ReaderWriterLock
 from parlant.core.tags import TagId
 from parlant.core.common import ItemNotFoundError, UniqueId, Version, generate_id
-from parlant.core.persistence.common import ObjectId
+from parlant.core.persistence.common import ObjectId, Where, keyset_filters
 from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
+from parlant.core.resource_versions import ResourceVersionStore
 
 FragmentId = NewType("FragmentId", str)
 
@@ -83,7 +84,11 @@ class FragmentStore(ABC):
     @abstractmethod
     async def list_fragments(
         self,
-    ) -> Sequence[Fragment]: ...
+        limit: Optional[int] = None,
+        after: Optional[FragmentId] = None,
+    ) -> Sequence[Fragment]:
+        """Lists fragments by creation time, optionally starting after a given fragment"""
+        ...
 
     @abstractmethod
     async def add_tag(
@@ -129,8 +134,10 @@ class FragmentDocumentStore(FragmentStore):
     def __init__(
         self,
         database: DocumentDatabase,
+        versions: Optional[ResourceVersionStore] = None,
     ) -> None:
         self._database = database
+        self._versions = versions
         self._fragments_collection: DocumentCollection[_FragmentDocument]
         self._fragment_tag_association_collection: DocumentCollection[
             _FragmentTagAssociationDocument
@@ -188,6 +195,10 @@ class FragmentDocumentStore(FragmentStore):
             tags=tags,
         )
 
+    async def _bump_version(self) -> None:
+        if self._versions:
+            await self._versions.bump_version("fragments")
+
     @override
     async def create_fragment(
         self,
@@ -209,6 +220,7 @@ class FragmentDocumentStore(FragmentStore):
             await self._fragments_collection.insert_one(
                 document=self._serialize_fragment(fragment=fragment)
             )
+            await self._bump_version()
 
         return fragment
 
@@ -251,6 +263,7 @@ class FragmentDocumentStore(FragmentStore):
                     ],
                 },
             )
+            await self._bump_version()
 
         assert result.updated_document
 
@@ -258,11 +271,27 @@ class FragmentDocumentStore(FragmentStore):
 
     async def list_fragments(
         self,
+        limit: Optional[int] = None,
+        after: Optional[FragmentId] = None,
     ) -> Sequence[Fragment]:
         async with self._lock.reader_lock:
+            filters: Where = {}
+
+            if after:
+                cursor = await self._fragments_collection.find_one({"id": {"$eq": after}})
+
+                if not cursor:
+                    raise ItemNotFoundError(item_id=UniqueId(after))
+
+                filters = keyset_filters(["creation_utc", "id"], cursor)
+
             return [
                 await self._deserialize_fragment(e)
-                for e in await self._fragments_collection.find({})
+                for e in await self._fragments_collection.find(
+                    filters,
+                    sort=["creation_utc", "id"],
+                    limit=limit,
+                )
             ]
 
     @override
@@ -273,6 +302,9 @@ class FragmentDocumentStore(FragmentStore):
         async with self._lock.writer_lock:
             result = await self._fragments_collection.delete_one({"id": {"$eq": fragment_id}})
 
+            if result.deleted_count:
+                await self._bump_version()
+
         if result.deleted_count == 0:
             raise ItemNotFoundError(item_id=UniqueId(fragment_id))
 
@@ -302,6 +334,7 @@ class FragmentDocumentStore(FragmentStore):
             _ = await self._fragment_tag_association_collection.insert_one(
                 document=association_document
             )
+            await self._bump_version()
 
             fragment_document = await self._fragments_collection.find_one(
                 {"id": {"$eq": fragment_id}}
@@ -329,6 +362,8 @@ class FragmentDocumentStore(FragmentStore):
             if delete_result.deleted_count == 0:
                 raise ItemNotFoundError(item_id=UniqueId(tag_id))
 
+            await self._bump_version()
+
             fragment_document = await self._fragments_collection.find_one(
                 {"id": {"$eq": fragment_id}}
             )
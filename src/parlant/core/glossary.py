@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from abc import abstractmethod
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from itertools import chain
@@ -22,7 +23,13 @@ from typing_extensions import override, Self
 from parlant.core import async_utils
 from parlant.core.async_utils import ReaderWriterLock
 from parlant.core.common import ItemNotFoundError, Version, generate_id, UniqueId
-from parlant.core.persistence.common import ObjectId
+from parlant.core.persistence.common import (
+    ObjectId,
+    keyset_filters,
+    matches_filters,
+    sort_documents,
+)
+from parlant.core.resource_versions import ResourceVersionStore
 from parlant.core.nlp.embedding import Embedder, EmbedderFactory
 from parlant.core.persistence.vector_database import VectorCollection, VectorDatabase
 
@@ -84,7 +91,11 @@ class GlossaryStore:
     async def list_terms(
         self,
         term_set: str,
-    ) -> Sequence[Term]: ...
+        limit: Optional[int] = None,
+        after: Optional[TermId] = None,
+    ) -> Sequence[Term]:
+        """Lists terms by creation time, optionally starting after a given term"""
+        ...
 
     @abstractmethod
     async def delete_term(
@@ -120,11 +131,13 @@ class GlossaryVectorStore(GlossaryStore):
         vector_db: VectorDatabase,
         embedder_type: type[Embedder],
         embedder_factory: EmbedderFactory,
+        versions: Optional[ResourceVersionStore] = None,
     ):
         self._vector_db = vector_db
         self._collection: VectorCollection[_TermDocument]
         self._embedder = embedder_factory.create_embedder(embedder_type)
         self._embedder_type = embedder_type
+        self._versions = versions
 
         self._lock = ReaderWriterLock()
 
@@ -166,6 +179,10 @@ class GlossaryVectorStore(GlossaryStore):
             synonyms=term_document["synonyms"].split(", ") if term_document["synonyms"] else [],
         )
 
+    async def _bump_version(self) -> None:
+        if self._versions:
+            await self._versions.bump_version("glossary")
+
     @override
     async def create_term(
         self,
@@ -193,6 +210,7 @@ class GlossaryVectorStore(GlossaryStore):
             )
 
             await self._collection.insert_one(document=self._serialize(term, term_set, content))
+            await self._bump_version()
 
         return term
 
@@ -234,6 +252,7 @@ class GlossaryVectorStore(GlossaryStore):
                     "synonyms": ", ".join(synonyms) if synonyms else "",
                 },
             )
+            await self._bump_version()
 
         assert update_result.updated_document
 
@@ -259,12 +278,29 @@ class GlossaryVectorStore(GlossaryStore):
     async def list_terms(
         self,
         term_set: str,
+        limit: Optional[int] = None,
+        after: Optional[TermId] = None,
     ) -> Sequence[Term]:
         async with self._lock.reader_lock:
-            return [
-                self._deserialize(term_document=d)
-                for d in await self._collection.find(filters={"term_set": {"$eq": term_set}})
-            ]
+            # Vector collections can't order their results, so paging is done here
+            term_documents = sort_documents(
+                await self._collection.find(filters={"term_set": {"$eq": term_set}}),
+                ["creation_utc", "id"],
+            )
+
+            if after:
+                cursor = next((d for d in term_documents if TermId(d["id"]) == after), None)
+
+                if not cursor:
+                    raise ItemNotFoundError(item_id=UniqueId(after), message=f"term_set={term_set}")
+
+                term_documents = [
+                    d
+                    for d in term_documents
+                    if matches_filters(keyset_filters(["creation_utc", "id"], cursor), d)
+                ]
+
+            return [self._deserialize(term_document=d) for d in term_documents[:limit]]
 
     @override
     async def delete_term(
@@ -283,6 +319,7 @@ class GlossaryVectorStore(GlossaryStore):
             await self._collection.delete_one(
                 filters={"$and": [{"term_set": {"$eq": term_set}}, {"id": {"$eq": term_id}}]}
             )
+            await self._bump_version()
 
     async def _query_chunks(self, query: str) -> list[str]:
         max_length = self._embedder.max_tokens // 5
@@ -345,3 +382,75 @@ class GlossaryVectorStore(GlossaryStore):
         content += f": {description}"
 
         return content
+
+
+class DeferredGlossaryStore(GlossaryStore):
+    """Stands in for a glossary store which is still being initialized.
+
+    Calls wait until the actual store is provided, so that
+    the server can start serving requests in the meantime.
+    """
+
+    def __init__(self) -> None:
+        self._store: asyncio.Future[GlossaryStore] = asyncio.get_running_loop().create_future()
+
+    def provide(self, store: GlossaryStore) -> None:
+        self._store.set_result(store)
+
+    def fail(self, exception: BaseException) -> None:
+        self._store.set_exception(exception)
+
+    @override
+    async def create_term(
+        self,
+        term_set: str,
+        name: str,
+        description: str,
+        creation_utc: Optional[datetime] = None,
+        synonyms: Optional[Sequence[str]] = None,
+    ) -> Term:
+        return await (await self._store).create_term(
+            term_set, name, description, creation_utc, synonyms
+        )
+
+    @override
+    async def update_term(
+        self,
+        term_set: str,
+        term_id: TermId,
+        params: TermUpdateParams,
+    ) -> Term:
+        return await (await self._store).update_term(term_set, term_id, params)
+
+    @override
+    async def read_term(
+        self,
+        term_set: str,
+        term_id: TermId,
+    ) -> Term:
+        return await (await self._store).read_term(term_set, term_id)
+
+    @override
+    async def list_terms(
+        self,
+        term_set: str,
+        limit: Optional[int] = None,
+        after: Optional[TermId] = None,
+    ) -> Sequence[Term]:
+        return await (await self._store).list_terms(term_set, limit, after)
+
+    @override
+    async def delete_term(
+        self,
+        term_set: str,
+        term_id: TermId,
+    ) -> None:
+        await (await self._store).delete_term(term_set, term_id)
+
+    @override
+    async def find_relevant_terms(
+        self,
+        term_set: str,
+        query: str,
+    ) -> Sequence[Term]:
+        return await (await self._store).find_relevant_terms(term_set, query)
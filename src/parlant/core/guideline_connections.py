@@ -19,15 +19,20 @@ from typing import NewType, Optional, Sequence
 from typing_extensions import override, TypedDict, Self
 
 import networkx  # type: ignore
+from more_itertools import chunked
 
 from parlant.core.async_utils import ReaderWriterLock
 from parlant.core.common import ItemNotFoundError, UniqueId, Version, generate_id
 from parlant.core.guidelines import GuidelineId
 from parlant.core.persistence.common import ObjectId
 from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
+from parlant.core.resource_versions import ResourceVersionStore
 
 GuidelineConnectionId = NewType("GuidelineConnectionId", str)
 
+# Bounds the size of each delete's filter, which SQLite translates to a chain of ORs
+DELETE_BATCH_SIZE = 100
+
 
 @dataclass(frozen=True)
 class GuidelineConnection:
@@ -45,12 +50,24 @@ class GuidelineConnectionStore(ABC):
         target: GuidelineId,
     ) -> GuidelineConnection: ...
 
+    @abstractmethod
+    async def create_connections(
+        self,
+        connections: Sequence[tuple[GuidelineId, GuidelineId]],
+    ) -> Sequence[GuidelineConnection]: ...
+
     @abstractmethod
     async def delete_connection(
         self,
         id: GuidelineConnectionId,
     ) -> None: ...
 
+    @abstractmethod
+    async def delete_connections(
+        self,
+        ids: Sequence[GuidelineConnectionId],
+    ) -> None: ...
+
     @abstractmethod
     async def list_connections(
         self,
@@ -71,10 +88,15 @@ class _GuidelineConnectionDocument(TypedDict, total=False):
 class GuidelineConnectionDocumentStore(GuidelineConnectionStore):
     VERSION = Version.from_string("0.1.0")
 
-    def __init__(self, database: DocumentDatabase) -> None:
+    def __init__(
+        self,
+        database: DocumentDatabase,
+        versions: Optional[ResourceVersionStore] = None,
+    ) -> None:
         self._database = database
         self._collection: DocumentCollection[_GuidelineConnectionDocument]
         self._graph: networkx.DiGraph | None = None
+        self._versions = versions
 
         self._lock = ReaderWriterLock()
 
@@ -144,6 +166,10 @@ class GuidelineConnectionDocumentStore(GuidelineConnectionStore):
 
         return self._graph
 
+    async def _bump_version(self) -> None:
+        if self._versions:
+            await self._versions.bump_version("guideline_connections")
+
     @override
     async def create_connection(
         self,
@@ -180,8 +206,56 @@ class GuidelineConnectionDocumentStore(GuidelineConnectionStore):
                 id=guideline_connection.id,
             )
 
+            await self._bump_version()
+
         return guideline_connection
 
+    @override
+    async def create_connections(
+        self,
+        connections: Sequence[tuple[GuidelineId, GuidelineId]],
+        creation_utc: Optional[datetime] = None,
+    ) -> Sequence[GuidelineConnection]:
+        async with self._lock.writer_lock:
+            creation_utc = creation_utc or datetime.now(timezone.utc)
+
+            guideline_connections = [
+                GuidelineConnection(
+                    id=GuidelineConnectionId(generate_id()),
+                    creation_utc=creation_utc,
+                    source=source,
+                    target=target,
+                )
+                for source, target in dict.fromkeys(connections)
+            ]
+
+            graph = await self._get_graph()
+
+            # Like create_connection, existing connections between the same guidelines are replaced
+            replaced_ids = [
+                graph.edges[c.source, c.target]["id"]
+                for c in guideline_connections
+                if graph.has_edge(c.source, c.target)
+            ]
+
+            await self._delete_documents(replaced_ids)
+
+            await self._collection.insert_many(
+                [self._serialize(c) for c in guideline_connections],
+            )
+
+            graph.add_edges_from((c.source, c.target, {"id": c.id}) for c in guideline_connections)
+
+            await self._bump_version()
+
+        return guideline_connections
+
+    async def _delete_documents(self, ids: Sequence[GuidelineConnectionId]) -> None:
+        for batch in chunked(ids, DELETE_BATCH_SIZE):
+            await self._collection.delete_many(
+                filters={"$or": [{"id": {"$eq": id}} for id in batch]},
+            )
+
     @override
     async def delete_connection(
         self,
@@ -198,6 +272,27 @@ class GuidelineConnectionDocumentStore(GuidelineConnectionStore):
             (await self._get_graph()).remove_edge(connection.source, connection.target)
 
             await self._collection.delete_one(filters={"id": {"$eq": id}})
+            await self._bump_version()
+
+    @override
+    async def delete_connections(
+        self,
+        ids: Sequence[GuidelineConnectionId],
+    ) -> None:
+        async with self._lock.writer_lock:
+            graph = await self._get_graph()
+
+            edges = {
+                data["id"]: (source, target) for source, target, data in graph.edges(data=True)
+            }
+
+            if missing_id := next((id for id in ids if id not in edges), None):
+                raise ItemNotFoundError(item_id=UniqueId(missing_id))
+
+            graph.remove_edges_from(edges[id] for id in ids)
+
+            await self._delete_documents(ids)
+            await self._bump_version()
 
     @override
     async def list_connections(
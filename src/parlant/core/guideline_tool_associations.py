@@ -23,6 +23,7 @@ from parlant.core.common import ItemNotFoundError, Version, generate_id, UniqueI
 from parlant.core.guidelines import GuidelineId
 from parlant.core.persistence.common import ObjectId
 from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
+from parlant.core.resource_versions import ResourceVersionStore
 from parlant.core.tools import ToolId
 
 GuidelineToolAssociationId = NewType("GuidelineToolAssociationId", str)
@@ -75,9 +76,14 @@ class _GuidelineToolAssociationDocument(TypedDict, total=False):
 class GuidelineToolAssociationDocumentStore(GuidelineToolAssociationStore):
     VERSION = Version.from_string("0.1.0")
 
-    def __init__(self, database: DocumentDatabase):
+    def __init__(
+        self,
+        database: DocumentDatabase,
+        versions: Optional[ResourceVersionStore] = None,
+    ):
         self._database = database
         self._collection: DocumentCollection[_GuidelineToolAssociationDocument]
+        self._versions = versions
 
         self._lock = ReaderWriterLock()
 
@@ -118,6 +124,10 @@ class GuidelineToolAssociationDocumentStore(GuidelineToolAssociationStore):
             tool_id=ToolId.from_string(association_document["tool_id"]),
         )
 
+    async def _bump_version(self) -> None:
+        if self._versions:
+            await self._versions.bump_version("guideline_tool_associations")
+
     @override
     async def create_association(
         self,
@@ -136,6 +146,7 @@ class GuidelineToolAssociationDocumentStore(GuidelineToolAssociationStore):
             )
 
             await self._collection.insert_one(document=self._serialize(association))
+            await self._bump_version()
 
         return association
 
@@ -159,6 +170,9 @@ class GuidelineToolAssociationDocumentStore(GuidelineToolAssociationStore):
         async with self._lock.writer_lock:
             result = await self._collection.delete_one(filters={"id": {"$eq": association_id}})
 
+            if result.deleted_document:
+                await self._bump_version()
+
         if not result.deleted_document:
             raise ItemNotFoundError(item_id=UniqueId(association_id))
 
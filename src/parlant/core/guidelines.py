@@ -20,7 +20,8 @@ from datetime import datetime, timezone
 
 from parlant.core.async_utils import ReaderWriterLock
 from parlant.core.common import ItemNotFoundError, UniqueId, Version, generate_id
-from parlant.core.persistence.common import ObjectId
+from parlant.core.persistence.common import ObjectId, Where, keyset_filters
+from parlant.core.resource_versions import ResourceVersionStore
 from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
 
 GuidelineId = NewType("GuidelineId", str)
@@ -59,11 +60,23 @@ class GuidelineStore(ABC):
     ) -> Guideline: ...
 
     @abstractmethod
-    async def list_guidelines(
+    async def create_guidelines(
         self,
         guideline_set: str,
+        contents: Sequence[GuidelineContent],
+        creation_utc: Optional[datetime] = None,
     ) -> Sequence[Guideline]: ...
 
+    @abstractmethod
+    async def list_guidelines(
+        self,
+        guideline_set: str,
+        limit: Optional[int] = None,
+        after: Optional[GuidelineId] = None,
+    ) -> Sequence[Guideline]:
+        """Lists guidelines by creation time, optionally starting after a given guideline"""
+        ...
+
     @abstractmethod
     async def read_guideline(
         self,
@@ -105,9 +118,14 @@ class _GuidelineDocument(TypedDict, total=False):
 class GuidelineDocumentStore(GuidelineStore):
     VERSION = Version.from_string("0.1.0")
 
-    def __init__(self, database: DocumentDatabase):
+    def __init__(
+        self,
+        database: DocumentDatabase,
+        versions: Optional[ResourceVersionStore] = None,
+    ):
         self._database = database
         self._collection: DocumentCollection[_GuidelineDocument]
+        self._versions = versions
 
         self._lock = ReaderWriterLock()
 
@@ -152,6 +170,10 @@ class GuidelineDocumentStore(GuidelineStore):
             ),
         )
 
+    async def _bump_version(self) -> None:
+        if self._versions:
+            await self._versions.bump_version("guidelines")
+
     @override
     async def create_guideline(
         self,
@@ -178,19 +200,73 @@ class GuidelineDocumentStore(GuidelineStore):
                     guideline_set=guideline_set,
                 )
             )
+            await self._bump_version()
 
         return guideline
 
+    @override
+    async def create_guidelines(
+        self,
+        guideline_set: str,
+        contents: Sequence[GuidelineContent],
+        creation_utc: Optional[datetime] = None,
+    ) -> Sequence[Guideline]:
+        async with self._lock.writer_lock:
+            creation_utc = creation_utc or datetime.now(timezone.utc)
+
+            guidelines = [
+                Guideline(
+                    id=GuidelineId(generate_id()),
+                    creation_utc=creation_utc,
+                    content=content,
+                )
+                for content in contents
+            ]
+
+            await self._collection.insert_many(
+                documents=[
+                    self._serialize(
+                        guideline=guideline,
+                        guideline_set=guideline_set,
+                    )
+                    for guideline in guidelines
+                ]
+            )
+            await self._bump_version()
+
+        return guidelines
+
     @override
     async def list_guidelines(
         self,
         guideline_set: str,
+        limit: Optional[int] = None,
+        after: Optional[GuidelineId] = None,
     ) -> Sequence[Guideline]:
         async with self._lock.reader_lock:
+            filters: Where = {"guideline_set": {"$eq": guideline_set}}
+
+            if after:
+                cursor = await self._collection.find_one(
+                    filters={
+                        "guideline_set": {"$eq": guideline_set},
+                        "id": {"$eq": after},
+                    }
+                )
+
+                if not cursor:
+                    raise ItemNotFoundError(
+                        item_id=UniqueId(after), message=f"guideline_set={guideline_set}"
+                    )
+
+                filters = {"$and": [filters, keyset_filters(["creation_utc", "id"], cursor)]}
+
             return [
                 self._deserialize(d)
                 for d in await self._collection.find(
-                    filters={"guideline_set": {"$eq": guideline_set}}
+                    filters=filters,
+                    sort=["creation_utc", "id"],
+                    limit=limit,
                 )
             ]
 
@@ -229,6 +305,9 @@ class GuidelineDocumentStore(GuidelineStore):
                 }
             )
 
+            if result.deleted_document:
+                await self._bump_version()
+
         if not result.deleted_document:
             raise ItemNotFoundError(
                 item_id=UniqueId(guideline_id), message=f"with guideline_set '{guideline_set}'"
@@ -257,6 +336,7 @@ class GuidelineDocumentStore(GuidelineStore):
                 filters={"id": {"$eq": guideline_id}},
                 params=guideline_document,
             )
+            await self._bump_version()
 
         assert result.updated_document
 
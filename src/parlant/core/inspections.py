@@ -0,0 +1,398 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import base64
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+from typing import Literal, Mapping, Optional, Sequence, TypeAlias, cast
+import zlib
+from typing_extensions import override, NotRequired, TypedDict, Self
+
+from parlant.core.async_utils import ReaderWriterLock
+from parlant.core.common import ItemNotFoundError, UniqueId, Version, generate_id
+from parlant.core.customers import Customer
+from parlant.core.nlp.generation import GenerationInfo, UsageInfo
+from parlant.core.persistence.common import ObjectId, Where
+from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
+from parlant.core.sessions import (
+    ContextVariable,
+    GuidelineProposition,
+    GuidelinePropositionInspection,
+    Inspection,
+    MessageEventData,
+    MessageGenerationInspection,
+    PreparationIteration,
+    PreparationIterationGenerations,
+    SessionId,
+    Term,
+    ToolCall,
+)
+from parlant.core.tags import TagId
+
+
+InspectionSamplingMode: TypeAlias = Literal["all", "errors", "rate", "tags"]
+
+
+@dataclass(frozen=True)
+class InspectionSamplingPolicy:
+    """Decides which processed turns have their inspection recorded.
+
+    Turns which ran into errors are recorded under every mode.
+    """
+
+    mode: InspectionSamplingMode = "all"
+    rate: int = 1
+    """Under the "rate" mode, one in every `rate` turns is recorded"""
+    tags: Sequence[TagId] = ()
+    """Under the "tags" mode, turns of customers with any of these tags are recorded"""
+
+    @staticmethod
+    def parse(spec: str) -> InspectionSamplingPolicy:
+        """Parses a sampling spec: `all`, `errors`, `1/N` or `tags:TAG_ID[,TAG_ID...]`"""
+        if spec in ("all", "errors"):
+            return InspectionSamplingPolicy(mode=cast(InspectionSamplingMode, spec))
+
+        if spec.startswith("1/") and spec[2:].isdigit() and int(spec[2:]) > 0:
+            return InspectionSamplingPolicy(mode="rate", rate=int(spec[2:]))
+
+        if spec.startswith("tags:") and (tags := [t for t in spec[5:].split(",") if t]):
+            return InspectionSamplingPolicy(mode="tags", tags=[TagId(t) for t in tags])
+
+        raise ValueError(
+            f"Invalid inspection sampling spec '{spec}' "
+            "(expected 'all', 'errors', '1/N' or 'tags:TAG_ID[,TAG_ID...]')"
+        )
+
+    def should_record(
+        self,
+        correlation_id: str,
+        customer: Customer,
+        errored: bool,
+    ) -> bool:
+        if errored or self.mode == "all":
+            return True
+
+        if self.mode == "rate":
+            # Hashing (rather than randomizing) keeps the decision stable for a given turn
+            return zlib.crc32(correlation_id.encode()) % self.rate == 0
+
+        if self.mode == "tags":
+            return any(t in self.tags for t in customer.tags)
+
+        return False
+
+
+class InspectionStore(ABC):
+    @abstractmethod
+    async def create_inspection(
+        self,
+        session_id: SessionId,
+        correlation_id: str,
+        message_generations: Sequence[MessageGenerationInspection],
+        preparation_iterations: Sequence[PreparationIteration],
+        creation_utc: Optional[datetime] = None,
+    ) -> Inspection: ...
+
+    @abstractmethod
+    async def read_inspection(
+        self,
+        session_id: SessionId,
+        correlation_id: str,
+    ) -> Inspection: ...
+
+    @abstractmethod
+    async def delete_inspections(
+        self,
+        session_id: Optional[SessionId] = None,
+        created_before: Optional[datetime] = None,
+    ) -> int:
+        """Deletes the inspections matching all of the given filters,
+        returning the number of deleted inspections"""
+        ...
+
+
+class _UsageInfoDocument(TypedDict):
+    input_tokens: int
+    output_tokens: int
+    extra: Optional[Mapping[str, int]]
+
+
+class _GenerationInfoDocument(TypedDict):
+    schema_name: str
+    model: str
+    duration: float
+    usage: _UsageInfoDocument
+
+
+class _GuidelinePropositionInspectionDocument(TypedDict):
+    total_duration: float
+    batches: Sequence[_GenerationInfoDocument]
+
+
+class _PreparationIterationGenerationsDocument(TypedDict):
+    guideline_proposition: _GuidelinePropositionInspectionDocument
+    tool_calls: Sequence[_GenerationInfoDocument]
+
+
+class _MessageGenerationInspectionDocument(TypedDict):
+    generation: _GenerationInfoDocument
+    messages: Sequence[Optional[MessageEventData]]
+    hedge_won: NotRequired[bool]
+
+
+class _PreparationIterationDocument(TypedDict):
+    guideline_propositions: Sequence[GuidelineProposition]
+    tool_calls: Sequence[ToolCall]
+    terms: Sequence[Term]
+    context_variables: Sequence[ContextVariable]
+    generations: _PreparationIterationGenerationsDocument
+
+
+class _InspectionContentDocument(TypedDict):
+    message_generations: Sequence[_MessageGenerationInspectionDocument]
+    preparation_iterations: Sequence[_PreparationIterationDocument]
+
+
+class _InspectionDocument(TypedDict, total=False):
+    id: ObjectId
+    version: Version.String
+    creation_utc: str
+    session_id: SessionId
+    correlation_id: str
+    content: Optional[_InspectionContentDocument]
+    compressed_content: Optional[str]
+    """Base64 of the zlib-compressed JSON of the content"""
+
+
+class InspectionDocumentStore(InspectionStore):
+    VERSION = Version.from_string("0.1.0")
+
+    def __init__(
+        self,
+        database: DocumentDatabase,
+        compress: bool = True,
+    ):
+        self._database = database
+        self._compress = compress
+        self._collection: DocumentCollection[_InspectionDocument]
+
+        self._lock = ReaderWriterLock()
+
+    async def __aenter__(self) -> Self:
+        self._collection = await self._database.get_or_create_collection(
+            name="inspections",
+            schema=_InspectionDocument,
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[object],
+    ) -> None:
+        pass
+
+    def _serialize_content(self, inspection: Inspection) -> _InspectionContentDocument:
+        def serialize_generation_info(generation: GenerationInfo) -> _GenerationInfoDocument:
+            return _GenerationInfoDocument(
+                schema_name=generation.schema_name,
+                model=generation.model,
+                duration=generation.duration,
+                usage=_UsageInfoDocument(
+                    input_tokens=generation.usage.input_tokens,
+                    output_tokens=generation.usage.output_tokens,
+                    extra=generation.usage.extra,
+                ),
+            )
+
+        return _InspectionContentDocument(
+            message_generations=[
+                _MessageGenerationInspectionDocument(
+                    generation=serialize_generation_info(m.generation),
+                    messages=m.messages,
+                    hedge_won=m.hedge_won,
+                )
+                for m in inspection.message_generations
+            ],
+            preparation_iterations=[
+                {
+                    "guideline_propositions": i.guideline_propositions,
+                    "tool_calls": i.tool_calls,
+                    "terms": i.terms,
+                    "context_variables": i.context_variables,
+                    "generations": _PreparationIterationGenerationsDocument(
+                        guideline_proposition=_GuidelinePropositionInspectionDocument(
+                            total_duration=i.generations.guideline_proposition.total_duration,
+                            batches=[
+                                serialize_generation_info(g)
+                                for g in i.generations.guideline_proposition.batches
+                            ],
+                        ),
+                        tool_calls=[serialize_generation_info(g) for g in i.generations.tool_calls],
+                    ),
+                }
+                for i in inspection.preparation_iterations
+            ],
+        )
+
+    def _deserialize_content(self, content_document: _InspectionContentDocument) -> Inspection:
+        def deserialize_generation_info(
+            generation_document: _GenerationInfoDocument,
+        ) -> GenerationInfo:
+            return GenerationInfo(
+                schema_name=generation_document["schema_name"],
+                model=generation_document["model"],
+                duration=generation_document["duration"],
+                usage=UsageInfo(
+                    input_tokens=generation_document["usage"]["input_tokens"],
+                    output_tokens=generation_document["usage"]["output_tokens"],
+                    extra=generation_document["usage"]["extra"],
+                ),
+            )
+
+        return Inspection(
+            message_generations=[
+                MessageGenerationInspection(
+                    generation=deserialize_generation_info(m["generation"]),
+                    messages=m["messages"],
+                    hedge_won=m.get("hedge_won", False),
+                )
+                for m in content_document["message_generations"]
+            ],
+            preparation_iterations=[
+                PreparationIteration(
+                    guideline_propositions=i["guideline_propositions"],
+                    tool_calls=i["tool_calls"],
+                    terms=i["terms"],
+                    context_variables=i["context_variables"],
+                    generations=PreparationIterationGenerations(
+                        guideline_proposition=GuidelinePropositionInspection(
+                            total_duration=i["generations"]["guideline_proposition"][
+                                "total_duration"
+                            ],
+                            batches=[
+                                deserialize_generation_info(g)
+                                for g in i["generations"]["guideline_proposition"]["batches"]
+                            ],
+                        ),
+                        tool_calls=[
+                            deserialize_generation_info(g) for g in i["generations"]["tool_calls"]
+                        ],
+                    ),
+                )
+                for i in content_document["preparation_iterations"]
+            ],
+        )
+
+    def _serialize_inspection(
+        self,
+        inspection: Inspection,
+        session_id: SessionId,
+        correlation_id: str,
+        creation_utc: datetime,
+    ) -> _InspectionDocument:
+        content = self._serialize_content(inspection)
+
+        return _InspectionDocument(
+            id=ObjectId(generate_id()),
+            version=self.VERSION.to_string(),
+            creation_utc=creation_utc.isoformat(),
+            session_id=session_id,
+            correlation_id=correlation_id,
+            content=None if self._compress else content,
+            compressed_content=(
+                base64.b64encode(zlib.compress(json.dumps(content).encode())).decode()
+                if self._compress
+                else None
+            ),
+        )
+
+    def _deserialize_inspection(self, inspection_document: _InspectionDocument) -> Inspection:
+        if compressed_content := inspection_document["compressed_content"]:
+            content = cast(
+                _InspectionContentDocument,
+                json.loads(zlib.decompress(base64.b64decode(compressed_content))),
+            )
+        else:
+            content = cast(_InspectionContentDocument, inspection_document["content"])
+
+        return self._deserialize_content(content)
+
+    @override
+    async def create_inspection(
+        self,
+        session_id: SessionId,
+        correlation_id: str,
+        message_generations: Sequence[MessageGenerationInspection],
+        preparation_iterations: Sequence[PreparationIteration],
+        creation_utc: Optional[datetime] = None,
+    ) -> Inspection:
+        inspection = Inspection(
+            message_generations=message_generations,
+            preparation_iterations=preparation_iterations,
+        )
+
+        document = self._serialize_inspection(
+            inspection,
+            session_id,
+            correlation_id,
+            creation_utc or datetime.now(timezone.utc),
+        )
+
+        async with self._lock.writer_lock:
+            await self._collection.insert_one(document=document)
+
+        return inspection
+
+    @override
+    async def read_inspection(
+        self,
+        session_id: SessionId,
+        correlation_id: str,
+    ) -> Inspection:
+        async with self._lock.reader_lock:
+            inspection_document = await self._collection.find_one(
+                filters={
+                    "session_id": {"$eq": session_id},
+                    "correlation_id": {"$eq": correlation_id},
+                }
+            )
+
+        if not inspection_document:
+            raise ItemNotFoundError(
+                item_id=UniqueId(correlation_id), message="Message inspection not found"
+            )
+
+        return self._deserialize_inspection(inspection_document)
+
+    @override
+    async def delete_inspections(
+        self,
+        session_id: Optional[SessionId] = None,
+        created_before: Optional[datetime] = None,
+    ) -> int:
+        async with self._lock.writer_lock:
+            filters = {
+                **({"session_id": {"$eq": session_id}} if session_id else {}),
+                **({"creation_utc": {"$lt": created_before.isoformat()}} if created_before else {}),
+            }
+
+            result = await self._collection.delete_many(filters=cast(Where, filters))
+
+        return result.deleted_count
@@ -0,0 +1,104 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+import random
+import time
+from typing import AsyncIterator, NewType, Optional
+from typing_extensions import override
+
+from parlant.core.common import generate_id
+
+LeaseToken = NewType("LeaseToken", str)
+
+
+class LeaseManager(ABC):
+    """Grants time-limited ownership of keys to the workers of a server.
+
+    A worker which already owns a lease may acquire it again, in which case
+    the lease moves to the new token and the previous one becomes stale.
+    """
+
+    def __init__(self) -> None:
+        self._local_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    @abstractmethod
+    async def acquire(self, key: str, ttl: timedelta) -> Optional[LeaseToken]: ...
+
+    @abstractmethod
+    async def renew(self, key: str, token: LeaseToken, ttl: timedelta) -> bool: ...
+
+    @abstractmethod
+    async def release(self, key: str, token: LeaseToken) -> None: ...
+
+    @asynccontextmanager
+    async def exclusive(
+        self,
+        key: str,
+        ttl: timedelta = timedelta(seconds=30),
+        polling_interval: float = 0.01,
+        max_polling_interval: float = 0.5,
+    ) -> AsyncIterator[None]:
+        # Leases can be re-acquired by their owner,
+        # so they must also be guarded within this worker.
+        async with self._local_locks[key]:
+            while not (token := await self.acquire(key, ttl)):
+                # Back off while another worker holds the lease, with jitter
+                # so that contending workers don't retry in lockstep
+                await asyncio.sleep(random.uniform(polling_interval / 2, polling_interval))
+                polling_interval = min(polling_interval * 2, max_polling_interval)
+
+            try:
+                yield
+            finally:
+                await self.release(key, token)
+
+
+@dataclass
+class _Lease:
+    token: LeaseToken
+    expires_at: float
+
+
+class InMemoryLeaseManager(LeaseManager):
+    """Serves a single-process server, which is the owner of every lease"""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._leases: dict[str, _Lease] = {}
+
+    @override
+    async def acquire(self, key: str, ttl: timedelta) -> Optional[LeaseToken]:
+        token = LeaseToken(generate_id())
+        self._leases[key] = _Lease(token, time.time() + ttl.total_seconds())
+        return token
+
+    @override
+    async def renew(self, key: str, token: LeaseToken, ttl: timedelta) -> bool:
+        if (lease := self._leases.get(key)) and lease.token == token:
+            lease.expires_at = time.time() + ttl.total_seconds()
+            return True
+        return False
+
+    @override
+    async def release(self, key: str, token: LeaseToken) -> None:
+        if (lease := self._leases.get(key)) and lease.token == token:
+            del self._leases[key]
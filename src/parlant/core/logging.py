@@ -14,14 +14,30 @@
 
 from abc import ABC, abstractmethod
 import asyncio
+import atexit
 from contextlib import ExitStack, contextmanager
 from enum import Enum, auto
+from functools import cache
 import logging
 from pathlib import Path
+import queue
 import structlog
+import threading
 import time
 import traceback
-from typing import Any, Iterator, Sequence, Protocol, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Iterator,
+    Sequence,
+    Protocol,
+    Dict,
+    List,
+    Optional,
+    TypeAlias,
+    Union,
+)
 from typing_extensions import override
 import json
 
@@ -45,39 +61,47 @@ class LogLevel(Enum):
         }[self]
 
 
+LogMessage: TypeAlias = Union[str, Callable[[], str]]
+"""A message, or a callable producing it, which is only invoked if the message is to be emitted"""
+
+
+def render_log_message(message: LogMessage) -> str:
+    return message if isinstance(message, str) else message()
+
+
 class Logger(Protocol):
     """Protocol for logging interface."""
-    
-    def debug(self, message: str) -> None:
+
+    def debug(self, message: LogMessage) -> None:
         """Log debug message."""
         ...
-    
-    def info(self, message: str) -> None:
+
+    def info(self, message: LogMessage) -> None:
         """Log info message."""
         ...
-    
-    def warning(self, message: str) -> None:
+
+    def warning(self, message: LogMessage) -> None:
         """Log warning message."""
         ...
-    
-    def error(self, message: str) -> None:
+
+    def error(self, message: LogMessage) -> None:
         """Log error message."""
         ...
-    
-    def critical(self, message: str) -> None:
+
+    def critical(self, message: LogMessage) -> None:
         """Log critical message."""
         ...
-    
-    def operation(self, name: str, props: dict[str, Any] = {}) -> Iterator[None]: ...
-    
-    def set_level(self, level: str) -> None:
+
+    def operation(self, name: str, props: dict[str, Any] = {}) -> ContextManager[None]: ...
+
+    def set_level(self, log_level: LogLevel) -> None:
         """Set log level."""
         ...
 
 
 class CorrelationalLogger(Logger):
     """Logger that tracks correlations between operations."""
-    
+
     def __init__(
         self,
         correlator: ContextualCorrelator,
@@ -108,24 +132,29 @@ class CorrelationalLogger(Logger):
         self.raw_logger.setLevel(log_level.to_logging_level())
 
     @override
-    def debug(self, message: str) -> None:
-        self._logger.debug(self._add_correlation_id(message))
+    def debug(self, message: LogMessage) -> None:
+        if self.raw_logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(self._add_correlation_id(render_log_message(message)))
 
     @override
-    def info(self, message: str) -> None:
-        self._logger.info(self._add_correlation_id(message))
+    def info(self, message: LogMessage) -> None:
+        if self.raw_logger.isEnabledFor(logging.INFO):
+            self._logger.info(self._add_correlation_id(render_log_message(message)))
 
     @override
-    def warning(self, message: str) -> None:
-        self._logger.warning(self._add_correlation_id(message))
+    def warning(self, message: LogMessage) -> None:
+        if self.raw_logger.isEnabledFor(logging.WARNING):
+            self._logger.warning(self._add_correlation_id(render_log_message(message)))
 
     @override
-    def error(self, message: str) -> None:
-        self._logger.error(self._add_correlation_id(message))
+    def error(self, message: LogMessage) -> None:
+        if self.raw_logger.isEnabledFor(logging.ERROR):
+            self._logger.error(self._add_correlation_id(render_log_message(message)))
 
     @override
-    def critical(self, message: str) -> None:
-        self._logger.critical(self._add_correlation_id(message))
+    def critical(self, message: LogMessage) -> None:
+        if self.raw_logger.isEnabledFor(logging.CRITICAL):
+            self._logger.critical(self._add_correlation_id(render_log_message(message)))
 
     @override
     @contextmanager
@@ -171,6 +200,92 @@ class StdoutLogger(CorrelationalLogger):
         super().__init__(correlator, log_level, logger_id)
 
 
+class _BackgroundLogWriter(logging.Handler):
+    """Hands records off to a writer thread, which writes them to its handlers in batches"""
+
+    def __init__(
+        self,
+        handlers: Sequence[logging.StreamHandler],  # type: ignore[type-arg]
+        max_batch_size: int = 512,
+    ) -> None:
+        super().__init__()
+
+        self._handlers = list(handlers)
+        self._max_batch_size = max_batch_size
+        self._queue = queue.SimpleQueue[Optional[logging.LogRecord]]()
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="parlant-log-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+        atexit.register(self.close)
+
+    @override
+    def emit(self, record: logging.LogRecord) -> None:
+        # Render the message on the calling thread, where its arguments are still valid
+        record.msg = record.getMessage()
+        record.args = None
+        self._queue.put(record)
+
+    @override
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+            for handler in self._handlers:
+                handler.close()
+
+        super().close()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [r for r in batch if r is not None]
+
+            for handler in self._handlers:
+                self._write(handler, records)
+
+            if len(records) < len(batch):
+                return
+
+    def _write(
+        self,
+        handler: logging.StreamHandler,  # type: ignore[type-arg]
+        records: Sequence[logging.LogRecord],
+    ) -> None:
+        try:
+            text = "".join(
+                handler.format(r) + handler.terminator
+                for r in records
+                if r.levelno >= handler.level
+            )
+
+            if not text:
+                return
+
+            handler.acquire()
+            try:
+                handler.stream.write(text)
+                handler.flush()
+            finally:
+                handler.release()
+        except Exception:
+            handler.handleError(records[-1])
+
+
 class FileLogger(CorrelationalLogger):
     def __init__(
         self,
@@ -181,13 +296,19 @@ class FileLogger(CorrelationalLogger):
     ) -> None:
         super().__init__(correlator, log_level, logger_id)
 
-        handlers: list[logging.Handler] = [
-            logging.FileHandler(log_file_path),
-            logging.StreamHandler(),
-        ]
+        self._writer = _BackgroundLogWriter(
+            [
+                logging.FileHandler(log_file_path),
+                logging.StreamHandler(),
+            ]
+        )
+
+        self.raw_logger.addHandler(self._writer)
 
-        for handler in handlers:
-            self.raw_logger.addHandler(handler)
+    def close(self) -> None:
+        """Writes out any pending records and stops the writer thread"""
+        self.raw_logger.removeHandler(self._writer)
+        self._writer.close()
 
 
 class CompositeLogger(Logger):
@@ -203,27 +324,37 @@ class CompositeLogger(Logger):
             logger.set_level(log_level)
 
     @override
-    def debug(self, message: str) -> None:
+    def debug(self, message: LogMessage) -> None:
+        message = self._render_once(message)
+
         for logger in self._loggers:
             logger.debug(message)
 
     @override
-    def info(self, message: str) -> None:
+    def info(self, message: LogMessage) -> None:
+        message = self._render_once(message)
+
         for logger in self._loggers:
             logger.info(message)
 
     @override
-    def warning(self, message: str) -> None:
+    def warning(self, message: LogMessage) -> None:
+        message = self._render_once(message)
+
         for logger in self._loggers:
             logger.warning(message)
 
     @override
-    def error(self, message: str) -> None:
+    def error(self, message: LogMessage) -> None:
+        message = self._render_once(message)
+
         for logger in self._loggers:
             logger.error(message)
 
     @override
-    def critical(self, message: str) -> None:
+    def critical(self, message: LogMessage) -> None:
+        message = self._render_once(message)
+
         for logger in self._loggers:
             logger.critical(message)
 
@@ -235,47 +366,58 @@ class CompositeLogger(Logger):
                 stack.enter_context(context)
             yield
 
+    def _render_once(self, message: LogMessage) -> LogMessage:
+        if isinstance(message, str):
+            return message
+        return cache(message)
+
 
 def get_logger(name: str) -> Logger:
     """Get a logger instance.
-    
+
     Args:
         name: Name of the logger
-        
+
     Returns:
         Logger instance
     """
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
-    
+
     # Add console handler if none exists
     if not logger.handlers:
         handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
         logger.addHandler(handler)
-    
+
     # Create wrapper that implements our protocol
     class LoggerWrapper:
-        def debug(self, message: str) -> None:
-            logger.debug(message)
-        
-        def info(self, message: str) -> None:
-            logger.info(message)
-        
-        def warning(self, message: str) -> None:
-            logger.warning(message)
-        
-        def error(self, message: str) -> None:
-            logger.error(message)
-        
-        def critical(self, message: str) -> None:
-            logger.critical(message)
-        
+        def debug(self, message: LogMessage) -> None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(render_log_message(message))
+
+        def info(self, message: LogMessage) -> None:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(render_log_message(message))
+
+        def warning(self, message: LogMessage) -> None:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(render_log_message(message))
+
+        def error(self, message: LogMessage) -> None:
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error(render_log_message(message))
+
+        def critical(self, message: LogMessage) -> None:
+            if logger.isEnabledFor(logging.CRITICAL):
+                logger.critical(render_log_message(message))
+
+        @contextmanager
         def operation(self, name: str, props: dict[str, Any] = {}) -> Iterator[None]:
             logger.info(f"OPERATION {name}: {json.dumps(props) if props else ''}")
             yield
-        
-        def set_level(self, level: str) -> None:
-            logger.setLevel(getattr(logging, level.upper()))
-    
+
+        def set_level(self, log_level: LogLevel) -> None:
+            logger.setLevel(log_level.to_logging_level())
+
     return LoggerWrapper()
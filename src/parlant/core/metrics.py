@@ -1,11 +1,436 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
 """Metrics tracking for model performance."""
-import time
+
+from __future__ import annotations
+import asyncio
+from bisect import bisect_left
+from contextlib import contextmanager
 from dataclasses import dataclass
+import math
+import threading
+import time
+from typing import Any, Callable, Iterator, Mapping, Sequence, TypeVar
+from typing_extensions import override
+
+from parlant.core.logging import LogLevel, LogMessage, Logger
+
+
+DEFAULT_DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+
+    pairs = ",".join(f'{n}="{_escape_label_value(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    TYPE: str
+
+    def __init__(self, name: str, description: str, labels: Sequence[str]) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = tuple(labels)
+
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Mapping[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"Metric '{self.name}' expects labels {list(self.label_names)}, got {list(labels)}"
+            )
+
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def render(self) -> list[str]:
+        return [
+            f"# TYPE {self.name} {self.TYPE}",
+            f"# HELP {self.name} {self.description}",
+            *self._render_samples(),
+        ]
+
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError()
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, description, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+
+        key = self._label_values(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    @override
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+
+        return [
+            f"{self.name}_total{_format_labels(self.label_names, k)} {_format_value(v)}"
+            for k, v in sorted(values.items())
+        ]
+
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        callback: Callable[[], Mapping[LabelValues, float]] | None = None,
+    ) -> None:
+        super().__init__(name, description, labels)
+        self._values: dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._collect().get(self._label_values(labels), 0.0)
+
+    @contextmanager
+    def track_in_progress(self, **labels: str) -> Iterator[None]:
+        self.inc(1.0, **labels)
+        try:
+            yield
+        finally:
+            self.dec(1.0, **labels)
+
+    def _collect(self) -> dict[LabelValues, float]:
+        if self._callback:
+            return dict(self._callback())
+
+        with self._lock:
+            return dict(self._values)
+
+    @override
+    def _render_samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}"
+            for k, v in sorted(self._collect().items())
+        ]
+
+
+@dataclass
+class _HistogramState:
+    bucket_counts: list[int]
+    count: int
+    sum: float
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_DURATION_BUCKETS,
+    ) -> None:
+        super().__init__(name, description, labels)
+
+        self.buckets = tuple(sorted(b for b in buckets if not math.isinf(b)))
+        self._states: dict[LabelValues, _HistogramState] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+
+        with self._lock:
+            state = self._states.get(key)
+
+            if not state:
+                state = _HistogramState([0] * len(self.buckets), 0, 0.0)
+                self._states[key] = state
+
+            if (index := bisect_left(self.buckets, value)) < len(self.buckets):
+                state.bucket_counts[index] += 1
+
+            state.count += 1
+            state.sum += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        t_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t_start, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            if state := self._states.get(self._label_values(labels)):
+                return state.count
+            return 0
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """Estimates the q-quantile by linear interpolation within the matching bucket"""
+
+        with self._lock:
+            state = self._states.get(self._label_values(labels))
+
+            if not state or not state.count:
+                return math.nan
+
+            rank = q * state.count
+            cumulative = 0
+            lower_bound = 0.0
+
+            for upper_bound, bucket_count in zip(self.buckets, state.bucket_counts):
+                if cumulative + bucket_count >= rank and bucket_count:
+                    return lower_bound + (upper_bound - lower_bound) * (
+                        (rank - cumulative) / bucket_count
+                    )
+
+                cumulative += bucket_count
+                lower_bound = upper_bound
+
+            return self.buckets[-1] if self.buckets else math.inf
+
+    @override
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            states = {
+                k: _HistogramState(list(s.bucket_counts), s.count, s.sum)
+                for k, s in self._states.items()
+            }
+
+        label_names = (*self.label_names, "le")
+        lines = []
+
+        for key, state in sorted(states.items()):
+            cumulative = 0
+
+            for upper_bound, bucket_count in zip(self.buckets, state.bucket_counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(label_names, (*key, _format_value(upper_bound)))}"
+                    f" {cumulative}"
+                )
+
+            lines.append(
+                f"{self.name}_bucket{_format_labels(label_names, (*key, '+Inf'))} {state.count}"
+            )
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {state.count}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(state.sum)}"
+            )
+
+        return lines
+
+
+TMetric = TypeVar("TMetric", bound=_Metric)
+
+
+class MetricsRegistry:
+    """Holds the server's performance counters and renders them in OpenMetrics text format"""
+
+    CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+    def __init__(self, namespace: str = "parlant") -> None:
+        self._namespace = namespace
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+    ) -> Counter:
+        return self._get_or_create(Counter, name, lambda n: Counter(n, description, labels))
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        callback: Callable[[], Mapping[LabelValues, float]] | None = None,
+    ) -> Gauge:
+        return self._get_or_create(
+            Gauge, name, lambda n: Gauge(n, description, labels, callback=callback)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_DURATION_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, lambda n: Histogram(n, description, labels, buckets=buckets)
+        )
+
+    def find(self, name: str) -> _Metric | None:
+        with self._lock:
+            return self._metrics.get(self._full_name(name))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+
+        lines = [line for metric in metrics for line in metric.render()]
+        lines.append("# EOF")
+
+        return "\n".join(lines) + "\n"
+
+    def _full_name(self, name: str) -> str:
+        return f"{self._namespace}_{name}" if self._namespace else name
+
+    def _get_or_create(
+        self,
+        metric_type: type[TMetric],
+        name: str,
+        factory: Callable[[str], TMetric],
+    ) -> TMetric:
+        full_name = self._full_name(name)
+
+        with self._lock:
+            if existing := self._metrics.get(full_name):
+                if not isinstance(existing, metric_type):
+                    raise ValueError(
+                        f"Metric '{full_name}' is already registered as a {existing.TYPE}"
+                    )
+                return existing
+
+            metric = factory(full_name)
+            self._metrics[full_name] = metric
+            return metric
+
+
+class MetricsLogger(Logger):
+    """A logger that ignores messages and records every operation's duration as a metric"""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self._operation_durations = registry.histogram(
+            "operation_duration_seconds",
+            "Duration of operations reported through Logger.operation",
+            labels=["operation", "outcome"],
+        )
+
+    @override
+    def set_level(self, log_level: LogLevel) -> None:
+        pass
+
+    @override
+    def debug(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    def info(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    def warning(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    def error(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    def critical(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    @contextmanager
+    def operation(self, name: str, props: dict[str, Any] = {}) -> Iterator[None]:
+        t_start = time.perf_counter()
+        outcome = "success"
+
+        try:
+            yield
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            self._operation_durations.observe(
+                time.perf_counter() - t_start,
+                operation=name,
+                outcome=outcome,
+            )
 
 
 @dataclass
 class ModelMetrics:
     """Metrics for tracking model performance."""
+
     total_tokens: int = 0
     total_api_calls: int = 0
     total_time: float = 0.0
@@ -13,18 +13,56 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass
 from functools import cached_property
-from typing import Any, Generic, Mapping, Optional, TypeVar, cast, get_args
+import math
+import time
+from typing import (
+    Any,
+    Generic,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeAlias,
+    TypeVar,
+    cast,
+    get_args,
+)
 from typing_extensions import override
 
 from parlant.core.common import DefaultBaseModel
 from parlant.core.logging import Logger
+from parlant.core.metrics import Gauge, MetricsRegistry
 from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.tracing import Tracer
 
 T = TypeVar("T", bound=DefaultBaseModel)
 
 
+class Prompt(str):
+    """A prompt whose first `static_prefix_length` characters are identical across generations
+    of the same kind, and can therefore be cached by providers that support prompt caching"""
+
+    static_prefix_length: int
+
+    def __new__(cls, content: str, static_prefix_length: int = 0) -> "Prompt":
+        prompt = super().__new__(cls, content)
+        prompt.static_prefix_length = static_prefix_length
+        return prompt
+
+
+def split_prompt(prompt: str) -> tuple[str, str]:
+    """Splits a prompt into its cacheable static prefix (possibly empty) and its dynamic remainder"""
+    if isinstance(prompt, Prompt) and 0 < prompt.static_prefix_length < len(prompt):
+        return str(prompt[: prompt.static_prefix_length]), str(
+            prompt[prompt.static_prefix_length :]
+        )
+
+    return "", str(prompt)
+
+
 @dataclass(frozen=True)
 class UsageInfo:
     input_tokens: int
@@ -73,16 +111,170 @@ class SchematicGenerator(ABC, Generic[T]):
     def tokenizer(self) -> EstimatingTokenizer: ...
 
 
+CircuitState: TypeAlias = Literal["closed", "half_open", "open"]
+
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    window_size: int = 20
+    min_calls: int = 5
+    """Calls recorded before the error rate alone can open the circuit"""
+    failure_rate_threshold: float = 0.5
+    cooldown: float = 30.0
+    """Seconds an open circuit skips its generator before letting a single probe call through"""
+    rate_limit_cooldown: float = 60.0
+
+
+def _is_rate_limit_error(exc: Exception) -> bool:
+    return type(exc).__name__ == "RateLimitError" or getattr(exc, "status_code", None) == 429
+
+
+class GeneratorHealth:
+    """Recent outcomes of calls to a generator, and the state of its circuit breaker"""
+
+    def __init__(self, policy: CircuitBreakerPolicy) -> None:
+        self._policy = policy
+        self._outcomes: deque[tuple[bool, float]] = deque(maxlen=policy.window_size)
+
+        self.state: CircuitState = "closed"
+        self.rate_limited = False
+        self._blocked_until = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+
+        return sum(1 for succeeded, _ in self._outcomes if not succeeded) / len(self._outcomes)
+
+    @property
+    def p95_latency(self) -> Optional[float]:
+        if not self._outcomes:
+            return None
+
+        latencies = sorted(latency for _, latency in self._outcomes)
+        return latencies[math.ceil(0.95 * len(latencies)) - 1]
+
+    def allows_call(self, now: float) -> bool:
+        if self.state == "closed":
+            return True
+
+        if now < self._blocked_until:
+            return False
+
+        # Only one probe call at a time; if it never reports back,
+        # another one is let through after a further cooldown
+        self.state = "half_open"
+        self._blocked_until = now + self._policy.cooldown
+        return True
+
+    def record_success(self, latency: float) -> None:
+        if self.state != "closed":
+            # Failures from before the circuit opened no longer say much about the generator
+            self._outcomes.clear()
+
+        self._outcomes.append((True, latency))
+
+        self.state = "closed"
+        self.rate_limited = False
+
+    def record_failure(self, latency: float, exc: Exception) -> None:
+        self._outcomes.append((False, latency))
+        self.rate_limited = _is_rate_limit_error(exc)
+
+        if self.rate_limited:
+            self._open(self._policy.rate_limit_cooldown)
+        elif self.state == "half_open" or (
+            len(self._outcomes) >= self._policy.min_calls
+            and self.error_rate >= self._policy.failure_rate_threshold
+        ):
+            self._open(self._policy.cooldown)
+
+    def _open(self, cooldown: float) -> None:
+        self.state = "open"
+        self._blocked_until = time.monotonic() + cooldown
+
+
 class FallbackSchematicGenerator(SchematicGenerator[T]):
+    """Tries its generators in order until one succeeds.
+
+    Generators whose circuit breaker is open are skipped, unless all of them are.
+    With `route_by_latency`, generators are tried from the lowest p95 latency instead,
+    which is only appropriate when they are equivalent to one another."""
+
+    CIRCUIT_STATE_VALUES: Mapping[CircuitState, float] = {"closed": 0, "half_open": 1, "open": 2}
+
     def __init__(
         self,
         *generators: SchematicGenerator[T],
         logger: Logger,
+        circuit_breaker_policy: CircuitBreakerPolicy = CircuitBreakerPolicy(),
+        route_by_latency: bool = False,
+        metrics: Optional[MetricsRegistry] = None,
     ) -> None:
         assert generators, "Fallback generator must be instantiated with at least 1 generator"
 
         self._generators = generators
         self._logger = logger
+        self._route_by_latency = route_by_latency
+
+        self._health = [GeneratorHealth(circuit_breaker_policy) for _ in generators]
+        self._circuit_states: Optional[Gauge] = None
+
+        if metrics:
+            self.export_metrics(metrics)
+
+    @property
+    def health(self) -> Sequence[GeneratorHealth]:
+        return self._health
+
+    def export_metrics(self, metrics: MetricsRegistry) -> None:
+        self._circuit_states = metrics.gauge(
+            "llm_generator_circuit_state",
+            "Circuit breaker state of each fallback generator (0: closed, 1: half-open, 2: open)",
+            labels=["schema", "generator"],
+        )
+
+    def _publish_circuit_state(self, index: int) -> None:
+        if self._circuit_states:
+            self._circuit_states.set(
+                self.CIRCUIT_STATE_VALUES[self._health[index].state],
+                schema=self.schema.__name__,
+                generator=self._generators[index].id,
+            )
+
+    async def _try_generator(
+        self,
+        index: int,
+        prompt: str,
+        hints: Mapping[str, Any],
+    ) -> SchematicGenerationResult[T]:
+        generator = self._generators[index]
+        health = self._health[index]
+        previous_state = health.state
+        started = time.monotonic()
+
+        try:
+            result = await generator.generate(prompt=prompt, hints=hints)
+            health.record_success(time.monotonic() - started)
+            return result
+        except Exception as e:
+            health.record_failure(time.monotonic() - started, e)
+
+            self._logger.warning(
+                f"Generator {index + 1}/{len(self._generators)} failed: {type(generator).__name__}: {e}"
+            )
+
+            if health.state == "open" and previous_state != "open":
+                self._logger.warning(
+                    f"Skipping generator {index + 1}/{len(self._generators)} for a while: "
+                    f"{type(generator).__name__} (error rate: {health.error_rate:.0%}"
+                    f"{', rate-limited' if health.rate_limited else ''})"
+                )
+
+            raise
+        finally:
+            self._publish_circuit_state(index)
 
     @override
     async def generate(
@@ -90,18 +282,37 @@ class FallbackSchematicGenerator(SchematicGenerator[T]):
         prompt: str,
         hints: Mapping[str, Any] = {},
     ) -> SchematicGenerationResult[T]:
-        last_exception: Exception
+        last_exception: Optional[Exception] = None
+
+        order = list(range(len(self._generators)))
+
+        if self._route_by_latency:
+            # Generators without recorded latencies go first, so that they get measured
+            order.sort(key=lambda i: self._health[i].p95_latency or 0.0)
+
+        skipped = []
+
+        for index in order:
+            if not self._health[index].allows_call(time.monotonic()):
+                skipped.append(index)
+                continue
+
+            self._publish_circuit_state(index)
 
-        for index, generator in enumerate(self._generators):
             try:
-                result = await generator.generate(prompt=prompt, hints=hints)
-                return result
+                return await self._try_generator(index, prompt, hints)
             except Exception as e:
-                self._logger.warning(
-                    f"Generator {index + 1}/{len(self._generators)} failed: {type(generator).__name__}: {e}"
-                )
                 last_exception = e
 
+        if len(skipped) == len(order):
+            # Better to wait on a generator which has been failing than not to generate at all
+            for index in skipped:
+                try:
+                    return await self._try_generator(index, prompt, hints)
+                except Exception as e:
+                    last_exception = e
+
+        assert last_exception
         raise last_exception
 
     @property
@@ -119,3 +330,118 @@ class FallbackSchematicGenerator(SchematicGenerator[T]):
     @override
     def max_tokens(self) -> int:
         return min(*(g.max_tokens for g in self._generators))
+
+
+class MeteredSchematicGenerator(SchematicGenerator[T]):
+    """Records the duration and token usage of every generation in a metrics registry.
+
+    When given a tracer, each generation is also recorded as a span carrying its token usage.
+    """
+
+    TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+
+    def __init__(
+        self,
+        generator: SchematicGenerator[T],
+        metrics: MetricsRegistry,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
+        self._generator = generator
+        self._tracer = tracer
+
+        self._durations = metrics.histogram(
+            "llm_generation_duration_seconds",
+            "Duration of schematic generations",
+            labels=["schema", "model"],
+        )
+        self._input_tokens = metrics.histogram(
+            "llm_generation_input_tokens",
+            "Input tokens consumed per schematic generation",
+            labels=["schema", "model"],
+            buckets=self.TOKEN_BUCKETS,
+        )
+        self._tokens = metrics.counter(
+            "llm_tokens",
+            "Tokens consumed by schematic generations",
+            labels=["schema", "model", "kind"],
+        )
+        self._failures = metrics.counter(
+            "llm_generation_failures",
+            "Schematic generations that raised an error",
+            labels=["schema", "model"],
+        )
+
+    @override
+    async def generate(
+        self,
+        prompt: str,
+        hints: Mapping[str, Any] = {},
+    ) -> SchematicGenerationResult[T]:
+        if not self._tracer:
+            return self._record(await self._do_generate(prompt, hints))
+
+        with self._tracer.span(
+            "[SchematicGenerator] Generating",
+            {"schema": self.schema.__name__, "model": self.id},
+        ) as span:
+            result = self._record(await self._do_generate(prompt, hints))
+
+            span.set_attributes(
+                {
+                    "input_tokens": result.info.usage.input_tokens,
+                    "output_tokens": result.info.usage.output_tokens,
+                    **(result.info.usage.extra or {}),
+                }
+            )
+
+            return result
+
+    async def _do_generate(
+        self,
+        prompt: str,
+        hints: Mapping[str, Any],
+    ) -> SchematicGenerationResult[T]:
+        try:
+            return await self._generator.generate(prompt=prompt, hints=hints)
+        except Exception:
+            self._failures.inc(schema=self.schema.__name__, model=self.id)
+            raise
+
+    def _record(self, result: SchematicGenerationResult[T]) -> SchematicGenerationResult[T]:
+        info = result.info
+
+        self._durations.observe(info.duration, schema=info.schema_name, model=info.model)
+        self._input_tokens.observe(
+            info.usage.input_tokens, schema=info.schema_name, model=info.model
+        )
+        self._tokens.inc(
+            info.usage.input_tokens, schema=info.schema_name, model=info.model, kind="input"
+        )
+        self._tokens.inc(
+            info.usage.output_tokens, schema=info.schema_name, model=info.model, kind="output"
+        )
+
+        for kind, amount in (info.usage.extra or {}).items():
+            self._tokens.inc(amount, schema=info.schema_name, model=info.model, kind=kind)
+
+        return result
+
+    @property
+    @override
+    def schema(self) -> type[T]:  # type: ignore[override]
+        return self._generator.schema
+
+    @property
+    @override
+    def id(self) -> str:
+        return self._generator.id
+
+    @property
+    @override
+    def tokenizer(self) -> EstimatingTokenizer:
+        return self._generator.tokenizer
+
+    @property
+    @override
+    def max_tokens(self) -> int:
+        return self._generator.max_tokens
@@ -13,7 +13,10 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
+import hashlib
+import time
 from typing import Literal, TypeAlias
 from typing_extensions import override
 
@@ -50,3 +53,53 @@ class NoModeration(ModerationService):
         content: str,
     ) -> ModerationCheck:
         return ModerationCheck(flagged=False, tags=[])
+
+
+class CachedModerationService(ModerationService):
+    """Remembers the verdicts of another moderation service for a while,
+    so that recurring messages ("hi", "thanks") aren't sent for moderation again"""
+
+    DEFAULT_TTL = 600.0
+    DEFAULT_MAX_SIZE = 4096
+
+    def __init__(
+        self,
+        moderation_service: ModerationService,
+        ttl: float = DEFAULT_TTL,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        self._moderation_service = moderation_service
+        self._ttl = ttl
+        self._max_size = max_size
+
+        self._verdicts: OrderedDict[str, tuple[float, ModerationCheck]] = OrderedDict()
+
+    @staticmethod
+    def _key(content: str) -> str:
+        normalized = " ".join(content.casefold().split())
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    @override
+    async def check(
+        self,
+        content: str,
+    ) -> ModerationCheck:
+        key = self._key(content)
+
+        if cached := self._verdicts.get(key):
+            expires_at, check = cached
+
+            if time.monotonic() < expires_at:
+                self._verdicts.move_to_end(key)
+                return check
+
+            del self._verdicts[key]
+
+        check = await self._moderation_service.check(content)
+
+        self._verdicts[key] = (time.monotonic() + self._ttl, check)
+
+        if len(self._verdicts) > self._max_size:
+            self._verdicts.popitem(last=False)
+
+        return check
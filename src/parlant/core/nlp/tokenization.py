@@ -13,8 +13,82 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+import hashlib
+import math
+from typing import Sequence
+from typing_extensions import Self, override
 
 
 class EstimatingTokenizer(ABC):
     @abstractmethod
     async def estimate_token_count(self, prompt: str) -> int: ...
+
+
+class MemoizingTokenizer(EstimatingTokenizer):
+    """Remembers the counts of recently estimated texts, keyed by their hash.
+
+    Prompts are largely made up of the same events and guidelines from turn to turn,
+    so most counts can be answered without going to the underlying tokenizer.
+    """
+
+    def __init__(self, tokenizer: EstimatingTokenizer, capacity: int = 10_000) -> None:
+        self.tokenizer = tokenizer
+        self._capacity = capacity
+        self._counts: OrderedDict[bytes, int] = OrderedDict()
+
+    @override
+    async def estimate_token_count(self, prompt: str) -> int:
+        key = hashlib.md5(prompt.encode()).digest()
+
+        if (count := self._counts.get(key)) is not None:
+            self._counts.move_to_end(key)
+            return count
+
+        count = await self.tokenizer.estimate_token_count(prompt)
+
+        self._counts[key] = count
+
+        if len(self._counts) > self._capacity:
+            self._counts.popitem(last=False)
+
+        return count
+
+
+class ApproximateTokenizer(EstimatingTokenizer):
+    """Estimates token counts locally, from a text's size in bytes and in words.
+
+    The larger of the two estimates is used, so that both prose and dense text
+    (code, JSON, non-Latin scripts) tend to be overestimated rather than underestimated.
+    Use an exact tokenizer wherever a count must not exceed a model's actual limit.
+    """
+
+    def __init__(self, bytes_per_token: float, tokens_per_word: float) -> None:
+        self.bytes_per_token = bytes_per_token
+        self.tokens_per_word = tokens_per_word
+
+    @classmethod
+    async def calibrate(
+        cls,
+        tokenizer: EstimatingTokenizer,
+        samples: Sequence[str],
+    ) -> Self:
+        """Derives the ratios from the counts of an exact tokenizer over some sample texts"""
+        tokens = sum([await tokenizer.estimate_token_count(s) for s in samples])
+
+        if not tokens:
+            raise ValueError("Calibration samples must contain at least one token")
+
+        return cls(
+            bytes_per_token=sum(len(s.encode()) for s in samples) / tokens,
+            tokens_per_word=tokens / max(sum(len(s.split()) for s in samples), 1),
+        )
+
+    @override
+    async def estimate_token_count(self, prompt: str) -> int:
+        return math.ceil(
+            max(
+                len(prompt.encode()) / self.bytes_per_token,
+                len(prompt.split()) * self.tokens_per_word,
+            )
+        )
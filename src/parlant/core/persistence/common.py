@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Callable, Mapping, NewType, Union, cast, get_type_hints
+from typing import Any, Callable, Mapping, NewType, Sequence, TypeVar, Union, cast, get_type_hints
 from typing_extensions import Literal, TypedDict
 
 
 ObjectId = NewType("ObjectId", str)
 
+TMapping = TypeVar("TMapping", bound=Mapping[str, Any])
+
 # Metadata Query Grammar
 LiteralValue = Union[str, int, float, bool]
 
@@ -99,6 +101,40 @@ def matches_filters(
     return True
 
 
+def sort_documents(
+    documents: Sequence[TMapping],
+    sort: Sequence[FieldName],
+) -> list[TMapping]:
+    """Orders documents by the given fields, keeping their original order on ties.
+
+    Documents missing a field sort before those that have it, as they do in SQLite.
+    """
+    return sorted(
+        documents,
+        key=lambda d: tuple((d.get(f) is not None, d.get(f)) for f in sort),
+    )
+
+
+def keyset_filters(
+    sort: Sequence[FieldName],
+    after: Mapping[str, Any],
+) -> Where:
+    """Matches the documents that follow the given one when ordered by the given fields,
+    which should end with a unique field so that pages neither skip nor repeat documents"""
+    return cast(
+        Where,
+        {
+            "$or": [
+                {
+                    **{f: {"$eq": after[f]} for f in sort[:i]},
+                    sort[i]: {"$gt": after[sort[i]]},
+                }
+                for i in range(len(sort))
+            ]
+        },
+    )
+
+
 def ensure_is_total(document: Mapping[str, Any], schema: type[Mapping[str, Any]]) -> None:
     type_hints = get_type_hints(schema)
 
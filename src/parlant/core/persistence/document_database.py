@@ -23,7 +23,7 @@ from typing import (
     TypedDict,
 )
 
-from parlant.core.persistence.common import ObjectId, Where
+from parlant.core.persistence.common import FieldName, ObjectId, Where
 from parlant.core.common import Version
 
 
@@ -104,8 +104,13 @@ class DocumentCollection(ABC, Generic[TDocument]):
     async def find(
         self,
         filters: Where,
+        sort: Sequence[FieldName] = [],
+        limit: Optional[int] = None,
     ) -> Sequence[TDocument]:
-        """Finds all documents that match the given filters."""
+        """Finds all documents that match the given filters.
+
+        Documents are returned in ascending order of the given sort fields,
+        or in insertion order if none are given, up to the given limit."""
         ...
 
     @abstractmethod
@@ -124,6 +129,14 @@ class DocumentCollection(ABC, Generic[TDocument]):
         """Inserts a single document into the collection."""
         ...
 
+    @abstractmethod
+    async def insert_many(
+        self,
+        documents: Sequence[TDocument],
+    ) -> InsertResult:
+        """Inserts several documents into the collection in a single write."""
+        ...
+
     @abstractmethod
     async def update_one(
         self,
@@ -142,3 +155,11 @@ class DocumentCollection(ABC, Generic[TDocument]):
     ) -> DeleteResult[TDocument]:
         """Deletes the first document that matches the query criteria."""
         ...
+
+    @abstractmethod
+    async def delete_many(
+        self,
+        filters: Where,
+    ) -> DeleteResult[TDocument]:
+        """Deletes all documents that match the query criteria in a single write."""
+        ...
@@ -0,0 +1,139 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import ABC, abstractmethod
+from typing import Mapping, Optional, Sequence, get_args
+from typing_extensions import Literal, override, TypedDict, Self
+
+from parlant.core.async_utils import ReaderWriterLock
+from parlant.core.common import Version, generate_id
+from parlant.core.persistence.common import ObjectId
+from parlant.core.persistence.document_database import DocumentCollection, DocumentDatabase
+
+Resource = Literal[
+    "agents",
+    "customers",
+    "fragments",
+    "glossary",
+    "guidelines",
+    "guideline_connections",
+    "guideline_tool_associations",
+    "services",
+    "sessions",
+]
+
+
+class ResourceVersionStore(ABC):
+    """Tracks the version of each kind of resource, which stores change whenever they write it,
+    so that readers can tell whether anything changed since they last read it"""
+
+    @abstractmethod
+    async def read_versions(
+        self,
+        resources: Sequence[Resource],
+    ) -> Mapping[Resource, str]: ...
+
+    @abstractmethod
+    async def bump_version(
+        self,
+        resource: Resource,
+    ) -> str: ...
+
+
+class _ResourceVersionDocument(TypedDict, total=False):
+    id: ObjectId
+    version: Version.String
+    resource_version: str
+
+
+class ResourceVersionDocumentStore(ResourceVersionStore):
+    VERSION = Version.from_string("0.1.0")
+
+    def __init__(self, database: DocumentDatabase) -> None:
+        self._database = database
+        self._collection: DocumentCollection[_ResourceVersionDocument]
+
+        self._lock = ReaderWriterLock()
+
+    async def __aenter__(self) -> Self:
+        self._collection = await self._database.get_or_create_collection(
+            name="resource_versions",
+            schema=_ResourceVersionDocument,
+        )
+
+        await self._record_missing_versions()
+
+        return self
+
+    async def _record_missing_versions(self) -> None:
+        # Every resource gets a version once, rather than each process making one up for
+        # resources nobody wrote yet, so that all processes agree on it. Processes which
+        # race to record the same one merely bump it twice.
+        recorded = {d["id"] for d in await self._collection.find({})}
+
+        for resource in get_args(Resource):
+            if ObjectId(resource) not in recorded:
+                await self._collection.update_one(
+                    filters={"id": {"$eq": resource}},
+                    params=_ResourceVersionDocument(
+                        id=ObjectId(resource),
+                        version=self.VERSION.to_string(),
+                        resource_version=generate_id(),
+                    ),
+                    upsert=True,
+                )
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[object],
+    ) -> None:
+        pass
+
+    @override
+    async def read_versions(
+        self,
+        resources: Sequence[Resource],
+    ) -> Mapping[Resource, str]:
+        async with self._lock.reader_lock:
+            documents = await self._collection.find(
+                {"$or": [{"id": {"$eq": r}} for r in resources]}
+            )
+
+        versions = {d["id"]: d["resource_version"] for d in documents}
+
+        return {r: versions[ObjectId(r)] for r in resources}
+
+    @override
+    async def bump_version(
+        self,
+        resource: Resource,
+    ) -> str:
+        # Versions are random rather than incremented, so that concurrent writers
+        # (possibly in other server processes) can never end up at the same version
+        resource_version = generate_id()
+
+        async with self._lock.writer_lock:
+            await self._collection.update_one(
+                filters={"id": {"$eq": resource}},
+                params=_ResourceVersionDocument(
+                    id=ObjectId(resource),
+                    version=self.VERSION.to_string(),
+                    resource_version=resource_version,
+                ),
+                upsert=True,
+            )
+
+        return resource_version
@@ -12,13 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import asyncio
-import hashlib
-from typing import Any, Iterable, Optional, OrderedDict, Sequence, cast
+from collections import deque
+from dataclasses import replace
+from typing import Awaitable, Callable, Mapping, Optional, OrderedDict, Sequence, cast
 
 from parlant.core import async_utils
 from parlant.core.agents import Agent, AgentStore
-from parlant.core.background_tasks import BackgroundTaskService
+from parlant.core.common import JSONSerializable
 from parlant.core.evaluations import (
     CoherenceCheck,
     ConnectionProposition,
@@ -36,11 +36,16 @@ from parlant.core.guidelines import Guideline, GuidelineContent, GuidelineStore,
 from parlant.core.services.indexing.coherence_checker import (
     CoherenceChecker,
 )
-from parlant.core.services.indexing.common import ProgressReport
+from parlant.core.services.indexing.common import ProgressReport, md5_checksum
 from parlant.core.services.indexing.guideline_connection_proposer import (
     GuidelineConnectionProposer,
 )
 from parlant.core.logging import Logger
+from parlant.core.task_queue import TaskQueueConsumer
+
+
+DEFAULT_MAX_CONCURRENT_PAYLOADS = 4
+MAX_CONCURRENT_EVALUATIONS = 4
 
 
 class EvaluationError(Exception):
@@ -53,11 +58,12 @@ class EvaluationValidationError(Exception):
         super().__init__(message)
 
 
-def md5_checksum(input: str) -> str:
-    md5_hash = hashlib.md5()
-    md5_hash.update(input.encode("utf-8"))
+def _content_key(content: GuidelineContent) -> str:
+    return f"{content.condition}{content.action}"
 
-    return md5_hash.hexdigest()
+
+async def _do_nothing(_: float) -> None:
+    pass
 
 
 class GuidelineEvaluator:
@@ -67,97 +73,91 @@ class GuidelineEvaluator:
         guideline_store: GuidelineStore,
         guideline_connection_proposer: GuidelineConnectionProposer,
         coherence_checker: CoherenceChecker,
+        max_concurrent_payloads: int = DEFAULT_MAX_CONCURRENT_PAYLOADS,
     ) -> None:
         self._logger = logger
         self._guideline_store = guideline_store
         self._guideline_connection_proposer = guideline_connection_proposer
         self._coherence_checker = coherence_checker
+        self._max_concurrent_payloads = max_concurrent_payloads
 
     async def evaluate(
         self,
         agent: Agent,
         payloads: Sequence[Payload],
         progress_report: ProgressReport,
+        exhaustive: bool = False,
+        checkpoints: Sequence[Optional[InvoiceGuidelineData]] = [],
+        on_checkpoint: Optional[Callable[[int, InvoiceGuidelineData], Awaitable[None]]] = None,
     ) -> Sequence[InvoiceGuidelineData]:
-        existing_guidelines = await self._guideline_store.list_guidelines(guideline_set=agent.id)
+        """Checks each payload against the payloads following it and the existing guidelines.
 
-        tasks: list[asyncio.Task[Any]] = []
-        coherence_checks_task: Optional[
-            asyncio.Task[Optional[Iterable[Sequence[CoherenceCheck]]]]
-        ] = None
-
-        connection_propositions_task: Optional[
-            asyncio.Task[Optional[Iterable[Sequence[ConnectionProposition]]]]
-        ] = None
+        Payloads are checked by a bounded pool of workers. Whenever a payload is done,
+        its findings are passed to `on_checkpoint`, and payloads with a checkpoint
+        (from an earlier, interrupted run) aren't checked again.
+        """
+        existing_guidelines = await self._guideline_store.list_guidelines(guideline_set=agent.id)
 
-        coherence_checks_task = asyncio.create_task(
-            self._check_payloads_coherence(
-                agent,
-                payloads,
-                existing_guidelines,
-                progress_report,
-            )
+        coherence_comparison_guidelines = self._get_coherence_comparison_guidelines(
+            agent, payloads, existing_guidelines
         )
-        tasks.append(coherence_checks_task)
-
-        connection_propositions_task = asyncio.create_task(
-            self._propose_payloads_connections(
-                agent,
-                payloads,
-                existing_guidelines,
-                progress_report,
-            )
+        connection_comparison_guidelines = self._get_connection_comparison_guidelines(
+            payloads, existing_guidelines
         )
-        tasks.append(connection_propositions_task)
 
-        if tasks:
-            await async_utils.safe_gather(*tasks)
+        results: list[Optional[InvoiceGuidelineData]] = [
+            checkpoints[i] if i < len(checkpoints) else None for i in range(len(payloads))
+        ]
+        pending = deque(i for i, result in enumerate(results) if result is None)
+
+        await progress_report.stretch(len(payloads))
+        await progress_report.increment(len(payloads) - len(pending))
+
+        async def worker() -> None:
+            while pending:
+                i = pending.popleft()
+
+                # Only what was pruned is reported from each payload's checks,
+                # as progress is reported per payload
+                payload_progress_report = ProgressReport(_do_nothing)
+
+                result = await self._evaluate_payload(
+                    agent,
+                    payloads,
+                    i,
+                    coherence_comparison_guidelines,
+                    connection_comparison_guidelines,
+                    payload_progress_report,
+                    exhaustive,
+                )
 
-        coherence_checks: Optional[Iterable[Sequence[CoherenceCheck]]] = []
-        if coherence_checks_task:
-            coherence_checks = coherence_checks_task.result()
+                results[i] = result
 
-        connection_propositions: Optional[Iterable[Sequence[ConnectionProposition]]] = None
-        if connection_propositions_task:
-            connection_propositions = connection_propositions_task.result()
+                if on_checkpoint:
+                    await on_checkpoint(i, result)
 
-        if coherence_checks:
-            return [
-                InvoiceGuidelineData(
-                    coherence_checks=payload_coherence_checks,
-                    connection_propositions=None,
-                )
-                for payload_coherence_checks in coherence_checks
-            ]
+                if payload_progress_report.pruned_pairs:
+                    await progress_report.prune(payload_progress_report.pruned_pairs)
 
-        elif connection_propositions:
-            return [
-                InvoiceGuidelineData(
-                    coherence_checks=[],
-                    connection_propositions=payload_connection_propositions,
-                )
-                for payload_connection_propositions in connection_propositions
-            ]
+                await progress_report.increment()
 
-        else:
-            return [
-                InvoiceGuidelineData(
-                    coherence_checks=[],
-                    connection_propositions=None,
-                )
-                for _ in payloads
-            ]
+        with self._logger.operation(
+            "[GuidelineEvaluator] Evaluating payloads",
+            {"payloads": len(payloads), "pending": len(pending)},
+        ):
+            await async_utils.safe_gather(
+                *[worker() for _ in range(min(self._max_concurrent_payloads, len(pending)))]
+            )
 
-    async def _check_payloads_coherence(
+        return self._aggregate_results(payloads, [cast(InvoiceGuidelineData, r) for r in results])
+
+    def _get_coherence_comparison_guidelines(
         self,
         agent: Agent,
         payloads: Sequence[Payload],
         existing_guidelines: Sequence[Guideline],
-        progress_report: ProgressReport,
-    ) -> Optional[Iterable[Sequence[CoherenceCheck]]]:
-        guidelines_to_evaluate = [p.content for p in payloads if p.coherence_check]
-
-        guidelines_to_skip = [(p.content, False) for p in payloads if not p.coherence_check]
+    ) -> list[GuidelineContent]:
+        guidelines_to_skip = [p.content for p in payloads if not p.coherence_check]
 
         updated_ids = {cast(GuidelineId, p.updated_id) for p in payloads if p.operation == "update"}
 
@@ -166,7 +166,7 @@ class GuidelineEvaluator:
         for g in existing_guidelines:
             if g.id not in updated_ids:
                 remaining_existing_guidelines.append(
-                    (GuidelineContent(condition=g.content.condition, action=g.content.action), True)
+                    GuidelineContent(condition=g.content.condition, action=g.content.action)
                 )
             else:
                 updated_ids.remove(g.id)
@@ -176,163 +176,195 @@ class GuidelineEvaluator:
                 f"Guideline ID(s): {', '.join(list(updated_ids))} in '{agent.id}' agent do not exist."
             )
 
-        comparison_guidelines = guidelines_to_skip + remaining_existing_guidelines
-
-        incoherences = await self._coherence_checker.propose_incoherencies(
-            agent=agent,
-            guidelines_to_evaluate=guidelines_to_evaluate,
-            comparison_guidelines=[g for g, _ in comparison_guidelines],
-            progress_report=progress_report,
-        )
-
-        if not incoherences:
-            return None
-
-        coherence_checks_by_guideline_payload: OrderedDict[str, list[CoherenceCheck]] = OrderedDict(
-            {f"{p.content.condition}{p.content.action}": [] for p in payloads}
-        )
-
-        guideline_payload_is_skipped_pairs = {
-            f"{p.content.condition}{p.content.action}": p.coherence_check for p in payloads
-        }
-
-        for c in incoherences:
-            if (
-                f"{c.guideline_a.condition}{c.guideline_a.action}"
-                in coherence_checks_by_guideline_payload
-                and guideline_payload_is_skipped_pairs[
-                    f"{c.guideline_a.condition}{c.guideline_a.action}"
-                ]
-            ):
-                coherence_checks_by_guideline_payload[
-                    f"{c.guideline_a.condition}{c.guideline_a.action}"
-                ].append(
-                    CoherenceCheck(
-                        kind="contradiction_with_another_evaluated_guideline"
-                        if f"{c.guideline_b.condition}{c.guideline_b.action}"
-                        in coherence_checks_by_guideline_payload
-                        else "contradiction_with_existing_guideline",
-                        first=c.guideline_a,
-                        second=c.guideline_b,
-                        issue=c.actions_contradiction_rationale,
-                        severity=c.actions_contradiction_severity,
-                    )
-                )
+        return guidelines_to_skip + remaining_existing_guidelines
 
-            if (
-                f"{c.guideline_b.condition}{c.guideline_b.action}"
-                in coherence_checks_by_guideline_payload
-                and guideline_payload_is_skipped_pairs[
-                    f"{c.guideline_b.condition}{c.guideline_b.action}"
-                ]
-            ):
-                coherence_checks_by_guideline_payload[
-                    f"{c.guideline_b.condition}{c.guideline_b.action}"
-                ].append(
-                    CoherenceCheck(
-                        kind="contradiction_with_another_evaluated_guideline",
-                        first=c.guideline_a,
-                        second=c.guideline_b,
-                        issue=c.actions_contradiction_rationale,
-                        severity=c.actions_contradiction_severity,
-                    )
-                )
-
-        return coherence_checks_by_guideline_payload.values()
-
-    async def _propose_payloads_connections(
+    def _get_connection_comparison_guidelines(
         self,
-        agent: Agent,
         payloads: Sequence[Payload],
         existing_guidelines: Sequence[Guideline],
-        progress_report: ProgressReport,
-    ) -> Optional[Iterable[Sequence[ConnectionProposition]]]:
-        proposed_guidelines = [p.content for p in payloads if p.connection_proposition]
-
-        guidelines_to_skip = [(p.content, False) for p in payloads if not p.connection_proposition]
+    ) -> list[GuidelineContent]:
+        guidelines_to_skip = [p.content for p in payloads if not p.connection_proposition]
 
         updated_ids = {p.updated_id for p in payloads if p.operation == "update"}
 
         remaining_existing_guidelines = [
-            (GuidelineContent(condition=g.content.condition, action=g.content.action), True)
+            GuidelineContent(condition=g.content.condition, action=g.content.action)
             for g in existing_guidelines
             if g.id not in updated_ids
         ]
 
-        comparison_guidelines = guidelines_to_skip + remaining_existing_guidelines
+        return guidelines_to_skip + remaining_existing_guidelines
+
+    async def _evaluate_payload(
+        self,
+        agent: Agent,
+        payloads: Sequence[Payload],
+        index: int,
+        coherence_comparison_guidelines: Sequence[GuidelineContent],
+        connection_comparison_guidelines: Sequence[GuidelineContent],
+        progress_report: ProgressReport,
+        exhaustive: bool,
+    ) -> InvoiceGuidelineData:
+        """Returns the findings of the checks between the payload and the ones following it
+        (or the existing guidelines), each from the payload's own point of view"""
+        payload = payloads[index]
+        payload_contents = {_content_key(p.content) for p in payloads}
+
+        async def check_coherence() -> list[CoherenceCheck]:
+            if not payload.coherence_check:
+                return []
+
+            incoherences = await self._coherence_checker.propose_incoherencies(
+                agent=agent,
+                guidelines_to_evaluate=[payload.content],
+                comparison_guidelines=[
+                    *[p.content for p in payloads[index + 1 :] if p.coherence_check],
+                    *coherence_comparison_guidelines,
+                ],
+                progress_report=progress_report,
+                exhaustive=exhaustive,
+            )
+
+            return [
+                CoherenceCheck(
+                    kind="contradiction_with_another_evaluated_guideline"
+                    if _content_key(c.guideline_b) in payload_contents
+                    else "contradiction_with_existing_guideline",
+                    first=c.guideline_a,
+                    second=c.guideline_b,
+                    issue=c.actions_contradiction_rationale,
+                    severity=c.actions_contradiction_severity,
+                )
+                for c in incoherences
+            ]
+
+        async def propose_connections() -> list[ConnectionProposition]:
+            if not payload.connection_proposition:
+                return []
 
-        connection_propositions = [
-            p
-            for p in await self._guideline_connection_proposer.propose_connections(
+            propositions = await self._guideline_connection_proposer.propose_connections(
                 agent,
-                introduced_guidelines=proposed_guidelines,
-                existing_guidelines=[g for g, _ in comparison_guidelines],
+                introduced_guidelines=[payload.content],
+                existing_guidelines=[
+                    *[p.content for p in payloads[index + 1 :] if p.connection_proposition],
+                    *connection_comparison_guidelines,
+                ],
                 progress_report=progress_report,
             )
-            if p.score >= 6
-        ]
 
-        if not connection_propositions:
-            return None
+            return [
+                ConnectionProposition(
+                    check_kind="connection_with_another_evaluated_guideline"
+                    if _content_key(c.source) in payload_contents
+                    and _content_key(c.target) in payload_contents
+                    else "connection_with_existing_guideline",
+                    source=c.source,
+                    target=c.target,
+                )
+                for c in propositions
+                if c.score >= 6
+            ]
+
+        coherence_checks, connection_propositions = await async_utils.safe_gather(
+            check_coherence(),
+            propose_connections(),
+        )
+
+        return InvoiceGuidelineData(
+            coherence_checks=coherence_checks,
+            connection_propositions=connection_propositions,
+        )
+
+    def _aggregate_results(
+        self,
+        payloads: Sequence[Payload],
+        results: Sequence[InvoiceGuidelineData],
+    ) -> Sequence[InvoiceGuidelineData]:
+        """Attributes each finding to the evaluated payloads on both of its sides"""
+        coherence_checks_by_guideline_payload: OrderedDict[str, list[CoherenceCheck]] = OrderedDict(
+            {_content_key(p.content): [] for p in payloads}
+        )
+        coherence_checked_payloads = {
+            _content_key(p.content) for p in payloads if p.coherence_check
+        }
 
         connection_results_by_guideline_payload: OrderedDict[str, list[ConnectionProposition]] = (
-            OrderedDict({f"{p.content.condition}{p.content.action}": [] for p in payloads})
+            OrderedDict({_content_key(p.content): [] for p in payloads})
         )
-        guideline_payload_is_skipped_pairs = {
-            f"{p.content.condition}{p.content.action}": p.connection_proposition for p in payloads
+        connection_checked_payloads = {
+            _content_key(p.content) for p in payloads if p.connection_proposition
         }
 
-        for c in connection_propositions:
-            if (
-                f"{c.source.condition}{c.source.action}" in connection_results_by_guideline_payload
-                and guideline_payload_is_skipped_pairs[f"{c.source.condition}{c.source.action}"]
-            ):
-                connection_results_by_guideline_payload[
-                    f"{c.source.condition}{c.source.action}"
-                ].append(
-                    ConnectionProposition(
-                        check_kind="connection_with_another_evaluated_guideline"
-                        if f"{c.target.condition}{c.target.action}"
-                        in connection_results_by_guideline_payload
-                        else "connection_with_existing_guideline",
-                        source=c.source,
-                        target=c.target,
+        incoherences_found = False
+        connections_found = False
+
+        for result in results:
+            for c in result.coherence_checks:
+                incoherences_found = True
+
+                if _content_key(c.first) in coherence_checked_payloads:
+                    coherence_checks_by_guideline_payload[_content_key(c.first)].append(c)
+
+                if _content_key(c.second) in coherence_checked_payloads:
+                    coherence_checks_by_guideline_payload[_content_key(c.second)].append(
+                        CoherenceCheck(
+                            kind="contradiction_with_another_evaluated_guideline",
+                            first=c.first,
+                            second=c.second,
+                            issue=c.issue,
+                            severity=c.severity,
+                        )
                     )
+
+            for p in result.connection_propositions or []:
+                connections_found = True
+
+                for side in (p.source, p.target):
+                    if _content_key(side) in connection_checked_payloads:
+                        connection_results_by_guideline_payload[_content_key(side)].append(p)
+
+        if incoherences_found:
+            return [
+                InvoiceGuidelineData(
+                    coherence_checks=payload_coherence_checks,
+                    connection_propositions=None,
                 )
+                for payload_coherence_checks in coherence_checks_by_guideline_payload.values()
+            ]
 
-            if (
-                f"{c.target.condition}{c.target.action}" in connection_results_by_guideline_payload
-                and guideline_payload_is_skipped_pairs[f"{c.target.condition}{c.target.action}"]
-            ):
-                connection_results_by_guideline_payload[
-                    f"{c.target.condition}{c.target.action}"
-                ].append(
-                    ConnectionProposition(
-                        check_kind="connection_with_another_evaluated_guideline"
-                        if f"{c.source.condition}{c.source.action}"
-                        in connection_results_by_guideline_payload
-                        else "connection_with_existing_guideline",
-                        source=c.source,
-                        target=c.target,
-                    )
+        elif connections_found:
+            return [
+                InvoiceGuidelineData(
+                    coherence_checks=[],
+                    connection_propositions=payload_connection_propositions,
                 )
+                for payload_connection_propositions in connection_results_by_guideline_payload.values()
+            ]
 
-        return connection_results_by_guideline_payload.values()
+        else:
+            return [
+                InvoiceGuidelineData(
+                    coherence_checks=[],
+                    connection_propositions=None,
+                )
+                for _ in payloads
+            ]
 
 
 class BehavioralChangeEvaluator:
     def __init__(
         self,
         logger: Logger,
-        background_task_service: BackgroundTaskService,
+        task_queue_consumer: TaskQueueConsumer,
         agent_store: AgentStore,
         evaluation_store: EvaluationStore,
         guideline_store: GuidelineStore,
         guideline_connection_proposer: GuidelineConnectionProposer,
         coherence_checker: CoherenceChecker,
+        max_concurrent_payloads: int = DEFAULT_MAX_CONCURRENT_PAYLOADS,
     ) -> None:
         self._logger = logger
-        self._background_task_service = background_task_service
+        self._task_queue_consumer = task_queue_consumer
         self._agent_store = agent_store
         self._evaluation_store = evaluation_store
         self._guideline_store = guideline_store
@@ -341,6 +373,15 @@ class BehavioralChangeEvaluator:
             guideline_store=guideline_store,
             guideline_connection_proposer=guideline_connection_proposer,
             coherence_checker=coherence_checker,
+            max_concurrent_payloads=max_concurrent_payloads,
+        )
+
+        # Evaluations are long and run many requests of their own,
+        # so only a few of them run at a time, apart from session processing
+        task_queue_consumer.register_handler(
+            "evaluation",
+            self._handle_evaluation_task,
+            concurrency=MAX_CONCURRENT_EVALUATIONS,
         )
 
     async def validate_payloads(
@@ -380,21 +421,39 @@ class BehavioralChangeEvaluator:
         self,
         agent: Agent,
         payload_descriptors: Sequence[PayloadDescriptor],
+        exhaustive: bool = False,
     ) -> EvaluationId:
         await self.validate_payloads(agent, payload_descriptors)
 
         evaluation = await self._evaluation_store.create_evaluation(
             agent.id,
             payload_descriptors,
+            exhaustive=exhaustive,
         )
 
-        await self._background_task_service.start(
-            self.run_evaluation(evaluation),
-            tag=f"evaluation({evaluation.id})",
-        )
+        await self.schedule_evaluation(evaluation.id)
 
         return evaluation.id
 
+    async def schedule_evaluation(self, evaluation_id: EvaluationId) -> None:
+        await self._task_queue_consumer.submit(
+            "evaluation",
+            tag=f"evaluation({evaluation_id})",
+            payload={"evaluation_id": evaluation_id},
+            supersede=False,
+        )
+
+    async def _handle_evaluation_task(self, payload: JSONSerializable) -> None:
+        evaluation = await self._evaluation_store.read_evaluation(
+            EvaluationId(cast(Mapping[str, str], payload)["evaluation_id"])
+        )
+
+        # Tasks are delivered at least once, so this one may have already run
+        if evaluation.status in [EvaluationStatus.COMPLETED, EvaluationStatus.FAILED]:
+            return
+
+        await self.run_evaluation(evaluation)
+
     async def run_evaluation(
         self,
         evaluation: Evaluation,
@@ -402,22 +461,29 @@ class BehavioralChangeEvaluator:
         async def _update_progress(percentage: float) -> None:
             await self._evaluation_store.update_evaluation(
                 evaluation_id=evaluation.id,
-                params={"progress": percentage},
+                params={
+                    "progress": percentage,
+                    "pruned_pairs": progress_report.pruned_pairs,
+                },
+            )
+
+        async def _save_checkpoint(index: int, data: InvoiceGuidelineData) -> None:
+            await self._evaluation_store.update_invoice(
+                evaluation_id=evaluation.id,
+                invoice_index=index,
+                invoice=replace(evaluation.invoices[index], checkpoint=data),
             )
 
         progress_report = ProgressReport(_update_progress)
 
-        try:
-            if running_task := next(
-                iter(
-                    e
-                    for e in await self._evaluation_store.list_evaluations()
-                    if e.status == EvaluationStatus.RUNNING and e.id != evaluation.id
-                ),
-                None,
-            ):
-                raise EvaluationError(f"An evaluation task '{running_task.id}' is already running.")
+        # Pairs pruned by payloads that were checked before an interruption still count
+        if evaluation.pruned_pairs:
+            await progress_report.prune(evaluation.pruned_pairs)
 
+        try:
+            # The task queue limits how many evaluations run at once (see MAX_CONCURRENT_EVALUATIONS),
+            # so any others wait for their turn instead of failing. That includes those recovered
+            # after a restart, whose status may still say that they're running.
             await self._evaluation_store.update_evaluation(
                 evaluation_id=evaluation.id,
                 params={"status": EvaluationStatus.RUNNING},
@@ -433,6 +499,13 @@ class BehavioralChangeEvaluator:
                     if invoice.kind == PayloadKind.GUIDELINE
                 ],
                 progress_report=progress_report,
+                exhaustive=evaluation.exhaustive,
+                checkpoints=[
+                    invoice.checkpoint
+                    for invoice in evaluation.invoices
+                    if invoice.kind == PayloadKind.GUIDELINE
+                ],
+                on_checkpoint=_save_checkpoint,
             )
 
             invoices: list[Invoice] = []
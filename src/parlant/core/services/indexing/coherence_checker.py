@@ -17,22 +17,30 @@ from datetime import datetime, timezone
 from enum import Enum, auto
 from itertools import chain
 import json
-from typing import Optional, Sequence
+from typing import Any, Optional, OrderedDict, Sequence, cast
 from more_itertools import chunked
 from dataclasses import dataclass
+import numpy as np
 
 from parlant.core import async_utils
-from parlant.core.common import DefaultBaseModel
+from parlant.core.common import DefaultBaseModel, JSONSerializable
 from parlant.core.engines.alpha.prompt_builder import PromptBuilder
 from parlant.core.nlp.generation import SchematicGenerator
+from parlant.core.nlp.service import NLPService
 from parlant.core.guidelines import GuidelineContent
 from parlant.core.logging import Logger
 from parlant.core.glossary import GlossaryStore
 from parlant.core.agents import Agent
 from parlant.core.services.indexing.common import ProgressReport
+from parlant.core.services.indexing.pair_verdicts import (
+    GuidelinePairVerdictStore,
+    guideline_checksum,
+)
 
 
 EVALUATION_BATCH_SIZE = 5
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_CACHE_SIZE = 10_000
 CRITICAL_INCOHERENCE_THRESHOLD = 6
 ACTION_CONTRADICTION_SEVERITY_THRESHOLD = 6
 
@@ -90,8 +98,20 @@ class CoherenceChecker:
         conditions_test_schematic_generator: SchematicGenerator[ConditionsEntailmentTestsSchema],
         actions_test_schematic_generator: SchematicGenerator[ActionsContradictionTestsSchema],
         glossary_store: GlossaryStore,
+        nlp_service: NLPService,
+        verdict_store: GuidelinePairVerdictStore,
+        top_k: int = 20,
+        similarity_margin: float = 0.05,
     ) -> None:
         self._logger = logger
+        self._nlp_service = nlp_service
+        self._verdict_store = verdict_store
+        # Evaluations check their guidelines one at a time against the same comparison guidelines,
+        # so their embeddings are kept around rather than requested again for every guideline
+        self._embeddings: OrderedDict[str, Sequence[float]] = OrderedDict()
+        self._embedding_lock = asyncio.Lock()
+        self._top_k = top_k
+        self._similarity_margin = similarity_margin
         self._conditions_entailment_checker = ConditionsEntailmentChecker(
             logger, conditions_test_schematic_generator, glossary_store
         )
@@ -105,16 +125,59 @@ class CoherenceChecker:
         guidelines_to_evaluate: Sequence[GuidelineContent],
         comparison_guidelines: Sequence[GuidelineContent] = [],
         progress_report: Optional[ProgressReport] = None,
+        exhaustive: bool = False,
     ) -> Sequence[IncoherenceTest]:
+        """Checks each guideline to evaluate against the ones following it and the comparison guidelines.
+
+        Unless `exhaustive` is set, each guideline is only checked against its
+        `top_k` most semantically similar candidates (and against any others whose
+        similarity falls within `similarity_margin` of the last of them).
+        """
         comparison_guidelines_list = list(comparison_guidelines)
         guidelines_to_evaluate_list = list(guidelines_to_evaluate)
+        incoherencies: list[IncoherenceTest] = []
         tasks = []
+        cached_pairs = 0
+
+        similarities = (
+            None
+            if exhaustive
+            else await self._compute_similarities(
+                guidelines_to_evaluate_list, comparison_guidelines_list
+            )
+        )
 
         for i, guideline_to_evaluate in enumerate(guidelines_to_evaluate):
             filtered_existing_guidelines = [
                 g for g in guidelines_to_evaluate_list[i + 1 :] + comparison_guidelines_list
             ]
-            guideline_batches = list(chunked(filtered_existing_guidelines, EVALUATION_BATCH_SIZE))
+
+            if similarities is not None:
+                candidates = self._select_candidates(similarities[i, i + 1 :])
+                pruned_pairs = len(filtered_existing_guidelines) - len(candidates)
+                filtered_existing_guidelines = [filtered_existing_guidelines[c] for c in candidates]
+
+                if progress_report and pruned_pairs:
+                    await progress_report.prune(pruned_pairs)
+
+            verdicts = await self._verdict_store.read_verdicts(
+                "coherence",
+                agent.id,
+                [(guideline_to_evaluate, g) for g in filtered_existing_guidelines],
+            )
+
+            uncached_guidelines = []
+
+            for g, verdict in zip(filtered_existing_guidelines, verdicts):
+                if verdict is None:
+                    uncached_guidelines.append(g)
+                else:
+                    incoherencies.extend(
+                        self._deserialize_verdict(guideline_to_evaluate, g, verdict)
+                    )
+                    cached_pairs += 1
+
+            guideline_batches = list(chunked(uncached_guidelines, EVALUATION_BATCH_SIZE))
             if progress_report:
                 await progress_report.stretch(len(guideline_batches))
 
@@ -129,10 +192,131 @@ class CoherenceChecker:
                 ]
             )
         with self._logger.operation(
-            f"Evaluating incoherencies for {len(tasks)} "
-            f"batches (batch size={EVALUATION_BATCH_SIZE})",
+            "[CoherenceChecker] Evaluating incoherencies",
+            {
+                "batches": len(tasks),
+                "batch_size": EVALUATION_BATCH_SIZE,
+                "cached_pairs": cached_pairs,
+            },
         ):
-            incoherencies = list(chain.from_iterable(await async_utils.safe_gather(*tasks)))
+            incoherencies.extend(chain.from_iterable(await async_utils.safe_gather(*tasks)))
+
+        return incoherencies
+
+    async def _compute_similarities(
+        self,
+        guidelines_to_evaluate: Sequence[GuidelineContent],
+        comparison_guidelines: Sequence[GuidelineContent],
+    ) -> Optional[np.ndarray]:
+        """Returns the similarity of each guideline to evaluate to every guideline
+        (the guidelines to evaluate followed by the comparison guidelines),
+        or None if there are too few guidelines for pruning to make a difference"""
+        guidelines = [*guidelines_to_evaluate, *comparison_guidelines]
+
+        if len(guidelines) - 1 <= self._top_k:
+            return None
+
+        # Pairs are ranked by the closer of their conditions and actions, so that a pair
+        # which is related on only one side (e.g., overlapping conditions with contradicting
+        # actions phrased differently) is not pruned
+        texts = [g.condition for g in guidelines] + [g.action for g in guidelines]
+
+        vectors = np.array(await self._embed(texts), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        conditions, actions = vectors[: len(guidelines)], vectors[len(guidelines) :]
+        evaluated = len(guidelines_to_evaluate)
+
+        similarities: np.ndarray = np.maximum(
+            conditions[:evaluated] @ conditions.T,
+            actions[:evaluated] @ actions.T,
+        )
+
+        return similarities
+
+    async def _embed(self, texts: Sequence[str]) -> list[Sequence[float]]:
+        async with self._embedding_lock:
+            embeddings = {t: self._embeddings[t] for t in texts if t in self._embeddings}
+            missing_texts = list(dict.fromkeys(t for t in texts if t not in embeddings))
+
+            for t in embeddings:
+                self._embeddings.move_to_end(t)
+
+            if missing_texts:
+                embedder = await self._nlp_service.get_embedder()
+
+                with self._logger.operation(
+                    "[CoherenceChecker] Embedding guidelines for pruning",
+                    {"texts": len(missing_texts)},
+                ):
+                    results = await async_utils.safe_gather(
+                        *[
+                            embedder.embed(batch)
+                            for batch in chunked(missing_texts, EMBEDDING_BATCH_SIZE)
+                        ]
+                    )
+
+                for t, v in zip(missing_texts, (v for r in results for v in r.vectors)):
+                    embeddings[t] = v
+                    self._embeddings[t] = v
+
+                while len(self._embeddings) > EMBEDDING_CACHE_SIZE:
+                    self._embeddings.popitem(last=False)
+
+        return [embeddings[t] for t in texts]
+
+    def _select_candidates(self, similarities: np.ndarray) -> list[int]:
+        if len(similarities) <= self._top_k:
+            return list(range(len(similarities)))
+
+        ranked = np.argsort(-similarities, kind="stable")
+        threshold = similarities[ranked[self._top_k - 1]] - self._similarity_margin
+
+        # Candidates are kept in their original order, so that batches are formed as before
+        return sorted(int(c) for c in ranked if similarities[c] >= threshold)
+
+    def _serialize_verdict(self, incoherencies: Sequence[IncoherenceTest]) -> JSONSerializable:
+        return [
+            {
+                "guideline_a": guideline_checksum(i.guideline_a),
+                "kind": i.IncoherenceKind.name,
+                "conditions_entailment_rationale": i.conditions_entailment_rationale,
+                "conditions_entailment_severity": i.conditions_entailment_severity,
+                "actions_contradiction_rationale": i.actions_contradiction_rationale,
+                "actions_contradiction_severity": i.actions_contradiction_severity,
+            }
+            for i in incoherencies
+        ]
+
+    def _deserialize_verdict(
+        self,
+        guideline_to_evaluate: GuidelineContent,
+        compared_guideline: GuidelineContent,
+        verdict: JSONSerializable,
+    ) -> list[IncoherenceTest]:
+        checksum = guideline_checksum(guideline_to_evaluate)
+        incoherencies = []
+
+        for i in cast(list[dict[str, Any]], verdict):
+            # The verdict may have been cached while evaluating the pair the other way around
+            guideline_a, guideline_b = (
+                (guideline_to_evaluate, compared_guideline)
+                if i["guideline_a"] == checksum
+                else (compared_guideline, guideline_to_evaluate)
+            )
+
+            incoherencies.append(
+                IncoherenceTest(
+                    guideline_a=guideline_a,
+                    guideline_b=guideline_b,
+                    IncoherenceKind=IncoherenceKind[i["kind"]],
+                    conditions_entailment_rationale=i["conditions_entailment_rationale"],
+                    conditions_entailment_severity=i["conditions_entailment_severity"],
+                    actions_contradiction_rationale=i["actions_contradiction_rationale"],
+                    actions_contradiction_severity=i["actions_contradiction_severity"],
+                    creation_utc=datetime.now(timezone.utc),
+                )
+            )
 
         return incoherencies
 
@@ -157,9 +341,12 @@ class CoherenceChecker:
         )
 
         incoherencies = []
+        verdicts = []
+
         for id, g in indexed_comparison_guidelines.items():
             w = [w for w in conditions_entailment_responses if w.compared_guideline_id == id][0]
             t = [t for t in actions_contradiction_responses if t.compared_guideline_id == id][0]
+            pair_incoherencies = []
             if t.severity >= ACTION_CONTRADICTION_SEVERITY_THRESHOLD:
                 if w.compared_entails_origin_severity > w.origin_entails_compared_severity:
                     entailment_severity = w.compared_entails_origin_severity
@@ -167,7 +354,7 @@ class CoherenceChecker:
                 else:
                     entailment_severity = w.origin_entails_compared_severity
                     entailment_rationale = w.origin_entails_compared_rationale
-                incoherencies.append(
+                pair_incoherencies.append(
                     IncoherenceTest(
                         guideline_a=guideline_to_evaluate,
                         guideline_b=g,
@@ -182,6 +369,11 @@ class CoherenceChecker:
                     )
                 )
 
+            verdicts.append((guideline_to_evaluate, g, self._serialize_verdict(pair_incoherencies)))
+            incoherencies.extend(pair_incoherencies)
+
+        await self._verdict_store.set_verdicts("coherence", agent.id, verdicts)
+
         if progress_report:
             await progress_report.increment()
 
@@ -214,7 +406,7 @@ class ConditionsEntailmentChecker:
             hints={"temperature": 0.0},
         )
         self._logger.debug(
-            f"""
+            lambda: f"""
 ----------------------------------------
 Condition Entailment Test Results:
 ----------------------------------------
@@ -485,7 +677,7 @@ class ActionsContradictionChecker:
             hints={"temperature": 0.0},
         )
         self._logger.debug(
-            f"""
+            lambda: f"""
 ----------------------------------------
 Action Contradiction Test Results:
 ----------------------------------------
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import asyncio
+import hashlib
 from typing import Awaitable, Callable
 
 
@@ -20,6 +21,7 @@ class ProgressReport:
     def __init__(self, progress_callback: Callable[[float], Awaitable[None]]) -> None:
         self._total = 0
         self._current = 0
+        self._pruned_pairs = 0
         self._lock = asyncio.Lock()
         self._progress_callback = progress_callback
 
@@ -29,6 +31,16 @@ class ProgressReport:
             return 0.0
         return self._current / self._total * 100
 
+    @property
+    def pruned_pairs(self) -> int:
+        """Number of guideline pairs which were deemed unrelated and so weren't checked"""
+        return self._pruned_pairs
+
+    async def prune(self, amount: int) -> None:
+        async with self._lock:
+            self._pruned_pairs += amount
+            await self._progress_callback(self.percentage)
+
     async def stretch(self, amount: int) -> None:
         async with self._lock:
             self._total += amount
@@ -38,3 +50,10 @@ class ProgressReport:
         async with self._lock:
             self._current += amount
             await self._progress_callback(self.percentage)
+
+
+def md5_checksum(input: str) -> str:
+    md5_hash = hashlib.md5()
+    md5_hash.update(input.encode("utf-8"))
+
+    return md5_hash.hexdigest()
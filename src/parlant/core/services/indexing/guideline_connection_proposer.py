@@ -15,18 +15,26 @@
 from dataclasses import dataclass
 from itertools import chain
 import json
-from typing import Optional, Sequence
-from more_itertools import chunked
+from typing import Any, Optional, Sequence, cast
 
 from parlant.core import async_utils
 from parlant.core.agents import Agent
-from parlant.core.common import DefaultBaseModel
+from parlant.core.common import DefaultBaseModel, JSONSerializable
 from parlant.core.guidelines import GuidelineContent
 from parlant.core.logging import Logger
 from parlant.core.nlp.generation import SchematicGenerator
 from parlant.core.glossary import GlossaryStore
 from parlant.core.engines.alpha.prompt_builder import PromptBuilder
 from parlant.core.services.indexing.common import ProgressReport
+from parlant.core.services.indexing.pair_verdicts import (
+    GuidelinePairVerdictStore,
+    guideline_checksum,
+)
+
+
+MAX_BATCH_SIZE = 10
+MAX_BATCH_TOKENS = 4_000
+PROPOSITION_OVERHEAD_TOKENS = 100
 
 
 class GuidelineConnectionPropositionSchema(DefaultBaseModel):
@@ -59,11 +67,16 @@ class GuidelineConnectionProposer:
         logger: Logger,
         schematic_generator: SchematicGenerator[GuidelineConnectionPropositionsSchema],
         glossary_store: GlossaryStore,
+        verdict_store: GuidelinePairVerdictStore,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_batch_tokens: int = MAX_BATCH_TOKENS,
     ) -> None:
         self._logger = logger
         self._glossary_store = glossary_store
         self._schematic_generator = schematic_generator
-        self._batch_size = 1
+        self._verdict_store = verdict_store
+        self._max_batch_size = max_batch_size
+        self._max_batch_tokens = max_batch_tokens
 
     async def propose_connections(
         self,
@@ -75,7 +88,9 @@ class GuidelineConnectionProposer:
         if not introduced_guidelines:
             return []
 
+        propositions: list[GuidelineConnectionProposition] = []
         connection_proposition_tasks = []
+        cached_pairs = 0
 
         for i, introduced_guideline in enumerate(introduced_guidelines):
             filtered_existing_guidelines = [
@@ -86,7 +101,22 @@ class GuidelineConnectionProposer:
                 )
             ]
 
-            guideline_batches = list(chunked(filtered_existing_guidelines, self._batch_size))
+            verdicts = await self._verdict_store.read_verdicts(
+                "connection",
+                agent.id,
+                [(introduced_guideline, g) for g in filtered_existing_guidelines],
+            )
+
+            uncached_guidelines = []
+
+            for g, verdict in zip(filtered_existing_guidelines, verdicts):
+                if verdict is None:
+                    uncached_guidelines.append(g)
+                else:
+                    propositions.extend(self._deserialize_verdict(introduced_guideline, g, verdict))
+                    cached_pairs += 1
+
+            guideline_batches = await self._make_batches(introduced_guideline, uncached_guidelines)
 
             if progress_report:
                 await progress_report.stretch(len(guideline_batches))
@@ -99,13 +129,91 @@ class GuidelineConnectionProposer:
             )
 
         with self._logger.operation(
-            f"Propose guideline connections for {len(connection_proposition_tasks)} "  # noqa
-            f"batches (batch size={self._batch_size})",
+            "[GuidelineConnectionProposer] Proposing guideline connections",
+            {"batches": len(connection_proposition_tasks), "cached_pairs": cached_pairs},
         ):
-            propositions = chain.from_iterable(
-                await async_utils.safe_gather(*connection_proposition_tasks)
+            propositions.extend(
+                chain.from_iterable(await async_utils.safe_gather(*connection_proposition_tasks))
             )
-            return list(propositions)
+            return propositions
+
+    async def _make_batches(
+        self,
+        guideline_to_test: GuidelineContent,
+        guidelines_to_compare: Sequence[GuidelineContent],
+    ) -> list[list[GuidelineContent]]:
+        """Packs the pairs into batches by the estimated size of their output,
+        as each pair yields two propositions which both restate the two guidelines"""
+        tokenizer = self._schematic_generator.tokenizer
+
+        batches: list[list[GuidelineContent]] = []
+        batch: list[GuidelineContent] = []
+        batch_tokens = 0
+
+        for g in guidelines_to_compare:
+            pair_tokens = 2 * (
+                await tokenizer.estimate_token_count(
+                    " ".join(
+                        [
+                            guideline_to_test.condition,
+                            guideline_to_test.action,
+                            g.condition,
+                            g.action,
+                        ]
+                    )
+                )
+                + PROPOSITION_OVERHEAD_TOKENS
+            )
+
+            if batch and (
+                len(batch) >= self._max_batch_size
+                or batch_tokens + pair_tokens > self._max_batch_tokens
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+
+            batch.append(g)
+            batch_tokens += pair_tokens
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    def _serialize_verdict(
+        self,
+        propositions: Sequence[GuidelineConnectionProposition],
+    ) -> JSONSerializable:
+        return [
+            {
+                "source": guideline_checksum(p.source),
+                "target": guideline_checksum(p.target),
+                "score": p.score,
+                "rationale": p.rationale,
+            }
+            for p in propositions
+        ]
+
+    def _deserialize_verdict(
+        self,
+        guideline_to_test: GuidelineContent,
+        compared_guideline: GuidelineContent,
+        verdict: JSONSerializable,
+    ) -> list[GuidelineConnectionProposition]:
+        guidelines = {
+            guideline_checksum(compared_guideline): compared_guideline,
+            guideline_checksum(guideline_to_test): guideline_to_test,
+        }
+
+        return [
+            GuidelineConnectionProposition(
+                source=guidelines[p["source"]],
+                target=guidelines[p["target"]],
+                score=p["score"],
+                rationale=p["rationale"],
+            )
+            for p in cast(list[dict[str, Any]], verdict)
+        ]
 
     async def _format_connection_propositions(
         self,
@@ -606,7 +714,7 @@ Please output JSON structured in the following format, which includes two entrie
         )
 
         self._logger.debug(
-            f"""
+            lambda: f"""
 ----------------------------------------
 Connection Propositions Found:
 ----------------------------------------
@@ -615,16 +723,34 @@ Connection Propositions Found:
 """
         )
 
-        relevant_propositions = [
-            GuidelineConnectionProposition(
-                source=guidelines_dict[p.source_id],
-                target=guidelines_dict[p.target_id],
-                score=int(p.causation_score),
-                rationale=p.rationale,
+        relevant_propositions = []
+        verdicts = []
+
+        for id, guideline_to_compare in guidelines_dict.items():
+            if id == 0:
+                continue
+
+            pair_propositions = [
+                GuidelineConnectionProposition(
+                    source=guidelines_dict[p.source_id],
+                    target=guidelines_dict[p.target_id],
+                    score=int(p.causation_score),
+                    rationale=p.rationale,
+                )
+                for p in response.content.propositions
+                if {p.source_id, p.target_id} == {0, id} and p.causation_score >= 7
+            ]
+
+            verdicts.append(
+                (
+                    guideline_to_test,
+                    guideline_to_compare,
+                    self._serialize_verdict(pair_propositions),
+                )
             )
-            for p in response.content.propositions
-            if p.causation_score >= 7
-        ]
+            relevant_propositions.extend(pair_propositions)
+
+        await self._verdict_store.set_verdicts("connection", agent.id, verdicts)
 
         if progress_report:
             await progress_report.increment()
@@ -0,0 +1,187 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+import json
+from typing import Optional, Sequence
+from typing_extensions import Literal, override, TypedDict, TypeAlias, Self
+
+from parlant.core.agents import AgentId
+from parlant.core.async_utils import ReaderWriterLock
+from parlant.core.common import JSONSerializable, Version
+from parlant.core.guidelines import GuidelineContent
+from parlant.core.persistence.common import ObjectId
+from parlant.core.persistence.document_database import DocumentCollection, DocumentDatabase
+from parlant.core.resource_versions import ResourceVersionStore
+from parlant.core.services.indexing.common import md5_checksum
+
+PairVerdictKind = Literal["connection", "coherence"]
+
+
+def guideline_checksum(content: GuidelineContent) -> str:
+    return md5_checksum(json.dumps([content.condition, content.action]))
+
+
+GuidelinePair: TypeAlias = tuple[GuidelineContent, GuidelineContent]
+
+
+class GuidelinePairVerdictStore(ABC):
+    """Memoizes the verdicts of pairwise guideline checks, keyed on the contents of both guidelines
+    (and the glossary they were checked against), so that re-evaluating unchanged guidelines
+    doesn't go through the model again.
+
+    Pairs are unordered, so a verdict that depends on the order of its pair
+    has to record the orientation itself."""
+
+    @abstractmethod
+    async def read_verdicts(
+        self,
+        kind: PairVerdictKind,
+        agent_id: AgentId,
+        pairs: Sequence[GuidelinePair],
+    ) -> Sequence[Optional[JSONSerializable]]: ...
+
+    @abstractmethod
+    async def set_verdicts(
+        self,
+        kind: PairVerdictKind,
+        agent_id: AgentId,
+        verdicts: Sequence[tuple[GuidelineContent, GuidelineContent, JSONSerializable]],
+    ) -> None: ...
+
+
+class _GuidelinePairVerdictDocument(TypedDict, total=False):
+    id: ObjectId
+    version: Version.String
+    creation_utc: str
+    kind: PairVerdictKind
+    agent_id: AgentId
+    verdict: JSONSerializable
+
+
+class GuidelinePairVerdictDocumentStore(GuidelinePairVerdictStore):
+    VERSION = Version.from_string("0.3.0")
+
+    def __init__(
+        self,
+        database: DocumentDatabase,
+        versions: Optional[ResourceVersionStore] = None,
+    ) -> None:
+        self._database = database
+        self._versions = versions
+        self._collection: DocumentCollection[_GuidelinePairVerdictDocument]
+
+        # Verdicts are only ever added, so they're all indexed in memory once,
+        # rather than scanning the collection for each pair
+        self._verdicts: dict[ObjectId, JSONSerializable] = {}
+
+        self._lock = ReaderWriterLock()
+
+    async def __aenter__(self) -> Self:
+        self._collection = await self._database.get_or_create_collection(
+            name="guideline_pair_verdicts",
+            schema=_GuidelinePairVerdictDocument,
+        )
+
+        self._verdicts = {
+            d["id"]: d["verdict"]
+            for d in await self._collection.find({"version": {"$eq": self.VERSION.to_string()}})
+        }
+
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[object],
+    ) -> None:
+        pass
+
+    async def _glossary_version(self) -> str:
+        # Checks take the glossary into account, so a verdict only holds as long as it is unchanged
+        if not self._versions:
+            return ""
+
+        return (await self._versions.read_versions(["glossary"]))["glossary"]
+
+    def _verdict_id(
+        self,
+        kind: PairVerdictKind,
+        agent_id: AgentId,
+        glossary_version: str,
+        first: GuidelineContent,
+        second: GuidelineContent,
+    ) -> ObjectId:
+        # Verdicts of an older format are simply never found
+        checksums = sorted([guideline_checksum(first), guideline_checksum(second)])
+        return ObjectId(
+            md5_checksum(
+                ":".join([self.VERSION.to_string(), kind, agent_id, glossary_version, *checksums])
+            )
+        )
+
+    @override
+    async def read_verdicts(
+        self,
+        kind: PairVerdictKind,
+        agent_id: AgentId,
+        pairs: Sequence[GuidelinePair],
+    ) -> Sequence[Optional[JSONSerializable]]:
+        glossary_version = await self._glossary_version()
+
+        async with self._lock.reader_lock:
+            return [
+                self._verdicts.get(
+                    self._verdict_id(kind, agent_id, glossary_version, first, second)
+                )
+                for first, second in pairs
+            ]
+
+    @override
+    async def set_verdicts(
+        self,
+        kind: PairVerdictKind,
+        agent_id: AgentId,
+        verdicts: Sequence[tuple[GuidelineContent, GuidelineContent, JSONSerializable]],
+    ) -> None:
+        creation_utc = datetime.now(timezone.utc).isoformat()
+        glossary_version = await self._glossary_version()
+
+        async with self._lock.writer_lock:
+            documents: dict[ObjectId, _GuidelinePairVerdictDocument] = {}
+
+            for first, second, verdict in verdicts:
+                verdict_id = self._verdict_id(kind, agent_id, glossary_version, first, second)
+
+                # A pair evaluated concurrently by another evaluation keeps its first verdict
+                if verdict_id in self._verdicts:
+                    continue
+
+                documents[verdict_id] = _GuidelinePairVerdictDocument(
+                    id=verdict_id,
+                    version=self.VERSION.to_string(),
+                    creation_utc=creation_utc,
+                    kind=kind,
+                    agent_id=agent_id,
+                    verdict=verdict,
+                )
+
+            if not documents:
+                return
+
+            await self._collection.insert_many(list(documents.values()))
+
+            self._verdicts.update({id: d["verdict"] for id, d in documents.items()})
@@ -15,7 +15,6 @@
 from __future__ import annotations
 from datetime import datetime, timezone
 from functools import partial
-import aiopenapi3  # type: ignore
 import httpx
 from openapi_parser import parse as parse_openapi_json
 from openapi_parser.parser import (
@@ -53,6 +52,9 @@ class OpenAPIClient(ToolService):
         self._tools = self._parse_tools(openapi_json)
 
     async def __aenter__(self) -> OpenAPIClient:
+        # Slow to import, and only needed once an OpenAPI service is actually in use
+        import aiopenapi3  # type: ignore
+
         class CustomClient(httpx.AsyncClient):
             def __init__(self, *args: Any, **kwargs: Any) -> None:
                 super().__init__(
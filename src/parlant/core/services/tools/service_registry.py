@@ -34,6 +34,7 @@ from parlant.core.tools import LocalToolService, ToolService
 from parlant.core.common import ItemNotFoundError, Version, UniqueId
 from parlant.core.persistence.common import ObjectId
 from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
+from parlant.core.resource_versions import ResourceVersionStore
 
 
 ToolServiceKind = Literal["openapi", "sdk", "local"]
@@ -109,9 +110,11 @@ class ServiceDocumentRegistry(ServiceRegistry):
         logger: Logger,
         correlator: ContextualCorrelator,
         nlp_services: Mapping[str, NLPService],
+        versions: Optional[ResourceVersionStore] = None,
     ):
         self._database = database
         self._tool_services_collection: DocumentCollection[_ToolServiceDocument]
+        self._versions = versions
 
         self._event_emitter_factory = event_emitter_factory
         self._logger = logger
@@ -217,6 +220,10 @@ class ServiceDocumentRegistry(ServiceRegistry):
         else:
             raise ValueError("Unsupported ToolService kind.")
 
+    async def _bump_version(self) -> None:
+        if self._versions:
+            await self._versions.bump_version("services")
+
     @override
     async def update_tool_service(
         self,
@@ -231,6 +238,7 @@ class ServiceDocumentRegistry(ServiceRegistry):
 
             if kind == "local":
                 self._running_services[name] = LocalToolService()
+                await self._bump_version()
                 return self._running_services[name]
             elif kind == "openapi":
                 assert source
@@ -269,6 +277,8 @@ class ServiceDocumentRegistry(ServiceRegistry):
                 upsert=True,
             )
 
+        await self._bump_version()
+
         return service
 
     @override
@@ -330,6 +340,7 @@ class ServiceDocumentRegistry(ServiceRegistry):
             if name in self._running_services:
                 if isinstance(self._running_services[name], LocalToolService):
                     del self._running_services[name]
+                    await self._bump_version()
                     return
 
                 service = self._running_services[name]
@@ -341,6 +352,7 @@ class ServiceDocumentRegistry(ServiceRegistry):
                     del self._service_sources[name]
 
             result = await self._tool_services_collection.delete_one({"name": {"$eq": name}})
+            await self._bump_version()
 
         if not result.deleted_count:
             raise ItemNotFoundError(item_id=UniqueId(name))
@@ -0,0 +1,96 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from parlant.core.background_tasks import BackgroundTaskService
+from parlant.core.leases import LeaseManager
+from parlant.core.logging import Logger
+from parlant.core.sessions import SessionStore
+
+
+@dataclass(frozen=True)
+class SessionRetentionPolicy:
+    compaction_interval: timedelta = timedelta(minutes=10)
+    idle_session_ttl: Optional[timedelta] = None
+    """Sessions without new events for longer than this are archived (default: never)"""
+
+
+@dataclass(frozen=True)
+class SessionCompactionResult:
+    purged_deleted_events: int
+    dropped_status_events: int
+    archived_sessions: int
+
+
+class SessionRetentionService:
+    """Periodically compacts the session store, keeping its live working set small.
+
+    When the server runs multiple workers, only the one holding
+    the retention lease compacts; the others stand by to take over.
+    """
+
+    LEASE_KEY = "session-retention"
+
+    def __init__(
+        self,
+        logger: Logger,
+        session_store: SessionStore,
+        background_task_service: BackgroundTaskService,
+        lease_manager: LeaseManager,
+        policy: SessionRetentionPolicy,
+    ) -> None:
+        self._logger = logger
+        self._session_store = session_store
+        self._background_task_service = background_task_service
+        self._lease_manager = lease_manager
+        self._policy = policy
+
+    async def start(self) -> None:
+        await self._background_task_service.start(self._run(), tag="session-retention")
+
+    async def compact(self) -> SessionCompactionResult:
+        with self._logger.operation("[SessionRetention] Compacting sessions"):
+            result = SessionCompactionResult(
+                purged_deleted_events=await self._session_store.purge_deleted_events(),
+                dropped_status_events=await self._session_store.drop_stale_status_events(),
+                archived_sessions=(
+                    await self._session_store.archive_idle_sessions(
+                        idle_since=datetime.now(timezone.utc) - self._policy.idle_session_ttl
+                    )
+                    if self._policy.idle_session_ttl
+                    else 0
+                ),
+            )
+
+        self._logger.debug(f"[SessionRetention] {result}")
+
+        return result
+
+    async def _run(self) -> None:
+        # The lease outlives an interval, so the holder keeps it by re-acquiring it
+        # each time, and another worker only takes over once the holder is gone
+        lease_ttl = self._policy.compaction_interval * 2
+
+        while True:
+            try:
+                if await self._lease_manager.acquire(self.LEASE_KEY, lease_ttl):
+                    await self.compact()
+            except Exception as exc:
+                self._logger.error(f"[SessionRetention] Compaction failed: {exc}")
+
+            await asyncio.sleep(self._policy.compaction_interval.total_seconds())
@@ -28,7 +28,6 @@ from typing import (
 )
 from typing_extensions import override, TypedDict, NotRequired, Self
 
-from parlant.core import async_utils
 from parlant.core.async_utils import ReaderWriterLock, Timeout
 from parlant.core.common import (
     ItemNotFoundError,
@@ -40,12 +39,16 @@ from parlant.core.common import (
 from parlant.core.agents import AgentId
 from parlant.core.context_variables import ContextVariableId
 from parlant.core.customers import CustomerId
+from parlant.core.entity_cache import EntityCache
 from parlant.core.guidelines import GuidelineId
-from parlant.core.nlp.generation import GenerationInfo, UsageInfo
-from parlant.core.persistence.common import ObjectId, Where
+from parlant.core.leases import InMemoryLeaseManager, LeaseManager
+from parlant.core.nlp.generation import GenerationInfo
+from parlant.core.persistence.common import ObjectId, Where, keyset_filters
 from parlant.core.persistence.document_database import DocumentDatabase, DocumentCollection
 from parlant.core.glossary import TermId
 from parlant.core.fragments import FragmentId
+from parlant.core.metrics import MetricsRegistry
+from parlant.core.resource_versions import ResourceVersionStore
 
 SessionId = NewType("SessionId", str)
 
@@ -101,6 +104,8 @@ class MessageEventData(TypedDict):
     flagged: NotRequired[bool]
     tags: NotRequired[Sequence[str]]
     fragments: NotRequired[Mapping[FragmentId, str]]
+    pending_moderation: NotRequired[str]
+    """The moderation mode which is yet to be applied to the message, if deferred"""
 
 
 class ControlOptions(TypedDict, total=False):
@@ -139,6 +144,22 @@ class StatusEventData(TypedDict):
     data: JSONSerializable
 
 
+class HistorySummaryEventData(TypedDict):
+    """Data of a custom system event which summarizes the interaction up to a given offset"""
+
+    history_summary: str
+    summarized_until_offset: int
+
+
+def is_history_summary(event: Event) -> bool:
+    return (
+        event.kind == "custom"
+        and event.source == "system"
+        and isinstance(event.data, Mapping)
+        and "history_summary" in event.data
+    )
+
+
 class GuidelineProposition(TypedDict):
     guideline_id: GuidelineId
     condition: str
@@ -166,6 +187,8 @@ class ContextVariable(TypedDict):
 class MessageGenerationInspection:
     generation: GenerationInfo
     messages: Sequence[Optional[MessageEventData]]
+    hedge_won: bool = False
+    """Whether the messages came from a hedged attempt rather than the one started first"""
 
 
 @dataclass(frozen=True)
@@ -220,6 +243,10 @@ class SessionUpdateParams(TypedDict, total=False):
     consumption_offsets: Mapping[ConsumerId, int]
 
 
+class EventUpdateParams(TypedDict, total=False):
+    data: JSONSerializable
+
+
 class SessionStore(ABC):
     @abstractmethod
     async def create_session(
@@ -254,7 +281,11 @@ class SessionStore(ABC):
         self,
         agent_id: Optional[AgentId] = None,
         customer_id: Optional[CustomerId] = None,
-    ) -> Sequence[Session]: ...
+        limit: Optional[int] = None,
+        after: Optional[SessionId] = None,
+    ) -> Sequence[Session]:
+        """Lists sessions by creation time, optionally starting after a given session"""
+        ...
 
     @abstractmethod
     async def create_event(
@@ -274,6 +305,14 @@ class SessionStore(ABC):
         event_id: EventId,
     ) -> Event: ...
 
+    @abstractmethod
+    async def update_event(
+        self,
+        session_id: SessionId,
+        event_id: EventId,
+        params: EventUpdateParams,
+    ) -> Event: ...
+
     @abstractmethod
     async def delete_event(
         self,
@@ -289,23 +328,47 @@ class SessionStore(ABC):
         kinds: Sequence[EventKind] = [],
         min_offset: Optional[int] = None,
         exclude_deleted: bool = True,
+        limit: Optional[int] = None,
     ) -> Sequence[Event]: ...
 
     @abstractmethod
-    async def create_inspection(
-        self,
-        session_id: SessionId,
-        correlation_id: str,
-        message_generations: Sequence[MessageGenerationInspection],
-        preparation_iterations: Sequence[PreparationIteration],
-    ) -> Inspection: ...
+    async def list_events_pending_moderation(self) -> Sequence[tuple[SessionId, Event]]:
+        """Lists customer messages whose deferred moderation hasn't completed yet"""
+        ...
 
     @abstractmethod
-    async def read_inspection(
-        self,
-        session_id: SessionId,
-        correlation_id: str,
-    ) -> Inspection: ...
+    async def purge_deleted_events(self) -> int:
+        """Permanently removes soft-deleted events, returning their count"""
+        ...
+
+    @abstractmethod
+    async def drop_stale_status_events(self) -> int:
+        """Permanently removes status events which precede the last completed turn
+        of their session, returning their count"""
+        ...
+
+    @abstractmethod
+    async def archive_idle_sessions(self, idle_since: datetime) -> int:
+        """Moves the events of sessions which have been idle since the given time
+        out of the live store, returning the number of archived sessions.
+        Archived events are restored transparently once their session is accessed."""
+        ...
+
+
+class SessionArchive(ABC):
+    """Cold storage for the events of idle sessions"""
+
+    @abstractmethod
+    async def list_session_ids(self) -> Sequence[SessionId]: ...
+
+    @abstractmethod
+    async def write(self, session_id: SessionId, content: JSONSerializable) -> None: ...
+
+    @abstractmethod
+    async def read(self, session_id: SessionId) -> JSONSerializable: ...
+
+    @abstractmethod
+    async def delete(self, session_id: SessionId) -> None: ...
 
 
 class _SessionDocument(TypedDict, total=False):
@@ -332,59 +395,24 @@ class _EventDocument(TypedDict, total=False):
     deleted: bool
 
 
-class _UsageInfoDocument(TypedDict):
-    input_tokens: int
-    output_tokens: int
-    extra: Optional[Mapping[str, int]]
-
-
-class _GenerationInfoDocument(TypedDict):
-    schema_name: str
-    model: str
-    duration: float
-    usage: _UsageInfoDocument
-
-
-class _GuidelinePropositionInspectionDocument(TypedDict):
-    total_duration: float
-    batches: Sequence[_GenerationInfoDocument]
-
-
-class _PreparationIterationGenerationsDocument(TypedDict):
-    guideline_proposition: _GuidelinePropositionInspectionDocument
-    tool_calls: Sequence[_GenerationInfoDocument]
-
-
-class _MessageGenerationInspectionDocument(TypedDict):
-    generation: _GenerationInfoDocument
-    messages: Sequence[Optional[MessageEventData]]
-
-
-class _PreparationIterationDocument(TypedDict):
-    guideline_propositions: Sequence[GuidelineProposition]
-    tool_calls: Sequence[ToolCall]
-    terms: Sequence[Term]
-    context_variables: Sequence[ContextVariable]
-    generations: _PreparationIterationGenerationsDocument
-
-
-class _InspectionDocument(TypedDict, total=False):
-    id: ObjectId
-    version: Version.String
-    session_id: SessionId
-    correlation_id: str
-    message_generations: Sequence[_MessageGenerationInspectionDocument]
-    preparation_iterations: Sequence[_PreparationIterationDocument]
-
-
 class SessionDocumentStore(SessionStore):
     VERSION = Version.from_string("0.1.0")
 
-    def __init__(self, database: DocumentDatabase):
+    def __init__(
+        self,
+        database: DocumentDatabase,
+        archive: Optional[SessionArchive] = None,
+        lease_manager: Optional[LeaseManager] = None,
+        versions: Optional[ResourceVersionStore] = None,
+    ):
         self._database = database
+        self._archive = archive
+        self._versions = versions
+        self._lease_manager = lease_manager or InMemoryLeaseManager()
         self._session_collection: DocumentCollection[_SessionDocument]
         self._event_collection: DocumentCollection[_EventDocument]
-        self._inspection_collection: DocumentCollection[_InspectionDocument]
+
+        self._archived_session_ids: set[SessionId] = set()
 
         self._lock = ReaderWriterLock()
 
@@ -397,10 +425,10 @@ class SessionDocumentStore(SessionStore):
             name="events",
             schema=_EventDocument,
         )
-        self._inspection_collection = await self._database.get_or_create_collection(
-            name="inspections",
-            schema=_InspectionDocument,
-        )
+
+        if self._archive:
+            self._archived_session_ids = set(await self._archive.list_session_ids())
+
         return self
 
     async def __aexit__(
@@ -411,6 +439,10 @@ class SessionDocumentStore(SessionStore):
     ) -> None:
         pass
 
+    async def _bump_version(self) -> None:
+        if self._versions:
+            await self._versions.bump_version("sessions")
+
     def _serialize_session(
         self,
         session: Session,
@@ -473,105 +505,28 @@ class SessionDocumentStore(SessionStore):
             deleted=event_document["deleted"],
         )
 
-    def _serialize_inspection(
-        self,
-        inspection: Inspection,
-        session_id: SessionId,
-        correlation_id: str,
-    ) -> _InspectionDocument:
-        def serialize_generation_info(generation: GenerationInfo) -> _GenerationInfoDocument:
-            return _GenerationInfoDocument(
-                schema_name=generation.schema_name,
-                model=generation.model,
-                duration=generation.duration,
-                usage=_UsageInfoDocument(
-                    input_tokens=generation.usage.input_tokens,
-                    output_tokens=generation.usage.output_tokens,
-                    extra=generation.usage.extra,
-                ),
-            )
+    async def _restore_archived_events(self, session_id: SessionId) -> None:
+        """Must be called while holding the writer lock"""
+        if session_id not in self._archived_session_ids:
+            return
 
-        return _InspectionDocument(
-            id=ObjectId(generate_id()),
-            version=self.VERSION.to_string(),
-            session_id=session_id,
-            correlation_id=correlation_id,
-            message_generations=[
-                _MessageGenerationInspectionDocument(
-                    generation=serialize_generation_info(m.generation), messages=m.messages
-                )
-                for m in inspection.message_generations
-            ],
-            preparation_iterations=[
-                {
-                    "guideline_propositions": i.guideline_propositions,
-                    "tool_calls": i.tool_calls,
-                    "terms": i.terms,
-                    "context_variables": i.context_variables,
-                    "generations": _PreparationIterationGenerationsDocument(
-                        guideline_proposition=_GuidelinePropositionInspectionDocument(
-                            total_duration=i.generations.guideline_proposition.total_duration,
-                            batches=[
-                                serialize_generation_info(g)
-                                for g in i.generations.guideline_proposition.batches
-                            ],
-                        ),
-                        tool_calls=[serialize_generation_info(g) for g in i.generations.tool_calls],
-                    ),
-                }
-                for i in inspection.preparation_iterations
-            ],
+        assert self._archive
+
+        archived = cast(
+            Mapping[str, Sequence[_EventDocument]], await self._archive.read(session_id)
         )
 
-    def _deserialize_message_inspection(
-        self,
-        inspection_document: _InspectionDocument,
-    ) -> Inspection:
-        def deserialize_generation_info(
-            generation_document: _GenerationInfoDocument,
-        ) -> GenerationInfo:
-            return GenerationInfo(
-                schema_name=generation_document["schema_name"],
-                model=generation_document["model"],
-                duration=generation_document["duration"],
-                usage=UsageInfo(
-                    input_tokens=generation_document["usage"]["input_tokens"],
-                    output_tokens=generation_document["usage"]["output_tokens"],
-                    extra=generation_document["usage"]["extra"],
-                ),
-            )
+        if archived["events"]:
+            await self._event_collection.insert_many(archived["events"])
 
-        return Inspection(
-            message_generations=[
-                MessageGenerationInspection(
-                    generation=deserialize_generation_info(m["generation"]), messages=m["messages"]
-                )
-                for m in inspection_document["message_generations"]
-            ],
-            preparation_iterations=[
-                PreparationIteration(
-                    guideline_propositions=i["guideline_propositions"],
-                    tool_calls=i["tool_calls"],
-                    terms=i["terms"],
-                    context_variables=i["context_variables"],
-                    generations=PreparationIterationGenerations(
-                        guideline_proposition=GuidelinePropositionInspection(
-                            total_duration=i["generations"]["guideline_proposition"][
-                                "total_duration"
-                            ],
-                            batches=[
-                                deserialize_generation_info(g)
-                                for g in i["generations"]["guideline_proposition"]["batches"]
-                            ],
-                        ),
-                        tool_calls=[
-                            deserialize_generation_info(g) for g in i["generations"]["tool_calls"]
-                        ],
-                    ),
-                )
-                for i in inspection_document["preparation_iterations"]
-            ],
-        )
+        await self._archive.delete(session_id)
+
+        self._archived_session_ids.discard(session_id)
+
+    async def _ensure_events_are_live(self, session_id: SessionId) -> None:
+        if session_id in self._archived_session_ids:
+            async with self._lock.writer_lock:
+                await self._restore_archived_events(session_id)
 
     @override
     async def create_session(
@@ -598,6 +553,7 @@ class SessionDocumentStore(SessionStore):
             )
 
             await self._session_collection.insert_one(document=self._serialize_session(session))
+            await self._bump_version()
 
         return session
 
@@ -607,15 +563,14 @@ class SessionDocumentStore(SessionStore):
         session_id: SessionId,
     ) -> None:
         async with self._lock.writer_lock:
-            events = await self._event_collection.find(filters={"session_id": {"$eq": session_id}})
-            await async_utils.safe_gather(
-                *(
-                    self._event_collection.delete_one(filters={"id": {"$eq": e["id"]}})
-                    for e in events
-                )
-            )
+            if session_id in self._archived_session_ids:
+                assert self._archive
+                await self._archive.delete(session_id)
+                self._archived_session_ids.discard(session_id)
 
+            await self._event_collection.delete_many(filters={"session_id": {"$eq": session_id}})
             await self._session_collection.delete_one({"id": {"$eq": session_id}})
+            await self._bump_version()
 
     @override
     async def read_session(
@@ -650,6 +605,7 @@ class SessionDocumentStore(SessionStore):
                 filters={"id": {"$eq": session_id}},
                 params=cast(_SessionDocument, params),
             )
+            await self._bump_version()
 
         assert result.updated_document
 
@@ -660,16 +616,33 @@ class SessionDocumentStore(SessionStore):
         self,
         agent_id: Optional[AgentId] = None,
         customer_id: Optional[CustomerId] = None,
+        limit: Optional[int] = None,
+        after: Optional[SessionId] = None,
     ) -> Sequence[Session]:
         async with self._lock.reader_lock:
-            filters = {
-                **({"agent_id": {"$eq": agent_id}} if agent_id else {}),
-                **({"customer_id": {"$eq": customer_id}} if customer_id else {}),
-            }
+            filters = cast(
+                Where,
+                {
+                    **({"agent_id": {"$eq": agent_id}} if agent_id else {}),
+                    **({"customer_id": {"$eq": customer_id}} if customer_id else {}),
+                },
+            )
+
+            if after:
+                cursor = await self._session_collection.find_one(filters={"id": {"$eq": after}})
+
+                if not cursor:
+                    raise ItemNotFoundError(item_id=UniqueId(after), message="Session not found")
+
+                filters = {"$and": [filters, keyset_filters(["creation_utc", "id"], cursor)]}
 
             return [
                 self._deserialize_session(d)
-                for d in await self._session_collection.find(filters=cast(Where, filters))
+                for d in await self._session_collection.find(
+                    filters=filters,
+                    sort=["creation_utc", "id"],
+                    limit=limit,
+                )
             ]
 
     @override
@@ -686,26 +659,33 @@ class SessionDocumentStore(SessionStore):
             if not await self._session_collection.find_one(filters={"id": {"$eq": session_id}}):
                 raise ItemNotFoundError(item_id=UniqueId(session_id), message="Session not found")
 
-            session_events = await self.list_events(
-                session_id
-            )  # FIXME: we need a more efficient way to do this
-            creation_utc = creation_utc or datetime.now(timezone.utc)
-            offset = len(list(session_events))
-
-            event = Event(
-                id=EventId(generate_id()),
-                source=source,
-                kind=kind,
-                offset=offset,
-                creation_utc=creation_utc,
-                correlation_id=correlation_id,
-                data=data,
-                deleted=False,
-            )
+            await self._restore_archived_events(session_id)
+
+            # Other server processes may be adding events to this session as well
+            async with self._lease_manager.exclusive(f"session-events({session_id})"):
+                session_events = await self._event_collection.find(
+                    filters={"session_id": {"$eq": session_id}, "deleted": {"$eq": False}}
+                )  # FIXME: we need a more efficient way to do this
+                creation_utc = creation_utc or datetime.now(timezone.utc)
+
+                # Offsets follow the last live event rather than the event count,
+                # since compaction may remove events from the middle of a session.
+                offset = max((e["offset"] for e in session_events), default=-1) + 1
+
+                event = Event(
+                    id=EventId(generate_id()),
+                    source=source,
+                    kind=kind,
+                    offset=offset,
+                    creation_utc=creation_utc,
+                    correlation_id=correlation_id,
+                    data=data,
+                    deleted=False,
+                )
 
-            await self._event_collection.insert_one(
-                document=self._serialize_event(event, session_id)
-            )
+                await self._event_collection.insert_one(
+                    document=self._serialize_event(event, session_id)
+                )
 
         return event
 
@@ -715,6 +695,8 @@ class SessionDocumentStore(SessionStore):
         session_id: SessionId,
         event_id: EventId,
     ) -> Event:
+        await self._ensure_events_are_live(session_id)
+
         async with self._lock.reader_lock:
             if not await self._session_collection.find_one(filters={"id": {"$eq": session_id}}):
                 raise ItemNotFoundError(item_id=UniqueId(session_id), message="Session not found")
@@ -726,6 +708,28 @@ class SessionDocumentStore(SessionStore):
 
         raise ItemNotFoundError(item_id=UniqueId(event_id), message="Event not found")
 
+    @override
+    async def update_event(
+        self,
+        session_id: SessionId,
+        event_id: EventId,
+        params: EventUpdateParams,
+    ) -> Event:
+        await self._ensure_events_are_live(session_id)
+
+        async with self._lock.writer_lock:
+            result = await self._event_collection.update_one(
+                filters={"id": {"$eq": event_id}, "session_id": {"$eq": session_id}},
+                params=cast(_EventDocument, params),
+            )
+
+        if result.matched_count == 0:
+            raise ItemNotFoundError(item_id=UniqueId(event_id), message="Event not found")
+
+        assert result.updated_document
+
+        return self._deserialize_event(result.updated_document)
+
     @override
     async def delete_event(
         self,
@@ -749,7 +753,10 @@ class SessionDocumentStore(SessionStore):
         kinds: Sequence[EventKind] = [],
         min_offset: Optional[int] = None,
         exclude_deleted: bool = True,
+        limit: Optional[int] = None,
     ) -> Sequence[Event]:
+        await self._ensure_events_are_live(session_id)
+
         async with self._lock.reader_lock:
             if not await self._session_collection.find_one(filters={"id": {"$eq": session_id}}):
                 raise ItemNotFoundError(item_id=UniqueId(session_id), message="Session not found")
@@ -764,74 +771,253 @@ class SessionDocumentStore(SessionStore):
 
             if kinds:
                 event_documents = await self._event_collection.find(
-                    cast(Where, {"$or": [{**base_filters, "kind": {"$eq": k}} for k in kinds]})
+                    cast(Where, {"$or": [{**base_filters, "kind": {"$eq": k}} for k in kinds]}),
+                    sort=["offset"],
+                    limit=limit,
                 )
             else:
                 event_documents = await self._event_collection.find(
                     cast(
                         Where,
                         base_filters,
-                    )
+                    ),
+                    sort=["offset"],
+                    limit=limit,
                 )
 
         return [self._deserialize_event(d) for d in event_documents]
 
     @override
-    async def create_inspection(
-        self,
-        session_id: SessionId,
-        correlation_id: str,
-        message_generations: Sequence[MessageGenerationInspection],
-        preparation_iterations: Sequence[PreparationIteration],
-    ) -> Inspection:
+    async def list_events_pending_moderation(self) -> Sequence[tuple[SessionId, Event]]:
+        async with self._lock.reader_lock:
+            message_documents = await self._event_collection.find(
+                filters={
+                    "source": {"$eq": "customer"},
+                    "kind": {"$eq": "message"},
+                    "deleted": {"$eq": False},
+                }
+            )
+
+        return [
+            (d["session_id"], self._deserialize_event(d))
+            for d in message_documents
+            if cast(MessageEventData, d["data"]).get("pending_moderation")
+        ]
+
+    @override
+    async def purge_deleted_events(self) -> int:
         async with self._lock.writer_lock:
-            if not await self._session_collection.find_one(filters={"id": {"$eq": session_id}}):
-                raise ItemNotFoundError(item_id=UniqueId(session_id), message="Session not found")
+            result = await self._event_collection.delete_many(filters={"deleted": {"$eq": True}})
+
+        return result.deleted_count
+
+    @override
+    async def drop_stale_status_events(self) -> int:
+        async with self._lock.writer_lock:
+            status_documents = await self._event_collection.find(
+                filters={"kind": {"$eq": "status"}}
+            )
+
+            last_ready_offsets: dict[SessionId, int] = {}
+
+            for d in status_documents:
+                if cast(StatusEventData, d["data"])["status"] == "ready":
+                    last_ready_offsets[d["session_id"]] = max(
+                        d["offset"], last_ready_offsets.get(d["session_id"], -1)
+                    )
+
+            if not last_ready_offsets:
+                return 0
 
-            inspection = Inspection(
-                message_generations=message_generations,
-                preparation_iterations=preparation_iterations,
+            result = await self._event_collection.delete_many(
+                filters={
+                    "$or": [
+                        {
+                            "session_id": {"$eq": session_id},
+                            "kind": {"$eq": "status"},
+                            "offset": {"$lt": offset},
+                        }
+                        for session_id, offset in last_ready_offsets.items()
+                    ]
+                }
             )
 
-            await self._inspection_collection.insert_one(
-                document=self._serialize_inspection(
-                    inspection,
+        return result.deleted_count
+
+    @override
+    async def archive_idle_sessions(self, idle_since: datetime) -> int:
+        if not self._archive:
+            return 0
+
+        async with self._lock.writer_lock:
+            events_by_session: dict[SessionId, list[_EventDocument]] = {}
+
+            for d in await self._event_collection.find(filters={}):
+                events_by_session.setdefault(d["session_id"], []).append(d)
+
+            idle_session_ids = [
+                session_id
+                for session_id, event_documents in events_by_session.items()
+                if max(datetime.fromisoformat(d["creation_utc"]) for d in event_documents)
+                < idle_since
+            ]
+
+            for session_id in idle_session_ids:
+                # Never overwrite an existing archive of the session, but merge into it
+                await self._restore_archived_events(session_id)
+
+                session_event_documents = await self._event_collection.find(
+                    filters={"session_id": {"$eq": session_id}}
+                )
+
+                await self._archive.write(
                     session_id,
-                    correlation_id,
+                    cast(JSONSerializable, {"events": session_event_documents}),
                 )
-            )
+                self._archived_session_ids.add(session_id)
+
+            if idle_session_ids:
+                await self._event_collection.delete_many(
+                    filters={
+                        "$or": [
+                            {"session_id": {"$eq": session_id}} for session_id in idle_session_ids
+                        ]
+                    }
+                )
+
+        return len(idle_session_ids)
+
+
+class CachedSessionStore(SessionStore):
+    def __init__(
+        self,
+        session_store: SessionStore,
+        metrics: MetricsRegistry,
+        versions: Optional[ResourceVersionStore] = None,
+    ) -> None:
+        self._session_store = session_store
+        self._cache = EntityCache[SessionId, Session]("sessions", metrics, versions)
+
+    @override
+    async def create_session(
+        self,
+        customer_id: CustomerId,
+        agent_id: AgentId,
+        creation_utc: Optional[datetime] = None,
+        title: Optional[str] = None,
+    ) -> Session:
+        return await self._session_store.create_session(customer_id, agent_id, creation_utc, title)
+
+    @override
+    async def read_session(
+        self,
+        session_id: SessionId,
+    ) -> Session:
+        return await self._cache.get_or_read(
+            session_id,
+            lambda: self._session_store.read_session(session_id),
+        )
+
+    @override
+    async def delete_session(
+        self,
+        session_id: SessionId,
+    ) -> None:
+        try:
+            await self._session_store.delete_session(session_id)
+        finally:
+            self._cache.discard(session_id)
+
+    @override
+    async def update_session(
+        self,
+        session_id: SessionId,
+        params: SessionUpdateParams,
+    ) -> Session:
+        try:
+            return await self._session_store.update_session(session_id, params)
+        finally:
+            self._cache.discard(session_id)
 
-        return inspection
+    @override
+    async def list_sessions(
+        self,
+        agent_id: Optional[AgentId] = None,
+        customer_id: Optional[CustomerId] = None,
+        limit: Optional[int] = None,
+        after: Optional[SessionId] = None,
+    ) -> Sequence[Session]:
+        return await self._session_store.list_sessions(agent_id, customer_id, limit, after)
 
     @override
-    async def read_inspection(
+    async def create_event(
         self,
         session_id: SessionId,
+        source: EventSource,
+        kind: EventKind,
         correlation_id: str,
-    ) -> Inspection:
-        async with self._lock.reader_lock:
-            if not await self._session_collection.find_one(filters={"id": {"$eq": session_id}}):
-                raise ItemNotFoundError(item_id=UniqueId(session_id), message="Session not found")
+        data: JSONSerializable,
+        creation_utc: Optional[datetime] = None,
+    ) -> Event:
+        return await self._session_store.create_event(
+            session_id, source, kind, correlation_id, data, creation_utc
+        )
 
-            if not await self._event_collection.find_one(
-                filters={
-                    "correlation_id": {"$eq": correlation_id},
-                    "kind": {"$eq": "message"},
-                }
-            ):
-                raise ItemNotFoundError(
-                    item_id=UniqueId(correlation_id), message="Message event not found"
-                )
+    @override
+    async def read_event(
+        self,
+        session_id: SessionId,
+        event_id: EventId,
+    ) -> Event:
+        return await self._session_store.read_event(session_id, event_id)
 
-            if inspection_document := await self._inspection_collection.find_one(
-                filters={"correlation_id": {"$eq": correlation_id}}
-            ):
-                return self._deserialize_message_inspection(inspection_document)
+    @override
+    async def update_event(
+        self,
+        session_id: SessionId,
+        event_id: EventId,
+        params: EventUpdateParams,
+    ) -> Event:
+        return await self._session_store.update_event(session_id, event_id, params)
+
+    @override
+    async def delete_event(
+        self,
+        event_id: EventId,
+    ) -> None:
+        await self._session_store.delete_event(event_id)
 
-        raise ItemNotFoundError(
-            item_id=UniqueId(correlation_id), message="Message inspection not found"
+    @override
+    async def list_events(
+        self,
+        session_id: SessionId,
+        source: Optional[EventSource] = None,
+        correlation_id: Optional[str] = None,
+        kinds: Sequence[EventKind] = [],
+        min_offset: Optional[int] = None,
+        exclude_deleted: bool = True,
+        limit: Optional[int] = None,
+    ) -> Sequence[Event]:
+        return await self._session_store.list_events(
+            session_id, source, correlation_id, kinds, min_offset, exclude_deleted, limit
         )
 
+    @override
+    async def list_events_pending_moderation(self) -> Sequence[tuple[SessionId, Event]]:
+        return await self._session_store.list_events_pending_moderation()
+
+    @override
+    async def purge_deleted_events(self) -> int:
+        return await self._session_store.purge_deleted_events()
+
+    @override
+    async def drop_stale_status_events(self) -> int:
+        return await self._session_store.drop_stale_status_events()
+
+    @override
+    async def archive_idle_sessions(self, idle_since: datetime) -> int:
+        return await self._session_store.archive_idle_sessions(idle_since)
+
 
 class SessionListener(ABC):
     @abstractmethod
@@ -847,9 +1033,14 @@ class SessionListener(ABC):
 
 
 class PollingSessionListener(SessionListener):
-    def __init__(self, session_store: SessionStore) -> None:
+    def __init__(self, session_store: SessionStore, metrics: MetricsRegistry) -> None:
         self._session_store = session_store
 
+        self._waiters = metrics.gauge(
+            "session_listener_waiters",
+            "Number of requests currently waiting for session events",
+        )
+
     @override
     async def wait_for_events(
         self,
@@ -863,18 +1054,19 @@ class PollingSessionListener(SessionListener):
         # Trigger exception if not found
         _ = await self._session_store.read_session(session_id)
 
-        while True:
-            events = await self._session_store.list_events(
-                session_id,
-                min_offset=min_offset,
-                source=source,
-                kinds=kinds,
-                correlation_id=correlation_id,
-            )
+        with self._waiters.track_in_progress():
+            while True:
+                events = await self._session_store.list_events(
+                    session_id,
+                    min_offset=min_offset,
+                    source=source,
+                    kinds=kinds,
+                    correlation_id=correlation_id,
+                )
 
-            if events:
-                return True
-            elif timeout.expired():
-                return False
-            else:
-                await timeout.wait_up_to(1)
+                if events:
+                    return True
+                elif timeout.expired():
+                    return False
+                else:
+                    await timeout.wait_up_to(1)
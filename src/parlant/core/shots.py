@@ -14,7 +14,7 @@
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import TypeVar, Generic, Sequence, cast
+from typing import Hashable, Optional, TypeVar, Generic, Sequence, cast
 
 from parlant.core.common import generate_id, JSONSerializable
 from parlant.core.sessions import (
@@ -63,13 +63,39 @@ TShot = TypeVar("TShot", bound=Shot)
 
 class ShotCollection(Generic[TShot]):
     def __init__(self, initial_shots: Sequence[TShot]) -> None:
+        self._id = generate_id()
         self._shots: list[TShot] = list(initial_shots)
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Incremented on every change to the collection"""
+        return self._version
+
+    def cache_key(self, shots: Sequence[TShot]) -> Optional[Hashable]:
+        """Identifies a rendering of the given shots at the collection's current version,
+        or returns None if any of them was not taken from this collection"""
+        indices = [self._index_of(s) for s in shots]
+
+        if None in indices:
+            return None
+
+        return (self._id, self._version, tuple(indices))
+
+    def _index_of(self, shot: TShot) -> Optional[int]:
+        # Positions are stable for a given version, as every change bumps it
+        for i, s in enumerate(self._shots):
+            if s is shot:
+                return i
+
+        return None
 
     async def append(
         self,
         shot: TShot,
     ) -> None:
         self._shots.append(shot)
+        self._version += 1
 
     async def insert(
         self,
@@ -77,6 +103,7 @@ class ShotCollection(Generic[TShot]):
         index: int = 0,
     ) -> None:
         self._shots.insert(index, shot)
+        self._version += 1
 
     async def list(self) -> Sequence[TShot]:
         return self._shots
@@ -86,6 +113,8 @@ class ShotCollection(Generic[TShot]):
         shot: TShot,
     ) -> None:
         self._shots.remove(shot)
+        self._version += 1
 
     async def clear(self) -> None:
         self._shots.clear()
+        self._version += 1
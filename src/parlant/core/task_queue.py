@@ -0,0 +1,414 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from datetime import timedelta
+import time
+from typing import Awaitable, Callable, NewType, Optional, Sequence, TypeAlias
+from typing_extensions import override
+
+from parlant.core.background_tasks import BackgroundTaskService
+from parlant.core.common import JSONSerializable, generate_id
+from parlant.core.contextual_correlator import ContextualCorrelator
+from parlant.core.logging import Logger
+
+QueuedTaskId = NewType("QueuedTaskId", str)
+
+
+@dataclass(frozen=True)
+class QueuedTask:
+    id: QueuedTaskId
+    kind: str
+    tag: str
+    payload: JSONSerializable
+    correlation_id: str
+    attempt: int
+
+
+class TaskQueue(ABC):
+    """A queue of tasks, each of which is delivered at least once.
+
+    Claimed tasks stay invisible to other consumers until their claim expires,
+    so tasks whose consumer crashed are eventually picked up by another one.
+    At most one task of any given tag is claimed at a time.
+    """
+
+    @abstractmethod
+    async def enqueue(
+        self,
+        kind: str,
+        tag: str,
+        payload: JSONSerializable,
+        correlation_id: str,
+        supersede: bool = True,
+    ) -> QueuedTaskId:
+        """Queues a task, superseding any other task with the same tag.
+
+        Without superseding, the task is only queued if no other task with the same tag is queued.
+        """
+        ...
+
+    @abstractmethod
+    async def claim(
+        self,
+        kinds: Sequence[str],
+        visibility_timeout: timedelta,
+    ) -> Optional[QueuedTask]: ...
+
+    @abstractmethod
+    async def extend(
+        self,
+        task_ids: Sequence[QueuedTaskId],
+        visibility_timeout: timedelta,
+    ) -> None: ...
+
+    @abstractmethod
+    async def list_superseded(
+        self,
+        task_ids: Sequence[QueuedTaskId],
+    ) -> Sequence[QueuedTaskId]: ...
+
+    @abstractmethod
+    async def complete(self, task_id: QueuedTaskId) -> None: ...
+
+    @abstractmethod
+    async def retry(self, task_id: QueuedTaskId, delay: timedelta) -> None: ...
+
+    @abstractmethod
+    async def fail(self, task_id: QueuedTaskId, error: str) -> None: ...
+
+    @abstractmethod
+    async def wait(self, timeout: float) -> None:
+        """Returns once a task may have become claimable, or when the timeout expires"""
+        ...
+
+
+@dataclass
+class _InMemoryTask:
+    id: QueuedTaskId
+    kind: str
+    tag: str
+    payload: JSONSerializable
+    correlation_id: str
+    attempts: int
+    available_at: float
+    claimed_until: Optional[float] = None
+    superseded: bool = False
+
+    def is_claimed(self, now: float) -> bool:
+        return self.claimed_until is not None and self.claimed_until >= now
+
+
+class InMemoryTaskQueue(TaskQueue):
+    """Serves a single-process server, whose queued tasks don't outlive it"""
+
+    def __init__(self) -> None:
+        self._tasks: dict[QueuedTaskId, _InMemoryTask] = {}
+        self._changed = asyncio.Event()
+
+    @override
+    async def enqueue(
+        self,
+        kind: str,
+        tag: str,
+        payload: JSONSerializable,
+        correlation_id: str,
+        supersede: bool = True,
+    ) -> QueuedTaskId:
+        now = time.time()
+
+        for task in [t for t in self._tasks.values() if t.tag == tag]:
+            if not supersede:
+                if not task.superseded:
+                    return task.id
+            elif task.is_claimed(now):
+                task.superseded = True
+            else:
+                del self._tasks[task.id]
+
+        task_id = QueuedTaskId(generate_id())
+        self._tasks[task_id] = _InMemoryTask(
+            id=task_id,
+            kind=kind,
+            tag=tag,
+            payload=payload,
+            correlation_id=correlation_id,
+            attempts=0,
+            available_at=now,
+        )
+
+        self._changed.set()
+
+        return task_id
+
+    @override
+    async def claim(
+        self,
+        kinds: Sequence[str],
+        visibility_timeout: timedelta,
+    ) -> Optional[QueuedTask]:
+        now = time.time()
+
+        claimed_tags = {t.tag for t in self._tasks.values() if t.is_claimed(now)}
+
+        for task in self._tasks.values():
+            if (
+                task.kind in kinds
+                and not task.superseded
+                and task.available_at <= now
+                and task.tag not in claimed_tags
+            ):
+                task.claimed_until = now + visibility_timeout.total_seconds()
+                task.attempts += 1
+
+                return QueuedTask(
+                    id=task.id,
+                    kind=task.kind,
+                    tag=task.tag,
+                    payload=task.payload,
+                    correlation_id=task.correlation_id,
+                    attempt=task.attempts,
+                )
+
+        return None
+
+    @override
+    async def extend(
+        self,
+        task_ids: Sequence[QueuedTaskId],
+        visibility_timeout: timedelta,
+    ) -> None:
+        for task_id in task_ids:
+            if task := self._tasks.get(task_id):
+                task.claimed_until = time.time() + visibility_timeout.total_seconds()
+
+    @override
+    async def list_superseded(
+        self,
+        task_ids: Sequence[QueuedTaskId],
+    ) -> Sequence[QueuedTaskId]:
+        return [id for id in task_ids if (task := self._tasks.get(id)) and task.superseded]
+
+    @override
+    async def complete(self, task_id: QueuedTaskId) -> None:
+        self._tasks.pop(task_id, None)
+        self._changed.set()
+
+    @override
+    async def retry(self, task_id: QueuedTaskId, delay: timedelta) -> None:
+        if not (task := self._tasks.get(task_id)):
+            return
+
+        if task.superseded:
+            del self._tasks[task_id]
+        else:
+            task.claimed_until = None
+            task.available_at = time.time() + delay.total_seconds()
+
+        self._changed.set()
+
+    @override
+    async def fail(self, task_id: QueuedTaskId, error: str) -> None:
+        # Failures are logged by the consumer, and nothing else would read them here
+        self._tasks.pop(task_id, None)
+        self._changed.set()
+
+    @override
+    async def wait(self, timeout: float) -> None:
+        now = time.time()
+
+        # Tasks which are waiting out a retry delay become claimable by themselves
+        due_times = [
+            t.available_at
+            for t in self._tasks.values()
+            if not t.superseded and not t.is_claimed(now) and t.available_at > now
+        ]
+
+        if due_times:
+            timeout = min(timeout, min(due_times) - now)
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            pass
+
+        self._changed.clear()
+
+
+TaskHandler: TypeAlias = Callable[[JSONSerializable], Awaitable[None]]
+
+
+class TaskQueueConsumer:
+    """Claims queued tasks of the kinds it has handlers for, and runs them as background tasks.
+
+    Each kind of task has its own concurrency limit, so that long tasks of one kind
+    can't hold up the others. Submitting a task supersedes queued and running tasks
+    of the same tag, wherever they run, so that they're effectively restarted.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        correlator: ContextualCorrelator,
+        background_task_service: BackgroundTaskService,
+        task_queue: TaskQueue,
+        concurrency: int = 32,
+        visibility_timeout: timedelta = timedelta(seconds=30),
+        polling_interval: float = 0.25,
+        max_attempts: int = 5,
+        base_retry_delay: timedelta = timedelta(seconds=1),
+        max_retry_delay: timedelta = timedelta(minutes=5),
+    ) -> None:
+        self._logger = logger
+        self._correlator = correlator
+        self._background_task_service = background_task_service
+        self._task_queue = task_queue
+        self._default_concurrency = concurrency
+        self._visibility_timeout = visibility_timeout
+        self._polling_interval = polling_interval
+        self._max_attempts = max_attempts
+        self._base_retry_delay = base_retry_delay
+        self._max_retry_delay = max_retry_delay
+
+        self._handlers: dict[str, TaskHandler] = {}
+        self._concurrency: dict[str, int] = {}
+        self._running_tasks: dict[QueuedTaskId, QueuedTask] = {}
+        self._superseded_task_ids: set[QueuedTaskId] = set()
+        self._wakeup = asyncio.Event()
+
+    def register_handler(
+        self,
+        kind: str,
+        handler: TaskHandler,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        self._handlers[kind] = handler
+        self._concurrency[kind] = concurrency or self._default_concurrency
+
+    async def start(self) -> None:
+        await self._background_task_service.start(self._run(), tag="task-queue-consumer")
+
+    async def submit(
+        self,
+        kind: str,
+        tag: str,
+        payload: JSONSerializable,
+        supersede: bool = True,
+    ) -> None:
+        await self._task_queue.enqueue(
+            kind=kind,
+            tag=tag,
+            payload=payload,
+            correlation_id=self._correlator.correlation_id,
+            supersede=supersede,
+        )
+
+        if supersede:
+            # Running tasks of other consumers find out on their next check
+            for task in list(self._running_tasks.values()):
+                if task.tag == tag:
+                    await self._cancel_superseded(task)
+
+        self._wakeup.set()
+
+    async def _cancel_superseded(self, task: QueuedTask) -> None:
+        self._superseded_task_ids.add(task.id)
+        await self._background_task_service.cancel(tag=task.tag, reason="Superseded")
+
+    def _claimable_kinds(self) -> list[str]:
+        running = Counter(t.kind for t in self._running_tasks.values())
+        return [kind for kind in self._handlers if running[kind] < self._concurrency[kind]]
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_extension = loop.time()
+
+        while True:
+            self._wakeup.clear()
+
+            while kinds := self._claimable_kinds():
+                task = await self._task_queue.claim(kinds, self._visibility_timeout)
+
+                if not task:
+                    break
+
+                self._running_tasks[task.id] = task
+
+                # A superseded task of the same tag may still be winding down
+                await self._background_task_service.restart(self._execute(task), tag=task.tag)
+
+            if running_task_ids := list(self._running_tasks):
+                for task_id in await self._task_queue.list_superseded(running_task_ids):
+                    if task := self._running_tasks.get(task_id):
+                        await self._cancel_superseded(task)
+
+                if loop.time() - last_extension > self._visibility_timeout.total_seconds() / 3:
+                    await self._task_queue.extend(running_task_ids, self._visibility_timeout)
+                    last_extension = loop.time()
+
+            # Running tasks have to be checked for supersession and extended periodically,
+            # while an idle consumer only has to wait for new tasks
+            timeout = (
+                self._polling_interval
+                if self._running_tasks
+                else self._visibility_timeout.total_seconds()
+            )
+
+            # Unlike wait_for(), wait() never swallows our own cancellation
+            wakeups = [
+                asyncio.ensure_future(self._wakeup.wait()),
+                asyncio.ensure_future(self._task_queue.wait(timeout)),
+            ]
+
+            try:
+                await asyncio.wait(wakeups, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for wakeup in wakeups:
+                    wakeup.cancel()
+
+    async def _execute(self, task: QueuedTask) -> None:
+        try:
+            with self._correlator.correlation_scope(task.correlation_id):
+                await self._handlers[task.kind](task.payload)
+
+            await self._task_queue.complete(task.id)
+        except asyncio.CancelledError:
+            if task.id in self._superseded_task_ids:
+                await self._task_queue.complete(task.id)
+            else:
+                # We're shutting down; let the task be resumed right away
+                await self._task_queue.retry(task.id, delay=timedelta(0))
+
+            raise
+        except Exception as exc:
+            if task.attempt >= self._max_attempts:
+                self._logger.error(f"Task '{task.tag}' failed after {task.attempt} attempts: {exc}")
+                await self._task_queue.fail(task.id, error=str(exc))
+            else:
+                delay = min(
+                    self._base_retry_delay * 2 ** (task.attempt - 1),
+                    self._max_retry_delay,
+                )
+                self._logger.warning(
+                    f"Task '{task.tag}' failed (attempt {task.attempt}); retrying in {delay}: {exc}"
+                )
+                await self._task_queue.retry(task.id, delay=delay)
+        finally:
+            self._running_tasks.pop(task.id, None)
+            self._superseded_task_ids.discard(task.id)
+            self._wakeup.set()
@@ -0,0 +1,387 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import asyncio
+from collections import deque
+from contextlib import contextmanager
+import contextvars
+from dataclasses import dataclass, field
+import hashlib
+import json
+from pathlib import Path
+import queue
+import secrets
+import threading
+import time
+from types import TracebackType
+from typing import Any, Iterator, Literal, Mapping, Optional, Sequence, TypeAlias
+from typing_extensions import override, Self
+
+from parlant.core.contextual_correlator import ContextualCorrelator
+from parlant.core.logging import LogLevel, LogMessage, Logger
+
+
+SpanStatus: TypeAlias = Literal["unset", "ok", "error", "cancelled"]
+
+DEFAULT_SPAN_CAPACITY = 10_000
+
+_OTLP_STATUS_CODES: Mapping[SpanStatus, int] = {
+    "unset": 0,
+    "ok": 1,
+    "error": 2,
+    "cancelled": 2,
+}
+
+_OTLP_SPAN_KIND_INTERNAL = 1
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    name: str
+    correlation_id: str
+    start_time_ns: int
+    end_time_ns: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: SpanStatus = "unset"
+    status_message: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": json.dumps(value, default=str)}
+
+
+def span_to_otlp(span: Span) -> dict[str, Any]:
+    result: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": _OTLP_SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(span.start_time_ns),
+        "endTimeUnixNano": str(span.end_time_ns or span.start_time_ns),
+        "attributes": [
+            {"key": "parlant.correlation_id", "value": _otlp_value(span.correlation_id)},
+            *({"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()),
+        ],
+        "status": {"code": _OTLP_STATUS_CODES[span.status]},
+    }
+
+    if span.parent_span_id:
+        result["parentSpanId"] = span.parent_span_id
+
+    if span.status_message:
+        result["status"]["message"] = span.status_message
+
+    return result
+
+
+def spans_to_otlp(spans: Sequence[Span], service_name: str = "parlant") -> dict[str, Any]:
+    """Builds an OTLP/JSON ExportTraceServiceRequest holding the given spans"""
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": service_name}},
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "parlant"},
+                        "spans": [span_to_otlp(s) for s in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def flush(self) -> None:
+        pass
+
+
+class OTLPJSONFileExporter(SpanExporter):
+    """Appends finished spans to a file in the OTLP file exporter format (one request per line).
+
+    Spans are exported from the event loop, so batches are serialized and written
+    on a dedicated thread. When max_file_size is set, a file which would grow past it
+    is rotated to file_path.1 (and so on, up to backup_count), as with logging's
+    RotatingFileHandler.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        batch_size: int = 100,
+        service_name: str = "parlant",
+        max_file_size: Optional[int] = None,
+        backup_count: int = 1,
+    ) -> None:
+        self.file_path = file_path
+        self._batch_size = batch_size
+        self._service_name = service_name
+        self._max_file_size = max_file_size
+        self._backup_count = backup_count
+
+        self._pending: list[Span] = []
+        self._lock = threading.Lock()
+
+        self._batches: queue.Queue[Optional[Sequence[Span]]] = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._run,
+            name=f"span-writer({file_path.name})",
+            daemon=True,
+        )
+        self._writer.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.flush()
+
+        self._batches.put(None)
+        self._writer.join()
+
+    @override
+    def export(self, spans: Sequence[Span]) -> None:
+        with self._lock:
+            self._pending.extend(spans)
+
+            if len(self._pending) < self._batch_size:
+                return
+
+            batch, self._pending = self._pending, []
+
+        self._batches.put(batch)
+
+    @override
+    def flush(self) -> None:
+        """Writes all spans exported so far, blocking until they're written"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+
+        if batch:
+            self._batches.put(batch)
+
+        self._batches.join()
+
+    def _run(self) -> None:
+        while batch := self._batches.get():
+            try:
+                line = json.dumps(spans_to_otlp(batch, self._service_name)) + "\n"
+
+                if self._should_rotate(len(line)):
+                    self._rotate()
+
+                with self.file_path.open("a") as f:
+                    f.write(line)
+            except Exception:
+                pass  # A failed write only loses its batch, and never the writer
+            finally:
+                self._batches.task_done()
+
+        self._batches.task_done()
+
+    def _should_rotate(self, size: int) -> bool:
+        if self._max_file_size is None or not self.file_path.exists():
+            return False
+
+        return self.file_path.stat().st_size + size > self._max_file_size
+
+    def _rotate(self) -> None:
+        if self._backup_count < 1:
+            self.file_path.unlink()
+            return
+
+        for n in range(self._backup_count - 1, 0, -1):
+            if (backup := self._backup_path(n)).exists():
+                backup.replace(self._backup_path(n + 1))
+
+        self.file_path.replace(self._backup_path(1))
+
+    def _backup_path(self, n: int) -> Path:
+        return self.file_path.with_name(f"{self.file_path.name}.{n}")
+
+
+class Tracer:
+    """Records nested spans for operations, grouping them into traces by root correlation scope"""
+
+    def __init__(
+        self,
+        correlator: ContextualCorrelator,
+        capacity: int = DEFAULT_SPAN_CAPACITY,
+        exporters: Sequence[SpanExporter] = (),
+    ) -> None:
+        self._correlator = correlator
+        self._exporters = list(exporters)
+
+        self._spans: deque[Span] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+        self._current_span = contextvars.ContextVar[Optional[Span]](
+            f"tracer_{id(self)}_current_span",
+            default=None,
+        )
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        self._exporters.append(exporter)
+
+    @property
+    def current_span(self) -> Optional[Span]:
+        return self._current_span.get()
+
+    @contextmanager
+    def span(self, name: str, attributes: Mapping[str, Any] = {}) -> Iterator[Span]:
+        correlation_id = self._correlator.correlation_id
+        trace_id = self._trace_id_for(correlation_id)
+        parent = self._current_span.get()
+
+        span = Span(
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent and parent.trace_id == trace_id else None,
+            name=name,
+            correlation_id=correlation_id,
+            start_time_ns=time.time_ns(),
+            attributes=dict(attributes),
+        )
+
+        reset_token = self._current_span.set(span)
+
+        try:
+            yield span
+            span.status = "ok"
+        except asyncio.CancelledError:
+            span.status = "cancelled"
+            raise
+        except BaseException as exc:
+            span.status = "error"
+            span.status_message = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            self._current_span.reset(reset_token)
+            span.end_time_ns = time.time_ns()
+            self._record(span)
+
+    def find_spans(self, correlation_id: str) -> Sequence[Span]:
+        """Returns recorded spans whose correlation id is, or is nested under, the given one"""
+
+        with self._lock:
+            spans = list(self._spans)
+
+        return [
+            s
+            for s in spans
+            if s.correlation_id == correlation_id
+            or s.correlation_id.startswith(f"{correlation_id}::")
+        ]
+
+    def flush(self) -> None:
+        for exporter in self._exporters:
+            exporter.flush()
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+        for exporter in self._exporters:
+            exporter.export([span])
+
+    def _trace_id_for(self, correlation_id: str) -> str:
+        if parent := self._current_span.get():
+            if correlation_id == parent.correlation_id or correlation_id.startswith(
+                f"{parent.correlation_id}::"
+            ):
+                return parent.trace_id
+
+        root_scope = correlation_id.split("::", 1)[0]
+
+        if root_scope == "<main>":
+            return secrets.token_hex(16)
+
+        return hashlib.md5(root_scope.encode()).hexdigest()
+
+
+class TracingLogger(Logger):
+    """A logger that ignores messages and turns every operation into a span"""
+
+    def __init__(self, tracer: Tracer) -> None:
+        self._tracer = tracer
+
+    @override
+    def set_level(self, log_level: LogLevel) -> None:
+        pass
+
+    @override
+    def debug(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    def info(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    def warning(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    def error(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    def critical(self, message: LogMessage) -> None:
+        pass
+
+    @override
+    @contextmanager
+    def operation(self, name: str, props: dict[str, Any] = {}) -> Iterator[None]:
+        with self._tracer.span(name, props):
+            yield
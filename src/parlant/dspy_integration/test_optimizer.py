@@ -1,36 +1,39 @@
 """Test script for the BatchOptimizedGuidelineManager."""
 
 import asyncio
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 from parlant.core.guidelines import Guideline, GuidelineContent, GuidelineId
-from parlant.core.logging import Logger
+from parlant.core.logging import Logger, LogLevel, LogMessage, render_log_message
 from parlant.dspy_integration.guideline_optimizer import BatchOptimizedGuidelineManager
 
 
 class SimpleLogger(Logger):
     """A simple logger implementation for testing."""
     
-    def debug(self, message: str, **kwargs) -> None:
-        print(f"DEBUG: {message}")
+    def debug(self, message: LogMessage) -> None:
+        print(f"DEBUG: {render_log_message(message)}")
         
-    def info(self, message: str, **kwargs) -> None:
-        print(f"INFO: {message}")
+    def info(self, message: LogMessage) -> None:
+        print(f"INFO: {render_log_message(message)}")
         
-    def warning(self, message: str, **kwargs) -> None:
-        print(f"WARNING: {message}")
+    def warning(self, message: LogMessage) -> None:
+        print(f"WARNING: {render_log_message(message)}")
         
-    def error(self, message: str, **kwargs) -> None:
-        print(f"ERROR: {message}")
+    def error(self, message: LogMessage) -> None:
+        print(f"ERROR: {render_log_message(message)}")
         
-    def critical(self, message: str, **kwargs) -> None:
-        print(f"CRITICAL: {message}")
+    def critical(self, message: LogMessage) -> None:
+        print(f"CRITICAL: {render_log_message(message)}")
         
-    def operation(self, message: str, **kwargs) -> None:
-        print(f"OPERATION: {message}")
+    @contextmanager
+    def operation(self, name: str, props: dict[str, Any] = {}) -> Iterator[None]:
+        print(f"OPERATION: {name}")
+        yield
         
-    def set_level(self, level: str) -> None:
+    def set_level(self, log_level: LogLevel) -> None:
         pass
 
 
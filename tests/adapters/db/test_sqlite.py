@@ -0,0 +1,344 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+import tempfile
+from typing import AsyncIterator, Optional
+from unittest.mock import AsyncMock
+from lagom import Container
+from pytest import fixture
+from typing_extensions import TypedDict
+
+from parlant.adapters.db.sqlite import (
+    SQLiteDocumentDatabase,
+    SQLiteLeaseManager,
+    SQLiteTaskQueue,
+)
+from parlant.core.agents import AgentDocumentStore, AgentId
+from parlant.core.common import Version
+from parlant.core.customers import CustomerId
+from parlant.core.logging import Logger
+from parlant.core.persistence.common import ObjectId, keyset_filters
+from parlant.core.sessions import EventSource, SessionDocumentStore
+
+
+class _TestDocument(TypedDict, total=False):
+    id: ObjectId
+    version: Version.String
+    name: str
+    rank: int
+    note: Optional[str]
+
+
+@fixture
+async def new_file() -> AsyncIterator[Path]:
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory) / "test.sqlite"
+
+
+def _document(id: str, name: str, rank: int) -> _TestDocument:
+    return _TestDocument(
+        id=ObjectId(id),
+        version=Version.String("0.1.0"),
+        name=name,
+        rank=rank,
+        note=None,
+    )
+
+
+async def test_that_documents_are_filtered_in_insertion_order(
+    container: Container,
+    new_file: Path,
+) -> None:
+    async with SQLiteDocumentDatabase(container[Logger], new_file) as db:
+        collection = await db.get_or_create_collection("test", _TestDocument)
+
+        for i, name in enumerate(["a", "b", "c", "d"]):
+            await collection.insert_one(_document(str(i), name, rank=i))
+
+        results = await collection.find(
+            {"$or": [{"rank": {"$lte": 1}}, {"name": {"$eq": "d"}}]},
+        )
+        assert [d["name"] for d in results] == ["a", "b", "d"]
+
+        results = await collection.find({"rank": {"$gt": 0, "$lt": 3}, "name": {"$ne": "b"}})
+        assert [d["name"] for d in results] == ["c"]
+
+        assert len(await collection.find({})) == 4
+        assert await collection.find_one({"name": {"$eq": "missing"}}) is None
+
+
+async def test_that_documents_can_be_updated_upserted_and_deleted(
+    container: Container,
+    new_file: Path,
+) -> None:
+    async with SQLiteDocumentDatabase(container[Logger], new_file) as db:
+        collection = await db.get_or_create_collection("test", _TestDocument)
+
+        await collection.insert_one(_document("1", "a", rank=1))
+
+        result = await collection.update_one({"id": {"$eq": "1"}}, {"note": "updated"})  # type: ignore
+        assert result.updated_document
+        assert result.updated_document["note"] == "updated"
+        assert result.updated_document["name"] == "a"
+
+        result = await collection.update_one(
+            {"id": {"$eq": "2"}},
+            _document("2", "b", rank=2),
+            upsert=True,
+        )
+        assert result.matched_count == 0
+        assert await collection.find_one({"id": {"$eq": "2"}})
+
+        deletion = await collection.delete_one({"id": {"$eq": "1"}})
+        assert deletion.deleted_count == 1
+        assert [d["id"] for d in await collection.find({})] == ["2"]
+
+
+async def test_that_documents_can_be_inserted_and_deleted_in_bulk(
+    container: Container,
+    new_file: Path,
+) -> None:
+    async with SQLiteDocumentDatabase(container[Logger], new_file) as db:
+        collection = await db.get_or_create_collection("test", _TestDocument)
+
+        await collection.insert_many(
+            [_document(str(i), name, rank=i) for i, name in enumerate(["a", "b", "c", "d"])]
+        )
+        assert [d["name"] for d in await collection.find({})] == ["a", "b", "c", "d"]
+
+        deletion = await collection.delete_many(
+            {"$or": [{"name": {"$eq": "a"}}, {"rank": {"$gte": 2}}]},
+        )
+        assert deletion.deleted_count == 3
+        assert [d["name"] for d in await collection.find({})] == ["b"]
+
+
+async def test_that_documents_can_be_paged_through_in_sort_order(
+    container: Container,
+    new_file: Path,
+) -> None:
+    async with SQLiteDocumentDatabase(container[Logger], new_file) as db:
+        collection = await db.get_or_create_collection("test", _TestDocument)
+
+        await collection.insert_many(
+            [
+                _document("4", "a", rank=2),
+                _document("1", "b", rank=1),
+                _document("3", "c", rank=2),
+                _document("2", "d", rank=1),
+            ]
+        )
+
+        first_page = await collection.find({}, sort=["rank", "id"], limit=3)
+        assert [d["name"] for d in first_page] == ["b", "d", "c"]
+
+        second_page = await collection.find(
+            keyset_filters(["rank", "id"], first_page[-1]),
+            sort=["rank", "id"],
+            limit=3,
+        )
+        assert [d["name"] for d in second_page] == ["a"]
+
+
+async def test_that_data_is_shared_between_database_instances_of_the_same_file(
+    container: Container,
+    new_file: Path,
+) -> None:
+    async with (
+        SQLiteDocumentDatabase(container[Logger], new_file) as first_db,
+        SQLiteDocumentDatabase(container[Logger], new_file) as second_db,
+    ):
+        async with (
+            AgentDocumentStore(first_db) as first_store,
+            AgentDocumentStore(second_db) as second_store,
+        ):
+            agent = await first_store.create_agent(name="Test Agent")
+
+            assert await second_store.read_agent(agent.id) == agent
+
+
+async def test_that_concurrent_event_creation_by_multiple_processes_yields_unique_offsets(
+    container: Container,
+    new_file: Path,
+) -> None:
+    lease_file = new_file.with_name("leases.sqlite")
+
+    async with (
+        SQLiteDocumentDatabase(container[Logger], new_file) as first_db,
+        SQLiteDocumentDatabase(container[Logger], new_file) as second_db,
+        SQLiteLeaseManager(lease_file) as first_lease_manager,
+        SQLiteLeaseManager(lease_file) as second_lease_manager,
+    ):
+        async with (
+            SessionDocumentStore(first_db, lease_manager=first_lease_manager) as first_store,
+            SessionDocumentStore(second_db, lease_manager=second_lease_manager) as second_store,
+        ):
+            session = await first_store.create_session(
+                customer_id=CustomerId("test-customer"),
+                agent_id=AgentId("test-agent"),
+            )
+
+            async def create_events(store: SessionDocumentStore, source: EventSource) -> None:
+                for _ in range(5):
+                    await store.create_event(
+                        session.id,
+                        source=source,
+                        kind="message",
+                        correlation_id="<main>",
+                        data={},
+                    )
+
+            await asyncio.gather(
+                create_events(first_store, "customer"),
+                create_events(second_store, "ai_agent"),
+            )
+
+            events = await first_store.list_events(session.id)
+
+            assert sorted(e.offset for e in events) == list(range(10))
+
+
+async def test_that_a_lease_is_owned_by_one_worker_at_a_time(
+    new_file: Path,
+) -> None:
+    async with (
+        SQLiteLeaseManager(new_file) as first_worker,
+        SQLiteLeaseManager(new_file) as second_worker,
+    ):
+        token = await first_worker.acquire("key", timedelta(seconds=30))
+
+        assert token
+        assert await second_worker.acquire("key", timedelta(seconds=30)) is None
+
+        await first_worker.release("key", token)
+
+        assert await second_worker.acquire("key", timedelta(seconds=30))
+
+
+async def test_that_an_expired_lease_can_be_taken_over(
+    new_file: Path,
+) -> None:
+    async with (
+        SQLiteLeaseManager(new_file) as first_worker,
+        SQLiteLeaseManager(new_file) as second_worker,
+    ):
+        stale_token = await first_worker.acquire("key", timedelta(seconds=0))
+        assert stale_token
+
+        assert await second_worker.acquire("key", timedelta(seconds=30))
+        assert not await first_worker.renew("key", stale_token, timedelta(seconds=30))
+
+
+async def test_that_waiting_for_a_held_lease_backs_off(
+    new_file: Path,
+) -> None:
+    async with (
+        SQLiteLeaseManager(new_file) as first_worker,
+        SQLiteLeaseManager(new_file) as second_worker,
+    ):
+        token = await first_worker.acquire("key", timedelta(seconds=30))
+        assert token
+
+        acquire = AsyncMock(wraps=second_worker.acquire)
+        setattr(second_worker, "acquire", acquire)
+
+        async def hold_lease() -> None:
+            await asyncio.sleep(1)
+            await first_worker.release("key", token)
+
+        release_task = asyncio.create_task(hold_lease())
+
+        async with second_worker.exclusive("key", polling_interval=0.01):
+            pass
+
+        await release_task
+
+        # Polling every 10ms would have taken around a hundred attempts
+        assert acquire.await_count < 15
+
+
+async def test_that_a_claimed_task_is_redelivered_after_its_visibility_timeout(
+    new_file: Path,
+) -> None:
+    async with SQLiteTaskQueue(new_file) as queue:
+        task_id = await queue.enqueue("kind", "tag", {"n": 1}, correlation_id="<main>")
+
+        first_claim = await queue.claim(["kind"], visibility_timeout=timedelta(seconds=0))
+        assert first_claim
+        assert first_claim.id == task_id
+        assert first_claim.payload == {"n": 1}
+
+        second_claim = await queue.claim(["kind"], visibility_timeout=timedelta(seconds=30))
+        assert second_claim
+        assert second_claim.id == task_id
+        assert second_claim.attempt == 2
+
+        assert await queue.claim(["kind"], visibility_timeout=timedelta(seconds=30)) is None
+
+        await queue.complete(task_id)
+
+        assert await queue.claim(["kind"], visibility_timeout=timedelta(seconds=0)) is None
+
+
+async def test_that_tasks_of_a_claimed_tag_wait_for_it_to_be_completed(
+    new_file: Path,
+) -> None:
+    async with SQLiteTaskQueue(new_file) as queue:
+        first_task_id = await queue.enqueue("kind", "tag", {}, correlation_id="<main>")
+
+        assert await queue.claim(["kind"], visibility_timeout=timedelta(seconds=30))
+
+        second_task_id = await queue.enqueue("kind", "tag", {}, correlation_id="<main>")
+
+        assert await queue.list_superseded([first_task_id]) == [first_task_id]
+        assert await queue.claim(["kind"], visibility_timeout=timedelta(seconds=30)) is None
+
+        await queue.complete(first_task_id)
+
+        task = await queue.claim(["kind"], visibility_timeout=timedelta(seconds=30))
+        assert task
+        assert task.id == second_task_id
+
+
+async def test_that_enqueuing_without_superseding_deduplicates_by_tag(
+    new_file: Path,
+) -> None:
+    async with SQLiteTaskQueue(new_file) as queue:
+        first_task_id = await queue.enqueue(
+            "kind", "tag", {}, correlation_id="<main>", supersede=False
+        )
+        second_task_id = await queue.enqueue(
+            "kind", "tag", {}, correlation_id="<main>", supersede=False
+        )
+
+        assert first_task_id == second_task_id
+
+
+async def test_that_a_retried_task_becomes_available_after_its_delay(
+    new_file: Path,
+) -> None:
+    async with SQLiteTaskQueue(new_file) as queue:
+        await queue.enqueue("kind", "tag", {}, correlation_id="<main>")
+
+        task = await queue.claim(["kind"], visibility_timeout=timedelta(seconds=30))
+        assert task
+
+        await queue.retry(task.id, delay=timedelta(seconds=30))
+        assert await queue.claim(["kind"], visibility_timeout=timedelta(seconds=30)) is None
+
+        await queue.retry(task.id, delay=timedelta(0))
+        assert await queue.claim(["kind"], visibility_timeout=timedelta(seconds=30))
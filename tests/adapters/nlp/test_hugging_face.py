@@ -0,0 +1,135 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+from datetime import timedelta
+import threading
+from typing import Any, Optional, Sequence
+
+from pytest import MonkeyPatch, fixture, raises
+
+from parlant.adapters.nlp import hugging_face
+from parlant.adapters.nlp.hugging_face import _EmbeddingRequest, _EmbeddingWorker
+
+
+class _StubEmbeddingWorker(_EmbeddingWorker):
+    """Embeds each text as its length, without a model"""
+
+    def __init__(self, max_batch_size: int, max_batch_latency: timedelta) -> None:
+        super().__init__(
+            "stub-model",
+            max_batch_size=max_batch_size,
+            max_batch_latency=max_batch_latency,
+            torch_threads=None,
+        )
+
+        self.batches: list[Sequence[str]] = []
+        self.error: Optional[Exception] = None
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def _infer(self, texts: Sequence[str]) -> list[list[float]]:
+        self.gate.wait()
+        self.batches.append(texts)
+
+        if self.error:
+            raise self.error
+
+        return [[float(len(t))] for t in texts]
+
+
+@fixture(autouse=True)
+def no_models(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(hugging_face, "_create_auto_model", lambda model_name: None)
+    monkeypatch.setattr(hugging_face, "_create_tokenizer", lambda model_name: None)
+
+
+async def test_that_concurrent_embedding_calls_are_run_in_a_single_batch() -> None:
+    worker = _StubEmbeddingWorker(max_batch_size=8, max_batch_latency=timedelta(seconds=0.1))
+
+    results = await asyncio.gather(
+        worker.embed(["a"]),
+        worker.embed(["bb", "ccc"]),
+        worker.embed(["dddd"]),
+    )
+
+    assert worker.batches == [["a", "bb", "ccc", "dddd"]]
+    assert [vectors for vectors, _ in results] == [[[1.0]], [[2.0], [3.0]], [[4.0]]]
+    assert all(info.size == 4 for _, info in results)
+
+
+async def test_that_a_full_batch_is_started_without_waiting_out_the_batch_latency() -> None:
+    worker = _StubEmbeddingWorker(max_batch_size=2, max_batch_latency=timedelta(seconds=30))
+
+    await asyncio.wait_for(
+        asyncio.gather(worker.embed(["a"]), worker.embed(["b"])),
+        timeout=5,
+    )
+
+    assert worker.batches == [["a", "b"]]
+
+
+async def test_that_an_inference_error_is_raised_to_every_caller_in_the_batch() -> None:
+    worker = _StubEmbeddingWorker(max_batch_size=8, max_batch_latency=timedelta(seconds=0.1))
+    worker.error = ValueError("Inference failed")
+
+    results = await asyncio.gather(
+        worker.embed(["a"]),
+        worker.embed(["b"]),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+    worker.error = None
+
+    vectors, _ = await worker.embed(["cc"])
+
+    assert vectors == [[2.0]]
+
+
+async def test_that_requests_whose_callers_gave_up_are_not_run() -> None:
+    worker = _StubEmbeddingWorker(max_batch_size=1, max_batch_latency=timedelta(0))
+    worker.gate.clear()
+
+    first = asyncio.ensure_future(worker.embed(["a"]))
+    abandoned = asyncio.ensure_future(worker.embed(["b"]))
+    await asyncio.sleep(0.1)
+
+    abandoned.cancel()
+    worker.gate.set()
+
+    await first
+    await worker.embed(["c"])
+
+    assert worker.batches == [["a"], ["c"]]
+
+
+async def test_that_the_worker_outlives_callers_whose_event_loop_was_shut_down() -> None:
+    worker = _StubEmbeddingWorker(max_batch_size=8, max_batch_latency=timedelta(0))
+    worker.gate.clear()
+
+    closed_loop = asyncio.new_event_loop()
+    future: asyncio.Future[Any] = closed_loop.create_future()
+    worker._requests.put(_EmbeddingRequest(texts=["a"], loop=closed_loop, future=future))
+    closed_loop.close()
+
+    worker.gate.set()
+
+    vectors, _ = await asyncio.wait_for(worker.embed(["bb"]), timeout=5)
+
+    assert vectors == [[2.0]]
+    with raises(asyncio.InvalidStateError):
+        future.result()
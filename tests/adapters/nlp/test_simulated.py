@@ -0,0 +1,128 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timezone
+
+from lagom import Container
+
+from parlant.adapters.nlp.simulated import SimulatedNLPService, SimulationConfig
+from parlant.core.agents import AgentStore
+from parlant.core.common import generate_id
+from parlant.core.customers import CustomerStore
+from parlant.core.engines.alpha.guideline_proposer import (
+    GuidelineProposer,
+    GuidelinePropositionsSchema,
+)
+from parlant.core.engines.alpha.message_assembler import AssembledMessageSchema, MessageAssembler
+from parlant.core.engines.alpha.tool_caller import ToolInsights
+from parlant.core.fragments import Fragment, FragmentField, FragmentId
+from parlant.core.guidelines import Guideline, GuidelineContent, GuidelineId
+from parlant.core.logging import Logger
+
+# The simulated generators read their inputs off the engine's prompts,
+# so these tests break whenever the layout they rely on changes
+
+
+async def test_that_simulated_guideline_propositions_cover_the_guidelines_in_the_prompt(
+    container: Container,
+) -> None:
+    agent = await container[AgentStore].create_agent(name="test-agent", max_engine_iterations=2)
+    customer = await container[CustomerStore].create_customer(name="Test Customer")
+
+    guidelines = {
+        id: Guideline(
+            id=id,
+            creation_utc=datetime.now(timezone.utc),
+            content=GuidelineContent(condition=f"condition {i}", action=f"action {i}"),
+        )
+        for i, id in enumerate(GuidelineId(generate_id()) for _ in range(3))
+    }
+
+    proposer = container[GuidelineProposer]
+
+    prompt = proposer._format_prompt(
+        agent=agent,
+        customer=customer,
+        context_variables=[],
+        interaction_history=[],
+        staged_events=[],
+        terms=[],
+        guidelines=guidelines,
+        shots=await proposer.shots(),
+    )
+
+    service = SimulatedNLPService(
+        container[Logger], SimulationConfig(guideline_activation_ratio=1.0)
+    )
+    generator = await service.get_schematic_generator(GuidelinePropositionsSchema)
+
+    result = await generator.generate(prompt)
+
+    assert {c.guideline_id for c in result.content.checks} == set(guidelines)
+    assert all(c.condition_applies for c in result.content.checks)
+
+
+async def test_that_simulated_assembly_selects_a_fragment_without_fields_from_the_prompt(
+    container: Container,
+) -> None:
+    agent = await container[AgentStore].create_agent(
+        name="test-agent",
+        max_engine_iterations=2,
+        composition_mode="strict_assembly",
+    )
+    customer = await container[CustomerStore].create_customer(name="Test Customer")
+
+    fragments = [
+        Fragment(
+            id=FragmentId(generate_id()),
+            creation_utc=datetime.now(timezone.utc),
+            value="Your balance is {balance}",
+            fields=[FragmentField(name="balance", description="The balance", examples=["$5"])],
+            tags=[],
+        ),
+        Fragment(
+            id=FragmentId(generate_id()),
+            creation_utc=datetime.now(timezone.utc),
+            value="Sorry, I can't help with that",
+            fields=[],
+            tags=[],
+        ),
+    ]
+
+    assembler = container[MessageAssembler]
+
+    prompt = assembler._format_prompt(
+        agent=agent,
+        customer=customer,
+        context_variables=[],
+        interaction_history=[],
+        terms=[],
+        ordinary_guideline_propositions=[],
+        tool_enabled_guideline_propositions={},
+        staged_events=[],
+        tool_insights=ToolInsights(),
+        fragments=fragments,
+        shots=await assembler.shots(agent.composition_mode),
+    )
+
+    service = SimulatedNLPService(container[Logger])
+    generator = await service.get_schematic_generator(AssembledMessageSchema)
+
+    result = await generator.generate(prompt)
+
+    [revision] = result.content.revisions
+    [selected] = revision.selected_content_fragments
+
+    assert selected.fragment_id == fragments[1].id
+    assert selected.raw_content == fragments[1].value
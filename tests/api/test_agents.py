@@ -184,6 +184,31 @@ async def test_that_an_agent_can_be_updated(
     assert updated_agent["composition_mode"] == expected_composition
 
 
+async def test_that_history_limits_of_an_agent_can_be_updated_and_cleared(
+    async_client: httpx.AsyncClient,
+    container: Container,
+) -> None:
+    agent = await container[AgentStore].create_agent("test-agent", max_history_turns=10)
+
+    response = await async_client.patch(
+        f"/agents/{agent.id}",
+        json={"max_history_tokens": 2000},
+    )
+    response.raise_for_status()
+
+    assert response.json()["max_history_turns"] == 10
+    assert response.json()["max_history_tokens"] == 2000
+
+    response = await async_client.patch(
+        f"/agents/{agent.id}",
+        json={"max_history_turns": None},
+    )
+    response.raise_for_status()
+
+    assert response.json()["max_history_turns"] is None
+    assert response.json()["max_history_tokens"] == 2000
+
+
 async def test_that_an_agent_can_be_deleted(
     async_client: httpx.AsyncClient,
     container: Container,
@@ -198,3 +223,44 @@ async def test_that_an_agent_can_be_deleted(
 
     with raises(ItemNotFoundError):
         await agent_store.read_agent(agent.id)
+
+
+async def test_that_an_unchanged_agent_list_is_not_sent_again(
+    async_client: httpx.AsyncClient,
+) -> None:
+    _ = (await async_client.post("/agents", json={"name": "first-agent"})).raise_for_status()
+
+    response = (await async_client.get("/agents")).raise_for_status()
+    etag = response.headers["etag"]
+
+    response = await async_client.get("/agents", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+
+    _ = (await async_client.post("/agents", json={"name": "second-agent"})).raise_for_status()
+
+    response = await async_client.get("/agents", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+    assert {a["name"] for a in response.json()} == {"first-agent", "second-agent"}
+
+
+async def test_that_large_responses_are_compressed(
+    async_client: httpx.AsyncClient,
+) -> None:
+    for i in range(20):
+        _ = (
+            await async_client.post(
+                "/agents",
+                json={"name": f"agent-{i}", "description": "You are a test agent"},
+            )
+        ).raise_for_status()
+
+    response = (
+        await async_client.get("/agents", headers={"Accept-Encoding": "gzip"})
+    ).raise_for_status()
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 20
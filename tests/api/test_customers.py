@@ -103,6 +103,34 @@ async def test_that_all_customers_including_guests_can_be_listed(
     assert any("<guest>" == customer["name"] for customer in customers)
 
 
+async def test_that_customers_can_be_listed_in_pages(
+    async_client: httpx.AsyncClient,
+    container: Container,
+) -> None:
+    customer_store = container[CustomerStore]
+
+    customers = [await customer_store.create_customer(name=f"customer-{i}") for i in range(3)]
+
+    first_page = (
+        (await async_client.get("/customers", params={"limit": 2})).raise_for_status().json()
+    )
+
+    assert [c["id"] for c in first_page] == [CustomerStore.GUEST_ID, customers[0].id]
+
+    second_page = (
+        (
+            await async_client.get(
+                "/customers",
+                params={"limit": 2, "after": first_page[-1]["id"]},
+            )
+        )
+        .raise_for_status()
+        .json()
+    )
+
+    assert [c["id"] for c in second_page] == [customers[1].id, customers[2].id]
+
+
 async def test_that_a_customer_can_be_updated_with_a_new_name(
     async_client: httpx.AsyncClient,
     container: Container,
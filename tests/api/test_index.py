@@ -462,7 +462,7 @@ async def test_that_an_error_is_returned_when_no_payloads_are_provided(
     assert data["detail"] == "No payloads provided for the evaluation task."
 
 
-async def test_that_an_evaluation_task_fails_if_another_task_is_already_running(
+async def test_that_an_evaluation_task_created_while_another_one_is_running_completes_as_well(
     async_client: httpx.AsyncClient,
     agent_id: AgentId,
     no_cache: NoCachedGenerations,
@@ -516,18 +516,14 @@ async def test_that_an_evaluation_task_fails_if_another_task_is_already_running(
         .json()["id"]
     )
 
-    content = (
-        (
-            await async_client.get(
-                f"/index/evaluations/{second_evaluation_id}", params={"wait_for_completion": 0}
-            )
+    for evaluation_id in [first_evaluation_id, second_evaluation_id]:
+        content = (
+            (await async_client.get(f"/index/evaluations/{evaluation_id}"))
+            .raise_for_status()
+            .json()
         )
-        .raise_for_status()
-        .json()
-    )
 
-    assert content["status"] == "failed"
-    assert content["error"] == f"An evaluation task '{first_evaluation_id}' is already running."
+        assert content["status"] == "completed"
 
 
 async def test_that_evaluation_task_with_payload_containing_contradictions_is_approved_when_check_flag_is_false(
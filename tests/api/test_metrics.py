@@ -0,0 +1,58 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from fastapi import status
+import httpx
+from lagom import Container
+
+from parlant.core.contextual_correlator import ContextualCorrelator
+from parlant.core.metrics import MetricsRegistry
+from parlant.core.tracing import Tracer
+
+
+async def test_that_metrics_can_be_read_in_openmetrics_format(
+    async_client: httpx.AsyncClient,
+    container: Container,
+) -> None:
+    container[MetricsRegistry].counter("test_events", "Test events").inc()
+
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/openmetrics-text")
+
+    lines = response.text.splitlines()
+
+    assert "parlant_test_events_total 1" in lines
+    assert lines[-1] == "# EOF"
+
+
+async def test_that_recorded_spans_can_be_read_by_correlation_id(
+    async_client: httpx.AsyncClient,
+    container: Container,
+) -> None:
+    tracer = container[Tracer]
+    correlator = container[ContextualCorrelator]
+
+    with correlator.correlation_scope("RID(test)"):
+        with tracer.span("Test Operation"):
+            pass
+
+    response = await async_client.get("/traces", params={"correlation_id": "RID(test)"})
+
+    assert response.status_code == status.HTTP_200_OK
+
+    [span] = response.json()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+    assert span["name"] == "Test Operation"
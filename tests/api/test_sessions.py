@@ -24,12 +24,15 @@ from pytest import fixture, mark
 from datetime import datetime, timezone
 
 from parlant.core.engines.alpha.fluid_message_generator import FluidMessageSchema
+from parlant.api.sessions import recover_pending_moderations
 from parlant.core.fragments import FragmentStore
 from parlant.core.nlp.service import NLPService
+from parlant.core.task_queue import TaskQueueConsumer
 from parlant.core.tools import ToolResult
 from parlant.core.agents import AgentId, AgentStore, AgentUpdateParams
 from parlant.core.async_utils import Timeout
 from parlant.core.customers import CustomerId
+from parlant.core.logging import Logger
 from parlant.core.sessions import (
     EventSource,
     MessageEventData,
@@ -250,6 +253,60 @@ async def test_that_sessions_can_be_listed(
         assert listed_session["customer_id"] == created_session.customer_id
 
 
+async def test_that_sessions_can_be_listed_in_pages(
+    async_client: httpx.AsyncClient,
+    container: Container,
+    agent_id: AgentId,
+) -> None:
+    sessions = [
+        await create_session(container, agent_id=agent_id, title=f"session-{i}") for i in range(5)
+    ]
+
+    listed_ids: list[str] = []
+    after = None
+
+    while True:
+        page = (
+            (
+                await async_client.get(
+                    "/sessions",
+                    params={"limit": 2, **({"after": after} if after else {})},
+                )
+            )
+            .raise_for_status()
+            .json()
+        )
+
+        if not page:
+            break
+
+        assert len(page) <= 2
+        listed_ids.extend(s["id"] for s in page)
+        after = page[-1]["id"]
+
+    assert listed_ids == [s.id for s in sessions]
+
+
+async def test_that_listed_sessions_can_be_restricted_to_specific_fields(
+    async_client: httpx.AsyncClient,
+    container: Container,
+    agent_id: AgentId,
+) -> None:
+    session = await create_session(container, agent_id=agent_id, title="first-session")
+
+    data = (
+        (await async_client.get("/sessions", params={"fields": "id,title"}))
+        .raise_for_status()
+        .json()
+    )
+
+    assert data == [{"id": session.id, "title": "first-session"}]
+
+    response = await async_client.get("/sessions", params={"fields": "id,password"})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 async def test_that_sessions_can_be_listed_by_agent_id(
     async_client: httpx.AsyncClient,
     container: Container,
@@ -578,6 +635,107 @@ async def test_that_expressing_frustration_does_not_cause_a_message_to_be_flagge
     assert not event["data"].get("flagged", True)
 
 
+async def test_that_a_message_with_deferred_moderation_is_flagged_after_being_stored(
+    async_client: httpx.AsyncClient,
+    session_id: SessionId,
+) -> None:
+    response = await async_client.post(
+        f"/sessions/{session_id}/events",
+        params={"moderation": "auto", "defer_moderation": True},
+        json={
+            "kind": "message",
+            "source": "customer",
+            "message": "Fuck all those guys",
+        },
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+    event = response.json()
+
+    assert not event["data"].get("flagged")
+
+    stored_event = None
+    deadline = time.time() + 30
+
+    while not stored_event and time.time() < deadline:
+        events = (
+            (
+                await async_client.get(
+                    f"/sessions/{session_id}/events",
+                    params={"kinds": "message", "wait_for_data": 0},
+                )
+            )
+            .raise_for_status()
+            .json()
+        )
+
+        stored_event = next(
+            (e for e in events if e["id"] == event["id"] and e["data"].get("flagged")), None
+        )
+
+        await asyncio.sleep(0.1)
+
+    assert stored_event
+
+
+async def test_that_a_deferred_moderation_whose_task_was_lost_is_recovered(
+    async_client: httpx.AsyncClient,
+    container: Container,
+    session_id: SessionId,
+) -> None:
+    session_store = container[SessionStore]
+
+    # As if the server went down before running the moderation task it queued
+    event = await session_store.create_event(
+        session_id=session_id,
+        source="customer",
+        kind="message",
+        correlation_id="<main>",
+        data={
+            "message": "Fuck all those guys",
+            "participant": {"display_name": "Johnny Boy"},
+            "flagged": False,
+            "tags": [],
+            "pending_moderation": "auto",
+        },
+    )
+
+    await recover_pending_moderations(
+        container[Logger],
+        session_store,
+        container[TaskQueueConsumer],
+    )
+
+    moderated_data = None
+    deadline = time.time() + 30
+
+    while not moderated_data and time.time() < deadline:
+        data = cast(MessageEventData, (await session_store.read_event(session_id, event.id)).data)
+
+        if "pending_moderation" not in data:
+            moderated_data = data
+
+        await asyncio.sleep(0.1)
+
+    assert moderated_data
+    assert moderated_data.get("flagged")
+
+    # Once moderated, the session is processed again
+    events = (
+        (
+            await async_client.get(
+                f"/sessions/{session_id}/events",
+                params={"min_offset": event.offset + 1, "wait_for_data": 30},
+            )
+        )
+        .raise_for_status()
+        .json()
+    )
+
+    assert events
+
+
 async def test_that_posting_a_customer_message_elicits_a_response_from_the_agent(
     async_client: httpx.AsyncClient,
     session_id: SessionId,
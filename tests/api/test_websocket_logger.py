@@ -13,13 +13,15 @@
 # limitations under the License.
 
 import asyncio
+from typing import Any
 from fastapi.testclient import TestClient
 from parlant.api.app import ASGIApplication
 from lagom import Container
 import pytest
 
-from parlant.adapters.loggers.websocket import WebSocketLogger
+from parlant.adapters.loggers.websocket import LogFilter, WebSocketLogger, WebSocketSubscription
 from parlant.core.contextual_correlator import ContextualCorrelator
+from parlant.core.logging import CompositeLogger, LogLevel, StdoutLogger
 
 
 @pytest.fixture
@@ -69,3 +71,106 @@ async def test_that_websocket_reconnects_and_receives_messages(
         assert data2["message"] == "Second connection test"
         assert data2["level"] == "INFO"
         assert data2["correlation_id"] == correlator.correlation_id
+
+
+async def test_that_websocket_logger_filters_messages_by_level_and_correlation_id(
+    container: Container,
+    test_client: TestClient,
+) -> None:
+    ws_logger = container[WebSocketLogger]
+    correlator = container[ContextualCorrelator]
+
+    with test_client.websocket_connect("/logs?level=WARNING&correlation_id=RID(1)") as ws:
+        with correlator.correlation_scope("RID(1)"):
+            ws_logger.info("Below the level")
+
+        with correlator.correlation_scope("RID(2)"):
+            ws_logger.warning("Of another scope")
+
+        with correlator.correlation_scope("RID(1)"):
+            with correlator.correlation_scope("process-session"):
+                ws_logger.warning("Expected message")
+
+        await asyncio.sleep(1)
+
+        data = ws.receive_json()
+
+        assert data["message"] == "Expected message"
+        assert data["correlation_id"] == "RID(1)::process-session"
+
+
+async def test_that_debug_messages_are_streamed_when_the_server_logs_at_info_level(
+    container: Container,
+    test_client: TestClient,
+) -> None:
+    ws_logger = container[WebSocketLogger]
+    correlator = container[ContextualCorrelator]
+
+    # As set up by the server, where the websocket logger
+    # shares the server's log level setting with its stdout logger
+    server_logger = CompositeLogger([StdoutLogger(correlator), ws_logger])
+    server_logger.set_level(LogLevel.INFO)
+
+    with test_client.websocket_connect("/logs?level=DEBUG") as ws:
+        server_logger.debug("Debugging details")
+        await asyncio.sleep(1)
+
+        data = ws.receive_json()
+
+        assert data["message"] == "Debugging details"
+        assert data["level"] == "DEBUG"
+
+
+async def test_that_websocket_logger_sends_batched_frames(
+    container: Container,
+    test_client: TestClient,
+) -> None:
+    ws_logger = container[WebSocketLogger]
+
+    with test_client.websocket_connect("/logs?batch=true") as ws:
+        ws_logger.info("First")
+        ws_logger.info("Second")
+        await asyncio.sleep(1)
+
+        messages: list[str] = []
+
+        while len(messages) < 2:
+            batch = ws.receive_json()
+            assert isinstance(batch, list)
+            messages.extend(m["message"] for m in batch)
+
+        assert messages == ["First", "Second"]
+
+
+async def test_that_a_lagging_subscriber_receives_a_summary_of_dropped_messages() -> None:
+    class _RecordingSocket:
+        def __init__(self) -> None:
+            self.frames: list[Any] = []
+
+        async def send_json(self, data: Any) -> None:
+            self.frames.append(data)
+
+    socket = _RecordingSocket()
+
+    subscription = WebSocketSubscription(
+        socket,  # type: ignore[arg-type]
+        LogFilter(),
+        batched=True,
+        max_queue_size=2,
+        max_batch_size=10,
+    )
+
+    for i in range(5):
+        subscription.offer({"level": "INFO", "correlation_id": "<main>", "message": str(i)})
+
+    assert subscription.dropped == 3
+
+    delivery = asyncio.create_task(subscription.deliver())
+    await asyncio.sleep(0.1)
+    subscription.expiration.set()
+    await delivery
+
+    [batch] = socket.frames
+
+    assert "Dropped 3 log messages" in batch[0]["message"]
+    assert [m["message"] for m in batch[1:]] == ["0", "1"]
@@ -0,0 +1,59 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from pytest import raises
+
+from parlant.bin.startup_profiler import StartupProfiler
+
+
+def test_that_marks_record_the_time_since_the_previous_mark() -> None:
+    profiler = StartupProfiler()
+
+    time.sleep(0.01)
+    profiler.mark("First")
+    profiler.mark("Second")
+
+    first, second = profiler.phases
+
+    assert first.name == "First"
+    assert first.duration >= 0.01
+    assert second.name == "Second"
+    assert second.started_at >= first.started_at + first.duration
+    assert second.duration < first.duration
+
+
+def test_that_measured_phases_are_recorded_even_when_they_fail() -> None:
+    profiler = StartupProfiler()
+
+    with raises(RuntimeError):
+        with profiler.measure("Failing"):
+            raise RuntimeError()
+
+    assert [p.name for p in profiler.phases] == ["Failing"]
+
+
+def test_that_the_report_lists_phases_in_the_order_they_started() -> None:
+    profiler = StartupProfiler()
+
+    with profiler.measure("Outer"):
+        with profiler.measure("Inner"):
+            pass
+
+    report_lines = profiler.report().splitlines()
+
+    assert "Phase" in report_lines[0]
+    assert report_lines[1].endswith("Outer")
+    assert report_lines[2].endswith("Inner")
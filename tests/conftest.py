@@ -31,12 +31,21 @@ from parlant.core.contextual_correlator import ContextualCorrelator
 from parlant.core.context_variables import ContextVariableDocumentStore, ContextVariableStore
 from parlant.core.emission.event_publisher import EventPublisherFactory
 from parlant.core.emissions import EventEmitterFactory
-from parlant.core.customers import CustomerDocumentStore, CustomerStore
+from parlant.core.customers import CachedCustomerStore, CustomerDocumentStore, CustomerStore
 from parlant.core.engines.alpha import guideline_proposer
 from parlant.core.engines.alpha import tool_caller
 from parlant.core.engines.alpha import fluid_message_generator
 from parlant.core.engines.alpha.hooks import LifecycleHooks
+from parlant.core.engines.alpha.interaction_history import (
+    HistorySummarizer,
+    HistorySummarySchema,
+)
 from parlant.core.engines.alpha.message_assembler import MessageAssembler, AssembledMessageSchema
+from parlant.core.inspections import (
+    InspectionDocumentStore,
+    InspectionSamplingPolicy,
+    InspectionStore,
+)
 from parlant.core.evaluations import (
     EvaluationListener,
     PollingEvaluationListener,
@@ -54,11 +63,13 @@ from parlant.core.guidelines import GuidelineDocumentStore, GuidelineStore
 from parlant.adapters.db.transient import TransientDocumentDatabase
 from parlant.core.nlp.service import NLPService
 from parlant.core.persistence.document_database import DocumentCollection
+from parlant.core.resource_versions import ResourceVersionDocumentStore, ResourceVersionStore
 from parlant.core.services.tools.service_registry import (
     ServiceDocumentRegistry,
     ServiceRegistry,
 )
 from parlant.core.sessions import (
+    CachedSessionStore,
     PollingSessionListener,
     SessionDocumentStore,
     SessionListener,
@@ -91,9 +102,17 @@ from parlant.core.services.indexing.guideline_connection_proposer import (
     GuidelineConnectionProposer,
     GuidelineConnectionPropositionsSchema,
 )
+from parlant.core.services.indexing.pair_verdicts import (
+    GuidelinePairVerdictDocumentStore,
+    GuidelinePairVerdictStore,
+)
+from parlant.core.metrics import MetricsRegistry
+from parlant.core.tracing import Tracer
 from parlant.core.logging import LogLevel, Logger, StdoutLogger
 from parlant.core.application import Application
-from parlant.core.agents import AgentDocumentStore, AgentStore
+from parlant.core.leases import InMemoryLeaseManager, LeaseManager
+from parlant.core.task_queue import InMemoryTaskQueue, TaskQueue, TaskQueueConsumer
+from parlant.core.agents import AgentDocumentStore, AgentStore, CachedAgentStore
 from parlant.core.guideline_tool_associations import (
     GuidelineToolAssociationDocumentStore,
     GuidelineToolAssociationStore,
@@ -190,50 +209,83 @@ async def container(
 
     container[ContextualCorrelator] = correlator
     container[Logger] = logger
+    container[MetricsRegistry] = MetricsRegistry()
+    container[Tracer] = Tracer(correlator)
     container[WebSocketLogger] = WebSocketLogger(container[ContextualCorrelator])
 
     async with AsyncExitStack() as stack:
+        container[TaskQueue] = InMemoryTaskQueue()
         container[BackgroundTaskService] = await stack.enter_async_context(
             BackgroundTaskService(container[Logger])
         )
+        # Constructed explicitly, as lagom would otherwise zero out the timedelta defaults
+        container[TaskQueueConsumer] = TaskQueueConsumer(
+            container[Logger],
+            container[ContextualCorrelator],
+            container[BackgroundTaskService],
+            container[TaskQueue],
+        )
 
         await container[BackgroundTaskService].start(
             container[WebSocketLogger].start(), tag="websocket-logger"
         )
 
-        container[AgentStore] = await stack.enter_async_context(
-            AgentDocumentStore(TransientDocumentDatabase())
+        container[ResourceVersionStore] = await stack.enter_async_context(
+            ResourceVersionDocumentStore(TransientDocumentDatabase())
+        )
+        versions = container[ResourceVersionStore]
+
+        container[AgentStore] = CachedAgentStore(
+            await stack.enter_async_context(
+                AgentDocumentStore(TransientDocumentDatabase(), versions=versions)
+            ),
+            container[MetricsRegistry],
         )
         container[GuidelineStore] = await stack.enter_async_context(
-            GuidelineDocumentStore(TransientDocumentDatabase())
+            GuidelineDocumentStore(TransientDocumentDatabase(), versions=versions)
         )
         container[GuidelineConnectionStore] = await stack.enter_async_context(
-            GuidelineConnectionDocumentStore(TransientDocumentDatabase())
+            GuidelineConnectionDocumentStore(TransientDocumentDatabase(), versions=versions)
+        )
+        container[LeaseManager] = InMemoryLeaseManager()
+        container[SessionStore] = CachedSessionStore(
+            await stack.enter_async_context(
+                SessionDocumentStore(
+                    TransientDocumentDatabase(),
+                    lease_manager=container[LeaseManager],
+                )
+            ),
+            container[MetricsRegistry],
         )
-        container[SessionStore] = await stack.enter_async_context(
-            SessionDocumentStore(TransientDocumentDatabase())
+        container[InspectionStore] = await stack.enter_async_context(
+            InspectionDocumentStore(TransientDocumentDatabase())
         )
+        container[InspectionSamplingPolicy] = InspectionSamplingPolicy()
         container[ContextVariableStore] = await stack.enter_async_context(
             ContextVariableDocumentStore(TransientDocumentDatabase())
         )
         container[TagStore] = await stack.enter_async_context(
             TagDocumentStore(TransientDocumentDatabase())
         )
-        container[CustomerStore] = await stack.enter_async_context(
-            CustomerDocumentStore(TransientDocumentDatabase())
+        container[CustomerStore] = CachedCustomerStore(
+            await stack.enter_async_context(CustomerDocumentStore(TransientDocumentDatabase())),
+            container[MetricsRegistry],
         )
         container[FragmentStore] = await stack.enter_async_context(
-            FragmentDocumentStore(TransientDocumentDatabase())
+            FragmentDocumentStore(TransientDocumentDatabase(), versions=versions)
         )
         container[GuidelineToolAssociationStore] = await stack.enter_async_context(
-            GuidelineToolAssociationDocumentStore(TransientDocumentDatabase())
+            GuidelineToolAssociationDocumentStore(TransientDocumentDatabase(), versions=versions)
         )
         container[SessionListener] = PollingSessionListener
         container[EvaluationStore] = await stack.enter_async_context(
             EvaluationDocumentStore(TransientDocumentDatabase())
         )
         container[EvaluationListener] = PollingEvaluationListener
-        container[BehavioralChangeEvaluator] = BehavioralChangeEvaluator
+        container[GuidelinePairVerdictStore] = await stack.enter_async_context(
+            GuidelinePairVerdictDocumentStore(TransientDocumentDatabase(), versions=versions)
+        )
+        container[BehavioralChangeEvaluator] = Singleton(BehavioralChangeEvaluator)
         container[EventEmitterFactory] = Singleton(EventPublisherFactory)
 
         container[ServiceRegistry] = await stack.enter_async_context(
@@ -243,6 +295,7 @@ async def container(
                 logger=container[Logger],
                 correlator=container[ContextualCorrelator],
                 nlp_services={"default": OpenAIService(container[Logger])},
+                versions=versions,
             )
         )
 
@@ -257,6 +310,7 @@ async def container(
                 ),
                 embedder_factory=embedder_factory,
                 embedder_type=embedder_type,
+                versions=versions,
             )
         )
 
@@ -268,6 +322,7 @@ async def container(
             ConditionsEntailmentTestsSchema,
             ActionsContradictionTestsSchema,
             GuidelineConnectionPropositionsSchema,
+            HistorySummarySchema,
         ):
             container[SchematicGenerator[generation_schema]] = await make_schematic_generator(  # type: ignore
                 container,
@@ -295,6 +350,7 @@ async def container(
         container[FluidMessageGenerator] = Singleton(FluidMessageGenerator)
         container[MessageAssembler] = Singleton(MessageAssembler)
         container[ToolEventGenerator] = Singleton(ToolEventGenerator)
+        container[HistorySummarizer] = Singleton(HistorySummarizer)
 
         container[LifecycleHooks] = LifecycleHooks()
 
@@ -302,6 +358,9 @@ async def container(
 
         container[Application] = Application(container)
 
+        _ = container[BehavioralChangeEvaluator]  # Registers its task handler
+        await container[TaskQueueConsumer].start()
+
         yield container
 
         await container[BackgroundTaskService].cancel_all()
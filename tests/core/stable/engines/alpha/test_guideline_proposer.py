@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from itertools import chain
 from typing import Sequence, cast
@@ -35,7 +35,9 @@ from parlant.core.glossary import Term
 from parlant.core.nlp.generation import SchematicGenerator
 from parlant.core.engines.alpha.guideline_proposer import (
     GuidelineProposer,
+    GuidelinePropositionShot,
     GuidelinePropositionsSchema,
+    shot_collection,
 )
 from parlant.core.engines.alpha.guideline_proposition import (
     GuidelineProposition,
@@ -927,3 +929,31 @@ def test_that_guideline_with_multiple_actions_is_partially_fulfilled_when_a_few_
         conversation_guideline_names,
         [],
     )
+
+
+def test_that_shots_provided_by_an_overridden_hook_are_included_in_the_prompt(
+    context: ContextOfTest,
+    agent: Agent,
+    customer: Customer,
+) -> None:
+    baseline_shot = context.sync_await(shot_collection.list())[0]
+    custom_shot = replace(baseline_shot, description="A custom shot")
+
+    class CustomGuidelineProposer(GuidelineProposer):
+        async def shots(self) -> Sequence[GuidelinePropositionShot]:
+            return [custom_shot]
+
+    guideline_proposer = CustomGuidelineProposer(context.logger, context.schematic_generator)
+
+    prompt = guideline_proposer._format_prompt(
+        agent=agent,
+        customer=customer,
+        context_variables=[],
+        interaction_history=[],
+        staged_events=[],
+        terms=[],
+        guidelines={},
+        shots=context.sync_await(guideline_proposer.shots()),
+    )
+
+    assert guideline_proposer._format_shots([custom_shot]).strip() in prompt
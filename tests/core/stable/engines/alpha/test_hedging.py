@@ -0,0 +1,151 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Awaitable, Callable
+
+from pytest import raises
+
+from parlant.core.engines.alpha.hedging import Hedger, HedgingPolicy
+
+
+def attempt(result: str, delay: float = 0) -> Callable[[], Awaitable[str]]:
+    async def run() -> str:
+        await asyncio.sleep(delay)
+        return result
+
+    return run
+
+
+def failing_attempt(delay: float = 0) -> Callable[[], Awaitable[str]]:
+    async def run() -> str:
+        await asyncio.sleep(delay)
+        raise Exception("Retry with another attempt")
+
+    return run
+
+
+def ignore_failure(attempt: int, exc: Exception) -> None:
+    pass
+
+
+async def warm_up(hedger: Hedger, runs: int, latency: float) -> None:
+    for _ in range(runs):
+        await hedger.run("schema", [attempt("warm-up", latency)], ignore_failure)
+
+
+async def test_that_attempts_run_one_after_the_other_without_hedging() -> None:
+    hedger = Hedger(HedgingPolicy())
+    failures = []
+
+    result = await hedger.run(
+        "schema",
+        [failing_attempt(), failing_attempt(), attempt("third")],
+        lambda attempt, exc: failures.append(attempt),
+    )
+
+    assert result.value == "third"
+    assert result.attempt == 2
+    assert not result.hedge_won
+    assert failures == [0, 1]
+
+
+async def test_that_the_last_failure_is_raised_when_all_attempts_fail() -> None:
+    hedger = Hedger(HedgingPolicy())
+
+    with raises(Exception, match="Retry with another attempt"):
+        await hedger.run("schema", [failing_attempt(), failing_attempt()], ignore_failure)
+
+
+async def test_that_a_slow_attempt_is_hedged_by_the_next_one() -> None:
+    hedger = Hedger(HedgingPolicy(latency_percentile=0.9, max_extra_spend=1, min_samples=5))
+
+    await warm_up(hedger, runs=5, latency=0.01)
+
+    result = await hedger.run(
+        "schema",
+        [attempt("slow", delay=5), attempt("fast")],
+        ignore_failure,
+    )
+
+    assert result.value == "fast"
+    assert result.hedge_won
+
+
+async def test_that_hedging_stops_once_the_extra_spend_is_exhausted() -> None:
+    hedger = Hedger(HedgingPolicy(latency_percentile=0.9, max_extra_spend=0.1, min_samples=5))
+
+    await warm_up(hedger, runs=9, latency=0.01)
+
+    # The tenth run may be hedged, but the eleventh would exceed 10% extra attempts
+    assert (
+        await hedger.run("schema", [attempt("slow", 0.2), attempt("fast")], ignore_failure)
+    ).hedge_won
+    assert not (
+        await hedger.run("schema", [attempt("slow", 0.2), attempt("fast")], ignore_failure)
+    ).hedge_won
+
+
+async def test_that_no_hedging_happens_before_enough_latencies_were_seen() -> None:
+    hedger = Hedger(HedgingPolicy(latency_percentile=0.9, max_extra_spend=1, min_samples=5))
+
+    await warm_up(hedger, runs=4, latency=0.01)
+
+    result = await hedger.run(
+        "schema",
+        [attempt("slow", delay=0.2), attempt("fast")],
+        ignore_failure,
+    )
+
+    assert result.value == "slow"
+
+
+async def test_that_the_extra_spend_is_measured_over_recent_runs_only() -> None:
+    hedger = Hedger(
+        HedgingPolicy(latency_percentile=0.9, max_extra_spend=0.1, min_samples=5, window_size=10)
+    )
+
+    # A long history without hedging doesn't save up budget for a burst of hedges later
+    await warm_up(hedger, runs=20, latency=0.01)
+
+    assert (
+        await hedger.run("schema", [attempt("slow", 0.2), attempt("fast")], ignore_failure)
+    ).hedge_won
+    assert not (
+        await hedger.run("schema", [attempt("slow", 0.2), attempt("fast")], ignore_failure)
+    ).hedge_won
+
+    # Once the hedged run has left the window, there's budget for hedging again
+    await warm_up(hedger, runs=10, latency=0.01)
+
+    assert (
+        await hedger.run("schema", [attempt("slow", 0.2), attempt("fast")], ignore_failure)
+    ).hedge_won
+
+
+async def test_that_a_cancelled_attempt_counts_toward_the_latencies() -> None:
+    hedger = Hedger(HedgingPolicy(latency_percentile=1, min_samples=5))
+
+    await warm_up(hedger, runs=5, latency=0.01)
+
+    with raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            hedger.run("schema", [attempt("slow", delay=5)], ignore_failure),
+            timeout=0.3,
+        )
+
+    delay = hedger.hedge_delay("schema")
+
+    assert delay is not None
+    assert delay >= 0.3
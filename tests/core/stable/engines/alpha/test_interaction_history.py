@@ -0,0 +1,285 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timezone
+from typing import Sequence, cast
+from unittest.mock import AsyncMock
+
+from lagom import Container
+from typing_extensions import override
+
+from parlant.core.agents import Agent, AgentId, AgentStore
+from parlant.core.background_tasks import BackgroundTaskService
+from parlant.core.common import JSONSerializable, generate_id
+from parlant.core.contextual_correlator import ContextualCorrelator
+from parlant.core.customers import CustomerId
+from parlant.core.engines.alpha.interaction_history import (
+    HistorySummarizer,
+    HistorySummarySchema,
+    fit_interaction_history,
+    window_interaction_history,
+)
+from parlant.core.engines.alpha.prompt_builder import PromptBuilder
+from parlant.core.logging import Logger
+from parlant.core.nlp.generation import (
+    GenerationInfo,
+    SchematicGenerationResult,
+    SchematicGenerator,
+    UsageInfo,
+)
+from parlant.core.nlp.tokenization import EstimatingTokenizer
+from parlant.core.sessions import (
+    Event,
+    EventId,
+    EventKind,
+    EventSource,
+    HistorySummaryEventData,
+    Session,
+    SessionStore,
+    is_history_summary,
+)
+
+
+class WordCountTokenizer(EstimatingTokenizer):
+    @override
+    async def estimate_token_count(self, prompt: str) -> int:
+        return len(prompt.split())
+
+
+def create_event(
+    offset: int,
+    source: EventSource,
+    kind: EventKind = "message",
+    data: JSONSerializable = None,
+) -> Event:
+    return Event(
+        id=EventId(generate_id()),
+        source=source,
+        kind=kind,
+        creation_utc=datetime.now(timezone.utc),
+        offset=offset,
+        correlation_id="<main>",
+        data=data
+        or {
+            "message": f"message {offset}",
+            "participant": {"display_name": source},
+        },
+        deleted=False,
+    )
+
+
+def create_interaction(turns: int) -> list[Event]:
+    events = []
+
+    for turn in range(turns):
+        events.append(create_event(2 * turn, "customer"))
+        events.append(create_event(2 * turn + 1, "ai_agent"))
+
+    return events
+
+
+def create_summary(offset: int, summarized_until_offset: int) -> Event:
+    return create_event(
+        offset,
+        "system",
+        kind="custom",
+        data={
+            "history_summary": "The customer asked about things",
+            "summarized_until_offset": summarized_until_offset,
+        },
+    )
+
+
+def offsets(events: Sequence[Event]) -> list[int]:
+    return [e.offset for e in events]
+
+
+def test_that_the_full_history_is_kept_when_no_turn_limit_is_set() -> None:
+    events = [*create_interaction(3), create_summary(6, 1)]
+
+    assert offsets(window_interaction_history(events, None)) == [0, 1, 2, 3, 4, 5]
+
+
+def test_that_summarized_turns_are_replaced_with_the_summary() -> None:
+    events = [*create_interaction(4), create_summary(8, 3)]
+
+    windowed = window_interaction_history(events, 2)
+
+    assert offsets(windowed) == [8, 4, 5, 6, 7]
+    assert windowed[0].kind == "custom"
+
+
+def test_that_turns_which_were_not_summarized_yet_are_kept_alongside_the_summary() -> None:
+    events = [*create_interaction(4), create_summary(8, 1)]
+
+    assert offsets(window_interaction_history(events, 2)) == [8, 2, 3, 4, 5, 6, 7]
+
+
+def test_that_older_turns_are_kept_until_a_summary_exists() -> None:
+    events = create_interaction(4)
+
+    assert offsets(window_interaction_history(events, 2)) == offsets(events)
+
+
+async def test_that_the_oldest_events_are_dropped_to_fit_the_token_budget() -> None:
+    events = create_interaction(5)
+    tokenizer = WordCountTokenizer()
+
+    event_tokens = await tokenizer.estimate_token_count(PromptBuilder.adapt_event(events[0]))
+
+    fitted = await fit_interaction_history(events, tokenizer, 3 * event_tokens)
+
+    assert offsets(fitted) == [7, 8, 9]
+
+
+async def test_that_the_summary_and_the_latest_event_are_kept_regardless_of_the_token_budget() -> (
+    None
+):
+    events = [create_summary(6, 3), *create_interaction(3)[4:]]
+
+    fitted = await fit_interaction_history(events, WordCountTokenizer(), 1)
+
+    assert offsets(fitted) == [6, 5]
+
+
+async def test_that_the_latest_message_is_kept_when_the_history_ends_in_status_events() -> None:
+    events = [
+        *create_interaction(2),
+        create_event(4, "customer"),
+        create_event(5, "ai_agent", kind="status", data={"status": "processing", "data": {}}),
+        create_event(6, "ai_agent", kind="status", data={"status": "typing", "data": {}}),
+    ]
+
+    fitted = await fit_interaction_history(events, WordCountTokenizer(), 1)
+
+    assert offsets(fitted) == [4, 5, 6]
+
+
+def create_summary_generator(summary: str) -> AsyncMock:
+    generator = AsyncMock(spec=SchematicGenerator[HistorySummarySchema])
+    generator.generate.return_value = SchematicGenerationResult(
+        content=HistorySummarySchema(summary=summary),
+        info=GenerationInfo(
+            schema_name="HistorySummarySchema",
+            model="not-real-model",
+            duration=1,
+            usage=UsageInfo(input_tokens=1, output_tokens=1),
+        ),
+    )
+    return generator
+
+
+async def create_session_with_turns(container: Container, turns: int) -> Session:
+    session_store = container[SessionStore]
+    session = await session_store.create_session(CustomerId("customer"), AgentId("agent"))
+
+    await add_turns(container, session, turns)
+
+    return session
+
+
+async def add_turns(container: Container, session: Session, turns: int) -> None:
+    for _ in range(turns):
+        for source in cast(list[EventSource], ["customer", "ai_agent"]):
+            await container[SessionStore].create_event(
+                session_id=session.id,
+                source=source,
+                kind="message",
+                correlation_id="<main>",
+                data={
+                    "message": f"a message from {source}",
+                    "participant": {"display_name": source},
+                },
+            )
+
+
+async def summarize(
+    container: Container,
+    generator: AsyncMock,
+    agent: Agent,
+    session: Session,
+) -> None:
+    async with BackgroundTaskService(container[Logger]) as background_task_service:
+        summarizer = HistorySummarizer(
+            container[Logger],
+            container[ContextualCorrelator],
+            container[SessionStore],
+            background_task_service,
+            generator,
+        )
+
+        await summarizer.schedule(agent, session.id)
+        await background_task_service.collect(force=True)
+
+
+async def read_summaries(container: Container, session: Session) -> list[HistorySummaryEventData]:
+    return [
+        cast(HistorySummaryEventData, e.data)
+        for e in await container[SessionStore].list_events(session.id)
+        if is_history_summary(e)
+    ]
+
+
+async def test_that_turns_before_the_verbatim_window_are_folded_into_a_summary(
+    container: Container,
+) -> None:
+    agent = await container[AgentStore].create_agent("test-agent", max_history_turns=1)
+    session = await create_session_with_turns(container, 3)
+    generator = create_summary_generator("The customer said hello twice")
+
+    await summarize(container, generator, agent, session)
+
+    assert await read_summaries(container, session) == [
+        {"history_summary": "The customer said hello twice", "summarized_until_offset": 3}
+    ]
+
+    prompt = generator.generate.call_args.kwargs["prompt"]
+    assert prompt.count("a message from customer") == 2
+
+
+async def test_that_a_new_summary_extends_and_replaces_the_previous_one(
+    container: Container,
+) -> None:
+    agent = await container[AgentStore].create_agent("test-agent", max_history_turns=1)
+    session = await create_session_with_turns(container, 2)
+
+    await summarize(container, create_summary_generator("First summary"), agent, session)
+
+    await add_turns(container, session, 1)
+
+    generator = create_summary_generator("Second summary")
+    await summarize(container, generator, agent, session)
+
+    [summary] = await read_summaries(container, session)
+    assert summary["history_summary"] == "Second summary"
+
+    # The first summary took offset 4, and the last turn starts at offset 5
+    assert summary["summarized_until_offset"] == 4
+
+    prompt = generator.generate.call_args.kwargs["prompt"]
+    assert "First summary" in prompt
+    assert prompt.count("a message from customer") == 1
+
+
+async def test_that_no_summary_is_made_while_the_history_fits_in_the_verbatim_window(
+    container: Container,
+) -> None:
+    agent = await container[AgentStore].create_agent("test-agent", max_history_turns=2)
+    session = await create_session_with_turns(container, 2)
+    generator = create_summary_generator("Unneeded summary")
+
+    await summarize(container, generator, agent, session)
+
+    generator.generate.assert_not_called()
+    assert await read_summaries(container, session) == []
@@ -0,0 +1,106 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from parlant.core.engines.alpha.prompt_builder import PromptBuilder
+from parlant.core.nlp.generation import split_prompt
+from parlant.core.shots import Shot, ShotCollection
+
+
+def test_that_static_sections_are_normalized_like_regular_sections() -> None:
+    static_prompt = PromptBuilder().add_static_section("\n  Static  \n").build()
+    regular_prompt = PromptBuilder().add_section("\n  Static  \n").build()
+
+    assert static_prompt == regular_prompt == "Static"
+
+
+def test_that_cached_sections_are_rendered_once_per_key() -> None:
+    renders = []
+
+    def render() -> str:
+        renders.append(1)
+        return "\nCached\n"
+
+    for _ in range(3):
+        prompt = (
+            PromptBuilder()
+            .add_cached_section(key=("test", "cached-once"), render=render)
+            .add_section("Dynamic")
+            .build()
+        )
+
+        assert prompt == "Cached\n\nDynamic"
+
+    assert len(renders) == 1
+
+
+async def test_that_shot_renderings_are_invalidated_when_the_collection_changes() -> None:
+    collection = ShotCollection[Shot]([Shot(description="first")])
+
+    async def build() -> str:
+        shots = await collection.list()
+
+        return (
+            PromptBuilder()
+            .add_cached_section(
+                key=("test", collection.cache_key(shots)),
+                render=lambda: ", ".join(s.description for s in shots),
+            )
+            .build()
+        )
+
+    assert await build() == "first"
+
+    await collection.append(Shot(description="second"))
+
+    assert await build() == "first, second"
+
+
+async def test_that_shot_cache_keys_identify_the_collection_and_the_selected_shots() -> None:
+    first, second = Shot(description="first"), Shot(description="second")
+
+    collection = ShotCollection[Shot]([first, second])
+    other_collection = ShotCollection[Shot]([first, second])
+
+    assert collection.cache_key([second]) == collection.cache_key([second])
+    assert collection.cache_key([second]) != collection.cache_key([first])
+    assert collection.cache_key([first]) != other_collection.cache_key([first])
+
+
+def test_that_shots_from_outside_the_collection_have_no_cache_key() -> None:
+    stored = Shot(description="stored")
+    collection = ShotCollection[Shot]([stored])
+
+    assert collection.cache_key([Shot(description="stored")]) is None
+    assert collection.cache_key([stored, Shot(description="other")]) is None
+    assert collection.cache_key([stored]) is not None
+
+
+def test_that_static_sections_are_placed_before_dynamic_ones() -> None:
+    prompt = (
+        PromptBuilder()
+        .add_static_section("Instructions")
+        .add_section("History")
+        .add_cached_section(key=("test", "examples"), render=lambda: "Examples")
+        .add_section("Guidelines")
+        .build()
+    )
+
+    assert prompt == "Instructions\n\nExamples\n\nHistory\n\nGuidelines"
+    assert split_prompt(prompt) == ("Instructions\n\nExamples\n\n", "History\n\nGuidelines")
+
+
+def test_that_a_prompt_without_static_sections_has_no_cacheable_prefix() -> None:
+    prompt = PromptBuilder().add_section("History").build()
+
+    assert split_prompt(prompt) == ("", "History")
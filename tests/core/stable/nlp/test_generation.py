@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from typing import Any, Mapping, cast
 from lagom import Container
 from unittest.mock import AsyncMock
@@ -20,8 +21,10 @@ from pytest import raises
 
 from parlant.core.common import DefaultBaseModel
 from parlant.core.logging import Logger
+from parlant.core.metrics import MetricsRegistry
 from parlant.core.nlp.embedding import EmbeddingResult
 from parlant.core.nlp.generation import (
+    CircuitBreakerPolicy,
     FallbackSchematicGenerator,
     GenerationInfo,
     SchematicGenerationResult,
@@ -43,6 +46,32 @@ class SecondException(Exception):
     pass
 
 
+class RateLimitError(Exception):
+    pass
+
+
+def create_successful_generator(id: str) -> AsyncMock:
+    generator = AsyncMock(spec=SchematicGenerator[DummySchema])
+    generator.id = id
+    generator.generate.return_value = SchematicGenerationResult(
+        content=DummySchema(result=id),
+        info=GenerationInfo(
+            schema_name="DummySchema",
+            model=id,
+            duration=1,
+            usage=UsageInfo(input_tokens=1, output_tokens=1),
+        ),
+    )
+    return generator
+
+
+def create_failing_generator(id: str, exception: Exception) -> AsyncMock:
+    generator = AsyncMock(spec=SchematicGenerator[DummySchema])
+    generator.id = id
+    generator.generate.side_effect = exception
+    return generator
+
+
 async def test_that_fallback_generation_uses_the_first_working_generator(
     container: Container,
 ) -> None:
@@ -136,6 +165,137 @@ async def test_that_fallback_generation_raises_an_error_when_all_generators_fail
     mock_second_generator.generate.assert_awaited_once_with(prompt="test prompt", hints={})
 
 
+async def test_that_fallback_generation_skips_a_generator_whose_circuit_is_open(
+    container: Container,
+) -> None:
+    first_generator = create_failing_generator("first", Exception("Failure"))
+    second_generator = create_successful_generator("second")
+
+    metrics = MetricsRegistry()
+
+    fallback_generator = FallbackSchematicGenerator[DummySchema](
+        first_generator,
+        second_generator,
+        logger=container[Logger],
+        circuit_breaker_policy=CircuitBreakerPolicy(min_calls=2, cooldown=60),
+        metrics=metrics,
+    )
+
+    for _ in range(3):
+        result = await fallback_generator.generate("test prompt")
+        assert result.content.result == "second"
+
+    assert first_generator.generate.await_count == 2
+    assert fallback_generator.health[0].state == "open"
+    assert fallback_generator.health[0].error_rate == 1.0
+
+    circuit_states = metrics.gauge("llm_generator_circuit_state", "")
+    assert circuit_states.value(schema="DummySchema", generator="first") == 2
+    assert circuit_states.value(schema="DummySchema", generator="second") == 0
+
+
+async def test_that_a_generator_whose_circuit_is_open_is_probed_after_the_cooldown(
+    container: Container,
+) -> None:
+    first_generator = create_failing_generator("first", Exception("Failure"))
+    second_generator = create_successful_generator("second")
+
+    fallback_generator = FallbackSchematicGenerator[DummySchema](
+        first_generator,
+        second_generator,
+        logger=container[Logger],
+        circuit_breaker_policy=CircuitBreakerPolicy(min_calls=1, cooldown=0),
+    )
+
+    first_health = fallback_generator.health[0]
+
+    await fallback_generator.generate("test prompt")
+    assert first_health.state == "open"
+
+    first_generator.generate.side_effect = None
+    first_generator.generate.return_value = second_generator.generate.return_value
+
+    await fallback_generator.generate("test prompt")
+
+    assert first_generator.generate.await_count == 2
+    assert fallback_generator.health[0].state == "closed"
+
+
+async def test_that_a_rate_limited_generator_is_skipped_immediately(
+    container: Container,
+) -> None:
+    first_generator = create_failing_generator("first", RateLimitError("Too many requests"))
+    second_generator = create_successful_generator("second")
+
+    fallback_generator = FallbackSchematicGenerator[DummySchema](
+        first_generator,
+        second_generator,
+        logger=container[Logger],
+    )
+
+    await fallback_generator.generate("test prompt")
+    await fallback_generator.generate("test prompt")
+
+    first_generator.generate.assert_awaited_once()
+    assert fallback_generator.health[0].rate_limited
+
+
+async def test_that_generators_are_tried_even_when_all_of_their_circuits_are_open(
+    container: Container,
+) -> None:
+    first_generator = create_failing_generator("first", RateLimitError("Too many requests"))
+    second_generator = create_failing_generator("second", RateLimitError("Too many requests"))
+
+    fallback_generator = FallbackSchematicGenerator[DummySchema](
+        first_generator,
+        second_generator,
+        logger=container[Logger],
+    )
+
+    with raises(RateLimitError):
+        await fallback_generator.generate("test prompt")
+
+    second_generator.generate.side_effect = None
+    second_generator.generate.return_value = create_successful_generator(
+        "second"
+    ).generate.return_value
+
+    result = await fallback_generator.generate("test prompt")
+
+    assert result.content.result == "second"
+    assert first_generator.generate.await_count == 2
+
+
+async def test_that_latency_routing_prefers_the_faster_generator(
+    container: Container,
+) -> None:
+    slow_generator = create_successful_generator("slow")
+    fast_generator = create_successful_generator("fast")
+
+    async def generate_slowly(*args: Any, **kwargs: Any) -> Any:
+        await asyncio.sleep(0.05)
+        return slow_generator.generate.return_value
+
+    slow_generator.generate.side_effect = generate_slowly
+
+    fallback_generator = FallbackSchematicGenerator[DummySchema](
+        slow_generator,
+        fast_generator,
+        logger=container[Logger],
+        route_by_latency=True,
+    )
+
+    # Let both generators be measured once
+    await fallback_generator.generate("test prompt")
+    fast_generator.generate.side_effect = FirstException("Failure")
+    await fallback_generator.generate("test prompt")
+    fast_generator.generate.side_effect = None
+
+    result = await fallback_generator.generate("test prompt")
+
+    assert result.content.result == "fast"
+
+
 async def test_that_retry_succeeds_on_first_attempt(
     container: Container,
 ) -> None:
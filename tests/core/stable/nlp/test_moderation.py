@@ -0,0 +1,46 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import AsyncMock
+
+from parlant.core.nlp.moderation import (
+    CachedModerationService,
+    ModerationCheck,
+    ModerationService,
+)
+
+
+async def test_that_a_recurring_message_is_only_moderated_once() -> None:
+    mock_service = AsyncMock(spec=ModerationService)
+    mock_service.check.return_value = ModerationCheck(flagged=False, tags=[])
+
+    service = CachedModerationService(mock_service)
+
+    for message in ["Thanks!", "thanks!", "  THANKS!  "]:
+        assert await service.check(message) == ModerationCheck(flagged=False, tags=[])
+
+    assert mock_service.check.await_count == 1
+
+
+async def test_that_an_expired_verdict_is_moderated_again() -> None:
+    mock_service = AsyncMock(spec=ModerationService)
+    mock_service.check.side_effect = [
+        ModerationCheck(flagged=False, tags=[]),
+        ModerationCheck(flagged=True, tags=["harassment"]),
+    ]
+
+    service = CachedModerationService(mock_service, ttl=0)
+
+    assert not (await service.check("hi")).flagged
+    assert (await service.check("hi")).flagged
@@ -0,0 +1,77 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import AsyncMock
+
+from pytest import raises
+
+from parlant.core.nlp.tokenization import (
+    ApproximateTokenizer,
+    EstimatingTokenizer,
+    MemoizingTokenizer,
+)
+
+
+async def test_that_memoized_counts_are_not_estimated_again() -> None:
+    mock_tokenizer = AsyncMock(spec=EstimatingTokenizer)
+    mock_tokenizer.estimate_token_count.side_effect = lambda prompt: len(prompt)
+
+    tokenizer = MemoizingTokenizer(mock_tokenizer)
+
+    assert await tokenizer.estimate_token_count("hello") == 5
+    assert await tokenizer.estimate_token_count("hello") == 5
+    assert await tokenizer.estimate_token_count("hi") == 2
+
+    assert mock_tokenizer.estimate_token_count.await_count == 2
+
+
+async def test_that_the_least_recently_used_count_is_evicted_once_capacity_is_reached() -> None:
+    mock_tokenizer = AsyncMock(spec=EstimatingTokenizer)
+    mock_tokenizer.estimate_token_count.side_effect = lambda prompt: len(prompt)
+
+    tokenizer = MemoizingTokenizer(mock_tokenizer, capacity=2)
+
+    await tokenizer.estimate_token_count("a")
+    await tokenizer.estimate_token_count("bb")
+    await tokenizer.estimate_token_count("a")
+    await tokenizer.estimate_token_count("ccc")
+
+    mock_tokenizer.estimate_token_count.reset_mock()
+
+    await tokenizer.estimate_token_count("a")
+    mock_tokenizer.estimate_token_count.assert_not_awaited()
+
+    await tokenizer.estimate_token_count("bb")
+    mock_tokenizer.estimate_token_count.assert_awaited_once_with("bb")
+
+
+async def test_that_an_approximate_count_uses_the_larger_of_the_byte_and_word_estimates() -> None:
+    tokenizer = ApproximateTokenizer(bytes_per_token=4, tokens_per_word=1.5)
+
+    assert await tokenizer.estimate_token_count("one two three four") == 6
+    assert await tokenizer.estimate_token_count('{"key":"value","other":[1,2,3]}') == 8
+    assert await tokenizer.estimate_token_count("") == 0
+
+
+async def test_that_an_approximate_tokenizer_can_be_calibrated_against_an_exact_one() -> None:
+    mock_tokenizer = AsyncMock(spec=EstimatingTokenizer)
+    mock_tokenizer.estimate_token_count.side_effect = lambda prompt: len(prompt.split()) * 2
+
+    tokenizer = await ApproximateTokenizer.calibrate(mock_tokenizer, ["aaa bbb", "ccc ddd eee"])
+
+    assert tokenizer.tokens_per_word == 2
+    assert tokenizer.bytes_per_token == 18 / 10
+
+    with raises(ValueError):
+        await ApproximateTokenizer.calibrate(mock_tokenizer, [""])
@@ -0,0 +1,39 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from typing import Any
+
+from parlant.core.persistence.common import sort_documents
+
+
+def test_that_documents_are_sorted_by_each_field_in_turn() -> None:
+    documents = [
+        {"rank": 2, "id": "a"},
+        {"rank": 1, "id": "c"},
+        {"rank": 1, "id": "b"},
+    ]
+
+    assert [d["id"] for d in sort_documents(documents, ["rank", "id"])] == ["b", "c", "a"]
+
+
+def test_that_documents_missing_a_sort_field_come_first() -> None:
+    documents: list[dict[str, Any]] = [
+        {"rank": 1, "id": "a"},
+        {"id": "b"},
+        {"rank": 0, "id": "c"},
+        {"id": "d"},
+    ]
+
+    assert [d["id"] for d in sort_documents(documents, ["rank"])] == ["b", "d", "c", "a"]
@@ -13,15 +13,38 @@
 # limitations under the License.
 
 from datetime import datetime, timezone
+from typing import Any, Optional
+from unittest.mock import AsyncMock
 
+from lagom import Container
+
+from parlant.adapters.db.transient import TransientDocumentDatabase
 from parlant.core.agents import Agent, AgentId
 from parlant.core.guidelines import GuidelineContent
 from parlant.core.glossary import GlossaryStore
+from parlant.core.logging import Logger
+from parlant.core.nlp.embedding import Embedder, EmbeddingResult
+from parlant.core.nlp.generation import (
+    GenerationInfo,
+    SchematicGenerationResult,
+    SchematicGenerator,
+    UsageInfo,
+)
+from parlant.core.nlp.service import NLPService
 from parlant.core.services.indexing.coherence_checker import (
+    ActionsContradictionTestSchema,
+    ActionsContradictionTestsSchema,
     CoherenceChecker,
+    ConditionsEntailmentTestSchema,
+    ConditionsEntailmentTestsSchema,
     IncoherenceKind,
     IncoherenceTest,
 )
+from parlant.core.services.indexing.common import ProgressReport
+from parlant.core.services.indexing.pair_verdicts import (
+    GuidelinePairVerdictDocumentStore,
+    GuidelinePairVerdictStore,
+)
 
 from tests.core.common.utils import ContextOfTest
 from tests.test_utilities import nlp_test
@@ -889,3 +912,179 @@ def test_that_seemingly_contradictory_but_actually_complementary_actions_are_not
     assert context.sync_await(
         incoherence_nlp_test(agent, context.container[GlossaryStore], incoherence_results[0])
     )
+
+
+def create_pruning_coherence_checker(
+    container: Container,
+    embedder: Embedder,
+    verdict_store: Optional[GuidelinePairVerdictStore] = None,
+) -> tuple[CoherenceChecker, AsyncMock, AsyncMock]:
+    def result(content: Any) -> SchematicGenerationResult[Any]:
+        return SchematicGenerationResult(
+            content=content,
+            info=GenerationInfo(
+                schema_name=type(content).__name__,
+                model="not-real-model",
+                duration=1,
+                usage=UsageInfo(input_tokens=1, output_tokens=1),
+            ),
+        )
+
+    conditions_generator = AsyncMock(spec=SchematicGenerator[ConditionsEntailmentTestsSchema])
+    conditions_generator.generate.return_value = result(
+        ConditionsEntailmentTestsSchema(
+            condition_entailments=[
+                ConditionsEntailmentTestSchema(
+                    compared_guideline_id=i,
+                    origin_guideline_when="",
+                    compared_guideline_when="",
+                    origin_entails_compared_rationale="",
+                    origin_when_entails_compared_when=False,
+                    origin_entails_compared_severity=0,
+                    compared_entails_origin_rationale="",
+                    compared_when_entails_origin_when=False,
+                    compared_entails_origin_severity=0,
+                )
+                for i in range(1, 6)
+            ]
+        )
+    )
+
+    actions_generator = AsyncMock(spec=SchematicGenerator[ActionsContradictionTestsSchema])
+    actions_generator.generate.return_value = result(
+        ActionsContradictionTestsSchema(
+            action_contradictions=[
+                ActionsContradictionTestSchema(
+                    compared_guideline_id=i,
+                    origin_guideline_then="",
+                    compared_guideline_then="",
+                    rationale="",
+                    thens_contradiction=False,
+                    severity=0,
+                )
+                for i in range(1, 6)
+            ]
+        )
+    )
+
+    glossary_store = AsyncMock(spec=GlossaryStore)
+    glossary_store.find_relevant_terms.return_value = []
+
+    nlp_service = AsyncMock(spec=NLPService)
+    nlp_service.get_embedder.return_value = embedder
+
+    if not verdict_store:
+        verdict_store = AsyncMock(spec=GuidelinePairVerdictStore)
+        verdict_store.read_verdicts.side_effect = lambda kind, agent_id, pairs: [None] * len(pairs)
+
+    coherence_checker = CoherenceChecker(
+        container[Logger],
+        conditions_generator,
+        actions_generator,
+        glossary_store,
+        nlp_service,
+        verdict_store,
+        top_k=2,
+        similarity_margin=0.0,
+    )
+
+    return coherence_checker, conditions_generator, actions_generator
+
+
+async def test_that_only_the_most_related_guidelines_are_checked_unless_exhaustive(
+    container: Container,
+    agent: Agent,
+) -> None:
+    embedder = AsyncMock(spec=Embedder)
+    embedder.embed.side_effect = lambda texts: EmbeddingResult(
+        vectors=[[1.0, 0.0] if "pizza" in t else [0.0, 1.0] for t in texts]
+    )
+
+    guideline_to_evaluate = GuidelineContent(
+        condition="the customer orders a pizza",
+        action="offer a discount on a second pizza",
+    )
+
+    related_guidelines = [
+        GuidelineContent(
+            condition="the customer orders a large pizza",
+            action="do not offer any discounts on pizza",
+        ),
+        GuidelineContent(
+            condition="a pizza order is delayed",
+            action="apologize to the customer",
+        ),
+    ]
+
+    unrelated_guidelines = [
+        GuidelineContent(
+            condition=f"the customer asks about topic {i}",
+            action=f"explain topic {i}",
+        )
+        for i in range(8)
+    ]
+
+    async def do_nothing(_: float) -> None:
+        pass
+
+    for exhaustive, expected_batches, expected_pruned_pairs in [(False, 1, 8), (True, 2, 0)]:
+        coherence_checker, conditions_generator, actions_generator = (
+            create_pruning_coherence_checker(container, embedder)
+        )
+        progress_report = ProgressReport(do_nothing)
+
+        await coherence_checker.propose_incoherencies(
+            agent,
+            [guideline_to_evaluate],
+            [*unrelated_guidelines[:4], *related_guidelines, *unrelated_guidelines[4:]],
+            progress_report=progress_report,
+            exhaustive=exhaustive,
+        )
+
+        assert conditions_generator.generate.await_count == expected_batches
+        assert actions_generator.generate.await_count == expected_batches
+        assert progress_report.pruned_pairs == expected_pruned_pairs
+
+        if not exhaustive:
+            prompt = conditions_generator.generate.call_args.kwargs["prompt"]
+
+            assert all(g.action in prompt for g in related_guidelines)
+            assert not any(g.action in prompt for g in unrelated_guidelines)
+
+
+async def test_that_a_cached_incoherence_keeps_its_orientation_when_the_pair_is_evaluated_in_reverse(
+    container: Container,
+    agent: Agent,
+) -> None:
+    first_guideline = GuidelineContent(
+        condition="the customer orders a pizza",
+        action="offer a discount on a second pizza",
+    )
+    second_guideline = GuidelineContent(
+        condition="the customer orders a large pizza",
+        action="do not offer any discounts on pizza",
+    )
+
+    async with GuidelinePairVerdictDocumentStore(TransientDocumentDatabase()) as verdict_store:
+        coherence_checker, _, actions_generator = create_pruning_coherence_checker(
+            container, AsyncMock(spec=Embedder), verdict_store
+        )
+        actions_generator.generate.return_value.content.action_contradictions[0].severity = 9
+
+        [evaluated_incoherence] = await coherence_checker.propose_incoherencies(
+            agent, [first_guideline], [second_guideline], exhaustive=True
+        )
+
+        coherence_checker, conditions_generator, actions_generator = (
+            create_pruning_coherence_checker(container, AsyncMock(spec=Embedder), verdict_store)
+        )
+
+        [cached_incoherence] = await coherence_checker.propose_incoherencies(
+            agent, [second_guideline], [first_guideline], exhaustive=True
+        )
+
+    conditions_generator.generate.assert_not_called()
+    actions_generator.generate.assert_not_called()
+
+    assert cached_incoherence.guideline_a == evaluated_incoherence.guideline_a == first_guideline
+    assert cached_incoherence.guideline_b == evaluated_incoherence.guideline_b == second_guideline
@@ -13,24 +13,33 @@
 # limitations under the License.
 
 import asyncio
+from dataclasses import replace
+from unittest.mock import AsyncMock
 
 from lagom import Container
 from pytest import raises
 
-from parlant.core.agents import Agent
+from parlant.core.agents import Agent, AgentStore
 from parlant.core.evaluations import (
     EvaluationListener,
     EvaluationStatus,
     EvaluationStore,
     GuidelinePayload,
+    InvoiceGuidelineData,
     PayloadDescriptor,
     PayloadKind,
 )
 from parlant.core.guidelines import GuidelineContent, GuidelineStore
+from parlant.core.logging import Logger
 from parlant.core.services.indexing.behavioral_change_evaluation import (
     BehavioralChangeEvaluator,
     EvaluationValidationError,
 )
+from parlant.core.services.indexing.coherence_checker import CoherenceChecker
+from parlant.core.services.indexing.guideline_connection_proposer import (
+    GuidelineConnectionProposer,
+)
+from parlant.core.task_queue import TaskQueueConsumer
 
 from tests.conftest import NoCachedGenerations
 
@@ -314,13 +323,14 @@ async def test_that_an_evaluation_of_multiple_payloads_completes_with_an_invoice
         assert invoice.data.connection_propositions is None
 
 
-async def test_that_an_evaluation_that_failed_due_to_already_running_evaluation_task_contains_its_error_details(
+async def test_that_an_evaluation_created_while_another_one_is_running_completes_as_well(
     container: Container,
     agent: Agent,
     no_cache: NoCachedGenerations,
 ) -> None:
     evaluation_service = container[BehavioralChangeEvaluator]
     evaluation_store = container[EvaluationStore]
+    evaluation_listener = container[EvaluationListener]
 
     first_evaluation_id = await evaluation_service.create_evaluation_task(
         agent=agent,
@@ -371,12 +381,11 @@ async def test_that_an_evaluation_that_failed_due_to_already_running_evaluation_
         payload_descriptors=[PayloadDescriptor(PayloadKind.GUIDELINE, p) for p in second_payloads],
     )
 
-    await asyncio.sleep(AMOUNT_OF_TIME_TO_WAIT_FOR_EVALUATION_TO_START_RUNNING)
+    for evaluation_id in [first_evaluation_id, second_evaluation_id]:
+        assert await evaluation_listener.wait_for_completion(evaluation_id)
 
-    evaluation = await evaluation_store.read_evaluation(second_evaluation_id)
-
-    assert evaluation.status == EvaluationStatus.FAILED
-    assert evaluation.error == f"An evaluation task '{first_evaluation_id}' is already running."
+        evaluation = await evaluation_store.read_evaluation(evaluation_id)
+        assert evaluation.status == EvaluationStatus.COMPLETED
 
 
 async def test_that_an_evaluation_validation_failed_due_to_guidelines_duplication_in_the_payloads_contains_relevant_error_details(
@@ -588,3 +597,77 @@ async def test_that_an_evaluation_completes_and_contains_connection_proposition_
     assert (
         invoice_data.connection_propositions[0].target.condition == "providing the weather update"
     )
+
+
+async def test_that_a_resumed_evaluation_only_checks_the_payloads_that_did_not_finish(
+    container: Container,
+    agent: Agent,
+) -> None:
+    evaluation_store = container[EvaluationStore]
+
+    coherence_checker = AsyncMock(spec=CoherenceChecker)
+    coherence_checker.propose_incoherencies.return_value = []
+    connection_proposer = AsyncMock(spec=GuidelineConnectionProposer)
+    connection_proposer.propose_connections.return_value = []
+
+    evaluator = BehavioralChangeEvaluator(
+        container[Logger],
+        container[TaskQueueConsumer],
+        container[AgentStore],
+        evaluation_store,
+        container[GuidelineStore],
+        connection_proposer,
+        coherence_checker,
+        max_concurrent_payloads=2,
+    )
+
+    guidelines = [
+        GuidelineContent(
+            condition=f"the customer asks about product {i}",
+            action=f"describe product {i}",
+        )
+        for i in range(4)
+    ]
+
+    evaluation = await evaluation_store.create_evaluation(
+        agent.id,
+        [
+            PayloadDescriptor(
+                PayloadKind.GUIDELINE,
+                GuidelinePayload(
+                    content=g,
+                    operation="add",
+                    coherence_check=True,
+                    connection_proposition=True,
+                ),
+            )
+            for g in guidelines
+        ],
+    )
+
+    # As if the evaluation was interrupted after checking the first two payloads
+    for i in range(2):
+        evaluation = await evaluation_store.update_invoice(
+            evaluation.id,
+            i,
+            replace(
+                evaluation.invoices[i],
+                checkpoint=InvoiceGuidelineData(coherence_checks=[], connection_propositions=[]),
+            ),
+        )
+
+    await evaluator.run_evaluation(evaluation)
+
+    checked_guidelines = [
+        call.kwargs["guidelines_to_evaluate"]
+        for call in coherence_checker.propose_incoherencies.call_args_list
+    ]
+
+    assert sorted(checked_guidelines, key=str) == [[guidelines[2]], [guidelines[3]]]
+
+    evaluation = await evaluation_store.read_evaluation(evaluation.id)
+
+    assert evaluation.status == EvaluationStatus.COMPLETED
+    assert evaluation.progress == 100.0
+    assert all(i.data for i in evaluation.invoices)
+    assert not any(i.checkpoint for i in evaluation.invoices)
@@ -14,14 +14,25 @@
 
 from datetime import datetime, timezone
 from typing import Sequence
+from unittest.mock import AsyncMock
 
 
 from parlant.core.agents import Agent, AgentId
 from parlant.core.glossary import GlossaryStore
 from parlant.core.guidelines import GuidelineContent
+from parlant.core.logging import Logger
+from parlant.core.nlp.generation import (
+    GenerationInfo,
+    SchematicGenerationResult,
+    SchematicGenerator,
+    UsageInfo,
+)
 from parlant.core.services.indexing.guideline_connection_proposer import (
     GuidelineConnectionProposer,
+    GuidelineConnectionPropositionSchema,
+    GuidelineConnectionPropositionsSchema,
 )
+from parlant.core.services.indexing.pair_verdicts import GuidelinePairVerdictStore
 from tests.core.common.utils import ContextOfTest
 
 
@@ -1050,3 +1061,97 @@ def test_that_an_action_that_causes_a_more_general_case_of_another_guidelines_so
     )
 
     assert len(connection_propositions) == 0
+
+
+def test_that_pairs_are_batched_and_only_evaluated_once_for_unchanged_guidelines(
+    context: ContextOfTest,
+    agent: Agent,
+) -> None:
+    schematic_generator = AsyncMock(spec=SchematicGenerator[GuidelineConnectionPropositionsSchema])
+    schematic_generator.tokenizer.estimate_token_count = AsyncMock(return_value=10)
+    schematic_generator.generate.return_value = SchematicGenerationResult(
+        content=GuidelineConnectionPropositionsSchema(
+            propositions=[
+                GuidelineConnectionPropositionSchema(
+                    source_id=0,
+                    target_id=1,
+                    source_when="",
+                    source_then="",
+                    target_when="",
+                    target_when_is_customer_action=False,
+                    rationale="the source causes the target",
+                    is_target_when_caused_by_source_then="causes",
+                    causation_score=9,
+                )
+            ]
+        ),
+        info=GenerationInfo(
+            schema_name="GuidelineConnectionPropositionsSchema",
+            model="not-real-model",
+            duration=1,
+            usage=UsageInfo(input_tokens=1, output_tokens=1),
+        ),
+    )
+
+    glossary_store = AsyncMock(spec=GlossaryStore)
+    glossary_store.find_relevant_terms.return_value = []
+
+    def create_connection_proposer() -> GuidelineConnectionProposer:
+        return GuidelineConnectionProposer(
+            context.container[Logger],
+            schematic_generator,
+            glossary_store,
+            context.container[GuidelinePairVerdictStore],
+            max_batch_size=5,
+        )
+
+    introduced_guideline = GuidelineContent(
+        condition="the customer asks for a recommendation",
+        action="recommend a product",
+    )
+
+    existing_guidelines = [
+        GuidelineContent(
+            condition=f"recommending product {i}",
+            action=f"mention that product {i} is on sale",
+        )
+        for i in range(8)
+    ]
+
+    first_propositions = context.sync_await(
+        create_connection_proposer().propose_connections(
+            agent, [introduced_guideline], existing_guidelines
+        )
+    )
+
+    assert schematic_generator.generate.await_count == 2
+    assert [(p.source, p.target) for p in first_propositions] == [
+        (introduced_guideline, existing_guidelines[0]),
+        (introduced_guideline, existing_guidelines[5]),
+    ]
+
+    second_propositions = context.sync_await(
+        create_connection_proposer().propose_connections(
+            agent, [introduced_guideline], existing_guidelines
+        )
+    )
+
+    assert schematic_generator.generate.await_count == 2
+    assert set(second_propositions) == set(first_propositions)
+
+    new_guideline = GuidelineContent(
+        condition="recommending a new product",
+        action="mention that it has just arrived",
+    )
+
+    context.sync_await(
+        create_connection_proposer().propose_connections(
+            agent, [introduced_guideline], [*existing_guidelines, new_guideline]
+        )
+    )
+
+    assert schematic_generator.generate.await_count == 3
+    assert new_guideline.action in schematic_generator.generate.call_args.kwargs["prompt"]
+    assert (
+        existing_guidelines[0].action not in schematic_generator.generate.call_args.kwargs["prompt"]
+    )
@@ -0,0 +1,99 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from parlant.adapters.db.transient import TransientDocumentDatabase
+from parlant.core.agents import AgentId
+from parlant.core.guidelines import GuidelineContent
+from parlant.core.resource_versions import ResourceVersionDocumentStore
+from parlant.core.services.indexing.pair_verdicts import GuidelinePairVerdictDocumentStore
+
+
+FIRST_GUIDELINE = GuidelineContent(condition="the customer greets you", action="greet them back")
+SECOND_GUIDELINE = GuidelineContent(condition="the customer says hello", action="say hello")
+THIRD_GUIDELINE = GuidelineContent(condition="the customer leaves", action="say goodbye")
+
+
+async def test_that_verdicts_are_found_for_either_order_of_their_pair() -> None:
+    async with GuidelinePairVerdictDocumentStore(TransientDocumentDatabase()) as store:
+        await store.set_verdicts(
+            "coherence",
+            AgentId("agent"),
+            [(FIRST_GUIDELINE, SECOND_GUIDELINE, ["verdict"])],
+        )
+
+        verdicts = await store.read_verdicts(
+            "coherence",
+            AgentId("agent"),
+            [
+                (SECOND_GUIDELINE, FIRST_GUIDELINE),
+                (FIRST_GUIDELINE, THIRD_GUIDELINE),
+            ],
+        )
+
+        assert verdicts == [["verdict"], None]
+
+        assert await store.read_verdicts(
+            "connection", AgentId("agent"), [(FIRST_GUIDELINE, SECOND_GUIDELINE)]
+        ) == [None]
+
+
+async def test_that_stored_verdicts_are_loaded_when_the_store_is_reopened() -> None:
+    database = TransientDocumentDatabase()
+
+    async with GuidelinePairVerdictDocumentStore(database) as store:
+        await store.set_verdicts(
+            "connection",
+            AgentId("agent"),
+            [
+                (FIRST_GUIDELINE, SECOND_GUIDELINE, ["first verdict"]),
+                (FIRST_GUIDELINE, THIRD_GUIDELINE, []),
+            ],
+        )
+
+    async with GuidelinePairVerdictDocumentStore(database) as store:
+        await store.set_verdicts(
+            "connection",
+            AgentId("agent"),
+            [(SECOND_GUIDELINE, FIRST_GUIDELINE, ["second verdict"])],
+        )
+
+        verdicts = await store.read_verdicts(
+            "connection",
+            AgentId("agent"),
+            [(FIRST_GUIDELINE, SECOND_GUIDELINE), (FIRST_GUIDELINE, THIRD_GUIDELINE)],
+        )
+
+    assert verdicts == [["first verdict"], []]
+
+
+async def test_that_verdicts_are_not_found_once_the_glossary_changes() -> None:
+    async with ResourceVersionDocumentStore(TransientDocumentDatabase()) as versions:
+        async with GuidelinePairVerdictDocumentStore(
+            TransientDocumentDatabase(), versions=versions
+        ) as store:
+            await store.set_verdicts(
+                "coherence",
+                AgentId("agent"),
+                [(FIRST_GUIDELINE, SECOND_GUIDELINE, ["verdict"])],
+            )
+
+            assert await store.read_verdicts(
+                "coherence", AgentId("agent"), [(FIRST_GUIDELINE, SECOND_GUIDELINE)]
+            ) == [["verdict"]]
+
+            await versions.bump_version("glossary")
+
+            assert await store.read_verdicts(
+                "coherence", AgentId("agent"), [(FIRST_GUIDELINE, SECOND_GUIDELINE)]
+            ) == [None]
@@ -182,6 +182,30 @@ async def test_that_a_session_update_is_detected_as_soon_as_a_client_event_is_po
     )
 
 
+async def test_that_a_session_is_not_processed_while_a_customer_message_is_pending_moderation(
+    context: ContextOfTest,
+    session: Session,
+) -> None:
+    event = await context.app.post_event(
+        session_id=session.id,
+        kind="message",
+        data={
+            "message": "Hey there",
+            "participant": {
+                "display_name": "Johnny Boy",
+            },
+            "pending_moderation": "auto",
+        },
+    )
+
+    assert not await context.app.wait_for_update(
+        session_id=session.id,
+        min_offset=1 + event.offset,
+        kinds=[],
+        timeout=Timeout(3),
+    )
+
+
 async def test_that_when_a_customer_quickly_posts_more_than_one_message_then_only_one_message_is_emitted_as_a_reply_to_the_last_message(
     context: ContextOfTest,
     session: Session,
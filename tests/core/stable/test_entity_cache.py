@@ -0,0 +1,113 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import AsyncIterator
+
+from pytest import fixture
+
+from parlant.adapters.db.transient import TransientDocumentDatabase
+from parlant.core.agents import AgentDocumentStore, AgentStore, CachedAgentStore
+from parlant.core.entity_cache import EntityCache
+from parlant.core.metrics import MetricsRegistry
+from parlant.core.resource_versions import ResourceVersionDocumentStore, ResourceVersionStore
+
+
+@fixture
+async def versions() -> AsyncIterator[ResourceVersionStore]:
+    async with ResourceVersionDocumentStore(TransientDocumentDatabase()) as store:
+        yield store
+
+
+@fixture
+async def agent_store(versions: ResourceVersionStore) -> AsyncIterator[AgentStore]:
+    async with AgentDocumentStore(TransientDocumentDatabase(), versions=versions) as store:
+        yield store
+
+
+async def test_that_repeated_reads_are_served_from_the_cache(
+    agent_store: AgentStore,
+) -> None:
+    metrics = MetricsRegistry()
+    cached_store = CachedAgentStore(agent_store, metrics)
+
+    agent = await agent_store.create_agent(name="Cached Agent")
+
+    for _ in range(3):
+        assert await cached_store.read_agent(agent.id) == agent
+
+    assert metrics.counter("entity_cache_misses", "").value(resource="agents") == 1
+    assert metrics.counter("entity_cache_hits", "").value(resource="agents") == 2
+
+
+async def test_that_an_updated_entity_is_read_again(
+    agent_store: AgentStore,
+) -> None:
+    cached_store = CachedAgentStore(agent_store, MetricsRegistry())
+
+    agent = await cached_store.create_agent(name="Old Name")
+    await cached_store.read_agent(agent.id)
+
+    await cached_store.update_agent(agent.id, {"name": "New Name"})
+
+    assert (await cached_store.read_agent(agent.id)).name == "New Name"
+
+
+async def test_that_the_cache_is_invalidated_when_another_process_writes_the_resource(
+    versions: ResourceVersionStore,
+) -> None:
+    cache = EntityCache[str, str](
+        "agents",
+        MetricsRegistry(),
+        versions,
+        version_check_interval=0,
+    )
+
+    async def read_old() -> str:
+        return "old"
+
+    async def read_new() -> str:
+        return "new"
+
+    assert await cache.get_or_read("key", read_old) == "old"
+    assert await cache.get_or_read("key", read_new) == "old"
+
+    await versions.bump_version("agents")
+
+    assert await cache.get_or_read("key", read_new) == "new"
+
+
+async def test_that_a_read_racing_an_invalidation_is_not_cached() -> None:
+    cache = EntityCache[str, str]("agents", MetricsRegistry())
+
+    async def read_and_invalidate() -> str:
+        cache.discard("key")
+        return "stale"
+
+    async def read_fresh() -> str:
+        return "fresh"
+
+    assert await cache.get_or_read("key", read_and_invalidate) == "stale"
+    assert await cache.get_or_read("key", read_fresh) == "fresh"
+
+
+async def test_that_stores_sharing_a_database_agree_on_versions_of_unwritten_resources() -> None:
+    database = TransientDocumentDatabase()
+
+    async with (
+        ResourceVersionDocumentStore(database) as first,
+        ResourceVersionDocumentStore(database) as second,
+    ):
+        assert await first.read_versions(["agents", "sessions"]) == await second.read_versions(
+            ["agents", "sessions"]
+        )
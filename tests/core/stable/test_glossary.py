@@ -0,0 +1,55 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+from pytest import raises
+
+from parlant.core.glossary import DeferredGlossaryStore, GlossaryStore, Term, TermId
+
+
+async def test_that_calls_wait_until_the_store_is_provided() -> None:
+    term = Term(
+        id=TermId("term-1"),
+        creation_utc=datetime.now(timezone.utc),
+        name="Bank",
+        description="A financial institution",
+        synonyms=[],
+    )
+
+    store = AsyncMock(spec=GlossaryStore)
+    store.read_term.return_value = term
+
+    deferred = DeferredGlossaryStore()
+
+    read = asyncio.create_task(deferred.read_term("glossary", term.id))
+    await asyncio.sleep(0.01)
+
+    assert not read.done()
+
+    deferred.provide(store)
+
+    assert await read == term
+    store.read_term.assert_awaited_once_with("glossary", term.id)
+
+
+async def test_that_calls_raise_the_error_the_store_failed_to_load_with() -> None:
+    deferred = DeferredGlossaryStore()
+
+    deferred.fail(RuntimeError("Failed to load embeddings"))
+
+    with raises(RuntimeError, match="Failed to load embeddings"):
+        await deferred.list_terms("glossary")
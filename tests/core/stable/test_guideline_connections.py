@@ -234,3 +234,38 @@ async def test_that_error_is_raised_when_both_source_and_target_are_provided(
             target=b_id,
             indirect=False,
         )
+
+
+async def test_that_connections_can_be_created_and_deleted_in_bulk(
+    guideline_connection_store: GuidelineConnectionStore,
+) -> None:
+    a_id = GuidelineId("a")
+    b_id = GuidelineId("b")
+    c_id = GuidelineId("c")
+
+    existing_connection = await guideline_connection_store.create_connection(
+        source=a_id,
+        target=b_id,
+    )
+
+    connections = await guideline_connection_store.create_connections(
+        [(a_id, b_id), (a_id, c_id), (b_id, c_id), (a_id, c_id)]
+    )
+
+    assert len(connections) == 3
+
+    a_connections = await guideline_connection_store.list_connections(
+        source=a_id,
+        indirect=False,
+    )
+
+    assert len(a_connections) == 2
+    assert existing_connection.id not in [c.id for c in a_connections]
+
+    await guideline_connection_store.delete_connections([c.id for c in a_connections])
+
+    assert not await guideline_connection_store.list_connections(source=a_id, indirect=False)
+    assert has_connection(
+        await guideline_connection_store.list_connections(source=b_id, indirect=False),
+        (b_id, c_id),
+    )
@@ -0,0 +1,138 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+from pytest import fixture, mark, raises
+
+from parlant.adapters.db.transient import TransientDocumentDatabase
+from parlant.core.common import ItemNotFoundError, generate_id
+from parlant.core.customers import Customer, CustomerId
+from parlant.core.inspections import (
+    InspectionDocumentStore,
+    InspectionSamplingPolicy,
+    InspectionStore,
+)
+from parlant.core.nlp.generation import GenerationInfo, UsageInfo
+from parlant.core.sessions import MessageGenerationInspection, SessionId
+from parlant.core.tags import TagId
+
+
+@fixture
+async def inspection_store() -> AsyncIterator[InspectionStore]:
+    async with InspectionDocumentStore(TransientDocumentDatabase()) as store:
+        yield store
+
+
+def create_customer(tags: list[TagId] = []) -> Customer:
+    return Customer(
+        id=CustomerId(generate_id()),
+        creation_utc=datetime.now(timezone.utc),
+        name="Larry",
+        extra={},
+        tags=tags,
+    )
+
+
+message_generation = MessageGenerationInspection(
+    generation=GenerationInfo(
+        schema_name="FluidMessageSchema",
+        model="test-model",
+        duration=1.5,
+        usage=UsageInfo(input_tokens=100, output_tokens=10, extra={"cached_input_tokens": 50}),
+    ),
+    messages=[None],
+)
+
+
+@mark.parametrize("compress", [True, False])
+async def test_that_an_inspection_can_be_read_back(compress: bool) -> None:
+    async with InspectionDocumentStore(TransientDocumentDatabase(), compress=compress) as store:
+        inspection = await store.create_inspection(
+            session_id=SessionId("session"),
+            correlation_id="RID(1)",
+            message_generations=[message_generation],
+            preparation_iterations=[],
+        )
+
+        assert await store.read_inspection(SessionId("session"), "RID(1)") == inspection
+
+
+async def test_that_reading_an_unrecorded_inspection_raises_not_found(
+    inspection_store: InspectionStore,
+) -> None:
+    with raises(ItemNotFoundError):
+        await inspection_store.read_inspection(SessionId("session"), "RID(1)")
+
+
+async def test_that_inspections_can_be_deleted_by_age(
+    inspection_store: InspectionStore,
+) -> None:
+    now = datetime.now(timezone.utc)
+
+    for correlation_id, age in [("RID(old)", timedelta(days=10)), ("RID(new)", timedelta(0))]:
+        await inspection_store.create_inspection(
+            session_id=SessionId("session"),
+            correlation_id=correlation_id,
+            message_generations=[message_generation],
+            preparation_iterations=[],
+            creation_utc=now - age,
+        )
+
+    assert await inspection_store.delete_inspections(created_before=now - timedelta(days=1)) == 1
+
+    with raises(ItemNotFoundError):
+        await inspection_store.read_inspection(SessionId("session"), "RID(old)")
+
+    assert await inspection_store.read_inspection(SessionId("session"), "RID(new)")
+
+
+def test_that_sampling_specs_are_parsed() -> None:
+    assert InspectionSamplingPolicy.parse("all") == InspectionSamplingPolicy()
+    assert InspectionSamplingPolicy.parse("errors").mode == "errors"
+    assert InspectionSamplingPolicy.parse("1/10") == InspectionSamplingPolicy(mode="rate", rate=10)
+    assert InspectionSamplingPolicy.parse("tags:a,b").tags == [TagId("a"), TagId("b")]
+
+    for invalid_spec in ("some", "1/0", "tags:"):
+        with raises(ValueError):
+            InspectionSamplingPolicy.parse(invalid_spec)
+
+
+def test_that_errored_turns_are_always_sampled() -> None:
+    customer = create_customer()
+
+    for spec in ("errors", "1/1000", "tags:vip"):
+        policy = InspectionSamplingPolicy.parse(spec)
+
+        assert policy.should_record("RID(1)", customer, errored=True)
+        assert not all(
+            policy.should_record(f"RID({i})", customer, errored=False) for i in range(10)
+        )
+
+
+def test_that_rate_sampling_records_roughly_one_in_n_turns() -> None:
+    policy = InspectionSamplingPolicy.parse("1/10")
+    customer = create_customer()
+
+    recorded = sum(policy.should_record(f"RID({i})", customer, errored=False) for i in range(1000))
+
+    assert 50 < recorded < 150
+
+
+def test_that_tag_sampling_records_turns_of_tagged_customers() -> None:
+    policy = InspectionSamplingPolicy.parse("tags:vip")
+
+    assert policy.should_record("RID(1)", create_customer([TagId("vip")]), errored=False)
+    assert not policy.should_record("RID(1)", create_customer([TagId("other")]), errored=False)
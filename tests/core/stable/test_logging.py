@@ -0,0 +1,74 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+import tempfile
+
+from parlant.core.contextual_correlator import ContextualCorrelator
+from parlant.core.logging import CompositeLogger, FileLogger, LogLevel, StdoutLogger
+
+
+def test_that_a_lazy_message_is_not_rendered_below_the_log_level() -> None:
+    logger = StdoutLogger(ContextualCorrelator(), LogLevel.INFO, logger_id="test-lazy-logging")
+    rendered: list[str] = []
+
+    def render(message: str) -> str:
+        rendered.append(message)
+        return message
+
+    logger.debug(lambda: render("debug"))
+    logger.info(lambda: render("info"))
+
+    assert rendered == ["info"]
+
+
+def test_that_a_composite_logger_renders_a_lazy_message_at_most_once() -> None:
+    correlator = ContextualCorrelator()
+    logger = CompositeLogger(
+        [
+            StdoutLogger(correlator, LogLevel.DEBUG, logger_id="test-lazy-logging-1"),
+            StdoutLogger(correlator, LogLevel.DEBUG, logger_id="test-lazy-logging-2"),
+        ]
+    )
+    rendered: list[str] = []
+
+    def render(message: str) -> str:
+        rendered.append(message)
+        return message
+
+    logger.debug(lambda: render("debug"))
+
+    assert rendered == ["debug"]
+
+
+def test_that_a_file_logger_writes_all_pending_records_when_closed() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_file_path = Path(temp_dir) / "parlant.log"
+
+        logger = FileLogger(
+            log_file_path,
+            ContextualCorrelator(),
+            LogLevel.INFO,
+            logger_id="test-file-logging",
+        )
+
+        for i in range(100):
+            logger.info(f"Message {i}")
+
+        logger.close()
+
+        lines = log_file_path.read_text().splitlines()
+
+    assert len(lines) == 100
+    assert "Message 99" in lines[-1]
@@ -0,0 +1,101 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import math
+from pytest import raises
+
+from parlant.core.metrics import MetricsLogger, MetricsRegistry
+
+
+def test_that_counters_are_rendered_with_their_labels() -> None:
+    registry = MetricsRegistry()
+
+    counter = registry.counter("requests", "Handled requests", labels=["method"])
+    counter.inc(method="GET")
+    counter.inc(2, method="POST")
+
+    rendered = registry.render().splitlines()
+
+    assert "# TYPE parlant_requests counter" in rendered
+    assert 'parlant_requests_total{method="GET"} 1' in rendered
+    assert 'parlant_requests_total{method="POST"} 2' in rendered
+    assert rendered[-1] == "# EOF"
+
+
+def test_that_registering_the_same_name_returns_the_same_metric() -> None:
+    registry = MetricsRegistry()
+
+    assert registry.counter("hits", "Hits") is registry.counter("hits", "Hits")
+
+    with raises(ValueError):
+        registry.gauge("hits", "Hits")
+
+
+def test_that_histogram_buckets_are_cumulative() -> None:
+    registry = MetricsRegistry()
+
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=[0.1, 1.0])
+
+    for value in [0.05, 0.5, 0.5, 5.0]:
+        histogram.observe(value)
+
+    rendered = registry.render().splitlines()
+
+    assert 'parlant_latency_seconds_bucket{le="0.1"} 1' in rendered
+    assert 'parlant_latency_seconds_bucket{le="1"} 3' in rendered
+    assert 'parlant_latency_seconds_bucket{le="+Inf"} 4' in rendered
+    assert "parlant_latency_seconds_count 4" in rendered
+    assert histogram.quantile(0.5) <= 1.0
+    assert math.isnan(registry.histogram("empty_seconds", "Empty").quantile(0.5))
+
+
+def test_that_gauge_callbacks_are_evaluated_on_render() -> None:
+    registry = MetricsRegistry()
+    running = {"process-session": 3}
+
+    registry.gauge(
+        "tasks",
+        "Running tasks",
+        labels=["kind"],
+        callback=lambda: {(k,): v for k, v in running.items()},
+    )
+
+    assert 'parlant_tasks{kind="process-session"} 3' in registry.render()
+
+    running["process-session"] = 1
+
+    assert 'parlant_tasks{kind="process-session"} 1' in registry.render()
+
+
+def test_that_metrics_logger_records_operation_outcomes() -> None:
+    registry = MetricsRegistry()
+    logger = MetricsLogger(registry)
+
+    with logger.operation("Succeeding"):
+        pass
+
+    with raises(RuntimeError):
+        with logger.operation("Failing"):
+            raise RuntimeError()
+
+    with raises(asyncio.CancelledError):
+        with logger.operation("Cancelled"):
+            raise asyncio.CancelledError()
+
+    rendered = registry.render()
+
+    assert 'operation="Succeeding",outcome="success"' in rendered
+    assert 'operation="Failing",outcome="error"' in rendered
+    assert 'operation="Cancelled",outcome="cancelled"' in rendered
@@ -0,0 +1,229 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from unittest.mock import AsyncMock
+
+from lagom import Container
+from pytest import fixture
+
+from parlant.adapters.db.file_session_archive import FileSessionArchive
+from parlant.adapters.db.sqlite import SQLiteLeaseManager
+from parlant.adapters.db.transient import TransientDocumentDatabase
+from parlant.core.agents import AgentId
+from parlant.core.background_tasks import BackgroundTaskService
+from parlant.core.customers import CustomerId
+from parlant.core.logging import Logger
+from parlant.core.session_retention import SessionRetentionPolicy, SessionRetentionService
+from parlant.core.sessions import Session, SessionDocumentStore, SessionStore
+
+
+@fixture
+def archive(tmp_path: Path) -> FileSessionArchive:
+    return FileSessionArchive(tmp_path / "sessions")
+
+
+@fixture
+async def session_store(archive: FileSessionArchive) -> AsyncIterator[SessionStore]:
+    async with SessionDocumentStore(TransientDocumentDatabase(), archive=archive) as store:
+        yield store
+
+
+@fixture
+async def session(session_store: SessionStore) -> Session:
+    return await session_store.create_session(CustomerId("customer"), AgentId("agent"))
+
+
+async def create_message(
+    session_store: SessionStore,
+    session: Session,
+    message: str,
+    creation_utc: Optional[datetime] = None,
+) -> None:
+    await session_store.create_event(
+        session_id=session.id,
+        source="customer",
+        kind="message",
+        correlation_id="<main>",
+        data={"message": message},
+        creation_utc=creation_utc,
+    )
+
+
+async def create_status(session_store: SessionStore, session: Session, status: str) -> None:
+    await session_store.create_event(
+        session_id=session.id,
+        source="ai_agent",
+        kind="status",
+        correlation_id="<main>",
+        data={"status": status, "data": {}},
+    )
+
+
+async def test_that_soft_deleted_events_are_purged(
+    session_store: SessionStore,
+    session: Session,
+) -> None:
+    await create_message(session_store, session, "Hello")
+    await create_message(session_store, session, "Anyone there?")
+
+    events = await session_store.list_events(session.id)
+    await session_store.delete_event(events[1].id)
+
+    assert await session_store.purge_deleted_events() == 1
+
+    remaining_events = await session_store.list_events(session.id, exclude_deleted=False)
+    assert [e.id for e in remaining_events] == [events[0].id]
+
+
+async def test_that_status_events_before_the_last_completed_turn_are_dropped(
+    session_store: SessionStore,
+    session: Session,
+) -> None:
+    await create_message(session_store, session, "Hello")
+    await create_status(session_store, session, "processing")
+    await create_status(session_store, session, "ready")
+    await create_message(session_store, session, "Anyone there?")
+    await create_status(session_store, session, "processing")
+    await create_status(session_store, session, "ready")
+    await create_message(session_store, session, "Hello?")
+    await create_status(session_store, session, "processing")
+
+    assert await session_store.drop_stale_status_events() == 3
+
+    events = await session_store.list_events(session.id)
+    assert [e.offset for e in events] == [0, 3, 5, 6, 7]
+
+
+async def test_that_stale_status_events_are_dropped_according_to_their_own_session(
+    session_store: SessionStore,
+    session: Session,
+) -> None:
+    other_session = await session_store.create_session(CustomerId("customer"), AgentId("agent"))
+
+    await create_status(session_store, session, "processing")
+    await create_status(session_store, other_session, "processing")
+    await create_status(session_store, other_session, "ready")
+    await create_status(session_store, other_session, "processing")
+    await create_status(session_store, other_session, "ready")
+
+    assert await session_store.drop_stale_status_events() == 3
+
+    assert [e.offset for e in await session_store.list_events(session.id)] == [0]
+    assert [e.offset for e in await session_store.list_events(other_session.id)] == [3]
+
+
+async def test_that_new_events_follow_the_last_offset_after_compaction(
+    session_store: SessionStore,
+    session: Session,
+) -> None:
+    await create_message(session_store, session, "Hello")
+    await create_status(session_store, session, "ready")
+    await create_message(session_store, session, "Anyone there?")
+    await create_status(session_store, session, "ready")
+
+    await session_store.drop_stale_status_events()
+    await create_message(session_store, session, "Hello?")
+
+    events = await session_store.list_events(session.id)
+    assert [e.offset for e in events] == [0, 2, 3, 4]
+
+
+async def test_that_idle_sessions_are_archived_and_restored_on_access(
+    archive: FileSessionArchive,
+    session_store: SessionStore,
+    session: Session,
+) -> None:
+    now = datetime.now(timezone.utc)
+
+    await create_message(session_store, session, "Hello", creation_utc=now - timedelta(days=2))
+    await create_message(session_store, session, "Hi", creation_utc=now - timedelta(days=2))
+
+    active_session = await session_store.create_session(CustomerId("other"), AgentId("agent"))
+    await create_message(session_store, active_session, "Hello", creation_utc=now)
+
+    assert await session_store.archive_idle_sessions(idle_since=now - timedelta(days=1)) == 1
+    assert await archive.list_session_ids() == [session.id]
+
+    events = await session_store.list_events(session.id)
+
+    assert [e.data for e in events] == [{"message": "Hello"}, {"message": "Hi"}]
+    assert await archive.list_session_ids() == []
+
+
+async def test_that_archived_sessions_are_restored_across_store_instances(
+    archive: FileSessionArchive,
+) -> None:
+    database = TransientDocumentDatabase()
+    now = datetime.now(timezone.utc)
+
+    async with SessionDocumentStore(database, archive=archive) as session_store:
+        session = await session_store.create_session(CustomerId("customer"), AgentId("agent"))
+        await create_message(session_store, session, "Hello", now - timedelta(days=2))
+        await session_store.archive_idle_sessions(idle_since=now - timedelta(days=1))
+
+    async with SessionDocumentStore(database, archive=archive) as session_store:
+        await create_message(session_store, session, "Anyone there?")
+
+        events = await session_store.list_events(session.id)
+
+    assert [e.offset for e in events] == [0, 1]
+
+
+async def test_that_only_one_worker_compacts_sessions(
+    container: Container,
+    tmp_path: Path,
+) -> None:
+    lease_file = tmp_path / "leases.sqlite"
+    policy = SessionRetentionPolicy(compaction_interval=timedelta(seconds=0.05))
+
+    async with (
+        BackgroundTaskService(container[Logger]) as first_background_task_service,
+        BackgroundTaskService(container[Logger]) as second_background_task_service,
+        SQLiteLeaseManager(lease_file) as first_lease_manager,
+        SQLiteLeaseManager(lease_file) as second_lease_manager,
+    ):
+        workers = [
+            (first_background_task_service, first_lease_manager),
+            (second_background_task_service, second_lease_manager),
+        ]
+
+        session_stores = []
+
+        for background_task_service, lease_manager in workers:
+            session_store = AsyncMock(spec=SessionStore)
+            session_store.purge_deleted_events.return_value = 0
+            session_store.drop_stale_status_events.return_value = 0
+            session_stores.append(session_store)
+
+            await SessionRetentionService(
+                container[Logger],
+                session_store,
+                background_task_service,
+                lease_manager,
+                policy,
+            ).start()
+
+        await asyncio.sleep(0.5)
+
+        for background_task_service, _ in workers:
+            await background_task_service.cancel_all()
+
+    compaction_counts = sorted(s.purge_deleted_events.await_count for s in session_stores)
+
+    assert compaction_counts[0] == 0
+    assert compaction_counts[1] > 1
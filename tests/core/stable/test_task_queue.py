@@ -0,0 +1,238 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+from typing import AsyncIterator
+from unittest.mock import AsyncMock
+
+from lagom import Container
+from pytest import FixtureRequest, fixture
+
+from parlant.adapters.db.sqlite import SQLiteTaskQueue
+from parlant.core.background_tasks import BackgroundTaskService
+from parlant.core.common import JSONSerializable
+from parlant.core.contextual_correlator import ContextualCorrelator
+from parlant.core.logging import Logger
+from parlant.core.task_queue import InMemoryTaskQueue, TaskQueue, TaskQueueConsumer
+
+
+@fixture(params=["in-memory", "sqlite"])
+async def task_queue(request: FixtureRequest, tmp_path: Path) -> AsyncIterator[TaskQueue]:
+    if request.param == "in-memory":
+        yield InMemoryTaskQueue()
+        return
+
+    async with SQLiteTaskQueue(tmp_path / "tasks.sqlite", polling_interval=0.01) as queue:
+        yield queue
+
+
+@fixture
+async def consumer(
+    container: Container,
+    task_queue: TaskQueue,
+) -> AsyncIterator[TaskQueueConsumer]:
+    async with BackgroundTaskService(container[Logger]) as background_task_service:
+        yield TaskQueueConsumer(
+            container[Logger],
+            container[ContextualCorrelator],
+            background_task_service,
+            task_queue,
+            polling_interval=0.01,
+            base_retry_delay=timedelta(0),
+        )
+
+        await background_task_service.cancel_all()
+
+
+async def test_that_submitting_a_task_with_a_running_tag_restarts_it(
+    consumer: TaskQueueConsumer,
+) -> None:
+    started: list[JSONSerializable] = []
+    completed: list[JSONSerializable] = []
+
+    async def handler(payload: JSONSerializable) -> None:
+        started.append(payload)
+        await asyncio.sleep(0.5)
+        completed.append(payload)
+
+    consumer.register_handler("test", handler)
+    await consumer.start()
+
+    await consumer.submit("test", tag="test(1)", payload=1)
+    await asyncio.sleep(0.1)
+    await consumer.submit("test", tag="test(1)", payload=2)
+    await asyncio.sleep(1)
+
+    assert started == [1, 2]
+    assert completed == [2]
+
+
+async def test_that_a_failed_task_is_retried(
+    consumer: TaskQueueConsumer,
+) -> None:
+    attempts = 0
+
+    async def handler(payload: JSONSerializable) -> None:
+        nonlocal attempts
+        attempts += 1
+
+        if attempts == 1:
+            raise Exception("Transient failure")
+
+    consumer.register_handler("test", handler)
+    await consumer.start()
+
+    await consumer.submit("test", tag="test(1)", payload=None)
+    await asyncio.sleep(0.5)
+
+    assert attempts == 2
+
+
+async def test_that_tasks_queued_before_a_restart_are_resumed(
+    container: Container,
+    task_queue: TaskQueue,
+    consumer: TaskQueueConsumer,
+) -> None:
+    await task_queue.enqueue("test", tag="test(1)", payload="queued", correlation_id="<main>")
+
+    resumed = asyncio.Event()
+
+    async def handler(payload: JSONSerializable) -> None:
+        assert payload == "queued"
+        assert container[ContextualCorrelator].correlation_id == "<main>"
+        resumed.set()
+
+    consumer.register_handler("test", handler)
+    await consumer.start()
+
+    await asyncio.wait_for(resumed.wait(), timeout=5)
+
+
+async def test_that_an_idle_consumer_does_not_keep_claiming_tasks(
+    task_queue: TaskQueue,
+    consumer: TaskQueueConsumer,
+) -> None:
+    claim = AsyncMock(wraps=task_queue.claim)
+    setattr(task_queue, "claim", claim)
+
+    handled = asyncio.Event()
+
+    async def handler(payload: JSONSerializable) -> None:
+        handled.set()
+
+    consumer.register_handler("test", handler)
+    await consumer.start()
+
+    await asyncio.sleep(0.5)
+    assert claim.await_count <= 2
+
+    await consumer.submit("test", tag="test(1)", payload=None)
+    await asyncio.wait_for(handled.wait(), timeout=1)
+
+
+async def test_that_each_kind_of_task_has_its_own_concurrency_limit(
+    consumer: TaskQueueConsumer,
+) -> None:
+    release_slow_tasks = asyncio.Event()
+    fast_task_handled = asyncio.Event()
+
+    async def slow_handler(payload: JSONSerializable) -> None:
+        await release_slow_tasks.wait()
+
+    async def fast_handler(payload: JSONSerializable) -> None:
+        fast_task_handled.set()
+
+    consumer.register_handler("slow", slow_handler, concurrency=1)
+    consumer.register_handler("fast", fast_handler)
+    await consumer.start()
+
+    await consumer.submit("slow", tag="slow(1)", payload=None)
+    await consumer.submit("slow", tag="slow(2)", payload=None)
+    await consumer.submit("fast", tag="fast(1)", payload=None)
+
+    await asyncio.wait_for(fast_task_handled.wait(), timeout=1)
+
+    release_slow_tasks.set()
+
+
+async def test_that_a_task_queued_by_another_process_wakes_up_the_consumer(
+    container: Container,
+    tmp_path: Path,
+) -> None:
+    handled = asyncio.Event()
+
+    async def handler(payload: JSONSerializable) -> None:
+        handled.set()
+
+    async with (
+        SQLiteTaskQueue(tmp_path / "tasks.sqlite", polling_interval=0.01) as consumer_queue,
+        SQLiteTaskQueue(tmp_path / "tasks.sqlite") as producer_queue,
+        BackgroundTaskService(container[Logger]) as background_task_service,
+    ):
+        consumer = TaskQueueConsumer(
+            container[Logger],
+            container[ContextualCorrelator],
+            background_task_service,
+            consumer_queue,
+        )
+        consumer.register_handler("test", handler)
+        await consumer.start()
+
+        await asyncio.sleep(0.1)
+        await producer_queue.enqueue("test", tag="test(1)", payload=None, correlation_id="<main>")
+
+        await asyncio.wait_for(handled.wait(), timeout=1)
+
+        await background_task_service.cancel_all()
+
+
+async def test_that_released_claims_can_be_claimed_again_right_away(tmp_path: Path) -> None:
+    async with SQLiteTaskQueue(tmp_path / "tasks.sqlite") as task_queue:
+        await task_queue.enqueue("test", tag="test(1)", payload=None, correlation_id="<main>")
+
+        assert await task_queue.claim(["test"], timedelta(minutes=1))
+        assert not await task_queue.claim(["test"], timedelta(minutes=1))
+
+        await task_queue.release_claims()
+
+        task = await task_queue.claim(["test"], timedelta(minutes=1))
+        assert task and task.attempt == 2
+
+
+async def test_that_old_failed_tasks_are_pruned(tmp_path: Path) -> None:
+    async with SQLiteTaskQueue(tmp_path / "tasks.sqlite") as task_queue:
+        for tag in ["test(1)", "test(2)"]:
+            await task_queue.enqueue("test", tag=tag, payload=None, correlation_id="<main>")
+
+        first_task = await task_queue.claim(["test"], timedelta(minutes=1))
+        second_task = await task_queue.claim(["test"], timedelta(minutes=1))
+        assert first_task and second_task
+
+        await task_queue.fail(first_task.id, error="Failure")
+
+        await task_queue._connection.run(
+            lambda connection: connection.execute(
+                "UPDATE tasks SET available_at = available_at - ?",
+                (SQLiteTaskQueue.FAILED_TASK_RETENTION.total_seconds() + 1,),
+            )
+        )
+
+        await task_queue.fail(second_task.id, error="Failure")
+
+        rows = await task_queue._connection.run(
+            lambda connection: connection.execute("SELECT id FROM tasks").fetchall()
+        )
+        assert rows == [(second_task.id,)]
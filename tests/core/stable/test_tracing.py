@@ -0,0 +1,183 @@
+# Copyright 2024 Emcie Co Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from pathlib import Path
+import tempfile
+import threading
+from typing import Any
+from pytest import MonkeyPatch, raises
+
+from parlant.core.contextual_correlator import ContextualCorrelator
+from parlant.core.tracing import OTLPJSONFileExporter, Tracer, TracingLogger
+
+
+def test_that_nested_operations_produce_parent_and_child_spans() -> None:
+    correlator = ContextualCorrelator()
+    tracer = Tracer(correlator)
+    logger = TracingLogger(tracer)
+
+    with correlator.correlation_scope("RID(1)"):
+        with logger.operation("Outer", {"guidelines": 3}):
+            with correlator.correlation_scope("process-session"):
+                with logger.operation("Inner"):
+                    pass
+
+    inner, outer = tracer.find_spans("RID(1)")
+
+    assert outer.name == "Outer"
+    assert outer.attributes == {"guidelines": 3}
+    assert outer.parent_span_id is None
+    assert inner.parent_span_id == outer.span_id
+    assert inner.trace_id == outer.trace_id
+    assert inner.correlation_id == "RID(1)::process-session"
+    assert outer.status == inner.status == "ok"
+
+
+def test_that_separate_correlation_scopes_produce_separate_traces() -> None:
+    correlator = ContextualCorrelator()
+    tracer = Tracer(correlator)
+
+    with correlator.correlation_scope("RID(1)"):
+        with tracer.span("First"):
+            pass
+
+    with correlator.correlation_scope("RID(2)"):
+        with tracer.span("Second"):
+            pass
+
+    [first] = tracer.find_spans("RID(1)")
+    [second] = tracer.find_spans("RID(2)")
+
+    assert first.trace_id != second.trace_id
+
+
+def test_that_a_failing_operation_marks_its_span_as_failed() -> None:
+    correlator = ContextualCorrelator()
+    tracer = Tracer(correlator)
+
+    with correlator.correlation_scope("RID(1)"):
+        with raises(ValueError):
+            with tracer.span("Failing"):
+                raise ValueError("bad input")
+
+    [span] = tracer.find_spans("RID(1)")
+
+    assert span.status == "error"
+    assert span.status_message == "ValueError: bad input"
+    assert span.duration is not None
+
+
+def test_that_the_span_buffer_keeps_only_the_most_recent_spans() -> None:
+    correlator = ContextualCorrelator()
+    tracer = Tracer(correlator, capacity=2)
+
+    with correlator.correlation_scope("RID(1)"):
+        for name in ["a", "b", "c"]:
+            with tracer.span(name):
+                pass
+
+    assert [s.name for s in tracer.find_spans("RID(1)")] == ["b", "c"]
+
+
+def test_that_spans_are_exported_as_otlp_json_lines() -> None:
+    correlator = ContextualCorrelator()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "traces.jsonl"
+
+        with OTLPJSONFileExporter(file_path, batch_size=10) as exporter:
+            tracer = Tracer(correlator, exporters=[exporter])
+
+            with correlator.correlation_scope("RID(1)"):
+                with tracer.span("Exported", {"batch_size": 5}):
+                    pass
+
+            assert not file_path.exists()
+
+        [line] = file_path.read_text().splitlines()
+
+    [span] = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+    assert span["name"] == "Exported"
+    assert len(span["traceId"]) == 32
+    assert len(span["spanId"]) == 16
+    assert span["status"]["code"] == 1
+    assert {"key": "batch_size", "value": {"intValue": "5"}} in span["attributes"]
+
+
+def test_that_full_batches_are_written_off_the_exporting_thread(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    correlator = ContextualCorrelator()
+    writing_threads: set[threading.Thread] = set()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "traces.jsonl"
+
+        with OTLPJSONFileExporter(file_path, batch_size=2) as exporter:
+            original_open = Path.open
+
+            def recording_open(path: Path, mode: str = "r", *args: Any, **kwargs: Any) -> Any:
+                if mode == "a":
+                    writing_threads.add(threading.current_thread())
+                return original_open(path, mode, *args, **kwargs)
+
+            monkeypatch.setattr(Path, "open", recording_open)
+
+            tracer = Tracer(correlator, exporters=[exporter])
+
+            with correlator.correlation_scope("RID(1)"):
+                for name in ["a", "b", "c", "d"]:
+                    with tracer.span(name):
+                        pass
+
+            exporter.flush()
+
+            assert len(file_path.read_text().splitlines()) == 2
+
+    assert writing_threads
+    assert threading.current_thread() not in writing_threads
+
+
+def test_that_the_exported_file_is_rotated_once_it_reaches_its_maximum_size() -> None:
+    correlator = ContextualCorrelator()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "traces.jsonl"
+
+        with OTLPJSONFileExporter(
+            file_path,
+            batch_size=1,
+            max_file_size=1,
+            backup_count=2,
+        ) as exporter:
+            tracer = Tracer(correlator, exporters=[exporter])
+
+            with correlator.correlation_scope("RID(1)"):
+                for name in ["First", "Second", "Third", "Fourth"]:
+                    with tracer.span(name):
+                        pass
+
+        def span_names(path: Path) -> list[str]:
+            return [
+                span["name"]
+                for line in path.read_text().splitlines()
+                for span in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+            ]
+
+        assert span_names(file_path) == ["Fourth"]
+        assert span_names(file_path.with_name("traces.jsonl.1")) == ["Third"]
+        assert span_names(file_path.with_name("traces.jsonl.2")) == ["Second"]
+        assert not file_path.with_name("traces.jsonl.3").exists()
@@ -54,7 +54,7 @@ from parlant.core.customers import Customer, CustomerId, CustomerStore
 from parlant.core.glossary import GlossaryStore, Term
 from parlant.core.guideline_tool_associations import GuidelineToolAssociationStore
 from parlant.core.guidelines import Guideline, GuidelineStore
-from parlant.core.logging import LogLevel, Logger
+from parlant.core.logging import LogLevel, LogMessage, Logger, render_log_message
 from parlant.core.nlp.generation import (
     FallbackSchematicGenerator,
     GenerationInfo,
@@ -64,9 +64,8 @@ from parlant.core.nlp.generation import (
 )
 from parlant.core.nlp.tokenization import EstimatingTokenizer
 from parlant.core.services.tools.plugins import PluginServer, ToolEntry
+from parlant.core.inspections import _GenerationInfoDocument, _UsageInfoDocument
 from parlant.core.sessions import (
-    _GenerationInfoDocument,
-    _UsageInfoDocument,
     Event,
     MessageEventData,
     Session,
@@ -114,20 +113,25 @@ class _TestLogger(Logger):
             }[log_level]
         )
 
-    def debug(self, message: str) -> None:
-        self.logger.debug(message)
+    def debug(self, message: LogMessage) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(render_log_message(message))
 
-    def info(self, message: str) -> None:
-        self.logger.info(message)
+    def info(self, message: LogMessage) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(render_log_message(message))
 
-    def warning(self, message: str) -> None:
-        self.logger.warning(message)
+    def warning(self, message: LogMessage) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(render_log_message(message))
 
-    def error(self, message: str) -> None:
-        self.logger.error(message)
+    def error(self, message: LogMessage) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(render_log_message(message))
 
-    def critical(self, message: str) -> None:
-        self.logger.critical(message)
+    def critical(self, message: LogMessage) -> None:
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.critical(render_log_message(message))
 
     @contextmanager
     def operation(self, name: str, props: dict[str, Any] = {}) -> Iterator[None]: